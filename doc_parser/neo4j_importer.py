@@ -5,6 +5,7 @@
 #   python neo4j_importer.py --def-file  # parsed_api_result_def.jsonを使用
 #   python neo4j_importer.py --original-file  # parsed_api_result.jsonを使用
 #   python neo4j_importer.py --file custom.json  # カスタムファイルを使用
+#   python neo4j_importer.py --migrate-qa-schema  # 既存データにQA用の影プロパティ/索引を追加
 #
 # 環境変数設定 (.envファイル):
 #   NEO4J_URI=bolt://localhost:7687
@@ -56,13 +57,40 @@ class Neo4jImporter:
         self.check_and_create_database()
 
         with self.driver.session(database=self.database) as session:
+            self._create_indexes(session)
             self._import_type_definitions(
                 session, data.get("type_definitions", [])
             )
             self._import_api_entries(session, data.get("api_entries", []))
             self._create_dependency_links(session)
+            self._backfill_qa_properties(session)
         print(f"Data import completed to database: {self.database}")
 
+    def migrate_qa_schema(self):
+        """投入済みデータに QA 用の影プロパティと索引を追加する（データの再投入なし）"""
+        from qa_cypher import migrate_qa_schema
+
+        with self.driver.session(database=self.database) as session:
+            migrate_qa_schema(lambda statement: session.run(statement).consume())
+        print(f"QA schema migration completed on database: {self.database}")
+
+    def _create_indexes(self, session):
+        """QA の照合に使うプロパティの索引を作成（Function.name の MERGE も速くなる）"""
+        from qa_cypher import INDEX_STATEMENTS
+
+        for statement in INDEX_STATEMENTS:
+            try:
+                session.run(statement).consume()
+            except Exception as e:
+                print(f"  - Warning: Could not create index: {e}")
+
+    def _backfill_qa_properties(self, session):
+        """以前の投入や他のツールで作られた、影プロパティの無いノードを補完"""
+        from qa_cypher import BACKFILL_STATEMENTS
+
+        for statement in BACKFILL_STATEMENTS:
+            session.run(statement).consume()
+
     def _import_type_definitions(self, session, type_definitions):
         """型定義のインポート"""
         if not type_definitions:
@@ -148,7 +176,8 @@ class Neo4jImporter:
 
         query = """
         MERGE (f:Function {name: $name})
-        SET f.description = $description,
+        SET f.name_lower = toLower($name),
+            f.description = $description,
             f.category = $category,
             f.implementation_status = $implementation_status,
             f.notes = $notes
@@ -249,7 +278,8 @@ class Neo4jImporter:
             MATCH (f:Function {name: $parent_name})
             MERGE (p:Parameter {name: $param_name,
                    parent_function: $parent_name})
-            SET p.description = $param_description,
+            SET p.parent_function_lower = toLower($parent_name),
+                p.description = $param_description,
                 p.is_required = $param_required
             MERGE (f)-[r:HAS_PARAMETER]->(p)
             SET r.position = $param_position
@@ -437,6 +467,7 @@ def main():
     python neo4j_importer.py --def-file  # parsed_api_result_def.jsonを使用
     python neo4j_importer.py --original-file  # parsed_api_result.jsonを使用
     python neo4j_importer.py --file custom.json  # カスタムファイルを使用
+    python neo4j_importer.py --migrate-qa-schema  # 既存データにQA用の影プロパティ/索引を追加
             """
     )
 
@@ -453,12 +484,27 @@ def main():
         '--file', type=str, metavar='FILE',
         help='指定されたファイルを使用'
     )
+    group.add_argument(
+        '--migrate-qa-schema', action='store_true',
+        help='インポートせず、既存データにQA用の影プロパティと索引を追加'
+    )
 
     args = parser.parse_args()
 
     # 環境変数の読み込み
     uri, user, password, database = load_environment()
 
+    if args.migrate_qa_schema:
+        importer = Neo4jImporter(uri, user, password, database)
+        try:
+            importer.migrate_qa_schema()
+        except Exception as e:
+            print(f"QA schema migration failed: {e}")
+            sys.exit(1)
+        finally:
+            importer.close()
+        return
+
     # ファイル選択の決定
     file_path = args.file if args.file else None
     use_def_file = not args.original_file
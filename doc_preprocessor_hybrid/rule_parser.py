@@ -3,11 +3,13 @@ from __future__ import annotations
 import json
 import re
 import hashlib
+from dataclasses import asdict
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Tuple
 
 from .config import PipelineConfig
 from .schemas import ApiBundle, ApiEntry, Parameter, ReturnSpec, TypeDefinition, SourceFragment
+from .spec_cache import cached_parse
 
 
 HEADER_RE = re.compile(r"^■(.+?)(?:のメソッド)?$")
@@ -643,8 +645,23 @@ def parse_api_documents(api_doc_path: Path | None = None, api_arg_path: Path | N
     api_text = _read_text_file(doc_path)
     arg_text = _read_text_file(arg_path)
 
-    types = parse_type_definitions(arg_text, path=arg_path)
-    entries = parse_api_specs(api_text, path=doc_path)
+    # 入力ハッシュ単位のキャッシュ（SourceFragment がパスを持つためパスもキーに含める）
+    types = cached_parse(
+        "rule_parser.type_definitions",
+        arg_text,
+        lambda text: parse_type_definitions(text, path=arg_path),
+        key_extra=str(arg_path),
+        encode=lambda defs: [asdict(d) for d in defs],
+        decode=lambda data: [_type_definition_from_cache(item) for item in data],
+    )
+    entries = cached_parse(
+        "rule_parser.api_entries",
+        api_text,
+        lambda text: parse_api_specs(text, path=doc_path),
+        key_extra=str(doc_path),
+        encode=lambda items: [asdict(e) for e in items],
+        decode=lambda data: [_api_entry_from_cache(item) for item in data],
+    )
 
     checklist = ["parsed_api_doc", "parsed_api_arg"]
 
@@ -722,6 +739,28 @@ def _api_entry_from_dict(data: Dict[str, object]) -> ApiEntry:
     )
 
 
+# キャッシュ用の復元（to_dict は空値を省略するため、asdict の全フィールドから戻す）
+def _source_from_cache(data: Optional[Dict[str, object]]) -> Optional[SourceFragment]:
+    return SourceFragment(**data) if data else None
+
+
+def _type_definition_from_cache(data: Dict[str, object]) -> TypeDefinition:
+    return TypeDefinition(**{**data, "source": _source_from_cache(data.get("source"))})
+
+
+def _api_entry_from_cache(data: Dict[str, object]) -> ApiEntry:
+    returns = data.get("returns")
+    return ApiEntry(
+        **{
+            **data,
+            "params": [Parameter(**item) for item in data.get("params", [])],
+            "properties": [Parameter(**item) for item in data.get("properties", [])],
+            "returns": ReturnSpec(**returns) if returns else None,
+            "source": _source_from_cache(data.get("source")),
+        }
+    )
+
+
 def load_bundle(path: Path) -> ApiBundle:
     payload = json.loads(Path(path).read_text(encoding="utf-8"))
     type_definitions = [_type_definition_from_dict(item) for item in payload.get("type_definitions", [])]
@@ -0,0 +1,310 @@
+"""api.txt / api_arg.txt の解析結果キャッシュ
+
+同じ入力テキストを各パイプライン（mycode/chunking, graphrag_gpt/ingest0903,
+rule_parser）が毎回正規表現で解析し直さないよう、入力の sha256 をキーに
+解析結果をメモリとディスク（コンパクト JSON）に保存する。
+
+- キャッシュディレクトリは既定でプロジェクトルートの .cache/api_spec
+  （環境変数 API_SPEC_CACHE_DIR で変更でき、空文字を指定するとディスクキャッシュを
+  無効化し、プロセス内メモリのみ使う）
+- キーには解析関数のモジュール（と本モジュール）のソースのハッシュを含めるため、
+  解析ロジックを変更すると自動的に再解析される。SPEC_CACHE_VERSION はそれ以外の
+  理由（依存ライブラリの変更など）で全キャッシュを捨てたい場合に上げる
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import os
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+SPEC_CACHE_VERSION = 1
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_CACHE_DIR = PROJECT_ROOT / ".cache" / "api_spec"
+
+T = TypeVar("T")
+
+# キャッシュキー -> シリアライズ済み JSON（呼び出し側ごとに新しいオブジェクトを返すため文字列で保持）
+_MEMORY_CACHE: Dict[str, str] = {}
+
+
+def cache_dir() -> Optional[Path]:
+    raw = os.getenv("API_SPEC_CACHE_DIR")
+    if raw is None:
+        return DEFAULT_CACHE_DIR
+    return Path(raw) if raw else None
+
+
+def clear_memory_cache() -> None:
+    _MEMORY_CACHE.clear()
+
+
+@lru_cache(maxsize=None)
+def _module_source_digest(module_name: str) -> str:
+    """モジュールのソースの sha256（ソースが取得できない場合は空文字列のハッシュ）"""
+    module = sys.modules.get(module_name)
+    try:
+        source = inspect.getsource(module) if module is not None else ""
+    except (OSError, TypeError):
+        source = ""
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _parser_digest(parse_fn: Callable[..., Any]) -> str:
+    """解析関数を定義したモジュールと本モジュールのソースから作るハッシュ"""
+    module_name = getattr(parse_fn, "__module__", None) or ""
+    return _module_source_digest(module_name) + _module_source_digest(__name__)
+
+
+def _cache_key(namespace: str, text: str, key_extra: str, parser_digest: str = "") -> str:
+    digest = hashlib.sha256()
+    for part in (namespace, str(SPEC_CACHE_VERSION), parser_digest, key_extra, text):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return f"{namespace}-{digest.hexdigest()}"
+
+
+def cached_parse(
+    namespace: str,
+    text: str,
+    parse_fn: Callable[[str], T],
+    *,
+    key_extra: str = "",
+    encode: Optional[Callable[[T], Any]] = None,
+    decode: Optional[Callable[[Any], T]] = None,
+) -> T:
+    """parse_fn(text) の結果を入力ハッシュ単位でキャッシュして返す。
+
+    encode/decode は JSON にできない結果（dataclass など）を変換するために使う。
+    キーには parse_fn を定義したモジュールのソースのハッシュも含める。
+    """
+    key = _cache_key(namespace, text, key_extra, _parser_digest(parse_fn))
+    payload = _MEMORY_CACHE.get(key)
+
+    directory = cache_dir()
+    path = directory / f"{key}.json" if directory else None
+    if payload is None and path is not None and path.exists():
+        try:
+            payload = path.read_text(encoding="utf-8")
+            json.loads(payload)
+        except (OSError, ValueError):
+            payload = None
+        if payload is not None:
+            _MEMORY_CACHE[key] = payload
+
+    if payload is None:
+        result = parse_fn(text)
+        data = encode(result) if encode else result
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        _MEMORY_CACHE[key] = payload
+        if path is not None:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = path.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, path)
+            except OSError:
+                pass
+        return decode(json.loads(payload)) if decode else result
+
+    data = json.loads(payload)
+    return decode(data) if decode else data
+
+
+# ---------------------------------------------------------------------------
+# 辞書形式の API 仕様パーサ（mycode/chunking と graphrag_gpt/ingest0903 で共有）
+# ---------------------------------------------------------------------------
+
+def normalize_text(text: str) -> str:
+    """
+    改行/タブ/空白の揺れを正規化。
+    - Windows系改行を \n に
+    - 行末の空白除去
+    - タブ→半角スペース
+    - 連続空白（NBSP, 全角スペース含む）→半角スペース1個
+    - BOM除去
+    """
+    text = text.replace("\ufeff", "")  # BOM
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    text = text.replace("\t", " ")
+    text = re.sub(r"[ \u00A0\u3000]+", " ", text)
+    return text
+
+
+def _to_object_id_from_header(header: str) -> str:
+    """
+    '■Partオブジェクトのメソッド' → 'Part'
+    末尾の 'オブジェクト' や 'のメソッド' を適宜落として Object 名を抽出
+    """
+    s = header.strip()
+    s = re.sub(r"^■", "", s)
+    s = s.replace("のメソッド", "")
+    s = s.replace("オブジェクト", "")
+    return s.strip()
+
+
+def _guess_return_type_from_desc(desc: str) -> str:
+    """
+    返り値説明からおおまかに型を推定。
+    ・'ID' / 'Id' / '要素ID' 含む → 'ID'
+    ・それ以外は '不明'
+    """
+    d = desc or ""
+    if re.search(r"\bID\b", d, flags=re.IGNORECASE) or ("要素ID" in d):
+        return "ID"
+    return "不明"
+
+
+def parse_api_spec_dicts(text: str) -> List[Dict[str, Any]]:
+    """
+    正規化済みの api.txt から以下の構造の配列を返す（キャッシュなし）:
+    [
+      {
+        "object": "Part",
+        "title_jp": "船殻のプレートソリッド要素を作成する",
+        "name": "CreatePlate",
+        "return_desc": "作成したソリッド要素のID",
+        "return_type": "ID",
+        "params": [
+          {"name": "...", "type": "...", "description": "..."},
+          ...
+        ],
+      },
+      ...
+    ]
+    """
+    lines = text.split("\n")
+    closing_pat = re.compile(r"\)\s*;?(?:\s*//.*)?$")
+    param_pat = re.compile(
+        r"^([A-Za-z_][A-Za-z0-9_]*)\s*,?\s*//\s*([^:：]+)\s*[:：]\s*(.*)$"
+    )
+    method_start_pat = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*\($")
+    header_pat = re.compile(r"^■.+のメソッド$")
+    title_pat = re.compile(r"^〇(.+)$")
+    ret_pat = re.compile(r"^返り値[:：]\s*(.+)$")
+
+    current_object = None
+    current_title = None
+    current_return_desc = None
+    collecting_params = False
+    current_entry: Optional[Dict[str, Any]] = None
+    entries: List[Dict[str, Any]] = []
+    i = 0
+    n = len(lines)
+    while i < n:
+        line = lines[i].strip()
+        if header_pat.match(line):
+            current_object = _to_object_id_from_header(line)
+            current_title = None
+            current_return_desc = None
+            i += 1
+            continue
+        m_title = title_pat.match(line)
+        if m_title:
+            current_title = m_title.group(1).strip()
+            i += 1
+            if i < n:
+                m_ret = ret_pat.match(lines[i].strip())
+                if m_ret:
+                    current_return_desc = m_ret.group(1).strip()
+                    i += 1
+            continue
+        m_start = method_start_pat.match(line)
+        if m_start:
+            method_name = m_start.group(1)
+            current_entry = {
+                "object": current_object or "Object",
+                "title_jp": current_title or "",
+                "name": method_name,
+                "return_desc": current_return_desc or "",
+                "return_type": _guess_return_type_from_desc(current_return_desc or ""),
+                "params": [],
+            }
+            collecting_params = True
+            i += 1
+            continue
+        if collecting_params and current_entry is not None:
+            pm = param_pat.match(line)
+            if pm:
+                pname, ptype, pdesc = pm.groups()
+                current_entry["params"].append(
+                    {"name": pname, "type": ptype.strip(), "description": pdesc.strip()}
+                )
+                if closing_pat.search(line):
+                    entries.append(current_entry)
+                    current_entry = None
+                    collecting_params = False
+                i += 1
+                continue
+            if closing_pat.search(line):
+                idx_close = line.rfind(")")
+                before = line[:idx_close]
+                token = before.split(",")[-1].strip()
+                token = re.sub(r"[;,\s]+$", "", token)
+                comment = line.split("//", 1)[1].strip() if "//" in line else ""
+                synth = f"{token} // {comment}" if comment else token
+                pm2 = param_pat.match(synth)
+                if pm2:
+                    pname, ptype, pdesc = pm2.groups()
+                    current_entry["params"].append(
+                        {
+                            "name": pname,
+                            "type": ptype.strip(),
+                            "description": pdesc.strip(),
+                        }
+                    )
+                entries.append(current_entry)
+                current_entry = None
+                collecting_params = False
+                i += 1
+                continue
+            i += 1
+            continue
+        i += 1
+    return entries
+
+
+def parse_type_description_dicts(text: str) -> Dict[str, str]:
+    """
+    正規化済みの api_arg.txt を解析し、データ型名とその説明の辞書を返す（キャッシュなし）。
+    例: {"文字列": "通常の文字列", "浮動小数点": "通常の数値", ...}
+    """
+    descriptions: Dict[str, str] = {}
+    current_type = None
+    current_desc_lines: List[str] = []
+
+    for line in text.split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith("■"):
+            if current_type and current_desc_lines:
+                descriptions[current_type] = "\n".join(current_desc_lines).strip()
+
+            current_type = line.replace("■", "").strip()
+            current_desc_lines = []
+        elif current_type:
+            current_desc_lines.append(line)
+
+    if current_type and current_desc_lines:
+        descriptions[current_type] = "\n".join(current_desc_lines).strip()
+
+    return descriptions
+
+
+def load_api_spec_dicts(text: str) -> List[Dict[str, Any]]:
+    """parse_api_spec_dicts のキャッシュ付き版"""
+    return cached_parse("api_spec_dicts", text, parse_api_spec_dicts)
+
+
+def load_type_description_dicts(text: str) -> Dict[str, str]:
+    """parse_type_description_dicts のキャッシュ付き版"""
+    return cached_parse("type_description_dicts", text, parse_type_description_dicts)
@@ -0,0 +1,152 @@
+"""
+GraphCypherQAChain に渡す Cypher 結果の行数/トークン数を制限するグラフストア
+（query0903.py から利用）
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+_token_encoder: Any = None
+
+# 注記行を含めて収まるよう、行の切り詰めで残す最短の文字列長
+_MIN_VALUE_CHARS = 8
+
+
+def _count_tokens(text: str) -> int:
+    """tiktoken があればトークン数、無ければ文字数から概算する"""
+    global _token_encoder
+    if _token_encoder is None:
+        try:
+            import tiktoken
+            _token_encoder = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _token_encoder = False
+    if _token_encoder:
+        return len(_token_encoder.encode(text))
+    # 日本語混じりのテキストを想定した控えめな概算
+    return len(text) // 2 + 1
+
+
+def _row_tokens(row: Dict[str, Any]) -> int:
+    return _count_tokens(json.dumps(row, ensure_ascii=False, default=str))
+
+
+def _truncate_row(row: Dict[str, Any], max_tokens: int) -> Optional[Dict[str, Any]]:
+    """1 行が max_tokens に収まるよう、長い値から順に半分ずつ切り詰める
+
+    リストや辞書の値は JSON 文字列にしてから切り詰める。
+    キーと短い値だけでも収まらない場合は None。
+    """
+    row = {
+        key: value if value is None or isinstance(value, (str, int, float, bool))
+        else json.dumps(value, ensure_ascii=False, default=str)
+        for key, value in row.items()
+    }
+    while _row_tokens(row) > max_tokens:
+        longest = max(
+            (key for key, value in row.items() if isinstance(value, str)),
+            key=lambda key: len(row[key]),
+            default=None,
+        )
+        if longest is None or len(row[longest]) <= _MIN_VALUE_CHARS:
+            return None
+        value = row[longest]
+        row[longest] = value[: len(value) // 2] + "…"
+    return row
+
+
+class BoundedGraphStore:
+    """
+    GraphCypherQAChain に渡す Neo4jGraph のラッパー。
+    - Cypher の結果を driver のセッションで fetch_size 単位でストリーミング取得する
+    - 行数 (max_rows) とトークン数 (max_context_tokens) の上限で打ち切る
+      （1 行目が上限を超える場合は値を切り詰めて上限内に収める）
+    - 打ち切った場合は末尾に注記行を追加し、LLM に結果が部分的であることを伝える
+    スキーマ取得などその他の操作は元の Neo4jGraph に委譲する。
+    driver を省略すると Neo4jGraph のドライバ（接続プール）をそのまま使い、
+    2 つ目の接続プールを作らない（database も Neo4jGraph の設定に合わせる）。
+    """
+
+    def __init__(
+        self,
+        graph: Any,
+        driver: Any = None,
+        *,
+        max_rows: int,
+        max_context_tokens: int,
+        fetch_size: int = 100,
+        database: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ):
+        if driver is None:
+            # Neo4jGraph はドライバを公開していないため内部属性を使う
+            driver = getattr(graph, "_driver", None)
+            if driver is None:
+                raise TypeError("graph にドライバが無いため driver を指定してください")
+            if database is None:
+                database = getattr(graph, "_database", None)
+        self._graph = graph
+        self._driver = driver
+        self.database = database
+        self.timeout = timeout
+        self.max_rows = max_rows
+        self.max_context_tokens = max_context_tokens
+        self.fetch_size = fetch_size
+        self.last_stats: Dict[str, Any] = {}
+
+    @property
+    def get_schema(self) -> str:
+        return self._graph.get_schema
+
+    @property
+    def get_structured_schema(self) -> Dict[str, Any]:
+        return self._graph.get_structured_schema
+
+    def refresh_schema(self) -> None:
+        self._graph.refresh_schema()
+
+    def add_graph_documents(self, graph_documents, include_source: bool = False) -> None:
+        self._graph.add_graph_documents(graph_documents, include_source=include_source)
+
+    def query(self, query: str, params: Optional[dict] = None) -> List[Dict[str, Any]]:
+        from neo4j import Query
+
+        rows: List[Dict[str, Any]] = []
+        used_tokens = 0
+        truncated = False
+        with self._driver.session(database=self.database, fetch_size=self.fetch_size) as session:
+            result = session.run(Query(text=query, timeout=self.timeout), params or {})
+            for record in result:
+                if len(rows) >= self.max_rows:
+                    truncated = True
+                    break
+                row = record.data()
+                cost = _row_tokens(row)
+                if used_tokens + cost > self.max_context_tokens:
+                    truncated = True
+                    if not rows:
+                        # 1 行も返せないと LLM が「該当なし」と誤解するので、切り詰めて入れる
+                        row = _truncate_row(row, self.max_context_tokens)
+                        if row is not None:
+                            rows.append(row)
+                            used_tokens += _row_tokens(row)
+                    break
+                rows.append(row)
+                used_tokens += cost
+            # 残りのレコードはクライアントに転送させずに破棄する
+            result.consume()
+
+        self.last_stats = {
+            "rows": len(rows),
+            "tokens": used_tokens,
+            "truncated": truncated,
+        }
+        if truncated:
+            rows.append(
+                {
+                    "注記": (
+                        f"検索結果が多いため先頭 {len(rows)} 件（約 {used_tokens} トークン）のみを表示しています。"
+                        "必要に応じて条件を絞り込んでください。"
+                    )
+                }
+            )
+        return rows
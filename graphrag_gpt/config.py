@@ -10,3 +10,8 @@ NEO4J_URI      = os.getenv("NEO4J_URI")
 NEO4J_USER     = os.getenv("NEO4J_USER")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Graph QA の結果上限（Cypher 実行結果を LLM に渡す前に打ち切る）
+GRAPH_QA_MAX_ROWS           = int(os.getenv("GRAPH_QA_MAX_ROWS", "200"))
+GRAPH_QA_MAX_CONTEXT_TOKENS = int(os.getenv("GRAPH_QA_MAX_CONTEXT_TOKENS", "6000"))
+GRAPH_QA_FETCH_SIZE         = int(os.getenv("GRAPH_QA_FETCH_SIZE", "100"))
@@ -2,11 +2,16 @@ from tree_sitter import Language, Parser
 import tree_sitter_python as tspython
 
 from pathlib import Path
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List, Dict, Optional, Tuple, Protocol, Union, Any
 import shutil
 import logging
 import json
+import gzip
 from datetime import datetime
 
 from langchain_core.documents import Document
@@ -16,6 +21,12 @@ from langchain_neo4j.graphs.graph_document import GraphDocument, Node, Relations
 from langchain_community.vectorstores import Chroma
 from langchain_openai import OpenAIEmbeddings
 
+from doc_preprocessor_hybrid.spec_cache import (
+    load_api_spec_dicts,
+    load_type_description_dicts,
+    normalize_text,
+)
+
 # tree-sitterのPython用パーサーをセットアップ
 PY_LANGUAGE = Language(tspython.language())
 parser = Parser(PY_LANGUAGE)
@@ -125,153 +136,16 @@ def _read_script_files(data_dir: Path) -> List[Tuple[str, str]]:
 
 
 def _normalize_text(text: str) -> str:
-    """
-    改行/タブ/空白の揺れを正規化。
-    - Windows系改行を \n に
-    - 行末の空白除去
-    - タブ→半角スペース
-    - 連続空白（NBSP, 全角スペース含む）→半角スペース1個
-    - BOM除去
-    """
-    text = text.replace("\ufeff", "")  # BOM
-    text = text.replace("\r\n", "\n").replace("\r", "\n")
-    text = "\n".join(line.rstrip() for line in text.split("\n"))
-    text = text.replace("\t", " ")
-    text = re.sub(r"[ \u00A0\u3000]+", " ", text)
-    return text
-
-
-def _to_object_id_from_header(header: str) -> str:
-    """
-    '■Partオブジェクトのメソッド' → 'Part'
-    末尾の 'オブジェクト' や 'のメソッド' を適宜落として Object 名を抽出
-    """
-    s = header.strip()
-    s = re.sub(r"^■", "", s)
-    s = s.replace("のメソッド", "")
-    s = s.replace("オブジェクト", "")
-    return s.strip()
-
-
-def _guess_return_type_from_desc(desc: str) -> str:
-    """
-    返り値説明からおおまかに型を推定。
-    ・'ID' / 'Id' / '要素ID' 含む → 'ID'
-    ・それ以外は '不明'
-    """
-    d = desc or ""
-    if re.search(r"\bID\b", d, flags=re.IGNORECASE) or ("要素ID" in d):
-        return "ID"
-    return "不明"
+    """改行/タブ/空白の揺れを正規化（doc_preprocessor_hybrid.spec_cache と共通）"""
+    return normalize_text(text)
 
 
 def _parse_api_specs(text: str) -> List[Dict[str, Any]]:
     """
-    api.txt から以下の構造の配列を返す:
-    [
-      {
-        "object": "Part",
-        "title_jp": "船殻のプレートソリッド要素を作成する",
-        "name": "CreatePlate",
-        "return_desc": "作成したソリッド要素のID",
-        "return_type": "ID",
-        "params": [
-          {"name": "...", "type": "...", "description": "..."},
-          ...
-        ],
-      },
-      ...
-    ]
+    api.txt を object/title_jp/name/return_desc/return_type/params の辞書配列に解析する。
+    解析本体は mycode/chunking と共通で、入力ハッシュ単位でキャッシュされる。
     """
-    lines = text.split("\n")
-    closing_pat = re.compile(r"\)\s*;?(?:\s*//.*)?$")
-    param_pat = re.compile(
-        r"^([A-Za-z_][A-Za-z0-9_]*)\s*,?\s*//\s*([^:：]+)\s*[:：]\s*(.*)$"
-    )
-    method_start_pat = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*\($")
-    header_pat = re.compile(r"^■.+のメソッド$")
-    title_pat = re.compile(r"^〇(.+)$")
-    ret_pat = re.compile(r"^返り値[:：]\s*(.+)$")
-
-    current_object = None
-    current_title = None
-    current_return_desc = None
-    collecting_params = False
-    current_entry: Optional[Dict[str, Any]] = None
-    entries: List[Dict[str, Any]] = []
-    i = 0
-    n = len(lines)
-    while i < n:
-        line = lines[i].strip()
-        if header_pat.match(line):
-            current_object = _to_object_id_from_header(line)
-            current_title = None
-            current_return_desc = None
-            i += 1
-            continue
-        m_title = title_pat.match(line)
-        if m_title:
-            current_title = m_title.group(1).strip()
-            i += 1
-            if i < n:
-                m_ret = ret_pat.match(lines[i].strip())
-                if m_ret:
-                    current_return_desc = m_ret.group(1).strip()
-                    i += 1
-            continue
-        m_start = method_start_pat.match(line)
-        if m_start:
-            method_name = m_start.group(1)
-            current_entry = {
-                "object": current_object or "Object",
-                "title_jp": current_title or "",
-                "name": method_name,
-                "return_desc": current_return_desc or "",
-                "return_type": _guess_return_type_from_desc(current_return_desc or ""),
-                "params": [],
-            }
-            collecting_params = True
-            i += 1
-            continue
-        if collecting_params and current_entry is not None:
-            pm = param_pat.match(line)
-            if pm:
-                pname, ptype, pdesc = pm.groups()
-                current_entry["params"].append(
-                    {"name": pname, "type": ptype.strip(), "description": pdesc.strip()}
-                )
-                if closing_pat.search(line):
-                    entries.append(current_entry)
-                    current_entry = None
-                    collecting_params = False
-                i += 1
-                continue
-            if closing_pat.search(line):
-                idx_close = line.rfind(")")
-                before = line[:idx_close]
-                token = before.split(",")[-1].strip()
-                token = re.sub(r"[;,\s]+$", "", token)
-                comment = line.split("//", 1)[1].strip() if "//" in line else ""
-                synth = f"{token} // {comment}" if comment else token
-                pm2 = param_pat.match(synth)
-                if pm2:
-                    pname, ptype, pdesc = pm2.groups()
-                    current_entry["params"].append(
-                        {
-                            "name": pname,
-                            "type": ptype.strip(),
-                            "description": pdesc.strip(),
-                        }
-                    )
-                entries.append(current_entry)
-                current_entry = None
-                collecting_params = False
-                i += 1
-                continue
-            i += 1
-            continue
-        i += 1
-    return entries
+    return load_api_spec_dicts(text)
 
 
 def _parse_data_type_descriptions(text: str) -> Dict[str, str]:
@@ -279,33 +153,9 @@ def _parse_data_type_descriptions(text: str) -> Dict[str, str]:
     api_arg.txt を解析し、データ型名とその説明の辞書を返す。
     例: {"文字列": "通常の文字列", "浮動小数点": "通常の数値", ...}
     """
-    descriptions = {}
-    current_type = None
-    current_desc_lines = []
-
-    normalized_text = _normalize_text(text)
-
-    for line in normalized_text.split("\n"):
-        line = line.strip()
-        if not line:
-            continue
-
-        if line.startswith("■"):
-            if current_type and current_desc_lines:
-                descriptions[current_type] = "\n".join(current_desc_lines).strip()
-
-            current_type = line.replace("■", "").strip()
-            current_desc_lines = []
-        elif current_type:
-            current_desc_lines.append(line)
+    return load_type_description_dicts(_normalize_text(text))
 
-    if current_type and current_desc_lines:
-        descriptions[current_type] = "\n".join(current_desc_lines).strip()
 
-    return descriptions
-
-
-# グラフデータのリッチ化を行う関数をリファクタリング
 def extract_triples_from_specs(
     api_text: str, type_descriptions: Dict[str, str]
 ) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
@@ -612,6 +462,44 @@ def extract_triples_from_script(
     return triples, node_props
 
 
+def _extract_script_worker(
+    item: Tuple[str, str]
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """プロセスプール用: 1スクリプト分のトリプルを抽出し由来を付与する"""
+    script_path, script_text = item
+    triples, node_props = extract_triples_from_script(script_path, script_text)
+    _tag_provenance(triples, node_props, _script_provenance(script_path))
+    return triples, node_props
+
+
+def _collect_script_results(
+    script_results: Any, script_files: List[Tuple[str, str]]
+) -> List[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]]:
+    """スクリプトごとの抽出結果を入力順に回収する
+
+    ワーカープロセスが異常終了した（BrokenProcessPool）場合は、回収済みの分を
+    残し、残りのスクリプトを逐次解析する（map は入力順に結果を返すため、
+    回収済みの件数がそのまま処理済みの先頭部分に当たる）。
+    """
+    collected: List[Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]] = []
+    try:
+        for result in script_results:
+            collected.append(result)
+    except BrokenProcessPool as e:
+        remaining = script_files[len(collected):]
+        logger.warning(
+            f"ワーカープロセスが異常終了したため、残り {len(remaining)} 件のスクリプトを逐次解析します: {e}"
+        )
+        collected.extend(map(_extract_script_worker, remaining))
+    return collected
+
+
+def _resolve_ingest_workers(config: IngestConfigProtocol, n_scripts: int) -> int:
+    """スクリプト解析のワーカー数（INGEST_WORKERS 未指定時は CPU コア数）"""
+    workers = getattr(config, "ingest_workers", None) or os.cpu_count() or 1
+    return max(1, min(int(workers), n_scripts))
+
+
 def _triples_to_graph_documents(
     triples: List[Dict[str, Any]], node_props: Dict[str, Dict[str, Any]]
 ) -> List[GraphDocument]:
@@ -640,9 +528,10 @@ def _triples_to_graph_documents(
             target_node = Node(id=t["target"], type=t["target_type"])
             node_map[t["target"]] = target_node
 
+        rel_props = {"provenance": t["provenance"]} if t.get("provenance") else {}
         rels.append(
             Relationship(
-                source=source_node, target=target_node, type=t["label"], properties={}
+                source=source_node, target=target_node, type=t["label"], properties=rel_props
             )
         )
 
@@ -687,6 +576,314 @@ def _rebuild_graph_in_neo4j(
         raise
 
 
+SPEC_PROVENANCE = "spec:api.txt"
+
+
+def _script_provenance(script_path: str) -> str:
+    return f"script:{script_path}"
+
+
+def _tag_provenance(
+    triples: List[Dict[str, Any]],
+    node_props: Dict[str, Dict[str, Any]],
+    provenance: str,
+) -> None:
+    """トリプルとノードに由来（api.txt / 各スクリプト）を付与する。
+
+    ノードの provenance はプロパティとして Neo4j に保存され、差分同期時に
+    由来ごとの置き換え単位として使われる。
+    """
+    for t in triples:
+        t["provenance"] = provenance
+    for meta in node_props.values():
+        meta.setdefault("properties", {})["provenance"] = provenance
+
+
+def _group_by_provenance(
+    triples: List[Dict[str, Any]], node_props: Dict[str, Dict[str, Any]]
+) -> Dict[str, Dict[str, Any]]:
+    """由来ごとに desired state（ノード/リレーション）をまとめる"""
+    grouped: Dict[str, Dict[str, Any]] = {}
+
+    def _bucket(provenance: str) -> Dict[str, Any]:
+        return grouped.setdefault(provenance, {"nodes": {}, "rels": {}})
+
+    for node_id, meta in node_props.items():
+        props = meta.get("properties", {})
+        provenance = props.get("provenance")
+        if not provenance:
+            continue
+        _bucket(provenance)["nodes"][node_id] = {
+            "type": meta["type"],
+            "properties": {**props, "id": node_id},
+        }
+    for t in triples:
+        provenance = t.get("provenance")
+        if not provenance:
+            continue
+        key = (t["source"], t["label"], t["target"])
+        _bucket(provenance)["rels"][key] = t
+    return grouped
+
+
+def _quote_label(label: str) -> str:
+    return "`" + label.replace("`", "") + "`"
+
+
+def _batched(rows: List[Any], batch_size: int):
+    for i in range(0, len(rows), batch_size):
+        yield rows[i: i + batch_size]
+
+
+def _node_types(desired: Dict[str, Dict[str, Any]]) -> set:
+    """desired state に現れるノードタイプ（= 投入時のラベル）"""
+    types = set()
+    for bucket in desired.values():
+        for meta in bucket["nodes"].values():
+            types.add(meta["type"])
+        for t in bucket["rels"].values():
+            types.add(t["source_type"])
+            types.add(t["target_type"])
+    return types
+
+
+def _primary_label(labels: Optional[List[str]], known_types: set) -> str:
+    """複数ラベルを持つノードから、投入時のタイプに当たるラベルを選ぶ
+
+    labels() の順序は保証されないため先頭を使わない。既知のタイプが無ければ
+    内部ラベル（__Entity__ など）以外を名前順で選ぶ。
+    """
+    labels = labels or []
+    for label in labels:
+        if label in known_types:
+            return label
+    candidates = sorted(label for label in labels if not label.startswith("__"))
+    return candidates[0] if candidates else (sorted(labels)[0] if labels else "Node")
+
+
+def _fetch_current_graph_state(
+    graph: Neo4jGraph, known_types: Optional[set] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Neo4j 上の provenance 付きノード/リレーションを由来ごとに取得する
+
+    known_types: 投入するノードタイプ。複数ラベルのノードはこれに含まれるラベルで扱う。
+    """
+    state: Dict[str, Dict[str, Any]] = {}
+    known_types = known_types or set()
+
+    def _bucket(provenance: str) -> Dict[str, Any]:
+        return state.setdefault(provenance, {"nodes": {}, "rels": {}})
+
+    node_rows = graph.query(
+        "MATCH (n) WHERE n.provenance IS NOT NULL "
+        "RETURN n.provenance AS provenance, n.id AS id, labels(n) AS labels, "
+        "properties(n) AS props"
+    )
+    for row in node_rows:
+        _bucket(row["provenance"])["nodes"][row["id"]] = {
+            "type": _primary_label(row["labels"], known_types),
+            "properties": row["props"],
+        }
+
+    rel_rows = graph.query(
+        "MATCH (a)-[r]->(b) WHERE r.provenance IS NOT NULL "
+        "RETURN r.provenance AS provenance, a.id AS source, labels(a) AS source_labels, "
+        "type(r) AS label, b.id AS target, labels(b) AS target_labels"
+    )
+    for row in rel_rows:
+        key = (row["source"], row["label"], row["target"])
+        _bucket(row["provenance"])["rels"][key] = {
+            "source": row["source"],
+            "source_type": _primary_label(row["source_labels"], known_types),
+            "label": row["label"],
+            "target": row["target"],
+            "target_type": _primary_label(row["target_labels"], known_types),
+            "provenance": row["provenance"],
+        }
+    return state
+
+
+def _diff_graph_state(
+    desired: Dict[str, Dict[str, Any]],
+    current: Dict[str, Dict[str, Any]],
+    provenances: Optional[List[str]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """desired と current の差分（追加/削除/更新）を計算する。
+
+    provenances を指定した場合はその由来だけを置き換え対象にする。
+    未指定の場合は両方に現れるすべての由来が対象で、desired に無い由来
+    （削除されたスクリプトなど）は丸ごと削除される。
+    """
+    targets = provenances if provenances is not None else sorted(set(desired) | set(current))
+    empty: Dict[str, Any] = {"nodes": {}, "rels": {}}
+
+    upsert_nodes: List[Dict[str, Any]] = []
+    stale_nodes: List[Dict[str, Any]] = []
+    add_rels: List[Dict[str, Any]] = []
+    remove_rels: List[Dict[str, Any]] = []
+
+    for provenance in targets:
+        want = desired.get(provenance, empty)
+        have = current.get(provenance, empty)
+
+        for node_id, meta in want["nodes"].items():
+            existing = have["nodes"].get(node_id)
+            if existing is None or existing["properties"] != meta["properties"]:
+                upsert_nodes.append({"id": node_id, **meta})
+
+        for key, t in want["rels"].items():
+            if key not in have["rels"]:
+                add_rels.append(t)
+        for key, t in have["rels"].items():
+            if key not in want["rels"]:
+                remove_rels.append(t)
+
+        wanted_ids = set(want["nodes"])
+        for t in want["rels"].values():
+            wanted_ids.add(t["source"])
+            wanted_ids.add(t["target"])
+        for node_id, meta in have["nodes"].items():
+            if node_id not in wanted_ids:
+                stale_nodes.append({"id": node_id, "type": meta["type"], "provenance": provenance})
+
+    return {
+        "upsert_nodes": upsert_nodes,
+        "stale_nodes": stale_nodes,
+        "add_rels": add_rels,
+        "remove_rels": remove_rels,
+    }
+
+
+def _apply_graph_diff(
+    graph: Neo4jGraph, diff: Dict[str, List[Dict[str, Any]]], batch_size: int
+) -> None:
+    """差分をラベル/リレーションタイプごとに UNWIND でバッチ適用する"""
+    node_types = {n["type"] for n in diff["upsert_nodes"]}
+    for t in diff["add_rels"]:
+        node_types.add(t["source_type"])
+        node_types.add(t["target_type"])
+    for node_type in sorted(node_types):
+        label = _quote_label(node_type)
+        graph.query(f"CREATE INDEX IF NOT EXISTS FOR (n:{label}) ON (n.id)")
+
+    # 1. ノードの追加/更新（プロパティは丸ごと置き換える）
+    nodes_by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for n in diff["upsert_nodes"]:
+        nodes_by_type.setdefault(n["type"], []).append(
+            {"id": n["id"], "properties": n["properties"]}
+        )
+    for node_type, rows in nodes_by_type.items():
+        query = (
+            "UNWIND $rows AS row "
+            f"MERGE (n:{_quote_label(node_type)} {{id: row.id}}) "
+            "SET n = row.properties"
+        )
+        for batch in _batched(rows, batch_size):
+            graph.query(query, params={"rows": batch})
+
+    # 2. 不要になったリレーションの削除
+    def _group_rels(rels: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], List[Dict[str, Any]]]:
+        grouped: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for t in rels:
+            key = (t["source_type"], t["label"], t["target_type"])
+            grouped.setdefault(key, []).append(
+                {"source": t["source"], "target": t["target"], "provenance": t["provenance"]}
+            )
+        return grouped
+
+    for (source_type, rel_type, target_type), rows in _group_rels(diff["remove_rels"]).items():
+        query = (
+            "UNWIND $rows AS row "
+            f"MATCH (s:{_quote_label(source_type)} {{id: row.source}})"
+            f"-[r:{_quote_label(rel_type)}]->"
+            f"(t:{_quote_label(target_type)} {{id: row.target}}) "
+            "WHERE r.provenance = row.provenance "
+            "DELETE r"
+        )
+        for batch in _batched(rows, batch_size):
+            graph.query(query, params={"rows": batch})
+
+    # 3. 新しいリレーションの追加（端点ノードが無ければ由来付きで作成）
+    # provenance 導入前に投入された由来なしのリレーションがあれば、新たに作らず
+    # それに由来を付ける（初回の diff 実行で重複リレーションを作らない）
+    for (source_type, rel_type, target_type), rows in _group_rels(diff["add_rels"]).items():
+        rel = _quote_label(rel_type)
+        query = (
+            "UNWIND $rows AS row "
+            f"MERGE (s:{_quote_label(source_type)} {{id: row.source}}) "
+            "ON CREATE SET s.provenance = row.provenance "
+            f"MERGE (t:{_quote_label(target_type)} {{id: row.target}}) "
+            "ON CREATE SET t.provenance = row.provenance "
+            "WITH s, t, row "
+            f"OPTIONAL MATCH (s)-[old:{rel}]->(t) "
+            "WHERE old.provenance IS NULL OR old.provenance = row.provenance "
+            "WITH s, t, row, head(collect(old)) AS existing "
+            "FOREACH (_ IN CASE WHEN existing IS NULL THEN [1] ELSE [] END | "
+            f"CREATE (s)-[:{rel} {{provenance: row.provenance}}]->(t)) "
+            "FOREACH (r IN CASE WHEN existing IS NULL THEN [] ELSE [existing] END | "
+            "SET r.provenance = row.provenance)"
+        )
+        for batch in _batched(rows, batch_size):
+            graph.query(query, params={"rows": batch})
+
+    # 4. 由来が置き換えられ孤立したノードの削除
+    stale_by_type: Dict[str, List[Dict[str, Any]]] = {}
+    for n in diff["stale_nodes"]:
+        stale_by_type.setdefault(n["type"], []).append(
+            {"id": n["id"], "provenance": n["provenance"]}
+        )
+    for node_type, rows in stale_by_type.items():
+        query = (
+            "UNWIND $rows AS row "
+            f"MATCH (n:{_quote_label(node_type)} {{id: row.id}}) "
+            "WHERE n.provenance = row.provenance AND NOT (n)--() "
+            "DELETE n"
+        )
+        for batch in _batched(rows, batch_size):
+            graph.query(query, params={"rows": batch})
+
+
+def _sync_graph_in_neo4j(
+    triples: List[Dict[str, Any]],
+    node_props: Dict[str, Dict[str, Any]],
+    config: IngestConfigProtocol,
+    provenances: Optional[List[str]] = None,
+    batch_size: int = 1000,
+) -> Tuple[int, int]:
+    """
+    Neo4j を削除せずに、由来ごとの差分だけを適用する（diff モード）
+    """
+    if not all([config.neo4j_uri, config.neo4j_user, config.neo4j_password]):
+        raise ValueError(
+            "Neo4j接続情報が設定されていません。設定を確認してください。"
+        )
+
+    try:
+        graph = Neo4jGraph(
+            url=config.neo4j_uri,
+            username=config.neo4j_user,
+            password=config.neo4j_password,
+            database=config.neo4j_database,
+        )
+
+        desired = _group_by_provenance(triples, node_props)
+        current = _fetch_current_graph_state(graph, _node_types(desired))
+        diff = _diff_graph_state(desired, current, provenances)
+        print(
+            "🔁 Neo4jへ差分を適用中... "
+            f"ノード更新={len(diff['upsert_nodes'])}, ノード削除候補={len(diff['stale_nodes'])}, "
+            f"リレーション追加={len(diff['add_rels'])}, リレーション削除={len(diff['remove_rels'])}"
+        )
+        _apply_graph_diff(graph, diff, batch_size)
+
+        res_nodes = graph.query("MATCH (n) RETURN count(n) AS c")
+        res_rels = graph.query("MATCH ()-[r]->() RETURN count(r) AS c")
+        return int(res_nodes[0]["c"]), int(res_rels[0]["c"])
+    except Exception as e:
+        print(f"⚠ Neo4j接続エラー: {e}")
+        raise
+
+
 def _export_neo4j_to_text(
     config: IngestConfigProtocol, out_dir: Path
 ) -> Tuple[Path, Path]:
@@ -835,6 +1032,43 @@ def _build_and_load_neo4j_from_docs(
         logger.error(f"エラー詳細: {str(e)}")
 
 
+def _sync_neo4j_from_triples(
+    triples: List[Dict[str, Any]],
+    node_props: Dict[str, Dict[str, Any]],
+    config: IngestConfigProtocol,
+) -> None:
+    """トリプルとの差分だけを Neo4j に反映する（GRAPH_SYNC_MODE=diff）"""
+    batch_size = int(getattr(config, "graph_sync_batch_size", 1000))
+    try:
+        node_count, rel_count = _sync_graph_in_neo4j(
+            triples, node_props, config, batch_size=batch_size
+        )
+        logger.info(
+            f"グラフデータベースの差分同期が完了しました: ノード={node_count}, リレーションシップ={rel_count}"
+        )
+    except ServiceUnavailable as se:
+        logger.error(f"Neo4j への接続に失敗しました: {se}")
+        logger.error("Neo4jサーバーが起動しているか確認してください。")
+    except Exception as e:
+        logger.error(f"グラフデータベースの構築中にエラーが発生しました: {e}")
+        logger.error(f"エラー詳細: {str(e)}")
+
+
+PREPROCESSED_FORMATS = ("json", "jsonl.gz")
+
+# 形式ごとの成果物ファイル（形式を切り替えたとき、もう一方の形式の古いファイルを削除する）
+PREPROCESSED_FILES = {
+    "json": (
+        "api_entries.json", "type_descriptions.json",
+        "graph_specs.json", "graph_scripts.json", "graph_all.json",
+    ),
+    "jsonl.gz": (
+        "api_entries.jsonl.gz", "type_descriptions.jsonl.gz",
+        "graph_specs.jsonl.gz", "graph_scripts.jsonl.gz",
+    ),
+}
+
+
 def _dump_preprocessed_artifacts(
     out_dir: Path,
     api_entries: List[Dict[str, Any]],
@@ -843,16 +1077,46 @@ def _dump_preprocessed_artifacts(
     spec_node_props: Dict[str, Dict[str, Any]],
     script_triples: List[Dict[str, Any]],
     script_node_props: Dict[str, Dict[str, Any]],
+    fmt: str = "json",
 ) -> None:
-    """前処理の成果物をJSONで書き出す。
+    """前処理の成果物を書き出す。
 
+    fmt="json"（既定）:
     - api_entries.json: _parse_api_specs の結果
     - type_descriptions.json: _parse_data_type_descriptions の結果
     - graph_specs.json: 仕様由来のトリプル/ノード
     - graph_scripts.json: スクリプト由来のトリプル/ノード
     - graph_all.json: 統合（トリプル/ノード）
+
+    fmt="jsonl.gz": 1行1レコードの gzip 圧縮 JSONL（iter_preprocessed_records で逐次読み込み）
+    - api_entries.jsonl.gz / type_descriptions.jsonl.gz
+    - graph_specs.jsonl.gz / graph_scripts.jsonl.gz
+      （{"kind": "node", ...} / {"kind": "triple", ...}。統合ビューは load_preprocessed_graph で合成する）
+
+    書き出した形式以外の成果物ファイルは削除する（古い形式が読み込まれないように）。
     """
+    if fmt not in PREPROCESSED_FORMATS:
+        raise ValueError(f"未対応の成果物形式です: {fmt} (対応: {', '.join(PREPROCESSED_FORMATS)})")
     out_dir.mkdir(parents=True, exist_ok=True)
+    for other, names in PREPROCESSED_FILES.items():
+        if other == fmt:
+            continue
+        for name in names:
+            (out_dir / name).unlink(missing_ok=True)
+
+    if fmt == "jsonl.gz":
+        _dump_records(out_dir / "api_entries.jsonl.gz", api_entries)
+        _dump_records(
+            out_dir / "type_descriptions.jsonl.gz",
+            ({"name": k, "description": v} for k, v in type_descriptions.items()),
+        )
+        _dump_records(
+            out_dir / "graph_specs.jsonl.gz", _graph_records(spec_triples, spec_node_props)
+        )
+        _dump_records(
+            out_dir / "graph_scripts.jsonl.gz", _graph_records(script_triples, script_node_props)
+        )
+        return
 
     def _dump(obj: Any, name: str) -> None:
         (out_dir / name).write_text(
@@ -871,6 +1135,65 @@ def _dump_preprocessed_artifacts(
     _dump({"triples": all_triples, "nodes": all_nodes}, "graph_all.json")
 
 
+def _graph_records(
+    triples: List[Dict[str, Any]], node_props: Dict[str, Dict[str, Any]]
+):
+    """ノードを先に、トリプルを後に 1件ずつレコード化する"""
+    for node_id, meta in node_props.items():
+        yield {"kind": "node", "id": node_id, **meta}
+    for t in triples:
+        yield {"kind": "triple", **t}
+
+
+def _dump_records(path: Path, records) -> None:
+    with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+
+
+def iter_preprocessed_records(path: Union[str, Path], kind: Optional[str] = None):
+    """jsonl.gz 成果物を 1レコードずつ読み出す（kind で node/triple を絞り込み可）"""
+    with gzip.open(Path(path), "rt", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec = json.loads(line)
+            if kind is not None and rec.get("kind") != kind:
+                continue
+            yield rec
+
+
+def load_preprocessed_graph(
+    out_dir: Union[str, Path],
+    sources: Tuple[str, ...] = ("specs", "scripts"),
+    with_nodes: bool = True,
+) -> Tuple[List[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """前処理済みグラフ（トリプル/ノード）を読み込む。
+
+    graph_<source>.jsonl.gz があればそれを逐次読み込み、無ければ従来の
+    graph_<source>.json を読む。sources の順にノードを上書き統合する。
+    """
+    out_dir = Path(out_dir)
+    triples: List[Dict[str, Any]] = []
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for source in sources:
+        compact = out_dir / f"graph_{source}.jsonl.gz"
+        if compact.exists():
+            for rec in iter_preprocessed_records(compact):
+                if rec.pop("kind") == "node":
+                    if with_nodes:
+                        nodes[rec.pop("id")] = rec
+                else:
+                    triples.append(rec)
+            continue
+        data = json.loads((out_dir / f"graph_{source}.json").read_text(encoding="utf-8"))
+        triples.extend(data.get("triples", []))
+        if with_nodes:
+            nodes.update(data.get("nodes", {}))
+    return triples, nodes
+
+
 def build_databases(config: IngestConfigProtocol) -> bool:
     """データベース構築のメイン処理（Configベース）"""
     logger.info("データベース構築プロセスを開始します...")
@@ -879,41 +1202,80 @@ def build_databases(config: IngestConfigProtocol) -> bool:
         # Config の api_document_dir は文字列の可能性があるため Path に正規化
         data_dir = Path(config.api_document_dir)
 
-        # --- 1. API仕様書と型定義の読み込み・解析（1回だけ） ---
-        logger.info("API仕様書を解析中...")
-        api_text = _normalize_text(_read_api_text(data_dir))
-        api_arg_text = _read_api_arg_text(data_dir)
-        type_descriptions = _parse_data_type_descriptions(api_arg_text)
-        api_entries = _parse_api_specs(api_text)
-        logger.info(f"{len(api_entries)}件のAPI仕様を解析しました。")
+        timings: Dict[str, float] = {}
 
-        # 仕様からトリプル生成
-        spec_triples, spec_node_props = extract_triples_from_specs(
-            api_text, type_descriptions
-        )
-
-        # --- 2. スクリプト例の読み込み・解析（1回だけ） ---
-        logger.info("スクリプト例 (data/*.py) を解析中...")
+        # --- 1. スクリプト例の読み込みと解析ジョブの投入 ---
+        # スクリプト側のトリプル抽出は API 仕様を参照しないため、
+        # 仕様の解析と並行してプロセスプールで実行する
+        t0 = time.perf_counter()
+        logger.info("スクリプト例 (data/*.py) を読み込み中...")
         script_files = _read_script_files(data_dir)
-        if script_files:
-            logger.info(f"{len(script_files)}件のスクリプト例を読み込みました。")
-            all_script_triples: List[Dict[str, Any]] = []
-            all_script_node_props: Dict[str, Dict[str, Any]] = {}
-            for script_path, script_text in script_files:
-                logger.info(f"ファイルを解析中: {script_path}")
-                triples, node_props = extract_triples_from_script(
-                    script_path, script_text
+        timings["read_scripts"] = time.perf_counter() - t0
+
+        workers = _resolve_ingest_workers(config, len(script_files)) if script_files else 0
+        executor: Optional[ProcessPoolExecutor] = None
+        script_results = None
+        t_scripts = time.perf_counter()
+        if workers > 1:
+            try:
+                executor = ProcessPoolExecutor(max_workers=workers)
+                chunksize = max(1, len(script_files) // (workers * 4))
+                script_results = executor.map(
+                    _extract_script_worker, script_files, chunksize=chunksize
                 )
-                all_script_triples.extend(triples)
-                all_script_node_props.update(node_props)
-            script_triples = all_script_triples
-            script_node_props = all_script_node_props
-            logger.info(f"スクリプト例からトリプルを総計: {len(script_triples)} 件")
-        else:
-            logger.warning("data ディレクトリに解析対象の .py ファイルが見つかりませんでした。スクリプト例の解析をスキップします。")
-            script_triples, script_node_props = [], {}
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"プロセスプールを起動できないため逐次解析します: {e}")
+                executor = None
+                script_results = None
 
-        # --- 3. 前処理結果をファイル出力（Neo4j投入の前） ---
+        try:
+            # --- 2. API仕様書と型定義の読み込み・解析（1回だけ） ---
+            t0 = time.perf_counter()
+            logger.info("API仕様書を解析中...")
+            api_text = _normalize_text(_read_api_text(data_dir))
+            api_arg_text = _read_api_arg_text(data_dir)
+            type_descriptions = _parse_data_type_descriptions(api_arg_text)
+            api_entries = _parse_api_specs(api_text)
+            logger.info(f"{len(api_entries)}件のAPI仕様を解析しました。")
+            timings["parse_specs"] = time.perf_counter() - t0
+
+            # 仕様からトリプル生成
+            t0 = time.perf_counter()
+            spec_triples, spec_node_props = extract_triples_from_specs(
+                api_text, type_descriptions
+            )
+            _tag_provenance(spec_triples, spec_node_props, SPEC_PROVENANCE)
+            timings["spec_triples"] = time.perf_counter() - t0
+
+            # --- 3. スクリプト例のトリプルを回収（入力順を保持） ---
+            if script_files:
+                logger.info(
+                    f"{len(script_files)}件のスクリプト例を解析中 (workers={workers})..."
+                )
+                if script_results is None:
+                    script_results = map(_extract_script_worker, script_files)
+                all_script_triples: List[Dict[str, Any]] = []
+                all_script_node_props: Dict[str, Dict[str, Any]] = {}
+                for triples, node_props in _collect_script_results(script_results, script_files):
+                    all_script_triples.extend(triples)
+                    all_script_node_props.update(node_props)
+                script_triples = all_script_triples
+                script_node_props = all_script_node_props
+                logger.info(f"スクリプト例からトリプルを総計: {len(script_triples)} 件")
+            else:
+                logger.warning("data ディレクトリに解析対象の .py ファイルが見つかりませんでした。スクリプト例の解析をスキップします。")
+                script_triples, script_node_props = [], {}
+            timings["script_triples"] = time.perf_counter() - t_scripts
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        logger.info(
+            "前処理の所要時間: "
+            + ", ".join(f"{k}={v:.2f}s" for k, v in timings.items())
+        )
+
+        # --- 4. 前処理結果をファイル出力（Neo4j投入の前） ---
         try:
             dump_dir = Path(config.api_document_dir) / "preprocessed"
             _dump_preprocessed_artifacts(
@@ -924,20 +1286,25 @@ def build_databases(config: IngestConfigProtocol) -> bool:
                 spec_node_props=spec_node_props,
                 script_triples=script_triples,
                 script_node_props=script_node_props,
+                fmt=getattr(config, "preprocessed_format", "json"),
             )
             logger.info(f"前処理成果物を出力しました: {dump_dir}")
         except Exception as e:
             logger.warning(f"前処理成果物の出力に失敗しました: {e}")
 
-        # --- 4. データ統合 → GraphDocument 構築 → Neo4j投入 ---
+        # --- 5. データ統合 → GraphDocument 構築 → Neo4j投入 ---
         logger.info("データを統合してグラフを構築中...")
         all_triples = spec_triples + script_triples
         all_node_props = spec_node_props
         all_node_props.update(script_node_props)
-        gdocs = _triples_to_graph_documents(all_triples, all_node_props)
-        _build_and_load_neo4j_from_docs(gdocs, config)
+        sync_mode = getattr(config, "graph_sync_mode", "rebuild")
+        if sync_mode == "diff":
+            _sync_neo4j_from_triples(all_triples, all_node_props, config)
+        else:
+            gdocs = _triples_to_graph_documents(all_triples, all_node_props)
+            _build_and_load_neo4j_from_docs(gdocs, config)
 
-        # --- 4. Neo4jの内容をテキスト(JSONL)でエクスポート ---
+        # --- 6. Neo4jの内容をテキスト(JSONL)でエクスポート ---
         try:
             export_dir = Path(config.api_document_dir) / "preprocessed" / "neo4j_export"
             nodes_fp, rels_fp = _export_neo4j_to_text(config, export_dir)
@@ -945,7 +1312,7 @@ def build_databases(config: IngestConfigProtocol) -> bool:
         except Exception as e:
             logger.warning(f"Neo4jエクスポートに失敗しました: {e}")
 
-        # --- 5. ベクトルデータベース (Chroma) を構築（読み済みデータを再利用） ---
+        # --- 7. ベクトルデータベース (Chroma) を構築（読み済みデータを再利用） ---
         logger.info("ChromaDB構築プロセス")
         _build_and_load_chroma(api_entries, script_files, config)
 
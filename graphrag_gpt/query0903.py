@@ -12,6 +12,7 @@ from langchain.chains import RetrievalQA
 from langchain_neo4j.chains.graph_qa.cypher import GraphCypherQAChain
 from langchain_neo4j import Neo4jGraph
 from langchain_core.prompts import PromptTemplate
+from bounded_graph import BoundedGraphStore
 
 # ---------- 共通 LLM ----------
 llm = ChatOpenAI(
@@ -37,6 +38,16 @@ graph = Neo4jGraph(
     password=config.NEO4J_PASSWORD,
 )
 
+
+# ---------- 結果サイズの制限 ----------
+# 結果のストリーミング取得には Neo4jGraph と同じドライバ（接続プール）を使う
+bounded_graph = BoundedGraphStore(
+    graph,
+    max_rows=config.GRAPH_QA_MAX_ROWS,
+    max_context_tokens=config.GRAPH_QA_MAX_CONTEXT_TOKENS,
+    fetch_size=config.GRAPH_QA_FETCH_SIZE,
+)
+
 # ▼▼▼ 変更点: プロンプトを2種類に分離 ▼▼▼
 
 # 1. Cypherクエリ生成に特化したプロンプト
@@ -102,12 +113,12 @@ QA_PROMPT = PromptTemplate(
 # GraphCypherQAChainを、2種類のカスタムプロンプトで初期化
 graph_qa = GraphCypherQAChain.from_llm(
     llm=llm,
-    graph=graph,
+    graph=bounded_graph,                   # 結果の行数/トークン数を制限したグラフ
     verbose=True,
     cypher_prompt=CYPHER_GENERATION_PROMPT, # Cypher生成用プロンプト
     qa_prompt=QA_PROMPT,                   # 回答(コード)生成用プロンプト
     allow_dangerous_requests=True,
-    top_k=10000,
+    top_k=config.GRAPH_QA_MAX_ROWS + 1,    # +1 は打ち切り時の注記行
 )
 # ▲▲▲ 変更ここまで ▲▲▲
 
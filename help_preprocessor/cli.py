@@ -11,6 +11,7 @@ from .config import HelpPreprocessorConfig, load_config_from_env
 from .html_parser import HelpHTMLParser
 from .pipeline import HelpPreprocessorPipeline
 from .storage.chroma_loader import HelpChromaLoader
+from .storage.elasticsearch_loader import HelpElasticsearchLoader
 from .storage.neo4j_loader import HelpNeo4jLoader
 
 
@@ -59,6 +60,9 @@ def _apply_cli_overrides(config: HelpPreprocessorConfig, args: argparse.Namespac
         neo4j_username=config.neo4j_username,
         neo4j_password=config.neo4j_password,
         neo4j_database=config.neo4j_database,
+        elasticsearch_url=config.elasticsearch_url,
+        elasticsearch_index=config.elasticsearch_index,
+        elasticsearch_batch_size=config.elasticsearch_batch_size,
     )
 
 
@@ -130,6 +134,20 @@ def _create_chroma_loader(config: HelpPreprocessorConfig) -> HelpChromaLoader |
         persist_directory=persist_directory,
     )
 
+
+def _create_elasticsearch_loader(config: HelpPreprocessorConfig) -> HelpElasticsearchLoader | None:
+    """Instantiate the Elasticsearch loader when an index is configured."""
+
+    if not config.elasticsearch_index:
+        logging.info("Skipping Elasticsearch loader; HELP_ELASTICSEARCH_INDEX is not set.")
+        return None
+
+    return HelpElasticsearchLoader(
+        config.elasticsearch_index,
+        url=config.elasticsearch_url,
+        batch_size=config.elasticsearch_batch_size,
+    )
+
 def main(argv: Sequence[str] | None = None) -> None:  # pragma: no cover - thin wrapper
     """Entry point for command line execution."""
 
@@ -143,16 +161,19 @@ def main(argv: Sequence[str] | None = None) -> None:  # pragma: no cover - thin
 
     neo4j_loader = None
     chroma_loader = None
+    elasticsearch_loader = None
 
     try:
         if not args.dry_run:
             neo4j_loader = _create_neo4j_loader(config)
             chroma_loader = _create_chroma_loader(config)
+            elasticsearch_loader = _create_elasticsearch_loader(config)
 
         pipeline = HelpPreprocessorPipeline(
             config,
             neo4j_loader=neo4j_loader,
             chroma_loader=chroma_loader,
+            elasticsearch_loader=elasticsearch_loader,
         )
 
         if args.dry_run:
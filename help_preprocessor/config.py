@@ -28,6 +28,11 @@ class HelpPreprocessorConfig:
     neo4j_username: Optional[str] = None
     neo4j_password: Optional[str] = None
     neo4j_database: Optional[str] = None
+    # Model for HelpTopic embeddings; must match the retriever's graph embedding model
+    neo4j_embedding_model: Optional[str] = None
+    elasticsearch_url: Optional[str] = None
+    elasticsearch_index: Optional[str] = None
+    elasticsearch_batch_size: int = 500
 
 
 def load_config_from_env(env: Mapping[str, str] | None = None) -> HelpPreprocessorConfig:
@@ -96,4 +101,8 @@ def load_config_from_env(env: Mapping[str, str] | None = None) -> HelpPreprocess
         neo4j_username=_get_str("HELP_NEO4J_USERNAME"),
         neo4j_password=_get_str("HELP_NEO4J_PASSWORD"),
         neo4j_database=_get_str("HELP_NEO4J_DATABASE"),
+        neo4j_embedding_model=_get_str("HELP_NEO4J_EMBEDDING_MODEL"),
+        elasticsearch_url=_get_str("HELP_ELASTICSEARCH_URL"),
+        elasticsearch_index=_get_str("HELP_ELASTICSEARCH_INDEX"),
+        elasticsearch_batch_size=_get_int("HELP_ELASTICSEARCH_BATCH_SIZE", 500),
     )
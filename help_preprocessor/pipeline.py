@@ -12,11 +12,17 @@ from .config import HelpPreprocessorConfig
 from .graph_builder import HelpGraphBuilder
 from .html_parser import HelpHTMLParser
 from .index_parser import HelpIndexParser
+from .retrieval.embeddings import EmbedBatchFn, openai_embed_batch
 from .schemas import HelpCategory, HelpSection, HelpTopic
 from .storage.chroma_loader import HelpChromaLoader
+from .storage.elasticsearch_loader import HelpElasticsearchLoader
 from .storage.neo4j_loader import HelpNeo4jLoader
 from .vector_generator import HelpVectorGenerator
 
+# Topic text sent for embedding is capped to stay within model input limits
+TOPIC_EMBEDDING_MAX_CHARS = 4000
+TOPIC_EMBEDDING_BATCH_SIZE = 64
+
 
 @dataclass(slots=True)
 class ParsedArtifacts:
@@ -45,6 +51,8 @@ class HelpPreprocessorPipeline:
     vector_generator: HelpVectorGenerator = field(default_factory=HelpVectorGenerator)
     neo4j_loader: HelpNeo4jLoader | None = None
     chroma_loader: HelpChromaLoader | None = None
+    elasticsearch_loader: HelpElasticsearchLoader | None = None
+    topic_embed_batch: EmbedBatchFn | None = None
     _section_cache: dict[Path, list[HelpSection]] = field(default_factory=dict, init=False)
 
     def run(self, dry_run: bool = False) -> PipelineResult:
@@ -63,11 +71,19 @@ class HelpPreprocessorPipeline:
                 len(result.graph_relationships),
             )
             self.neo4j_loader.upsert(result.graph_nodes, result.graph_relationships)
+            if self.config.neo4j_embedding_model:
+                embeddings = self._build_topic_embeddings(result)
+                logging.info("Writing %s topic embeddings to Neo4j.", len(embeddings))
+                self.neo4j_loader.upsert_embeddings(embeddings)
 
         if self.chroma_loader is not None and result.vector_chunks:
             logging.info("Writing %s vector chunks to Chroma.", len(result.vector_chunks))
             self.chroma_loader.upsert(result.vector_chunks)
 
+        if self.elasticsearch_loader is not None and result.vector_chunks:
+            logging.info("Writing %s chunks to Elasticsearch.", len(result.vector_chunks))
+            self.elasticsearch_loader.upsert(result.vector_chunks)
+
         return result
 
     def build_only(self) -> PipelineResult:
@@ -144,6 +160,32 @@ class HelpPreprocessorPipeline:
         logging.debug("Vector payload generated: %s chunks", len(chunks))
         return chunks
 
+    def _build_topic_embeddings(self, result: PipelineResult) -> dict[str, list[float]]:
+        """Embed each HelpTopic node with the model used by the graph retriever."""
+
+        topics = {topic.topic_id: topic for topic in result.artifacts.root_category.iter_topics()}
+        texts: dict[str, str] = {}
+        for node in result.graph_nodes:
+            if self.graph_builder.topic_label not in node.get("labels", []):
+                continue
+            topic = topics.get(node["properties"].get("topic_id"))
+            if topic is None:
+                continue
+            body = "\n".join(section.content for section in topic.sections)
+            texts[node["id"]] = f"{topic.title}\n{body}".strip()[:TOPIC_EMBEDDING_MAX_CHARS]
+
+        model = self.config.neo4j_embedding_model or ""
+        embed_batch = self.topic_embed_batch or openai_embed_batch(model)
+        node_ids = list(texts)
+        embeddings: dict[str, list[float]] = {}
+        for start in range(0, len(node_ids), TOPIC_EMBEDDING_BATCH_SIZE):
+            batch = node_ids[start:start + TOPIC_EMBEDDING_BATCH_SIZE]
+            vectors = embed_batch([texts[node_id] for node_id in batch])
+            for node_id, vector in zip(batch, vectors):
+                embeddings[node_id] = [float(value) for value in vector]
+        logging.debug("Topic embeddings generated with %s: %s", model, len(embeddings))
+        return embeddings
+
     def _iter_sections(self, root: HelpCategory) -> Iterable[HelpSection]:
         html_parser = HelpHTMLParser(self.config.source_root, encoding=self.config.encoding)
         for topic in root.iter_topics():
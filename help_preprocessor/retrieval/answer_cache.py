@@ -0,0 +1,387 @@
+"""Persistent semantic cache for generated answers."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+EmbedFn = Callable[[List[str]], Sequence[Sequence[float]]]
+FingerprintFn = Callable[[Sequence[str]], str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    question TEXT NOT NULL,
+    embedding BLOB NOT NULL,
+    answer TEXT NOT NULL,
+    context_ids TEXT NOT NULL,
+    fingerprint TEXT,
+    key TEXT,
+    created_at REAL NOT NULL,
+    last_hit_at REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS answers_namespace ON answers(namespace);
+"""
+
+
+@dataclass
+class CachedAnswer:
+    """A cache hit: the stored answer and what it was based on."""
+
+    answer: str
+    context_ids: List[str]
+    question: str
+    similarity: float
+    created_at: float
+
+
+def _hash_rows(rows: Iterable[Any]) -> str:
+    digest = hashlib.sha256()
+    for row in rows:
+        digest.update(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def chroma_fingerprint(collection) -> FingerprintFn:
+    """Fingerprint ids by their current documents and metadata in a Chroma collection.
+
+    Ids missing from the collection are part of the fingerprint, so deleting a
+    document also changes it.
+    """
+
+    def _fingerprint(ids: Sequence[str]) -> str:
+        if not ids:
+            return _hash_rows([])
+        found = collection.get(ids=list(ids), include=["documents", "metadatas"])
+        rows = {
+            doc_id: [document, metadata]
+            for doc_id, document, metadata in zip(
+                found.get("ids") or [],
+                found.get("documents") or [],
+                found.get("metadatas") or [],
+            )
+        }
+        return _hash_rows([doc_id, rows.get(doc_id)] for doc_id in sorted(ids))
+
+    return _fingerprint
+
+
+_LABEL_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def neo4j_fingerprint(
+    session_factory: Callable[[], Any],
+    labels: Sequence[str],
+    *,
+    key: str = "id",
+    exclude_properties: Sequence[str] = ("embedding",),
+) -> FingerprintFn:
+    """Fingerprint ids by the current properties of the Neo4j nodes carrying them.
+
+    ``session_factory`` returns a context-managed session (e.g.
+    ``lambda: driver.session(database=...)``). One indexed lookup runs per
+    label; ``exclude_properties`` keeps large vectors out of the hash.
+    """
+    for name in (*labels, key):
+        if not _LABEL_RE.match(name):
+            raise ValueError(f"Invalid Neo4j identifier: {name!r}")
+    queries = [
+        f"MATCH (n:`{label}`) WHERE n.`{key}` IN $ids RETURN n.`{key}` AS id, properties(n) AS props"
+        for label in labels
+    ]
+    excluded = set(exclude_properties)
+
+    def _fingerprint(ids: Sequence[str]) -> str:
+        if not ids:
+            return _hash_rows([])
+        rows: Dict[str, Any] = {}
+        with session_factory() as session:
+            for query in queries:
+                for record in session.run(query, ids=list(ids)):
+                    props = {k: v for k, v in dict(record["props"]).items() if k not in excluded}
+                    rows[str(record["id"])] = props
+        return _hash_rows([doc_id, rows.get(doc_id)] for doc_id in sorted(ids))
+
+    return _fingerprint
+
+
+def routed_fingerprint(routes: Mapping[str, FingerprintFn]) -> FingerprintFn:
+    """Combine fingerprints for prefixed ids such as ``"vector:<id>"`` / ``"graph:<id>"``.
+
+    Ids without a known prefix only contribute their own value.
+    """
+
+    def _fingerprint(ids: Sequence[str]) -> str:
+        grouped: Dict[str, List[str]] = {}
+        other: List[str] = []
+        for context_id in ids:
+            prefix, sep, rest = context_id.partition(":")
+            if sep and prefix in routes:
+                grouped.setdefault(prefix, []).append(rest)
+            else:
+                other.append(context_id)
+        parts = [[prefix, routes[prefix](grouped[prefix])] for prefix in sorted(grouped)]
+        parts.append(["", sorted(other)])
+        return _hash_rows(parts)
+
+    return _fingerprint
+
+
+def combined_fingerprint(fingerprint_fns: Sequence[FingerprintFn]) -> FingerprintFn:
+    """Fingerprint unprefixed ids against several stores at once.
+
+    Used when results are fused and an id may live in any of the stores.
+    """
+
+    def _fingerprint(ids: Sequence[str]) -> str:
+        return _hash_rows(fn(ids) for fn in fingerprint_fns)
+
+    return _fingerprint
+
+
+class SemanticAnswerCache:
+    """SQLite-backed answer cache looked up by question-embedding similarity.
+
+    A lookup embeds the question once and compares it (cosine) against the
+    cached questions of the namespace, held as a normalized in-memory matrix.
+    Entries stored with a ``key`` (e.g. the keyword a question was searched
+    by) only match lookups with the same key, so paraphrases that embed
+    closely but ask about different things do not share answers.
+    The best match at or above ``threshold`` is returned only if the
+    fingerprint of its context ids still matches the one stored with it;
+    otherwise the entry is dropped as stale. Without ``fingerprint_fn`` entries
+    are only invalidated explicitly, by ``max_age_seconds`` or by eviction of
+    the least recently hit entries beyond ``max_entries``.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        embed_fn: EmbedFn,
+        *,
+        threshold: float = 0.92,
+        fingerprint_fn: Optional[FingerprintFn] = None,
+        namespace: str = "default",
+        max_entries: int = 5000,
+        max_age_seconds: Optional[float] = None,
+    ) -> None:
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.path = Path(path)
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.fingerprint_fn = fingerprint_fn
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_seconds
+        self.stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0}
+
+        self._lock = threading.RLock()
+        if str(path) != ":memory:":
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._ids = np.empty(0, dtype=np.int64)
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._load()
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(answers)")}
+        if "key" not in columns:
+            # Caches written before keys were stored
+            self._conn.execute("ALTER TABLE answers ADD COLUMN key TEXT")
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # In-memory index
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        rows = self._conn.execute(
+            "SELECT id, embedding FROM answers WHERE namespace = ? ORDER BY id", (self.namespace,)
+        ).fetchall()
+        if not rows:
+            self._ids = np.empty(0, dtype=np.int64)
+            self._matrix = np.empty((0, 0), dtype=np.float32)
+            return
+        self._ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        self._matrix = np.vstack([np.frombuffer(row[1], dtype=np.float32) for row in rows])
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(array))
+        return array / norm if norm > 0 else array
+
+    def _embed(self, question: str) -> np.ndarray:
+        return self._normalize(self.embed_fn([question])[0])
+
+    def _delete(self, entry_ids: Sequence[int]) -> None:
+        if not len(entry_ids):
+            return
+        self._conn.executemany("DELETE FROM answers WHERE id = ?", [(int(i),) for i in entry_ids])
+        self._conn.commit()
+        keep = ~np.isin(self._ids, np.asarray(entry_ids, dtype=np.int64))
+        self._ids = self._ids[keep]
+        self._matrix = self._matrix[keep] if self._matrix.size else self._matrix
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def lookup(
+        self,
+        question: str,
+        *,
+        embedding: Optional[np.ndarray] = None,
+        key: Optional[str] = None,
+        min_similarity: Optional[float] = None,
+    ) -> Optional[CachedAnswer]:
+        """Return a still-valid cached answer for ``question`` stored with ``key``, or None.
+
+        ``min_similarity`` raises (never lowers) ``threshold`` for this lookup.
+        """
+        threshold = max(self.threshold, min_similarity or 0.0)
+        with self._lock:
+            if not len(self._ids):
+                self.stats["misses"] += 1
+                return None
+            query = self._embed(question) if embedding is None else embedding
+            if query.shape[0] != self._matrix.shape[1]:
+                logging.warning("Answer cache embedding size changed; clearing namespace %s", self.namespace)
+                self.clear()
+                self.stats["misses"] += 1
+                return None
+
+            similarities = self._matrix @ query
+            for position in np.argsort(-similarities):
+                similarity = float(similarities[position])
+                if similarity < threshold:
+                    break
+                entry_id = int(self._ids[position])
+                row = self._conn.execute(
+                    "SELECT question, answer, context_ids, fingerprint, created_at, key FROM answers WHERE id = ?",
+                    (entry_id,),
+                ).fetchone()
+                if row is None:
+                    continue
+                cached_question, answer, context_json, fingerprint, created_at, cached_key = row
+                if cached_key != key:
+                    continue
+                context_ids = json.loads(context_json)
+                if self._is_stale(context_ids, fingerprint, created_at):
+                    self.stats["stale"] += 1
+                    self._delete([entry_id])
+                    continue
+                self._conn.execute(
+                    "UPDATE answers SET hits = hits + 1, last_hit_at = ? WHERE id = ?",
+                    (time.time(), entry_id),
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+                return CachedAnswer(
+                    answer=answer,
+                    context_ids=context_ids,
+                    question=cached_question,
+                    similarity=similarity,
+                    created_at=created_at,
+                )
+            self.stats["misses"] += 1
+            return None
+
+    def _is_stale(self, context_ids: List[str], fingerprint: Optional[str], created_at: float) -> bool:
+        if self.max_age_seconds is not None and time.time() - created_at > self.max_age_seconds:
+            return True
+        if self.fingerprint_fn is None:
+            return False
+        try:
+            return self.fingerprint_fn(context_ids) != fingerprint
+        except Exception as exc:
+            # A store we cannot check is treated as changed.
+            logging.warning("Answer cache fingerprint check failed: %s", exc)
+            return True
+
+    def store(
+        self,
+        question: str,
+        answer: str,
+        context_ids: Sequence[str],
+        *,
+        key: Optional[str] = None,
+    ) -> None:
+        """Cache ``answer`` for ``question`` with the ids of the context it used."""
+        context_ids = [str(context_id) for context_id in context_ids]
+        fingerprint = self.fingerprint_fn(context_ids) if self.fingerprint_fn else None
+        embedding = self._embed(question)
+        now = time.time()
+        with self._lock:
+            if self._matrix.size and embedding.shape[0] != self._matrix.shape[1]:
+                self.clear()
+            cursor = self._conn.execute(
+                "INSERT INTO answers (namespace, question, embedding, answer, context_ids, fingerprint,"
+                " key, created_at, last_hit_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.namespace,
+                    question,
+                    embedding.astype(np.float32).tobytes(),
+                    answer,
+                    json.dumps(context_ids, ensure_ascii=False),
+                    fingerprint,
+                    key,
+                    now,
+                    now,
+                ),
+            )
+            self._conn.commit()
+            self._ids = np.append(self._ids, np.int64(cursor.lastrowid))
+            self._matrix = (
+                np.vstack([self._matrix, embedding[None, :]]) if self._matrix.size else embedding[None, :].copy()
+            )
+            self.stats["stores"] += 1
+            self._evict()
+
+    def _evict(self) -> None:
+        overflow = len(self._ids) - self.max_entries
+        if overflow <= 0:
+            return
+        rows = self._conn.execute(
+            "SELECT id FROM answers WHERE namespace = ? ORDER BY last_hit_at ASC, id ASC LIMIT ?",
+            (self.namespace, overflow),
+        ).fetchall()
+        self._delete([row[0] for row in rows])
+
+    def invalidate(self, context_ids: Iterable[str]) -> int:
+        """Drop every entry based on any of ``context_ids``; returns the count."""
+        targets = {str(context_id) for context_id in context_ids}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, context_ids FROM answers WHERE namespace = ?", (self.namespace,)
+            ).fetchall()
+            doomed = [row[0] for row in rows if targets.intersection(json.loads(row[1]))]
+            self._delete(doomed)
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM answers WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
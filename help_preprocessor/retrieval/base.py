@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Any, List, Optional
@@ -76,6 +77,13 @@ class BaseRetriever(ABC):
         """Return retriever name for identification."""
         pass
 
+    async def asearch(self, context: QueryContext) -> List[SearchResult]:
+        """Awaitable search; runs the blocking ``search`` in a worker thread.
+
+        Retrievers with native async clients can override this.
+        """
+        return await asyncio.to_thread(self.search, context)
+
 
 class BaseResultFusion(ABC):
     """Abstract base class for result fusion strategies."""
@@ -10,6 +10,7 @@ from typing import Dict, Any
 
 from .langchain_integration import create_help_langchain_system
 from .llamaindex_integration import create_help_llamaindex_system
+from .streaming import TokenStream
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -54,7 +55,7 @@ def build_parser() -> argparse.ArgumentParser:
     
     parser.add_argument(
         "--performance-mode",
-        choices=["speed", "balanced", "memory"],
+        choices=["speed", "balanced", "memory", "cascade"],
         default="balanced",
         help="Performance optimization mode"
     )
@@ -101,6 +102,19 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Interactive chat mode"
     )
+
+    parser.add_argument(
+        "--answer-cache",
+        type=Path,
+        help="SQLite file caching RAG answers for repeated / near-duplicate questions (rag mode)"
+    )
+
+    parser.add_argument(
+        "--no-stream",
+        dest="stream",
+        action="store_false",
+        help="Wait for the full answer instead of printing tokens as they arrive (rag/chat modes)"
+    )
     
     return parser
 
@@ -165,6 +179,44 @@ def execute_chat(system: Dict[str, Any], message: str, args: argparse.Namespace)
         raise ValueError("Chat system not available")
 
 
+def stream_rag(system: Dict[str, Any], query: str, args: argparse.Namespace) -> TokenStream:
+    """Start a streaming RAG query."""
+    if "rag_chain" in system:
+        return system["rag_chain"].stream_query(query)
+    elif "query_engine" in system:
+        return system["query_engine"].stream_query(query)
+    else:
+        raise ValueError("RAG system not available")
+
+
+def stream_chat(system: Dict[str, Any], message: str, args: argparse.Namespace) -> TokenStream:
+    """Start a streaming chat query."""
+    if "conversational_chain" in system:
+        return system["conversational_chain"].stream_chat(message)
+    elif "chat_engine" in system:
+        return system["chat_engine"].stream_chat(message)
+    else:
+        raise ValueError("Chat system not available")
+
+
+def print_stream(stream: TokenStream, args: argparse.Namespace) -> Dict[str, Any]:
+    """Print tokens as they arrive; in detailed mode add timings and sources."""
+    result = stream.consume(lambda token: print(token, end="", flush=True))
+    print()
+
+    if args.output_format == "detailed":
+        metrics = result["metrics"]
+        if metrics["ttft_ms"] is not None:
+            print(f"\n[first token {metrics['ttft_ms']:.0f} ms, total {metrics['total_ms']:.0f} ms]")
+        sources = result.get("source_documents") or result.get("source_nodes") or []
+        if sources:
+            print("\nSources:")
+            for i, doc in enumerate(sources[:3], 1):
+                title = doc.get("metadata", {}).get("title", "Unknown")
+                print(f"  {i}. {title}")
+    return result
+
+
 def format_output(result: Dict[str, Any], format_type: str) -> str:
     """Format output based on specified format."""
     if format_type == "json":
@@ -238,6 +290,11 @@ def interactive_chat(system: Dict[str, Any], args: argparse.Namespace):
                 continue
             
             # Execute chat
+            if args.stream:
+                print("\nAssistant: ", end="", flush=True)
+                print_stream(stream_chat(system, user_input, args), args)
+                continue
+
             result = execute_chat(system, user_input, args)
             
             # Format and display response
@@ -271,6 +328,8 @@ def main(argv=None):
             "fusion_method": args.fusion_method,
             "performance_mode": args.performance_mode
         }
+        if args.answer_cache:
+            config_overrides["answer_cache_path"] = str(args.answer_cache)
         
         if args.system == "langchain":
             system = create_help_langchain_system(args.config, **config_overrides)
@@ -285,6 +344,19 @@ def main(argv=None):
             interactive_chat(system, args)
             return
         
+        # Stream answers to the terminal when nothing needs the full result first
+        if (
+            args.stream
+            and args.mode in ("rag", "chat")
+            and args.output_format != "json"
+            and not args.output_file
+        ):
+            if args.mode == "rag":
+                print_stream(stream_rag(system, args.query, args), args)
+            else:
+                print_stream(stream_chat(system, args.query, args), args)
+            return
+
         # Execute based on mode
         if args.mode == "search":
             result = execute_search(system, args.query, args)
@@ -0,0 +1,117 @@
+"""Client-side query embedding with an LRU cache."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence
+
+EmbedBatchFn = Callable[[List[str]], Sequence[Sequence[float]]]
+
+
+def openai_embed_batch(model: str, *, timeout: Optional[float] = None) -> EmbedBatchFn:
+    """Return a batch embed function backed by the OpenAI embeddings API.
+
+    With ``timeout`` (seconds) each request is abandoned after that long and
+    not retried, so a latency budget on the caller side actually holds.
+    """
+    try:
+        import openai
+    except ImportError as exc:
+        raise ImportError("OpenAI package required for embedding. Install with: pip install openai") from exc
+
+    if timeout is None:
+        client = openai.Client()
+    else:
+        client = openai.Client(timeout=timeout, max_retries=0)
+
+    def _embed(texts: List[str]) -> List[List[float]]:
+        response = client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    return _embed
+
+
+class QueryEmbedder:
+    """Embed queries explicitly with a fixed model, caching recent vectors.
+
+    ``embed_batch`` defaults to the OpenAI embeddings API for ``model``; pass
+    another callable to use a local model. Only texts missing from the cache
+    are sent to ``embed_batch``, in a single call per ``embed_many``.
+    ``timeout`` (seconds) bounds each call of the default OpenAI backend.
+    """
+
+    def __init__(
+        self,
+        model: str = "text-embedding-3-small",
+        *,
+        embed_batch: Optional[EmbedBatchFn] = None,
+        cache_size: int = 1024,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.model = model
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self._embed_batch = embed_batch
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_embed_batch(self) -> EmbedBatchFn:
+        if self._embed_batch is None:
+            self._embed_batch = openai_embed_batch(self.model, timeout=self.timeout)
+        return self._embed_batch
+
+    def embed(self, text: str) -> List[float]:
+        """Embed a single query."""
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        """Embed several queries, batching the cache misses into one call."""
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                vector = self._cache.get(text)
+                if vector is None:
+                    missing.append(text)
+                else:
+                    self._cache.move_to_end(text)
+                    found[text] = vector
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            vectors = self._get_embed_batch()(missing)
+            if len(vectors) != len(missing):
+                raise ValueError(
+                    f"Embedding backend returned {len(vectors)} vectors for {len(missing)} texts"
+                )
+            with self._lock:
+                for text, vector in zip(missing, vectors):
+                    vector = [float(value) for value in vector]
+                    found[text] = vector
+                    if self.cache_size > 0:
+                        self._cache[text] = vector
+                        self._cache.move_to_end(text)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return [found[text] for text in texts]
+
+    def cache_info(self) -> Dict[str, int]:
+        """Return cache statistics."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._cache),
+                "max_size": self.cache_size,
+            }
+
+    def clear_cache(self) -> None:
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
@@ -3,17 +3,235 @@
 from __future__ import annotations
 
 import logging
-from typing import Dict, List, Iterator
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Iterator, Optional, Tuple
 
 from .base import BaseRetriever, QueryContext, SearchResult
 from .hybrid_retriever import HybridRetriever, HybridRetrieverConfig
 from .parallel_retriever import (  # type: ignore[reportMissingImports]
+    RankingUpdate,
     StreamingRetriever,
     CachedRetriever,
     PerformanceMonitoringRetriever,
 )
 
 
+@dataclass
+class CascadeConfig:
+    """Tiers, budgets and confidence thresholds for cascade retrieval."""
+
+    # Retriever names per tier, cheapest first. Configured retrievers not
+    # listed here are added to the last tier.
+    tiers: List[List[str]] = field(default_factory=lambda: [
+        ["sparse_bm25", "sparse_tfidf"],
+        ["dense", "fulltext_whoosh"],
+        ["graph_neo4j", "graph_path", "fulltext_elasticsearch"],
+    ])
+    # Latency budget per tier (ms); the last value applies to further tiers
+    stage_budgets_ms: List[float] = field(default_factory=lambda: [50.0, 300.0, 1000.0])
+    # Stop escalating when the fused results look confident enough
+    min_results: int = 3
+    min_top_score: float = 0.3
+    # Required lead of the top hit over the runner-up, as a fraction of its score
+    min_margin: float = 0.05
+    # BM25-style retrievers rescale each result list so the top hit is 1.0;
+    # confidence is judged on the raw score kept in this metadata key instead.
+    raw_score_keys: Dict[str, str] = field(default_factory=lambda: {
+        "sparse_bm25": "bm25_score",
+        "fulltext_whoosh": "whoosh_score",
+        "fulltext_elasticsearch": "es_score",
+    })
+    # Per-source minimum top score on that source's raw scale; used only when
+    # the raw score is present, otherwise ``min_top_score`` applies.
+    # All three sources score with BM25 (k1 1.2-1.5, b 0.75), where one query
+    # term found in ~1% of the documents scores about 4.5-5 in an average
+    # length document: the 5.0 default asks for at least one selective term
+    # match. IDF grows with corpus size, so lower these for small corpora and
+    # raise them for long multi-term queries; set them per deployment through
+    # ``create_enhanced_retrieval_system(cascade_config=...)``.
+    source_min_top_score: Dict[str, float] = field(default_factory=lambda: {
+        "sparse_bm25": 5.0,
+        "fulltext_whoosh": 5.0,
+        "fulltext_elasticsearch": 5.0,
+    })
+    # Size of the retriever's long-lived worker pool shared by all tiers and
+    # queries; backends that overrun their budget keep a worker until they return.
+    max_workers: int = 16
+
+
+class CascadeRetriever(BaseRetriever):
+    """Query cheap retrievers first and escalate only on weak confidence.
+
+    Each tier runs its retrievers in parallel within its latency budget;
+    retrievers that miss the budget are dropped for that query. After each
+    tier the accumulated results are fused and checked against the
+    confidence thresholds in :class:`CascadeConfig`. Searches run on one
+    worker pool owned by the retriever; call :meth:`close` to release it.
+    """
+
+    def __init__(self, hybrid: HybridRetriever, config: Optional[CascadeConfig] = None):
+        self.hybrid = hybrid
+        self.config = config or CascadeConfig()
+        self._logger = logging.getLogger(__name__)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.config.max_workers, thread_name_prefix="cascade"
+        )
+        self._stats_lock = threading.Lock()
+        self._queries = 0
+        self._stopped_at: Counter = Counter()
+        self._tier_reached: Counter = Counter()
+        self._tier_timeouts: Counter = Counter()
+        self._tier_time_ms: Counter = Counter()
+
+    def _tiers(self, retrievers: Dict[str, BaseRetriever]) -> List[List[str]]:
+        tiers = [[name for name in tier if name in retrievers] for tier in self.config.tiers]
+        listed = {name for tier in self.config.tiers for name in tier}
+        rest = [name for name in retrievers if name not in listed]
+        if rest:
+            if tiers:
+                tiers[-1].extend(rest)
+            else:
+                tiers.append(rest)
+        return [tier for tier in tiers if tier]
+
+    def _budget_seconds(self, tier_index: int) -> float:
+        budgets = self.config.stage_budgets_ms
+        if not budgets:
+            return 30.0
+        return budgets[min(tier_index, len(budgets) - 1)] / 1000.0
+
+    def _is_confident(
+        self,
+        results_by_source: Dict[str, List[SearchResult]],
+        fused: List[SearchResult],
+        top_k: int,
+    ) -> bool:
+        """Enough fused results, and a clear, strong leader in some source."""
+        if len(fused) < min(self.config.min_results, top_k):
+            return False
+        for source, results in results_by_source.items():
+            key = self.config.raw_score_keys.get(source)
+            if key is not None and results and all(r.metadata.get(key) is not None for r in results):
+                scores = sorted((float(r.metadata[key]) for r in results), reverse=True)
+                min_top = self.config.source_min_top_score.get(source, self.config.min_top_score)
+            else:
+                scores = sorted((r.score for r in results), reverse=True)
+                min_top = self.config.min_top_score
+            if not scores or scores[0] < min_top:
+                continue
+            if len(scores) == 1 or scores[0] - scores[1] >= self.config.min_margin * scores[0]:
+                return True
+        return False
+
+    def _run_tier(
+        self,
+        names: List[str],
+        retrievers: Dict[str, BaseRetriever],
+        context: QueryContext,
+        budget: float,
+    ) -> Tuple[Dict[str, List[SearchResult]], List[str]]:
+        futures = {self._executor.submit(retrievers[name].search, context): name for name in names}
+        done, not_done = wait(futures, timeout=budget)
+        for future in not_done:
+            # Drops searches still queued behind busy workers; running ones finish on their own
+            future.cancel()
+        results: Dict[str, List[SearchResult]] = {}
+        for future in done:
+            name = futures[future]
+            try:
+                tier_results = future.result()
+                if tier_results:
+                    results[name] = tier_results
+            except Exception as exc:
+                self._logger.warning("Cascade search failed for %s: %s", name, exc)
+        return results, [futures[future] for future in not_done]
+
+    def search(self, context: QueryContext) -> List[SearchResult]:
+        """Execute tiered search, stopping at the first confident tier."""
+        retrievers = self.hybrid._filter_retrievers(context)
+        tiers = self._tiers(retrievers)
+        if not tiers:
+            return []
+
+        retriever_context = QueryContext(
+            query=context.query,
+            filters=context.filters,
+            top_k=min(context.top_k * 2, 20),
+            search_types=context.search_types,
+            fusion_method=context.fusion_method,
+        )
+
+        results_by_source: Dict[str, List[SearchResult]] = {}
+        fused: List[SearchResult] = []
+        stopped_at = len(tiers) - 1
+        for tier_index, names in enumerate(tiers):
+            started = time.perf_counter()
+            tier_results, timed_out = self._run_tier(
+                names, retrievers, retriever_context, self._budget_seconds(tier_index)
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            with self._stats_lock:
+                self._tier_reached[tier_index] += 1
+                self._tier_time_ms[tier_index] += elapsed_ms
+                self._tier_timeouts[tier_index] += len(timed_out)
+            if timed_out:
+                self._logger.debug("Cascade tier %d budget exceeded by: %s", tier_index, timed_out)
+
+            for results in tier_results.values():
+                for result in results:
+                    results_by_source.setdefault(result.source, []).append(result)
+            fused = (
+                self.hybrid.fusion_engine.fuse_results(results_by_source, context)
+                if results_by_source
+                else []
+            )
+            if self._is_confident(results_by_source, fused, context.top_k):
+                stopped_at = tier_index
+                break
+
+        with self._stats_lock:
+            self._queries += 1
+            self._stopped_at[stopped_at] += 1
+        self._logger.debug("Cascade search stopped at tier %d", stopped_at)
+        return fused[: context.top_k]
+
+    def get_cascade_stats(self) -> Dict:
+        """How often each tier was needed, with timeouts and mean latency."""
+        with self._stats_lock:
+            queries = self._queries
+            tiers = sorted(set(self._tier_reached) | set(self._stopped_at))
+            return {
+                "queries": queries,
+                "tiers": [
+                    {
+                        "tier": tier,
+                        "retrievers": self.config.tiers[tier] if tier < len(self.config.tiers) else [],
+                        "reached": self._tier_reached[tier],
+                        "reach_rate": self._tier_reached[tier] / queries if queries else 0.0,
+                        "stopped_here": self._stopped_at[tier],
+                        "timeouts": self._tier_timeouts[tier],
+                        "avg_ms": (
+                            self._tier_time_ms[tier] / self._tier_reached[tier]
+                            if self._tier_reached[tier]
+                            else 0.0
+                        ),
+                    }
+                    for tier in tiers
+                ],
+            }
+
+    def close(self) -> None:
+        """Release the worker pool without waiting for overrunning searches."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_name(self) -> str:
+        return f"cascade_{self.hybrid.get_name()}"
+
+
 class EnhancedHybridRetriever(BaseRetriever):
     """Enhanced hybrid retriever with parallel processing and caching."""
 
@@ -26,6 +244,8 @@ class EnhancedHybridRetriever(BaseRetriever):
         cache_size: int = 128,
         cache_ttl_seconds: int = 3600,
         parallel_timeout: float = 30.0,
+        enable_cascade: bool = False,
+        cascade_config: Optional[CascadeConfig] = None,
     ):
         self.config = config
         self.enable_parallel = enable_parallel
@@ -34,19 +254,24 @@ class EnhancedHybridRetriever(BaseRetriever):
         self.cache_size = cache_size
         self.cache_ttl_seconds = cache_ttl_seconds
         self.parallel_timeout = parallel_timeout
+        self.enable_cascade = enable_cascade
+        self.cascade_config = cascade_config
 
         # Initialize logger first
         self._logger = logging.getLogger(__name__)
 
         # Create base hybrid retriever
         self.base_retriever = HybridRetriever(config)
+        self.cascade_retriever = (
+            CascadeRetriever(self.base_retriever, cascade_config) if enable_cascade else None
+        )
 
         # Wrap with enhancements
         self.enhanced_retriever = self._build_enhanced_retriever()
 
     def _build_enhanced_retriever(self) -> BaseRetriever:
         """Build enhanced retriever with all optimizations."""
-        retriever = self.base_retriever
+        retriever = self.cascade_retriever or self.base_retriever
 
         # Add performance monitoring
         if self.enable_monitoring:
@@ -88,15 +313,27 @@ class EnhancedHybridRetriever(BaseRetriever):
             for result in results:
                 yield result
 
+    def stream_rankings(self, context: QueryContext) -> Iterator[RankingUpdate]:
+        """Yield provisional fused rankings as backends finish; the last is final."""
+        streaming_retriever = StreamingRetriever(
+            retrievers=self.base_retriever._filter_retrievers(context),
+            timeout_seconds=self.parallel_timeout,
+        )
+        yield from streaming_retriever.stream_rankings(context, self.base_retriever.fusion_engine)
+
     def get_performance_report(self) -> Dict:
         """Get performance statistics."""
         report = {
             "retriever_type": "enhanced_hybrid",
             "parallel_enabled": self.enable_parallel,
             "caching_enabled": self.enable_caching,
-            "monitoring_enabled": self.enable_monitoring
+            "monitoring_enabled": self.enable_monitoring,
+            "cascade_enabled": self.enable_cascade,
         }
 
+        if self.cascade_retriever is not None:
+            report["cascade_stats"] = self.cascade_retriever.get_cascade_stats()
+
         # Get monitoring data if available
         if self.enable_monitoring and isinstance(self.enhanced_retriever, PerformanceMonitoringRetriever):
             report.update(self.enhanced_retriever.get_performance_report())
@@ -122,6 +359,11 @@ class EnhancedHybridRetriever(BaseRetriever):
                     break
                 current = current.base_retriever
 
+    def close(self) -> None:
+        """Release the cascade worker pool, if any."""
+        if self.cascade_retriever is not None:
+            self.cascade_retriever.close()
+
     def get_name(self) -> str:
         return "enhanced_hybrid_retriever"
 
@@ -169,12 +411,27 @@ class AdaptiveRetriever(BaseRetriever):
 
 def create_enhanced_retrieval_system(
     config: HybridRetrieverConfig,
-    performance_mode: str = "balanced"  # "speed", "memory", "balanced"
+    performance_mode: str = "balanced",  # "speed", "memory", "balanced", "cascade"
+    cascade_config: Optional[CascadeConfig] = None,
 ) -> Dict[str, BaseRetriever]:
-    """Factory function to create optimized retrieval system."""
+    """Factory function to create optimized retrieval system.
+
+    ``cascade_config`` (tiers, budgets, corpus-specific score thresholds) is
+    used in "cascade" mode.
+    """
 
     # Configure based on performance mode
-    if performance_mode == "speed":
+    if performance_mode == "cascade":
+        enhanced_config = {
+            "enable_parallel": True,
+            "enable_caching": True,
+            "enable_monitoring": True,
+            "cache_size": 256,
+            "cache_ttl_seconds": 7200,
+            "parallel_timeout": 15.0,
+            "enable_cascade": True,
+        }
+    elif performance_mode == "speed":
         enhanced_config = {
             "enable_parallel": True,
             "enable_caching": True,
@@ -203,6 +460,8 @@ def create_enhanced_retrieval_system(
         }
 
     # Create enhanced retriever
+    if performance_mode == "cascade":
+        enhanced_config["cascade_config"] = cascade_config
     enhanced_retriever = EnhancedHybridRetriever(config, **enhanced_config)
 
     # Create adaptive wrapper
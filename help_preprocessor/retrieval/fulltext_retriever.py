@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
+
+from search_common.whoosh_pool import WhooshSearcherPool
 
 from .base import BaseRetriever, QueryContext, SearchResult
 
@@ -11,125 +13,129 @@ from .base import BaseRetriever, QueryContext, SearchResult
 class WhooshRetriever(BaseRetriever):
     """Whoosh-based full-text search retriever."""
     
-    def __init__(self, index_dir: Path):
+    def __init__(
+        self,
+        index_dir: Path,
+        refresh_interval: float = 1.0,
+        query_cache_size: int = 256,
+        max_searchers: int = 8,
+    ):
         self.index_dir = index_dir
-        self._index = None
-        self._searcher = None
+        self._pool = WhooshSearcherPool(
+            index_dir,
+            refresh_interval=refresh_interval,
+            query_cache_size=query_cache_size,
+            max_searchers=max_searchers,
+        )
         
     def _get_index(self):
         """Get or create Whoosh index."""
-        if self._index is None:
-            try:
-                from whoosh import index
-                self._index = index.open_dir(str(self.index_dir))
-            except ImportError as exc:
-                raise ImportError("Whoosh package required. Install with: pip install whoosh") from exc
-            except Exception as exc:
-                raise RuntimeError(f"Failed to open Whoosh index at {self.index_dir}") from exc
-        return self._index
-    
-    def _get_searcher(self):
-        """Get Whoosh searcher."""
-        if self._searcher is None:
-            idx = self._get_index()
-            self._searcher = idx.searcher()
-        return self._searcher
+        return self._pool.get_index()
     
     def search(self, context: QueryContext) -> List[SearchResult]:
         """Execute full-text search using Whoosh."""
         try:
-            from whoosh.qparser import QueryParser, MultifieldParser
             from whoosh.query import Every
         except ImportError as exc:
             raise ImportError("Whoosh package required. Install with: pip install whoosh") from exc
+
+        with self._pool.searcher() as searcher:
+            # Pick query fields (assuming common field names)
+            schema_fields = list(searcher.schema.names())
+            content_fields = [f for f in schema_fields if f in ['content', 'title', 'text', 'body']]
+            query_fields = content_fields or schema_fields[:1]
             
-        searcher = self._get_searcher()
-        
-        # Create query parser (assuming common field names)
-        schema_fields = list(searcher.schema.names())
-        content_fields = [f for f in schema_fields if f in ['content', 'title', 'text', 'body']]
-        
-        if content_fields:
-            if len(content_fields) == 1:
-                parser = QueryParser(content_fields[0], searcher.schema)
-            else:
-                parser = MultifieldParser(content_fields, searcher.schema)
-        else:
-            # Fallback to first field
-            parser = QueryParser(schema_fields[0], searcher.schema) if schema_fields else None
-            
-        if not parser:
-            return []
+            if not query_fields:
+                return []
             
-        try:
-            # Parse and execute query
-            if context.query.strip():
-                query = parser.parse(context.query)
-            else:
-                query = Every()  # Match all documents if empty query
+            try:
+                # Parse and execute query
+                if context.query.strip():
+                    query = self._pool.parse(query_fields, context.query)
+                else:
+                    query = Every()  # Match all documents if empty query
                 
-            search_results = searcher.search(query, limit=context.top_k)
+                search_results = searcher.search(query, limit=context.top_k)
             
-            results = []
-            max_score = max(hit.score for hit in search_results) if search_results else 1.0
+                results = []
+                max_score = max(hit.score for hit in search_results) if search_results else 1.0
             
-            for hit in search_results:
-                # Extract content from available fields
-                content = ""
-                for field in content_fields:
-                    if field in hit and hit[field]:
-                        content = str(hit[field])
-                        break
+                for hit in search_results:
+                    # Extract content from available fields
+                    content = ""
+                    for field in content_fields:
+                        if field in hit and hit[field]:
+                            content = str(hit[field])
+                            break
                         
-                # Normalize score
-                normalized_score = hit.score / max_score if max_score > 0 else 0.0
+                    # Normalize score
+                    normalized_score = hit.score / max_score if max_score > 0 else 0.0
                 
-                result = SearchResult(
-                    id=hit.get('id', hit.get('section_id', f'whoosh_{hit.docnum}')),
-                    content=content,
-                    score=normalized_score,
-                    source="fulltext_whoosh",
-                    metadata={
-                        "whoosh_score": hit.score,
-                        "docnum": hit.docnum,
-                        "matched_fields": [f for f in content_fields if f in hit],
-                        **{k: v for k, v in hit.items() if k not in content_fields}
-                    }
-                )
-                results.append(result)
+                    result = SearchResult(
+                        id=hit.get('id', hit.get('section_id', f'whoosh_{hit.docnum}')),
+                        content=content,
+                        score=normalized_score,
+                        source="fulltext_whoosh",
+                        metadata={
+                            "whoosh_score": hit.score,
+                            "docnum": hit.docnum,
+                            "matched_fields": [f for f in content_fields if f in hit],
+                            **{k: v for k, v in hit.items() if k not in content_fields}
+                        }
+                    )
+                    results.append(result)
                 
-            return results
+                return results
             
-        except Exception as exc:
-            # Log error but return empty results
-            import logging
-            logging.warning("Whoosh search failed: %s", exc)
-            return []
+            except Exception as exc:
+                # Log error but return empty results
+                import logging
+                logging.warning("Whoosh search failed: %s", exc)
+                return []
     
     def get_name(self) -> str:
         return "fulltext_whoosh"
+
+    def close(self):
+        """Close all pooled searchers."""
+        self._pool.close()
     
     def __del__(self):
-        """Clean up searcher."""
-        if self._searcher:
-            self._searcher.close()
+        """Clean up searchers."""
+        try:
+            self.close()
+        except Exception:
+            pass
 
 
 class ElasticsearchRetriever(BaseRetriever):
-    """Elasticsearch-based full-text search retriever."""
-    
+    """Elasticsearch-based full-text search retriever.
+
+    ``fuzziness`` is applied to the multi_match query (``None`` disables fuzzy
+    matching, which is noticeably cheaper on large indexes). Pass ``client`` to
+    reuse an existing client, e.g. ``InMemoryElasticsearch`` in offline tests.
+    """
+
+    DEFAULT_FIELDS = ("content^2", "title^3", "text", "body")
+
     def __init__(
         self,
         host: str = "localhost",
         port: int = 9200,
         index_name: str = "help_documents",
+        *,
+        fuzziness: Optional[str] = "AUTO",
+        fields: Optional[Sequence[str]] = None,
+        client=None,
         **es_kwargs
     ):
         self.host = host
         self.port = port
         self.index_name = index_name
+        self.fuzziness = fuzziness
+        self.fields = list(fields or self.DEFAULT_FIELDS)
         self.es_kwargs = es_kwargs
-        self._client = None
+        self._client = client
         
     def _get_client(self):
         """Get or create Elasticsearch client."""
@@ -146,21 +152,19 @@ class ElasticsearchRetriever(BaseRetriever):
             except ImportError as exc:
                 raise ImportError("Elasticsearch package required. Install with: pip install elasticsearch") from exc
         return self._client
-    
-    def search(self, context: QueryContext) -> List[SearchResult]:
-        """Execute full-text search using Elasticsearch."""
-        client = self._get_client()
-        
-        # Build Elasticsearch query
-        es_query = {
-            "query": {
-                "multi_match": {
-                    "query": context.query,
-                    "fields": ["content^2", "title^3", "text", "body"],  # Boost title and content
-                    "type": "best_fields",
-                    "fuzziness": "AUTO"
-                }
-            },
+
+    def _build_query(self, context: QueryContext) -> Dict[str, Any]:
+        """Build the search body for one query."""
+        multi_match: Dict[str, Any] = {
+            "query": context.query,
+            "fields": self.fields,
+            "type": "best_fields",
+        }
+        if self.fuzziness:
+            multi_match["fuzziness"] = self.fuzziness
+
+        es_query: Dict[str, Any] = {
+            "query": {"multi_match": multi_match},
             "size": context.top_k,
             "highlight": {
                 "fields": {
@@ -186,44 +190,83 @@ class ElasticsearchRetriever(BaseRetriever):
                         "filter": filter_clauses
                     }
                 }
+        return es_query
+    
+    def search(self, context: QueryContext) -> List[SearchResult]:
+        """Execute full-text search using Elasticsearch."""
+        client = self._get_client()
         
         try:
-            response = client.search(index=self.index_name, body=es_query)
-            
-            results = []
-            max_score = response["hits"]["max_score"] or 1.0
-            
-            for hit in response["hits"]["hits"]:
-                source = hit["_source"]
-                
-                # Extract content with highlights if available
-                content = source.get("content", "")
-                if "highlight" in hit and "content" in hit["highlight"]:
-                    content = " ... ".join(hit["highlight"]["content"])
-                
-                # Normalize score
-                normalized_score = hit["_score"] / max_score if max_score > 0 else 0.0
-                
-                result = SearchResult(
-                    id=hit["_id"],
-                    content=content,
-                    score=normalized_score,
-                    source="fulltext_elasticsearch",
-                    metadata={
-                        "es_score": hit["_score"],
-                        "highlights": hit.get("highlight", {}),
-                        "index": hit["_index"],
-                        **source
-                    }
-                )
-                results.append(result)
-                
-            return results
+            response = client.search(index=self.index_name, body=self._build_query(context))
+            return self._to_results(response)
             
         except Exception as exc:
             import logging
             logging.warning("Elasticsearch search failed: %s", exc)
             return []
+
+    def search_batch(self, contexts: Sequence[QueryContext]) -> List[List[SearchResult]]:
+        """Search several queries with a single ``_msearch`` round trip.
+
+        A failed sub-search yields an empty list for that query only.
+        """
+        if not contexts:
+            return []
+        client = self._get_client()
+
+        searches: List[Dict[str, Any]] = []
+        for context in contexts:
+            searches.append({"index": self.index_name})
+            searches.append(self._build_query(context))
+
+        try:
+            response = client.msearch(body=searches)
+        except Exception as exc:
+            import logging
+            logging.warning("Elasticsearch msearch failed: %s", exc)
+            return [[] for _ in contexts]
+
+        batched: List[List[SearchResult]] = []
+        for item in response.get("responses", []):
+            if "error" in item:
+                import logging
+                logging.warning("Elasticsearch msearch item failed: %s", item["error"])
+                batched.append([])
+            else:
+                batched.append(self._to_results(item))
+        batched.extend([] for _ in range(len(contexts) - len(batched)))
+        return batched
+
+    def _to_results(self, response: Dict[str, Any]) -> List[SearchResult]:
+        results = []
+        max_score = response["hits"]["max_score"] or 1.0
+        
+        for hit in response["hits"]["hits"]:
+            source = hit["_source"]
+            
+            # Extract content with highlights if available
+            content = source.get("content", "")
+            if "highlight" in hit and "content" in hit["highlight"]:
+                content = " ... ".join(hit["highlight"]["content"])
+            
+            # Normalize score
+            normalized_score = hit["_score"] / max_score if max_score > 0 else 0.0
+            
+            result = SearchResult(
+                id=hit["_id"],
+                content=content,
+                score=normalized_score,
+                source="fulltext_elasticsearch",
+                metadata={
+                    "es_score": hit["_score"],
+                    "highlights": hit.get("highlight", {}),
+                    "index": hit["_index"],
+                    **source
+                }
+            )
+            results.append(result)
+            
+        return results
     
     def get_name(self) -> str:
         return f"fulltext_elasticsearch_{self.index_name}"
@@ -2,12 +2,63 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
-from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
 
 from .base import BaseResultFusion, SearchResult, QueryContext
 
 
+class _FusionCandidates:
+    """Unique result ids across sources with per-source position/score arrays.
+
+    Fusion strategies accumulate scores into a single array indexed by
+    candidate position and only build ``SearchResult`` objects for the final
+    top-k. The first occurrence of an id (in source order) supplies its
+    content and metadata.
+    """
+
+    def __init__(self, results_by_source: Dict[str, List[SearchResult]]):
+        self.first: List[SearchResult] = []
+        self.per_source: List[Tuple[str, np.ndarray, np.ndarray]] = []
+        index: Dict[str, int] = {}
+
+        for source, results in results_by_source.items():
+            positions = np.empty(len(results), dtype=np.int64)
+            for i, result in enumerate(results):
+                position = index.get(result.id)
+                if position is None:
+                    position = index[result.id] = len(self.first)
+                    self.first.append(result)
+                positions[i] = position
+            scores = np.fromiter((r.score for r in results), dtype=np.float64, count=len(results))
+            self.per_source.append((source, positions, scores))
+
+    def __len__(self) -> int:
+        return len(self.first)
+
+    def accumulate(self, contributions: List[np.ndarray]) -> np.ndarray:
+        """Sum per-source contribution arrays into one score per candidate."""
+        total = np.zeros(len(self.first), dtype=np.float64)
+        for (_, positions, _), values in zip(self.per_source, contributions):
+            if positions.size:
+                total += np.bincount(positions, weights=values, minlength=len(self.first))
+        return total
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k best scores; ties keep first-seen order."""
+        n = scores.shape[0]
+        if k <= 0 or n == 0:
+            return np.empty(0, dtype=np.int64)
+        if k < n:
+            threshold = np.partition(scores, n - k)[n - k]
+            candidates = np.flatnonzero(scores >= threshold)
+        else:
+            candidates = np.arange(n)
+        order = np.argsort(-scores[candidates], kind="stable")
+        return candidates[order][:k]
+
+
 class ReciprocalRankFusion(BaseResultFusion):
     """Reciprocal Rank Fusion (RRF) for combining search results."""
     
@@ -21,27 +72,20 @@ class ReciprocalRankFusion(BaseResultFusion):
     ) -> List[SearchResult]:
         """Combine results using Reciprocal Rank Fusion."""
         
-        # Collect all unique results
-        all_results: Dict[str, SearchResult] = {}
-        rrf_scores: Dict[str, float] = defaultdict(float)
+        candidates = _FusionCandidates(results_by_source)
         
-        for source, results in results_by_source.items():
-            for rank, result in enumerate(results, 1):
-                result_id = result.id
-                
-                # Store the result (first occurrence wins for metadata)
-                if result_id not in all_results:
-                    all_results[result_id] = result
-                    
-                # Add RRF score: 1 / (k + rank)
-                rrf_scores[result_id] += 1.0 / (self.k + rank)
-        
-        # Create fused results with RRF scores
+        # RRF score: sum of 1 / (k + rank) over sources
+        rrf_scores = candidates.accumulate([
+            1.0 / (self.k + np.arange(1, positions.size + 1, dtype=np.float64))
+            for _, positions, _ in candidates.per_source
+        ])
+        
+        # Materialize only the top-k fused results
         fused_results = []
-        for result_id, rrf_score in rrf_scores.items():
-            result = all_results[result_id]
+        for position in candidates.top_k(rrf_scores, context.top_k):
+            result = candidates.first[position]
+            rrf_score = float(rrf_scores[position])
             
-            # Create new result with fused score
             fused_result = SearchResult(
                 id=result.id,
                 content=result.content,
@@ -57,9 +101,7 @@ class ReciprocalRankFusion(BaseResultFusion):
             )
             fused_results.append(fused_result)
             
-        # Sort by RRF score and return top-k
-        fused_results.sort(key=lambda x: x.score, reverse=True)
-        return fused_results[:context.top_k]
+        return fused_results
 
 
 class WeightedSumFusion(BaseResultFusion):
@@ -83,51 +125,36 @@ class WeightedSumFusion(BaseResultFusion):
     ) -> List[SearchResult]:
         """Combine results using weighted sum of normalized scores."""
         
-        # Normalize scores within each source
-        normalized_results: Dict[str, List[SearchResult]] = {}
+        candidates = _FusionCandidates(results_by_source)
         
-        for source, results in results_by_source.items():
-            if not results:
+        # Min-max normalize scores within each source, then weight them
+        normalized_first = np.zeros(len(candidates), dtype=np.float64)
+        seen = np.zeros(len(candidates), dtype=bool)
+        contributions = []
+        for source, positions, scores in candidates.per_source:
+            if not scores.size:
+                contributions.append(scores)
                 continue
-                
-            max_score = max(r.score for r in results)
-            min_score = min(r.score for r in results)
+            max_score = scores.max()
+            min_score = scores.min()
             score_range = max_score - min_score if max_score > min_score else 1.0
+            normalized = (scores - min_score) / score_range
+            contributions.append(normalized * self.source_weights.get(source, 1.0))
             
-            normalized = []
-            for result in results:
-                normalized_score = (result.score - min_score) / score_range
-                
-                new_result = SearchResult(
-                    id=result.id,
-                    content=result.content,
-                    score=normalized_score,
-                    source=result.source,
-                    metadata=result.metadata
-                )
-                normalized.append(new_result)
-                
-            normalized_results[source] = normalized
-        
-        # Combine with weighted sum
-        all_results: Dict[str, SearchResult] = {}
-        weighted_scores: Dict[str, float] = defaultdict(float)
-        
-        for source, results in normalized_results.items():
-            weight = self.source_weights.get(source, 1.0)
-            
-            for result in results:
-                result_id = result.id
-                
-                if result_id not in all_results:
-                    all_results[result_id] = result
-                    
-                weighted_scores[result_id] += result.score * weight
-        
-        # Create fused results
+            # Normalized score of each id's first occurrence (reported as original_score)
+            fresh = ~seen[positions]
+            if fresh.any():
+                first_positions, first_index = np.unique(positions[fresh], return_index=True)
+                normalized_first[first_positions] = normalized[fresh][first_index]
+                seen[first_positions] = True
+        
+        weighted_scores = candidates.accumulate(contributions)
+        
+        # Materialize only the top-k fused results
         fused_results = []
-        for result_id, weighted_score in weighted_scores.items():
-            result = all_results[result_id]
+        for position in candidates.top_k(weighted_scores, context.top_k):
+            result = candidates.first[position]
+            weighted_score = float(weighted_scores[position])
             
             fused_result = SearchResult(
                 id=result.id,
@@ -136,7 +163,7 @@ class WeightedSumFusion(BaseResultFusion):
                 source="fusion_weighted",
                 metadata={
                     **result.metadata,
-                    "original_score": result.score,
+                    "original_score": float(normalized_first[position]),
                     "original_source": result.source,
                     "weighted_score": weighted_score,
                     "fusion_method": "weighted_sum"
@@ -144,9 +171,7 @@ class WeightedSumFusion(BaseResultFusion):
             )
             fused_results.append(fused_result)
             
-        # Sort and return top-k
-        fused_results.sort(key=lambda x: x.score, reverse=True)
-        return fused_results[:context.top_k]
+        return fused_results
 
 
 class BordaCountFusion(BaseResultFusion):
@@ -159,28 +184,21 @@ class BordaCountFusion(BaseResultFusion):
     ) -> List[SearchResult]:
         """Combine results using Borda count method."""
         
-        all_results: Dict[str, SearchResult] = {}
-        borda_scores: Dict[str, int] = defaultdict(int)
+        candidates = _FusionCandidates(results_by_source)
         
-        for source, results in results_by_source.items():
-            n_results = len(results)
-            
-            for rank, result in enumerate(results):
-                result_id = result.id
-                
-                if result_id not in all_results:
-                    all_results[result_id] = result
-                    
-                # Borda score: n - rank (higher is better)
-                borda_scores[result_id] += n_results - rank
-        
-        # Create fused results
-        fused_results = []
-        max_borda = max(borda_scores.values()) if borda_scores else 1
+        # Borda score: n - rank (higher is better)
+        borda_scores = candidates.accumulate([
+            np.arange(positions.size, 0, -1, dtype=np.float64)
+            for _, positions, _ in candidates.per_source
+        ])
+        max_borda = borda_scores.max() if borda_scores.size else 1.0
         
-        for result_id, borda_score in borda_scores.items():
-            result = all_results[result_id]
-            normalized_score = borda_score / max_borda
+        # Materialize only the top-k fused results
+        fused_results = []
+        for position in candidates.top_k(borda_scores, context.top_k):
+            result = candidates.first[position]
+            borda_score = int(borda_scores[position])
+            normalized_score = float(borda_score / max_borda)
             
             fused_result = SearchResult(
                 id=result.id,
@@ -198,9 +216,7 @@ class BordaCountFusion(BaseResultFusion):
             )
             fused_results.append(fused_result)
             
-        # Sort and return top-k
-        fused_results.sort(key=lambda x: x.score, reverse=True)
-        return fused_results[:context.top_k]
+        return fused_results
 
 
 class AdaptiveFusion(BaseResultFusion):
@@ -2,26 +2,70 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Dict, Any, Sequence
 
+from ..storage.neo4j_schema import (
+    CATEGORY_NAME_INDEX,
+    FULLTEXT_INDEX_DEFINITIONS,
+    TOPIC_EMBEDDING_INDEX,
+    TOPIC_TITLE_INDEX,
+    fulltext_index_statements,
+)
 from .base import BaseRetriever, QueryContext, SearchResult
 
+logger = logging.getLogger(__name__)
+
+
+_LUCENE_SPECIAL = re.compile(r'([+\-!(){}\[\]^"~*?:\\/&|])')
+
+
+def to_lucene_query(text: str) -> str:
+    """Escape free text for db.index.fulltext.queryNodes (terms are OR-ed)."""
+    terms = [_LUCENE_SPECIAL.sub(r"\\\1", term) for term in text.split()]
+    return " ".join(term for term in terms if term)
+
 
 class Neo4jGraphRetriever(BaseRetriever):
-    """Neo4j-based graph retrieval for help documents."""
+    """Neo4j-based graph retrieval for help documents.
+
+    Strategies run concurrently, each in its own session. Title and category
+    lookups use Neo4j full-text indexes when they are available and fall
+    back to ``CONTAINS`` scans otherwise. Per-strategy wall times of the
+    last search are kept in ``last_strategy_timings`` (milliseconds).
+
+    Content similarity queries the topic embedding vector index when an
+    ``embed_fn`` is given; ``vector_k`` nearest neighbours are requested and
+    the lookup (embedding included) is cut off after ``vector_budget_ms``.
+    """
     
     def __init__(
         self,
         uri: str,
         username: str, 
         password: str,
-        database: Optional[str] = None
+        database: Optional[str] = None,
+        use_fulltext: bool = True,
+        create_indexes: bool = True,
+        embed_fn: Optional[Callable[[str], Sequence[float]]] = None,
+        vector_k: int = 10,
+        vector_budget_ms: float = 300.0,
     ):
         self.uri = uri
         self.username = username
         self.password = password
         self.database = database
+        self.use_fulltext = use_fulltext
+        self.create_indexes = create_indexes
+        self.embed_fn = embed_fn
+        self.vector_k = vector_k
+        self.vector_budget_ms = vector_budget_ms
         self._driver = None
+        self._fulltext_ready: Optional[bool] = None
+        self.last_strategy_timings: Dict[str, float] = {}
         
     def _get_driver(self):
         """Get or create Neo4j driver."""
@@ -35,43 +79,103 @@ class Neo4jGraphRetriever(BaseRetriever):
             except ImportError as exc:
                 raise ImportError("Neo4j package required. Install with: pip install neo4j") from exc
         return self._driver
+
+    def session(self):
+        """Open a session on this retriever's (shared) driver."""
+        return self._get_driver().session(database=self.database)
+
+    def _run(
+        self,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> List[Dict]:
+        """Execute Cypher query and return results, raising on failure."""
+        driver = self._get_driver()
+        if timeout is not None:
+            from neo4j import Query
+
+            query = Query(query, timeout=timeout)
+        with driver.session(database=self.database) as session:
+            result = session.run(query, parameters or {})
+            return [record.data() for record in result]
     
     def _execute_query(self, query: str, parameters: Dict[str, Any] = None) -> List[Dict]:
         """Execute Cypher query and return results."""
-        driver = self._get_driver()
-        parameters = parameters or {}
-        
         try:
-            with driver.session(database=self.database) as session:
-                result = session.run(query, parameters)
-                return [record.data() for record in result]
+            return self._run(query, parameters)
         except Exception as exc:
-            import logging
-            logging.warning("Neo4j query failed: %s", exc)
+            logger.warning("Neo4j query failed: %s", exc)
             return []
+
+    def ensure_indexes(self) -> bool:
+        """Create (if allowed) and check the full-text indexes; returns availability."""
+        if self._fulltext_ready is not None:
+            return self._fulltext_ready
+        if not self.use_fulltext:
+            self._fulltext_ready = False
+            return False
+        try:
+            if self.create_indexes:
+                for statement in fulltext_index_statements():
+                    self._run(statement)
+            rows = self._run(
+                "SHOW FULLTEXT INDEXES YIELD name, state WHERE name IN $names RETURN name, state",
+                {"names": list(FULLTEXT_INDEX_DEFINITIONS)},
+            )
+            online = {row["name"] for row in rows if row.get("state") == "ONLINE"}
+            self._fulltext_ready = online == set(FULLTEXT_INDEX_DEFINITIONS)
+        except Exception as exc:
+            logger.info("Full-text indexes unavailable, using CONTAINS scans: %s", exc)
+            self._fulltext_ready = False
+        return self._fulltext_ready
     
     def search(self, context: QueryContext) -> List[SearchResult]:
         """Execute graph-based search."""
-        query_text = context.query.lower()
+        # Keyword/full-text strategies match lowercased text; the embedding
+        # strategy gets the query as typed (casing can matter to the model).
+        keyword_text = context.query.lower()
+        self.ensure_indexes()
         
         # Multi-strategy graph search
-        strategies = [
-            self._search_by_topic_title,
-            self._search_by_category_name,
-            self._search_related_topics,
-            self._search_by_content_similarity
-        ]
-        
-        all_results = []
-        for strategy in strategies:
+        strategies = {
+            "topic_title": (self._search_by_topic_title, keyword_text),
+            "category_name": (self._search_by_category_name, keyword_text),
+            "related_topics": (self._search_related_topics, keyword_text),
+            "content_similarity": (self._search_by_content_similarity, context.query),
+        }
+
+        def _timed(name: str, strategy, query_text: str) -> tuple[str, List[SearchResult], float]:
+            started = time.perf_counter()
             try:
                 results = strategy(query_text, context.top_k)
-                all_results.extend(results)
             except Exception as exc:
-                import logging
-                logging.debug("Graph search strategy failed: %s", exc)
+                logger.debug("Graph search strategy %s failed: %s", name, exc)
+                results = []
+            return name, results, (time.perf_counter() - started) * 1000.0
+
+        timings: Dict[str, float] = {}
+        all_results: List[SearchResult] = []
+        with ThreadPoolExecutor(max_workers=len(strategies)) as executor:
+            futures = [
+                executor.submit(_timed, name, fn, query_text)
+                for name, (fn, query_text) in strategies.items()
+            ]
+            for future in futures:
+                name, results, elapsed_ms = future.result()
+                timings[name] = elapsed_ms
+                for result in results:
+                    result.metadata["strategy_ms"] = round(elapsed_ms, 2)
+                all_results.extend(results)
+
+        self.last_strategy_timings = timings
+        logger.debug(
+            "Graph strategy timings (ms): %s",
+            ", ".join(f"{name}={ms:.1f}" for name, ms in timings.items()),
+        )
                 
-        # Remove duplicates and limit results
+        # Remove duplicates (keeping the best score) and limit results
+        all_results.sort(key=lambda r: r.score, reverse=True)
         seen_ids = set()
         unique_results = []
         for result in all_results:
@@ -80,35 +184,61 @@ class Neo4jGraphRetriever(BaseRetriever):
                 unique_results.append(result)
                 
         return unique_results[:context.top_k]
+
+    @staticmethod
+    def _scale_scores(records: List[Dict], weight: float) -> List[float]:
+        """Scale raw (Lucene) scores into (0, weight] relative to the best hit."""
+        best = max((record["score"] or 0.0 for record in records), default=0.0)
+        if best <= 0:
+            return [weight for _ in records]
+        return [weight * (record["score"] or 0.0) / best for record in records]
     
     def _search_by_topic_title(self, query: str, limit: int) -> List[SearchResult]:
         """Search topics by title similarity."""
-        cypher = """
-        MATCH (topic:HelpTopic)
-        WHERE toLower(topic.title) CONTAINS $query
-        RETURN topic.topic_id as id, 
-               topic.title as title,
-               topic.source_path as source_path,
-               topic.section_count as section_count,
-               1.0 - (size($query) - size(topic.title)) * 1.0 / size(topic.title) as score
-        ORDER BY score DESC
-        LIMIT $limit
-        """
-        
-        records = self._execute_query(cypher, {"query": query, "limit": limit})
+        if self._fulltext_ready:
+            cypher = """
+            CALL db.index.fulltext.queryNodes($index, $lucene) YIELD node AS topic, score
+            RETURN topic.topic_id as id,
+                   topic.title as title,
+                   topic.source_path as source_path,
+                   topic.section_count as section_count,
+                   score
+            ORDER BY score DESC
+            LIMIT $limit
+            """
+            records = self._run(
+                cypher,
+                {"index": TOPIC_TITLE_INDEX, "lucene": to_lucene_query(query), "limit": limit},
+            )
+            scores = self._scale_scores(records, 1.0)
+        else:
+            cypher = """
+            MATCH (topic:HelpTopic)
+            WHERE toLower(topic.title) CONTAINS $query
+            RETURN topic.topic_id as id, 
+                   topic.title as title,
+                   topic.source_path as source_path,
+                   topic.section_count as section_count,
+                   1.0 - (size($query) - size(topic.title)) * 1.0 / size(topic.title) as score
+            ORDER BY score DESC
+            LIMIT $limit
+            """
+            records = self._execute_query(cypher, {"query": query, "limit": limit})
+            scores = [record["score"] for record in records]
         
         results = []
-        for record in records:
+        for record, score in zip(records, scores):
             result = SearchResult(
                 id=record["id"],
                 content=record["title"],
-                score=max(0.0, record["score"]),
+                score=max(0.0, score),
                 source="graph_topic_title",
                 metadata={
                     "title": record["title"],
                     "source_path": record["source_path"],
                     "section_count": record["section_count"],
-                    "search_type": "topic_title"
+                    "search_type": "topic_title",
+                    "raw_score": record["score"],
                 }
             )
             results.append(result)
@@ -117,32 +247,51 @@ class Neo4jGraphRetriever(BaseRetriever):
     
     def _search_by_category_name(self, query: str, limit: int) -> List[SearchResult]:
         """Search by category names and return related topics."""
-        cypher = """
-        MATCH (cat:HelpCategory)-[:HAS_TOPIC]->(topic:HelpTopic)
-        WHERE toLower(cat.name) CONTAINS $query
-        RETURN topic.topic_id as id,
-               topic.title as title,
-               cat.name as category_name,
-               topic.source_path as source_path,
-               0.8 as score
-        ORDER BY topic.title
-        LIMIT $limit
-        """
-        
-        records = self._execute_query(cypher, {"query": query, "limit": limit})
+        if self._fulltext_ready:
+            cypher = """
+            CALL db.index.fulltext.queryNodes($index, $lucene) YIELD node AS cat, score
+            MATCH (cat)-[:HAS_TOPIC]->(topic:HelpTopic)
+            RETURN topic.topic_id as id,
+                   topic.title as title,
+                   cat.name as category_name,
+                   topic.source_path as source_path,
+                   score
+            ORDER BY score DESC, title
+            LIMIT $limit
+            """
+            records = self._run(
+                cypher,
+                {"index": CATEGORY_NAME_INDEX, "lucene": to_lucene_query(query), "limit": limit},
+            )
+            scores = self._scale_scores(records, 0.8)
+        else:
+            cypher = """
+            MATCH (cat:HelpCategory)-[:HAS_TOPIC]->(topic:HelpTopic)
+            WHERE toLower(cat.name) CONTAINS $query
+            RETURN topic.topic_id as id,
+                   topic.title as title,
+                   cat.name as category_name,
+                   topic.source_path as source_path,
+                   0.8 as score
+            ORDER BY topic.title
+            LIMIT $limit
+            """
+            records = self._execute_query(cypher, {"query": query, "limit": limit})
+            scores = [record["score"] for record in records]
         
         results = []
-        for record in records:
+        for record, score in zip(records, scores):
             result = SearchResult(
                 id=record["id"],
                 content=f"{record['category_name']}: {record['title']}",
-                score=record["score"],
+                score=score,
                 source="graph_category",
                 metadata={
                     "title": record["title"],
                     "category_name": record["category_name"],
                     "source_path": record["source_path"],
-                    "search_type": "category_name"
+                    "search_type": "category_name",
+                    "raw_score": record["score"],
                 }
             )
             results.append(result)
@@ -151,35 +300,58 @@ class Neo4jGraphRetriever(BaseRetriever):
     
     def _search_related_topics(self, query: str, limit: int) -> List[SearchResult]:
         """Find topics related to matching topics."""
-        cypher = """
-        MATCH (topic1:HelpTopic)
-        WHERE toLower(topic1.title) CONTAINS $query
-        MATCH (cat:HelpCategory)-[:HAS_TOPIC]->(topic1)
-        MATCH (cat)-[:HAS_TOPIC]->(topic2:HelpTopic)
-        WHERE topic1 <> topic2
-        RETURN DISTINCT topic2.topic_id as id,
-               topic2.title as title,
-               topic2.source_path as source_path,
-               cat.name as category_name,
-               0.6 as score
-        ORDER BY topic2.title
-        LIMIT $limit
-        """
-        
-        records = self._execute_query(cypher, {"query": query, "limit": limit})
+        if self._fulltext_ready:
+            cypher = """
+            CALL db.index.fulltext.queryNodes($index, $lucene) YIELD node AS topic1, score
+            WITH topic1, score ORDER BY score DESC LIMIT $limit
+            MATCH (cat:HelpCategory)-[:HAS_TOPIC]->(topic1)
+            MATCH (cat)-[:HAS_TOPIC]->(topic2:HelpTopic)
+            WHERE topic1 <> topic2
+            WITH topic2, cat, max(score) AS score
+            RETURN topic2.topic_id as id,
+                   topic2.title as title,
+                   topic2.source_path as source_path,
+                   cat.name as category_name,
+                   score
+            ORDER BY score DESC, title
+            LIMIT $limit
+            """
+            records = self._run(
+                cypher,
+                {"index": TOPIC_TITLE_INDEX, "lucene": to_lucene_query(query), "limit": limit},
+            )
+            scores = self._scale_scores(records, 0.6)
+        else:
+            cypher = """
+            MATCH (topic1:HelpTopic)
+            WHERE toLower(topic1.title) CONTAINS $query
+            MATCH (cat:HelpCategory)-[:HAS_TOPIC]->(topic1)
+            MATCH (cat)-[:HAS_TOPIC]->(topic2:HelpTopic)
+            WHERE topic1 <> topic2
+            RETURN DISTINCT topic2.topic_id as id,
+                   topic2.title as title,
+                   topic2.source_path as source_path,
+                   cat.name as category_name,
+                   0.6 as score
+            ORDER BY topic2.title
+            LIMIT $limit
+            """
+            records = self._execute_query(cypher, {"query": query, "limit": limit})
+            scores = [record["score"] for record in records]
         
         results = []
-        for record in records:
+        for record, score in zip(records, scores):
             result = SearchResult(
                 id=record["id"],
                 content=record["title"],
-                score=record["score"],
+                score=score,
                 source="graph_related",
                 metadata={
                     "title": record["title"],
                     "category_name": record["category_name"],
                     "source_path": record["source_path"],
-                    "search_type": "related_topics"
+                    "search_type": "related_topics",
+                    "raw_score": record["score"],
                 }
             )
             results.append(result)
@@ -187,10 +359,60 @@ class Neo4jGraphRetriever(BaseRetriever):
         return results
     
     def _search_by_content_similarity(self, query: str, limit: int) -> List[SearchResult]:
-        """Search by content keywords (if available in graph)."""
-        # This would require storing content or keywords in the graph
-        # For now, return empty results
-        return []
+        """Search topics by embedding similarity through the vector index."""
+        if self.embed_fn is None:
+            return []
+
+        started = time.perf_counter()
+        embedding = [float(value) for value in self.embed_fn(query)]
+        remaining_ms = self.vector_budget_ms - (time.perf_counter() - started) * 1000.0
+        if remaining_ms <= 0:
+            logger.debug("Vector search skipped: embedding exceeded %.0f ms budget", self.vector_budget_ms)
+            return []
+
+        cypher = """
+        CALL db.index.vector.queryNodes($index, $k, $embedding) YIELD node AS topic, score
+        RETURN topic.topic_id as id,
+               topic.title as title,
+               topic.source_path as source_path,
+               topic.section_count as section_count,
+               score
+        ORDER BY score DESC
+        LIMIT $limit
+        """
+        try:
+            records = self._run(
+                cypher,
+                {
+                    "index": TOPIC_EMBEDDING_INDEX,
+                    "k": max(self.vector_k, limit),
+                    "embedding": embedding,
+                    "limit": limit,
+                },
+                timeout=remaining_ms / 1000.0,
+            )
+        except Exception as exc:
+            logger.debug("Vector index query failed: %s", exc)
+            return []
+
+        results = []
+        for record in records:
+            result = SearchResult(
+                id=record["id"],
+                content=record["title"],
+                score=record["score"],
+                source="graph_content",
+                metadata={
+                    "title": record["title"],
+                    "source_path": record["source_path"],
+                    "section_count": record["section_count"],
+                    "search_type": "content_similarity",
+                    "raw_score": record["score"],
+                }
+            )
+            results.append(result)
+
+        return results
     
     def get_name(self) -> str:
         return "graph_neo4j"
@@ -207,7 +429,13 @@ class Neo4jGraphRetriever(BaseRetriever):
 
 
 class GraphPathRetriever(BaseRetriever):
-    """Retriever that finds paths between concepts in the graph."""
+    """Retriever that finds paths between concepts in the graph.
+
+    All term pairs are resolved by one ``UNWIND`` query in a single session.
+    ``max_terms`` bounds the number of pairs and ``timeout_seconds`` is the
+    transaction timeout for the whole search. Term/pair counts and latency of
+    the last search are kept in ``last_search_stats``.
+    """
     
     def __init__(
         self,
@@ -215,14 +443,19 @@ class GraphPathRetriever(BaseRetriever):
         username: str,
         password: str,
         database: Optional[str] = None,
-        max_path_length: int = 3
+        max_path_length: int = 3,
+        max_terms: int = 8,
+        timeout_seconds: Optional[float] = 2.0,
     ):
         self.uri = uri
         self.username = username
         self.password = password
         self.database = database
-        self.max_path_length = max_path_length
+        self.max_path_length = max(1, int(max_path_length))
+        self.max_terms = max_terms
+        self.timeout_seconds = timeout_seconds
         self._driver = None
+        self.last_search_stats: Dict[str, Any] = {}
         
     def _get_driver(self):
         """Get or create Neo4j driver."""
@@ -236,23 +469,41 @@ class GraphPathRetriever(BaseRetriever):
             except ImportError as exc:
                 raise ImportError("Neo4j package required. Install with: pip install neo4j") from exc
         return self._driver
+
+    def _query_terms(self, query: str) -> List[str]:
+        """Unique lower-cased terms in query order, capped at max_terms."""
+        terms = list(dict.fromkeys(query.lower().split()))
+        return terms[: self.max_terms]
     
     def search(self, context: QueryContext) -> List[SearchResult]:
         """Find conceptual paths in the help system."""
-        driver = self._get_driver()
-        query_terms = context.query.lower().split()
+        query_terms = self._query_terms(context.query)
         
         if len(query_terms) < 2:
             return []
+
+        pairs = [
+            [term1, term2]
+            for i, term1 in enumerate(query_terms)
+            for term2 in query_terms[i + 1:]
+        ]
             
-        # Find paths between concepts
+        # Find paths between concepts for every pair in one round-trip
         cypher = """
-        MATCH (start:HelpTopic), (end:HelpTopic)
-        WHERE toLower(start.title) CONTAINS $term1 
-          AND toLower(end.title) CONTAINS $term2
-          AND start <> end
-        MATCH path = shortestPath((start)-[*1..{max_length}]-(end))
-        RETURN path,
+        UNWIND $pairs AS pair
+        CALL {{
+            WITH pair
+            MATCH (start:HelpTopic), (end:HelpTopic)
+            WHERE toLower(start.title) CONTAINS pair[0]
+              AND toLower(end.title) CONTAINS pair[1]
+              AND start <> end
+            MATCH path = shortestPath((start)-[*1..{max_length}]-(end))
+            RETURN path, start, end
+            ORDER BY length(path)
+            LIMIT $limit
+        }}
+        RETURN pair[0] as term1,
+               pair[1] as term2,
                length(path) as path_length,
                start.title as start_title,
                end.title as end_title,
@@ -262,39 +513,52 @@ class GraphPathRetriever(BaseRetriever):
         """.format(max_length=self.max_path_length)
         
         results = []
-        
-        # Try all pairs of terms
-        for i, term1 in enumerate(query_terms):
-            for term2 in query_terms[i+1:]:
-                try:
-                    with driver.session(database=self.database) as session:
-                        records = session.run(cypher, {
-                            "term1": term1,
-                            "term2": term2,
-                            "limit": context.top_k
-                        })
-                        
-                        for record in records:
-                            path_info = f"Path from '{record['start_title']}' to '{record['end_title']}'"
-                            
-                            result = SearchResult(
-                                id=f"path_{term1}_{term2}_{record['path_length']}",
-                                content=path_info,
-                                score=record["score"],
-                                source="graph_path",
-                                metadata={
-                                    "start_title": record["start_title"],
-                                    "end_title": record["end_title"],
-                                    "path_length": record["path_length"],
-                                    "search_terms": [term1, term2],
-                                    "search_type": "concept_path"
-                                }
-                            )
-                            results.append(result)
-                            
-                except Exception as exc:
-                    import logging
-                    logging.debug("Path search failed for %s -> %s: %s", term1, term2, exc)
+        started = time.perf_counter()
+        try:
+            from neo4j import Query
+
+            driver = self._get_driver()
+            with driver.session(database=self.database) as session:
+                records = list(
+                    session.run(
+                        Query(cypher, timeout=self.timeout_seconds),
+                        {"pairs": pairs, "limit": context.top_k},
+                    )
+                )
+        except Exception as exc:
+            logger.debug("Path search failed for %d term pairs: %s", len(pairs), exc)
+            records = []
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+
+        self.last_search_stats = {
+            "terms": len(query_terms),
+            "pairs": len(pairs),
+            "paths": len(records),
+            "elapsed_ms": elapsed_ms,
+        }
+        logger.debug(
+            "Path search: %d terms, %d pairs, %d paths in %.1f ms",
+            len(query_terms), len(pairs), len(records), elapsed_ms,
+        )
+
+        for record in records:
+            term1, term2 = record["term1"], record["term2"]
+            path_info = f"Path from '{record['start_title']}' to '{record['end_title']}'"
+            
+            result = SearchResult(
+                id=f"path_{term1}_{term2}_{record['path_length']}",
+                content=path_info,
+                score=record["score"],
+                source="graph_path",
+                metadata={
+                    "start_title": record["start_title"],
+                    "end_title": record["end_title"],
+                    "path_length": record["path_length"],
+                    "search_terms": [term1, term2],
+                    "search_type": "concept_path"
+                }
+            )
+            results.append(result)
                     
         return results[:context.top_k]
     
@@ -2,13 +2,15 @@
 
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .base import BaseRetriever, QueryContext, SearchResult
 from .sparse_retriever import SparseVectorRetriever, BM25Retriever
 from .fulltext_retriever import WhooshRetriever, ElasticsearchRetriever
+from .embeddings import QueryEmbedder
 from .graph_retriever import Neo4jGraphRetriever, GraphPathRetriever
 from .fusion import (
     ReciprocalRankFusion,
@@ -24,6 +26,8 @@ class HybridRetriever(BaseRetriever):
     def __init__(self, config: HybridRetrieverConfig):
         self.config = config
         self.retrievers: Dict[str, BaseRetriever] = {}
+        self._embedders: Dict[Tuple[str, Optional[float]], QueryEmbedder] = {}
+        self._async_retriever = None
         self.fusion_engine = self._create_fusion_engine()
         self._initialize_retrievers()
 
@@ -42,16 +46,31 @@ class HybridRetriever(BaseRetriever):
         else:
             return ReciprocalRankFusion()  # Default
 
+    def _get_embedder(
+        self, model: str, cache_size: int = 1024, timeout: Optional[float] = None
+    ) -> QueryEmbedder:
+        """Share one query embedder (and cache) per embedding model and timeout."""
+        key = (model, timeout)
+        if key not in self._embedders:
+            self._embedders[key] = QueryEmbedder(model, cache_size=cache_size, timeout=timeout)
+        return self._embedders[key]
+
     def _initialize_retrievers(self):
         """Initialize all configured retrievers."""
 
         # Dense vector retriever (Chroma)
         if self.config.enable_dense and self.config.chroma_config:
             try:
+                chroma_config = self.config.chroma_config
                 self.retrievers["dense"] = ChromaDenseRetriever(
-                    collection_name=self.config.chroma_config.collection_name,
-                    persist_directory=self.config.chroma_config.persist_directory,
-                    embedding_model=self.config.chroma_config.embedding_model,
+                    collection_name=chroma_config.collection_name,
+                    persist_directory=chroma_config.persist_directory,
+                    embedding_model=chroma_config.embedding_model,
+                    embedder=(
+                        self._get_embedder(chroma_config.embedding_model, chroma_config.query_cache_size)
+                        if chroma_config.embedding_model
+                        else None
+                    ),
                 )
             except Exception as exc:
                 import logging
@@ -66,6 +85,7 @@ class HybridRetriever(BaseRetriever):
                         vectorizer_path=self.config.tfidf_config.vectorizer_path,
                         documents_path=self.config.tfidf_config.documents_path,
                         index_name=self.config.tfidf_config.index_name,
+                        index_dir=self.config.tfidf_config.index_dir,
                     )
                 except Exception as exc:
                     import logging
@@ -78,6 +98,7 @@ class HybridRetriever(BaseRetriever):
                         documents_path=self.config.bm25_config.documents_path,
                         k1=self.config.bm25_config.k1,
                         b=self.config.bm25_config.b,
+                        index_dir=self.config.bm25_config.index_dir,
                     )
                 except Exception as exc:
                     import logging
@@ -102,6 +123,7 @@ class HybridRetriever(BaseRetriever):
                         host=self.config.elasticsearch_config.host,
                         port=self.config.elasticsearch_config.port,
                         index_name=self.config.elasticsearch_config.index_name,
+                        fuzziness=self.config.elasticsearch_config.fuzziness,
                     )
                 except Exception as exc:
                     import logging
@@ -118,6 +140,17 @@ class HybridRetriever(BaseRetriever):
                     username=self.config.neo4j_config.username,
                     password=self.config.neo4j_config.password,
                     database=self.config.neo4j_config.database,
+                    embed_fn=(
+                        self._get_embedder(
+                            self.config.neo4j_config.embedding_model,
+                            # The embedding call must fit the vector search budget
+                            timeout=self.config.neo4j_config.vector_budget_ms / 1000.0,
+                        ).embed
+                        if self.config.neo4j_config.embedding_model
+                        else None
+                    ),
+                    vector_k=self.config.neo4j_config.vector_k,
+                    vector_budget_ms=self.config.neo4j_config.vector_budget_ms,
                 )
 
                 if self.config.enable_graph_paths:
@@ -127,6 +160,8 @@ class HybridRetriever(BaseRetriever):
                         password=self.config.neo4j_config.password,
                         database=self.config.neo4j_config.database,
                         max_path_length=self.config.max_path_length,
+                        max_terms=self.config.max_path_terms,
+                        timeout_seconds=self.config.path_timeout_seconds,
                     )
             except Exception as exc:
                 import logging
@@ -198,6 +233,52 @@ class HybridRetriever(BaseRetriever):
             logging.warning("Parallel hybrid search failed: %s", exc)
             return []
 
+    async def asearch(self, context: QueryContext) -> List[SearchResult]:
+        """Awaitable hybrid search for use inside a running event loop.
+
+        Backends run concurrently under per-backend concurrency limits and a
+        timeout; cancelling the caller cancels the pending backend calls.
+        """
+        active_retrievers = self._filter_retrievers(context)
+        if not active_retrievers:
+            return []
+
+        if self._async_retriever is None:
+            from .parallel_retriever import AsyncRetriever  # type: ignore[reportMissingImports]
+
+            self._async_retriever = AsyncRetriever(
+                retrievers=self.retrievers,
+                max_concurrency=self.config.async_max_concurrency,
+                timeout_seconds=self.config.async_timeout_seconds,
+            )
+
+        if len(active_retrievers) == 1:
+            results_by_name = await self._async_retriever.search_by_source(context, active_retrievers)
+            results = next(iter(results_by_name.values()), [])
+            return results[: context.top_k]
+
+        retriever_context = QueryContext(
+            query=context.query,
+            filters=context.filters,
+            top_k=min(context.top_k * 2, 20),  # Get more results for fusion
+            search_types=context.search_types,
+            fusion_method=context.fusion_method,
+        )
+        results_by_name = await self._async_retriever.search_by_source(
+            retriever_context, active_retrievers
+        )
+
+        # Group results by source for fusion
+        results_by_source: Dict[str, List[SearchResult]] = {}
+        for results in results_by_name.values():
+            for result in results:
+                results_by_source.setdefault(result.source, []).append(result)
+        if not results_by_source:
+            return []
+
+        fused_results = self.fusion_engine.fuse_results(results_by_source, context)
+        return fused_results[: context.top_k]
+
     def _filter_retrievers(self, context: QueryContext) -> Dict[str, BaseRetriever]:
         """Filter retrievers based on search context."""
         if context.search_types:
@@ -232,17 +313,27 @@ class HybridRetriever(BaseRetriever):
 
 
 class ChromaDenseRetriever(BaseRetriever):
-    """Dense vector retriever using Chroma."""
+    """Dense vector retriever using Chroma.
+
+    With an ``embedding_model`` the query is embedded client-side (through a
+    cached :class:`QueryEmbedder`) so it matches the model used at ingest;
+    otherwise the collection's own embedding function is used.
+    """
 
     def __init__(
         self,
         collection_name: str,
         persist_directory: Optional[str] = None,
         embedding_model: Optional[str] = None,
+        embedder: Optional[QueryEmbedder] = None,
+        query_cache_size: int = 1024,
     ):
         self.collection_name = collection_name
         self.persist_directory = persist_directory
         self.embedding_model = embedding_model
+        if embedder is None and embedding_model:
+            embedder = QueryEmbedder(embedding_model, cache_size=query_cache_size)
+        self.embedder = embedder
         self._client = None
         self._collection = None
 
@@ -272,51 +363,81 @@ class ChromaDenseRetriever(BaseRetriever):
 
     def search(self, context: QueryContext) -> List[SearchResult]:
         """Execute dense vector search using Chroma."""
+        return self.search_batch([context])[0]
+
+    def search_batch(self, contexts: Sequence[QueryContext]) -> List[List[SearchResult]]:
+        """Search several queries, embedding them in one batch.
+
+        Queries sharing the same filters are sent in a single Chroma query.
+        """
+        if not contexts:
+            return []
         collection = self._get_collection()
 
         try:
-            # Query collection
-            results = collection.query(
-                query_texts=[context.query],
-                n_results=context.top_k,
-                where=context.filters,
+            embeddings = (
+                self.embedder.embed_many([context.query for context in contexts])
+                if self.embedder is not None
+                else None
             )
 
-            search_results = []
+            groups: Dict[str, List[int]] = {}
+            for index, context in enumerate(contexts):
+                key = json.dumps(context.filters, sort_keys=True, default=str)
+                groups.setdefault(key, []).append(index)
 
-            if results["ids"] and results["ids"][0]:
-                for i, doc_id in enumerate(results["ids"][0]):
-                    content = results["documents"][0][i] if results["documents"] else ""
-                    distance = (
-                        results["distances"][0][i] if results["distances"] else 0.0
-                    )
-                    metadata = (
-                        results["metadatas"][0][i] if results["metadatas"] else {}
-                    )
-
-                    # Convert distance to similarity score (assuming cosine distance)
-                    score = max(0.0, 1.0 - distance)
-
-                    result = SearchResult(
-                        id=doc_id,
-                        content=content,
-                        score=score,
-                        source="dense_chroma",
-                        metadata={
-                            "distance": distance,
-                            "embedding_model": self.embedding_model,
-                            **metadata,
-                        },
-                    )
-                    search_results.append(result)
-
-            return search_results
+            batched: List[List[SearchResult]] = [[] for _ in contexts]
+            for indexes in groups.values():
+                n_results = max(contexts[i].top_k for i in indexes)
+                if embeddings is not None:
+                    query_kwargs = {"query_embeddings": [embeddings[i] for i in indexes]}
+                else:
+                    query_kwargs = {"query_texts": [contexts[i].query for i in indexes]}
+                results = collection.query(
+                    n_results=n_results,
+                    where=contexts[indexes[0]].filters,
+                    **query_kwargs,
+                )
+                for row, i in enumerate(indexes):
+                    batched[i] = self._to_results(results, row)[: contexts[i].top_k]
+            return batched
 
         except Exception as exc:
             import logging
 
             logging.warning("Chroma search failed: %s", exc)
-            return []
+            return [[] for _ in contexts]
+
+    def _to_results(self, results: Dict, row: int) -> List[SearchResult]:
+        search_results = []
+
+        if results["ids"] and results["ids"][row]:
+            for i, doc_id in enumerate(results["ids"][row]):
+                content = results["documents"][row][i] if results["documents"] else ""
+                distance = (
+                    results["distances"][row][i] if results["distances"] else 0.0
+                )
+                metadata = (
+                    results["metadatas"][row][i] if results["metadatas"] else {}
+                )
+
+                # Convert distance to similarity score (assuming cosine distance)
+                score = max(0.0, 1.0 - distance)
+
+                result = SearchResult(
+                    id=doc_id,
+                    content=content,
+                    score=score,
+                    source="dense_chroma",
+                    metadata={
+                        "distance": distance,
+                        "embedding_model": self.embedding_model,
+                        **metadata,
+                    },
+                )
+                search_results.append(result)
+
+        return search_results
 
     def get_name(self) -> str:
         return f"dense_chroma_{self.collection_name}"
@@ -330,20 +451,25 @@ class ChromaConfig:
     collection_name: str
     persist_directory: Optional[str] = None
     embedding_model: Optional[str] = None
+    # LRU size for client-side query embeddings
+    query_cache_size: int = 1024
 
 
 @dataclass
 class TFIDFConfig:
-    vectorizer_path: Path
-    documents_path: Path
+    vectorizer_path: Optional[Path] = None
+    documents_path: Optional[Path] = None
     index_name: str = "tfidf"
+    # Pickle-free sparse index directory (takes precedence over the paths above)
+    index_dir: Optional[Path] = None
 
 
 @dataclass
 class BM25Config:
-    documents_path: Path
+    documents_path: Optional[Path] = None
     k1: float = 1.2
     b: float = 0.75
+    index_dir: Optional[Path] = None
 
 
 @dataclass
@@ -356,6 +482,8 @@ class ElasticsearchConfig:
     host: str = "localhost"
     port: int = 9200
     index_name: str = "help_documents"
+    # None disables fuzzy matching
+    fuzziness: Optional[str] = "AUTO"
 
 
 @dataclass
@@ -364,6 +492,10 @@ class Neo4jConfig:
     username: str
     password: str
     database: Optional[str] = None
+    # Topic embedding search (vector index); disabled when no model is set
+    embedding_model: Optional[str] = None
+    vector_k: int = 10
+    vector_budget_ms: float = 300.0
 
 
 @dataclass
@@ -382,6 +514,12 @@ class HybridRetrieverConfig:
 
     # Graph configuration
     max_path_length: int = 3
+    max_path_terms: int = 8
+    path_timeout_seconds: float = 2.0
+
+    # Async search (HybridRetriever.asearch): per-backend concurrency and timeout
+    async_max_concurrency: int = 8
+    async_timeout_seconds: float = 30.0
 
     # Retriever configurations
     chroma_config: Optional[ChromaConfig] = None
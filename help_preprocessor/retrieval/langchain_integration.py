@@ -2,11 +2,18 @@
 
 from __future__ import annotations
 
+import re
+import time
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 
 from .base import QueryContext
 from .hybrid_retriever import HybridRetriever, HybridRetrieverConfig
+from .answer_cache import SemanticAnswerCache
+from .streaming import TokenStream, stream_from_callback
+
+# API names, identifiers and numbers scope answer cache entries
+_CACHE_KEY_TERM = re.compile(r"[A-Za-z0-9_.]+")
 
 
 class HelpLangChainRetriever:
@@ -17,22 +24,35 @@ class HelpLangChainRetriever:
         
     def get_relevant_documents(self, query: str, **kwargs) -> List[Any]:
         """LangChain-compatible retrieval method."""
-        try:
-            from langchain.schema import Document
-        except ImportError as exc:
-            raise ImportError("LangChain package required. Install with: pip install langchain") from exc
-            
+        context = self._build_context(query, **kwargs)
+        
+        # Execute search
+        results = self.hybrid_retriever.search(context)
+        return self._to_documents(results)
+    
+    async def aget_relevant_documents(self, query: str, **kwargs) -> List[Any]:
+        """Async version of get_relevant_documents (awaitable from a running loop)."""
+        context = self._build_context(query, **kwargs)
+        results = await self.hybrid_retriever.asearch(context)
+        return self._to_documents(results)
+
+    @staticmethod
+    def _build_context(query: str, **kwargs) -> QueryContext:
         # Convert to our query context
-        context = QueryContext(
+        return QueryContext(
             query=query,
             top_k=kwargs.get("k", 5),
             filters=kwargs.get("filters"),
             search_types=kwargs.get("search_types")
         )
-        
-        # Execute search
-        results = self.hybrid_retriever.search(context)
-        
+
+    @staticmethod
+    def _to_documents(results) -> List[Any]:
+        try:
+            from langchain.schema import Document
+        except ImportError as exc:
+            raise ImportError("LangChain package required. Install with: pip install langchain") from exc
+            
         # Convert to LangChain documents
         documents = []
         for result in results:
@@ -48,29 +68,36 @@ class HelpLangChainRetriever:
             documents.append(doc)
             
         return documents
-    
-    async def aget_relevant_documents(self, query: str, **kwargs) -> List[Any]:
-        """Async version of get_relevant_documents."""
-        # For now, just call sync version
-        # Could be improved with actual async implementation
-        return self.get_relevant_documents(query, **kwargs)
 
 
 class HelpRAGChain:
-    """RAG (Retrieval-Augmented Generation) chain for help system."""
+    """RAG (Retrieval-Augmented Generation) chain for help system.
+
+    Answer cache entries are keyed by the question's identifier and number
+    terms (e.g. ``CreatePlate``, ``DXF``, ``10``), so near-duplicate questions about
+    different APIs or values do not share answers. Questions without such
+    terms must reach ``unscoped_cache_threshold`` similarity instead.
+    """
     
     def __init__(
         self,
         hybrid_retriever: HybridRetriever,
         llm_model: str = "gpt-3.5-turbo",
         temperature: float = 0.1,
-        max_tokens: int = 500
+        max_tokens: int = 500,
+        answer_cache: Optional[SemanticAnswerCache] = None,
+        unscoped_cache_threshold: float = 0.97,
     ):
         self.hybrid_retriever = hybrid_retriever
         self.llm_model = llm_model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.answer_cache = answer_cache
+        self.unscoped_cache_threshold = unscoped_cache_threshold
         self._chain = None
+        self._llm = None
+        self._prompt = None
+        self._retriever = None
         
     def _build_chain(self):
         """Build LangChain RAG chain."""
@@ -90,6 +117,8 @@ class HelpRAGChain:
         
         # Create retriever
         retriever = HelpLangChainRetriever(self.hybrid_retriever)
+        self._llm = llm
+        self._retriever = retriever
         
         # Custom prompt for help system
         prompt_template = """以下のヘルプドキュメントの内容を参考にして、質問に回答してください。
@@ -106,6 +135,7 @@ class HelpRAGChain:
             template=prompt_template,
             input_variables=["context", "question"]
         )
+        self._prompt = PROMPT
         
         # Build chain
         self._chain = RetrievalQA.from_chain_type(
@@ -119,12 +149,105 @@ class HelpRAGChain:
         return self._chain
     
     def query(self, question: str, **kwargs) -> Dict[str, Any]:
-        """Execute RAG query."""
+        """Execute RAG query, answering near-duplicate questions from the answer cache."""
+        cached = self._cached_result(question)
+        if cached is not None:
+            return cached
+
         if self._chain is None:
             self._chain = self._build_chain()
             
-        result = self._chain({"query": question})
-        
+        result = self._format_result(self._chain({"query": question}))
+        self._remember(question, result)
+        return result
+
+    @staticmethod
+    def _cache_key(question: str) -> Optional[str]:
+        terms = {
+            term.lower()
+            for term in _CACHE_KEY_TERM.findall(question)
+            # CamelCase / upper-case names, snake_case names and numbers; not plain words
+            if term[1:] != term[1:].lower() or any(ch.isdigit() or ch == "_" for ch in term)
+        }
+        return " ".join(sorted(terms)) or None
+
+    def _cached_result(self, question: str) -> Optional[Dict[str, Any]]:
+        if self.answer_cache is None:
+            return None
+        key = self._cache_key(question)
+        hit = self.answer_cache.lookup(
+            question,
+            key=key,
+            min_similarity=None if key else self.unscoped_cache_threshold,
+        )
+        if hit is None:
+            return None
+        return {
+            "answer": hit.answer,
+            "source_documents": [{"content": "", "metadata": {"id": doc_id}} for doc_id in hit.context_ids],
+            "retrieval_method": "answer_cache",
+            "cache": {"similarity": hit.similarity, "question": hit.question},
+        }
+
+    def _remember(self, question: str, result: Dict[str, Any]) -> None:
+        if self.answer_cache is None or not result.get("answer"):
+            return
+        context_ids = [
+            doc["metadata"]["id"] for doc in result["source_documents"] if doc["metadata"].get("id")
+        ]
+        self.answer_cache.store(question, result["answer"], context_ids, key=self._cache_key(question))
+
+    def stream_query(self, question: str, **kwargs) -> TokenStream:
+        """Execute RAG query, streaming the answer tokens as they are generated.
+
+        Retrieval runs first (its time counts towards the stream's TTFT), then
+        the same "stuff" prompt is sent to the LLM with ``stream()``. A cache
+        hit is replayed as a single-chunk stream.
+        """
+        started = time.perf_counter()
+        cached = self._cached_result(question)
+        if cached is not None:
+            answer = cached.pop("answer")
+            return TokenStream([answer], started=started, extra=cached)
+
+        if self._chain is None:
+            self._chain = self._build_chain()
+
+        documents = self._retriever.get_relevant_documents(question)
+        retrieval_ms = (time.perf_counter() - started) * 1000
+        prompt = self._prompt.format(
+            context="\n\n".join(doc.page_content for doc in documents),
+            question=question,
+        )
+        extra = {
+            "source_documents": [
+                {"content": doc.page_content, "metadata": doc.metadata}
+                for doc in documents
+            ],
+            "retrieval_method": "langchain_rag_stream",
+            "retrieval_ms": retrieval_ms,
+        }
+
+        def _chunks():
+            stream = TokenStream(self._llm.stream(prompt))
+            yield from stream
+            self._remember(question, {**extra, "answer": stream.text})
+
+        return TokenStream(_chunks(), started=started, extra=extra)
+    
+    async def aquery(self, question: str, **kwargs) -> Dict[str, Any]:
+        """Async version of query (retrieval and LLM call are awaited)."""
+        if self._chain is None:
+            self._chain = self._build_chain()
+            
+        if hasattr(self._chain, "ainvoke"):
+            result = await self._chain.ainvoke({"query": question})
+        else:
+            result = await self._chain.acall({"query": question})
+        return self._format_result(result)
+
+    @staticmethod
+    def _format_result(result: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "answer": result["result"],
             "source_documents": [
@@ -136,11 +259,6 @@ class HelpRAGChain:
             ],
             "retrieval_method": "langchain_rag"
         }
-    
-    async def aquery(self, question: str, **kwargs) -> Dict[str, Any]:
-        """Async version of query."""
-        # For now, just call sync version
-        return self.query(question, **kwargs)
 
 
 class HelpConversationalChain:
@@ -157,20 +275,40 @@ class HelpConversationalChain:
         self.memory_key = memory_key
         self._chain = None
         self._memory = None
+        self._token_handler = None
         
     def _build_chain(self):
         """Build conversational RAG chain."""
         try:
+            from langchain.callbacks.base import BaseCallbackHandler
             from langchain.chains import ConversationalRetrievalChain
             from langchain.chat_models import ChatOpenAI
             from langchain.memory import ConversationBufferWindowMemory
         except ImportError as exc:
             raise ImportError("LangChain package required. Install with: pip install langchain openai") from exc
+
+        class _TokenHandler(BaseCallbackHandler):
+            """Forward answer tokens to the active stream, if any."""
+
+            on_token = None
+
+            def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+                if self.on_token is not None:
+                    self.on_token(token)
+
+        self._token_handler = _TokenHandler()
             
-        # Create LLM
+        # Create LLM; only the answering LLM streams, the question
+        # condensing step uses a plain one so its tokens are not shown.
         llm = ChatOpenAI(
             model_name=self.llm_model,
-            temperature=0.1
+            temperature=0.1,
+            streaming=True,
+            callbacks=[self._token_handler]
+        )
+        condense_llm = ChatOpenAI(
+            model_name=self.llm_model,
+            temperature=0
         )
         
         # Create memory
@@ -188,6 +326,7 @@ class HelpConversationalChain:
             llm=llm,
             retriever=retriever,
             memory=self._memory,
+            condense_question_llm=condense_llm,
             return_source_documents=True
         )
         
@@ -199,7 +338,28 @@ class HelpConversationalChain:
             self._chain = self._build_chain()
             
         result = self._chain({"question": message})
-        
+        return self._format_result(result)
+
+    def stream_chat(self, message: str) -> TokenStream:
+        """Execute conversational query, streaming the answer tokens.
+
+        The chain runs in a worker thread; tokens reach the stream through the
+        answering LLM's callback handler. Calls must not overlap.
+        """
+        if self._chain is None:
+            self._chain = self._build_chain()
+
+        def _run(on_token) -> Dict[str, Any]:
+            self._token_handler.on_token = on_token
+            try:
+                result = self._chain({"question": message})
+            finally:
+                self._token_handler.on_token = None
+            return {**self._format_result(result), "retrieval_method": "langchain_conversational_stream"}
+
+        return stream_from_callback(_run)
+
+    def _format_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "answer": result["answer"],
             "source_documents": [
@@ -219,6 +379,59 @@ class HelpConversationalChain:
             self._memory.clear()
 
 
+def _create_answer_cache(
+    config_dict: Dict[str, Any],
+    retriever_config: HybridRetrieverConfig,
+    graph_retriever: Optional[Any] = None,
+) -> SemanticAnswerCache:
+    """Build the RAG answer cache, fingerprinting cited ids in Chroma and Neo4j.
+
+    Neo4j fingerprints run on ``graph_retriever``'s driver; without a graph
+    retriever no graph ids are cited, so Neo4j is not checked.
+    """
+    import logging
+
+    from .answer_cache import chroma_fingerprint, combined_fingerprint, neo4j_fingerprint
+    from .embeddings import QueryEmbedder
+
+    fingerprints = []
+    chroma_config = retriever_config.chroma_config
+    if chroma_config is not None:
+        try:
+            import chromadb
+            from chromadb.config import Settings
+
+            if chroma_config.persist_directory:
+                client = chromadb.Client(
+                    Settings(persist_directory=chroma_config.persist_directory, is_persistent=True)
+                )
+            else:
+                client = chromadb.Client()
+            fingerprints.append(chroma_fingerprint(client.get_collection(chroma_config.collection_name)))
+        except Exception as exc:
+            logging.warning("Answer cache cannot check Chroma for changes: %s", exc)
+
+    if graph_retriever is not None:
+        fingerprints.append(neo4j_fingerprint(
+            graph_retriever.session,
+            config_dict.get("answer_cache_graph_labels", ["HelpTopic", "HelpCategory"]),
+        ))
+
+    embedder = QueryEmbedder(
+        config_dict.get("answer_cache_embedding_model")
+        or (chroma_config.embedding_model if chroma_config else None)
+        or "text-embedding-3-small"
+    )
+    return SemanticAnswerCache(
+        Path(config_dict["answer_cache_path"]),
+        embedder.embed_many,
+        threshold=config_dict.get("answer_cache_threshold", 0.92),
+        fingerprint_fn=combined_fingerprint(fingerprints) if fingerprints else None,
+        namespace=config_dict.get("llm_model", "gpt-3.5-turbo"),
+        max_age_seconds=config_dict.get("answer_cache_ttl"),
+    )
+
+
 def create_help_langchain_system(
     config_path: Optional[Path] = None,
     **override_config
@@ -241,6 +454,7 @@ def create_help_langchain_system(
         ChromaConfig, TFIDFConfig, BM25Config, WhooshConfig, 
         Neo4jConfig
     )
+    from search_common.sparse_store import is_sparse_index
     
     retriever_config = HybridRetrieverConfig(
         enable_dense=config_dict.get("enable_dense", True),
@@ -264,14 +478,18 @@ def create_help_langchain_system(
     # TF-IDF config
     if retriever_config.enable_sparse:
         tfidf_dir = data_dir / "sparse_index"
-        if (tfidf_dir / "tfidf_vectorizer.joblib").exists():
+        if is_sparse_index(tfidf_dir):
+            # Pickle-free index (manifest.json + .npy arrays) serves both retrievers
+            retriever_config.tfidf_config = TFIDFConfig(index_dir=tfidf_dir)
+            retriever_config.bm25_config = BM25Config(index_dir=tfidf_dir)
+        elif (tfidf_dir / "tfidf_vectorizer.joblib").exists():
             retriever_config.tfidf_config = TFIDFConfig(
                 vectorizer_path=tfidf_dir / "tfidf_vectorizer.joblib",
                 documents_path=tfidf_dir / "documents.pkl"
             )
         
         # BM25 uses same documents
-        if (tfidf_dir / "documents.pkl").exists():
+        if retriever_config.bm25_config is None and (tfidf_dir / "documents.pkl").exists():
             retriever_config.bm25_config = BM25Config(
                 documents_path=tfidf_dir / "documents.pkl"
             )
@@ -288,22 +506,41 @@ def create_help_langchain_system(
             uri=config_dict.get("neo4j_uri", "bolt://localhost:7687"),
             username=config_dict.get("neo4j_username", "neo4j"),
             password=config_dict.get("neo4j_password", "password"),
-            database=config_dict.get("neo4j_database")
+            database=config_dict.get("neo4j_database"),
+            embedding_model=config_dict.get("graph_embedding_model"),
+            vector_k=config_dict.get("graph_vector_k", 10),
+            vector_budget_ms=config_dict.get("graph_vector_budget_ms", 300.0),
         )
     
     # Create enhanced hybrid retriever with optimizations
-    from .enhanced_retriever import create_enhanced_retrieval_system
+    from .enhanced_retriever import CascadeConfig, create_enhanced_retrieval_system
     
     performance_mode = config_dict.get("performance_mode", "balanced")
-    retrieval_system = create_enhanced_retrieval_system(retriever_config, performance_mode)
+    cascade_config = CascadeConfig()
+    # Raw BM25 confidence thresholds depend on the corpus; override per source
+    cascade_config.source_min_top_score.update(config_dict.get("cascade_source_min_top_score", {}))
+    retrieval_system = create_enhanced_retrieval_system(
+        retriever_config, performance_mode, cascade_config=cascade_config
+    )
     
     # Use adaptive retriever as the main hybrid retriever
     hybrid_retriever = retrieval_system["adaptive"]
     
+    # Semantic answer cache for repeated / near-duplicate RAG questions
+    answer_cache = None
+    if config_dict.get("answer_cache_path"):
+        answer_cache = _create_answer_cache(
+            config_dict,
+            retriever_config,
+            graph_retriever=retrieval_system["base"].retrievers.get("graph_neo4j"),
+        )
+
     # Create LangChain components
     rag_chain = HelpRAGChain(
         hybrid_retriever=hybrid_retriever,
-        llm_model=config_dict.get("llm_model", "gpt-3.5-turbo")
+        llm_model=config_dict.get("llm_model", "gpt-3.5-turbo"),
+        answer_cache=answer_cache,
+        unscoped_cache_threshold=config_dict.get("answer_cache_unscoped_threshold", 0.97),
     )
     
     conversational_chain = HelpConversationalChain(
@@ -317,5 +554,6 @@ def create_help_langchain_system(
         "conversational_chain": conversational_chain,
         "langchain_retriever": HelpLangChainRetriever(hybrid_retriever),
         "retrieval_system": retrieval_system,  # Full retrieval system with all variants
+        "answer_cache": answer_cache,
         "config": retriever_config
     }
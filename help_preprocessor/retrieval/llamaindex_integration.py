@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any
+import itertools
+import json
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from pathlib import Path
 
 from .base import QueryContext
 from .hybrid_retriever import HybridRetriever
+from .streaming import TokenStream
+
+
+def _source_nodes(response: Any) -> List[Dict[str, Any]]:
+    return [
+        {
+            "content": node_with_score.node.text,
+            "score": node_with_score.score,
+            "metadata": node_with_score.node.metadata,
+        }
+        for node_with_score in getattr(response, "source_nodes", None) or []
+    ]
 
 
 class HelpLlamaIndexRetriever:
@@ -71,8 +86,9 @@ class HelpQueryEngine:
         self.similarity_top_k = similarity_top_k
         self.response_mode = response_mode
         self._query_engine = None
+        self._streaming_query_engine = None
         
-    def _build_query_engine(self):
+    def _build_query_engine(self, streaming: bool = False):
         """Build LlamaIndex query engine."""
         try:
             from llama_index import ServiceContext
@@ -107,16 +123,15 @@ class HelpQueryEngine:
         response_synthesizer = get_response_synthesizer(
             service_context=service_context,
             response_mode=self.response_mode,
-            text_qa_template=help_qa_prompt
+            text_qa_template=help_qa_prompt,
+            streaming=streaming
         )
         
         # Build query engine
-        self._query_engine = RetrieverQueryEngine(
+        return RetrieverQueryEngine(
             retriever=retriever,
             response_synthesizer=response_synthesizer
         )
-        
-        return self._query_engine
     
     def query(self, query_str: str, **kwargs) -> Dict[str, Any]:
         """Execute query using LlamaIndex."""
@@ -141,6 +156,22 @@ class HelpQueryEngine:
             "source_nodes": source_nodes,
             "retrieval_method": "llamaindex_query_engine"
         }
+
+    def stream_query(self, query_str: str, **kwargs) -> TokenStream:
+        """Execute query, streaming the answer tokens as they are generated."""
+        if self._streaming_query_engine is None:
+            self._streaming_query_engine = self._build_query_engine(streaming=True)
+
+        started = time.perf_counter()
+        response = self._streaming_query_engine.query(query_str)
+        return TokenStream(
+            response.response_gen,
+            started=started,
+            extra={
+                "source_nodes": _source_nodes(response),
+                "retrieval_method": "llamaindex_query_engine_stream",
+            },
+        )
     
     async def aquery(self, query_str: str, **kwargs) -> Dict[str, Any]:
         """Async version of query."""
@@ -243,6 +274,22 @@ class HelpChatEngine:
             "source_nodes": source_nodes,
             "retrieval_method": "llamaindex_chat_engine"
         }
+
+    def stream_chat(self, message: str, **kwargs) -> TokenStream:
+        """Execute chat, streaming the answer tokens as they are generated."""
+        if self._chat_engine is None:
+            self._chat_engine = self._build_chat_engine()
+
+        started = time.perf_counter()
+        response = self._chat_engine.stream_chat(message)
+        return TokenStream(
+            response.response_gen,
+            started=started,
+            extra={
+                "source_nodes": _source_nodes(response),
+                "retrieval_method": "llamaindex_chat_engine_stream",
+            },
+        )
     
     async def achat(self, message: str, **kwargs) -> Dict[str, Any]:
         """Async version of chat."""
@@ -275,59 +322,173 @@ class HelpChatEngine:
 
 
 class HelpIndexBuilder:
-    """Build LlamaIndex index from help documents."""
-    
-    def __init__(self, documents_path: Path):
-        self.documents_path = documents_path
-        
-    def build_vector_store_index(self, persist_dir: Optional[Path] = None):
+    """Build a LlamaIndex vector index from help documents, batch by batch.
+
+    Documents are streamed from ``documents.jsonl`` (one dict per line, as
+    written by ``sparse_store.write_documents``), so memory stays bounded by
+    ``batch_size``. With a ``persist_dir`` the index lives in a persistent
+    Chroma collection and a checkpoint records how many documents were
+    inserted, so an interrupted build resumes after the last completed batch.
+    Node ids are derived from document ids, which keeps a replayed batch from
+    creating duplicates.
+    """
+
+    CHECKPOINT_FILE = "ingest_checkpoint.json"
+
+    def __init__(
+        self,
+        documents_path: Path,
+        *,
+        batch_size: int = 256,
+        embed_model: Optional[str] = None,
+        collection_name: str = "help_documents",
+    ):
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.documents_path = Path(documents_path)
+        self.batch_size = batch_size
+        self.embed_model = embed_model
+        self.collection_name = collection_name
+
+    def iter_documents(self, start: int = 0) -> Iterator[Dict[str, Any]]:
+        """Yield document dicts from ``start`` on, one line at a time."""
+        if self.documents_path.suffix == ".pkl":
+            import logging
+            import pickle
+
+            logging.warning(
+                "Loading legacy pickled documents from %s into memory; "
+                "convert them with sparse_store.convert_pickle_index to stream documents.jsonl",
+                self.documents_path,
+            )
+            with open(self.documents_path, "rb") as f:
+                yield from pickle.load(f)[start:]
+            return
+
+        with open(self.documents_path, "r", encoding="utf-8") as f:
+            for line in itertools.islice(f, start, None):
+                if line.strip():
+                    yield json.loads(line)
+
+    def iter_batches(self, start: int = 0) -> Iterator[List[Dict[str, Any]]]:
+        documents = self.iter_documents(start)
+        while True:
+            batch = list(itertools.islice(documents, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def _source_signature(self) -> Dict[str, Any]:
+        stat = self.documents_path.stat()
+        return {"path": str(self.documents_path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def load_checkpoint(self, checkpoint_path: Path) -> int:
+        """Return the number of documents already inserted, or 0 if the source changed."""
+        if not checkpoint_path.exists():
+            return 0
+        checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        if checkpoint.get("source") != self._source_signature():
+            return 0
+        return int(checkpoint.get("inserted", 0))
+
+    def _save_checkpoint(self, checkpoint_path: Path, inserted: int) -> None:
+        tmp = checkpoint_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"source": self._source_signature(), "inserted": inserted}),
+            encoding="utf-8",
+        )
+        tmp.replace(checkpoint_path)
+
+    def ingest(
+        self,
+        insert_batch: Callable[[List[Dict[str, Any]]], None],
+        *,
+        checkpoint_path: Optional[Path] = None,
+        resume: bool = True,
+    ) -> Dict[str, Any]:
+        """Feed document batches to ``insert_batch``, checkpointing after each one."""
+        start = self.load_checkpoint(checkpoint_path) if checkpoint_path and resume else 0
+        inserted = start
+        batches = 0
+        started = time.perf_counter()
+        for batch in self.iter_batches(start):
+            insert_batch(batch)
+            inserted += len(batch)
+            batches += 1
+            if checkpoint_path:
+                self._save_checkpoint(checkpoint_path, inserted)
+        return {
+            "resumed_from": start,
+            "inserted": inserted - start,
+            "total": inserted,
+            "batches": batches,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def build_vector_store_index(self, persist_dir: Optional[Path] = None, *, resume: bool = True):
         """Build vector store index from documents."""
         try:
-            from llama_index import VectorStoreIndex, Document, ServiceContext, StorageContext
-            from llama_index.vector_stores import ChromaVectorStore
-            import chromadb
+            from llama_index.core import Document, Settings, StorageContext, VectorStoreIndex
         except ImportError as exc:
-            raise ImportError("LlamaIndex and ChromaDB packages required") from exc
-            
-        # Load documents
-        import pickle
-        with open(self.documents_path, 'rb') as f:
-            raw_documents = pickle.load(f)
-            
-        # Convert to LlamaIndex documents
-        documents = []
-        for doc in raw_documents:
-            llama_doc = Document(
-                text=doc.get('content', ''),
-                doc_id=doc.get('id'),
-                metadata=doc.get('metadata', {})
-            )
-            documents.append(llama_doc)
-            
-        # Create service context
-        service_context = ServiceContext.from_defaults()
-        
-        # Create vector store
+            raise ImportError("LlamaIndex package required. Install with: pip install llama-index") from exc
+
+        if self.embed_model:
+            try:
+                from llama_index.embeddings.openai import OpenAIEmbedding
+            except ImportError as exc:
+                raise ImportError(
+                    "LlamaIndex OpenAI embeddings required. Install with: pip install llama-index-embeddings-openai"
+                ) from exc
+            Settings.embed_model = OpenAIEmbedding(model=self.embed_model)
+
+        checkpoint_path = None
         if persist_dir:
+            try:
+                from llama_index.vector_stores.chroma import ChromaVectorStore
+                import chromadb
+            except ImportError as exc:
+                raise ImportError(
+                    "LlamaIndex Chroma vector store required. Install with: pip install llama-index-vector-stores-chroma chromadb"
+                ) from exc
+
             persist_dir.mkdir(parents=True, exist_ok=True)
             chroma_client = chromadb.PersistentClient(path=str(persist_dir))
-            chroma_collection = chroma_client.get_or_create_collection("help_documents")
+            chroma_collection = chroma_client.get_or_create_collection(self.collection_name)
             vector_store = ChromaVectorStore(chroma_collection=chroma_collection)
-            storage_context = StorageContext.from_defaults(vector_store=vector_store)
+            index = VectorStoreIndex.from_vector_store(vector_store)
+            checkpoint_path = persist_dir / self.CHECKPOINT_FILE
         else:
-            storage_context = StorageContext.from_defaults()
-            
-        # Build index
-        index = VectorStoreIndex.from_documents(
-            documents,
-            service_context=service_context,
-            storage_context=storage_context
+            index = VectorStoreIndex(nodes=[], storage_context=StorageContext.from_defaults())
+
+        node_parser = Settings.node_parser
+
+        def _insert(batch: List[Dict[str, Any]]) -> None:
+            documents = [
+                Document(
+                    text=doc.get("content", ""),
+                    id_=str(doc.get("id")),
+                    metadata=doc.get("metadata", {}),
+                )
+                for doc in batch
+            ]
+            nodes = node_parser.get_nodes_from_documents(documents)
+            chunk_numbers: Dict[str, int] = {}
+            for node in nodes:
+                ref_id = node.ref_doc_id or node.node_id
+                chunk_numbers[ref_id] = chunk_numbers.get(ref_id, -1) + 1
+                node.id_ = f"{ref_id}:{chunk_numbers[ref_id]}"
+            index.insert_nodes(nodes)
+
+        stats = self.ingest(_insert, checkpoint_path=checkpoint_path, resume=resume)
+        import logging
+
+        logging.info(
+            "Inserted %s documents in %s batches (resumed from %s, %.1fs)",
+            stats["inserted"],
+            stats["batches"],
+            stats["resumed_from"],
+            stats["seconds"],
         )
-        
-        # Persist if directory provided
-        if persist_dir:
-            index.storage_context.persist(persist_dir=str(persist_dir))
-            
         return index
 
 
@@ -369,9 +530,17 @@ def create_help_llamaindex_system(
     # Create index builder if documents path provided
     index_builder = None
     data_dir = Path(config_dict.get("data_dir", "data"))
-    documents_path = data_dir / "sparse_index" / "documents.pkl"
-    if documents_path.exists():
-        index_builder = HelpIndexBuilder(documents_path)
+    for documents_path in (
+        data_dir / "sparse_index" / "documents.jsonl",
+        data_dir / "sparse_index" / "documents.pkl",
+    ):
+        if documents_path.exists():
+            index_builder = HelpIndexBuilder(
+                documents_path,
+                batch_size=config_dict.get("index_batch_size", 256),
+                embed_model=config_dict.get("embedding_model", "text-embedding-3-small"),
+            )
+            break
     
     return {
         "hybrid_retriever": hybrid_retriever,
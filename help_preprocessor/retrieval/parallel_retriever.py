@@ -4,12 +4,15 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Iterator, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Iterator, Optional, Union
 import hashlib
 
-from .base import BaseRetriever, QueryContext, SearchResult
+from .base import BaseResultFusion, BaseRetriever, QueryContext, SearchResult
 
 
 class ParallelRetriever(BaseRetriever):
@@ -92,60 +95,122 @@ class ParallelRetriever(BaseRetriever):
 
 
 class AsyncRetriever(BaseRetriever):
-    """Async-based parallel retriever for better resource utilization."""
+    """Async-based parallel retriever for better resource utilization.
+
+    ``async_search`` is a coroutine meant to be awaited from a running event
+    loop. Each backend gets its own concurrency limit (``max_concurrency`` as
+    an int for all, or a per-name dict) and every call is bounded by
+    ``timeout_seconds``. Cancelling the caller cancels all pending backend
+    calls; blocking backends running in worker threads are abandoned rather
+    than interrupted. Their concurrency slot is held by the worker thread
+    itself, so an abandoned call keeps its slot until it actually returns
+    and calls still queued for a slot are skipped.
+    """
 
-    def __init__(self, retrievers: Dict[str, BaseRetriever]):
+    def __init__(
+        self,
+        retrievers: Dict[str, BaseRetriever],
+        max_concurrency: Union[int, Dict[str, int]] = 4,
+        timeout_seconds: Optional[float] = 30.0,
+    ):
         self.retrievers = retrievers
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
         self._logger = logging.getLogger(__name__)
+        # Semaphores are bound to an event loop, so keep one set per loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Slots for blocking backends are taken inside their worker threads
+        self._thread_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._thread_slots_lock = threading.Lock()
 
     def search(self, context: QueryContext) -> List[SearchResult]:
-        """Execute async search and return results."""
-        return asyncio.run(self.async_search(context))
-
-    async def async_search(self, context: QueryContext) -> List[SearchResult]:
-        """Execute search across all retrievers asynchronously."""
-        if not self.retrievers:
-            return []
-
-        start_time = time.time()
-
-        # Create async tasks
-        tasks = [
-            self._async_search_wrapper(name, retriever, context)
-            for name, retriever in self.retrievers.items()
-        ]
-
-        # Execute all tasks concurrently
-        results_list = await asyncio.gather(*tasks, return_exceptions=True)
+        """Execute async search and return results (no running loop only)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.async_search(context))
+        raise RuntimeError(
+            "AsyncRetriever.search() cannot be called from a running event loop; "
+            "use 'await async_search(context)' instead"
+        )
 
-        # Collect successful results
-        all_results: List[SearchResult] = []
-        successful_retrievers = 0
+    async def asearch(self, context: QueryContext) -> List[SearchResult]:
+        return await self.async_search(context)
 
-        for i, result in enumerate(results_list):
-            retriever_name = list(self.retrievers.keys())[i]
+    def _limit(self, name: str) -> int:
+        limit = (
+            self.max_concurrency.get(name, 4)
+            if isinstance(self.max_concurrency, dict)
+            else self.max_concurrency
+        )
+        return max(1, limit)
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if name not in semaphores:
+            semaphores[name] = asyncio.Semaphore(self._limit(name))
+        return semaphores[name]
+
+    def _thread_slot(self, name: str) -> threading.BoundedSemaphore:
+        with self._thread_slots_lock:
+            if name not in self._thread_slots:
+                self._thread_slots[name] = threading.BoundedSemaphore(self._limit(name))
+            return self._thread_slots[name]
+
+    async def search_by_source(
+        self, context: QueryContext, names: Optional[Iterable[str]] = None
+    ) -> Dict[str, List[SearchResult]]:
+        """Run the selected retrievers concurrently and group results by retriever name."""
+        selected = [name for name in (names or self.retrievers) if name in self.retrievers]
+        if not selected:
+            return {}
+
+        results_list = await asyncio.gather(
+            *(self._async_search_wrapper(name, self.retrievers[name], context) for name in selected),
+            return_exceptions=True,
+        )
 
-            if isinstance(result, Exception):
+        results_by_source: Dict[str, List[SearchResult]] = {}
+        for retriever_name, result in zip(selected, results_list):
+            if isinstance(result, asyncio.CancelledError):
+                raise result
+            if isinstance(result, BaseException):
                 self._logger.warning(
                     "Async search failed for %s: %s",
                     retriever_name,
                     result,
                 )
-            elif isinstance(result, list):
-                all_results.extend(result)
-                successful_retrievers += 1
+            elif result:
+                results_by_source[retriever_name] = result
                 self._logger.debug(
                     "Async search completed for %s: %d results",
                     retriever_name,
                     len(result),
                 )
+        return results_by_source
+
+    async def async_search(self, context: QueryContext) -> List[SearchResult]:
+        """Execute search across all retrievers asynchronously."""
+        if not self.retrievers:
+            return []
+
+        start_time = time.time()
+        results_by_source = await self.search_by_source(context)
+
+        # Collect successful results
+        all_results: List[SearchResult] = []
+        for results in results_by_source.values():
+            all_results.extend(results)
 
         execution_time = time.time() - start_time
         self._logger.info(
             "Async search completed in %.2fs: %d results from %d/%d retrievers",
             execution_time,
             len(all_results),
-            successful_retrievers,
+            len(results_by_source),
             len(self.retrievers),
         )
 
@@ -154,32 +219,88 @@ class AsyncRetriever(BaseRetriever):
     async def _async_search_wrapper(
         self, name: str, retriever: BaseRetriever, context: QueryContext
     ) -> List[SearchResult]:
-        """Async wrapper for synchronous retriever search."""
-        loop = asyncio.get_event_loop()
+        """Run one backend under its concurrency limit and timeout."""
+        if type(retriever).asearch is BaseRetriever.asearch:
+            return await self._threaded_search(name, retriever, context)
+        async with self._semaphore(name):
+            try:
+                return await asyncio.wait_for(retriever.asearch(context), self.timeout_seconds)
+            except asyncio.TimeoutError:
+                self._logger.warning(
+                    "Async search timed out for %s after %.1fs", name, self.timeout_seconds
+                )
+                return []
+
+    async def _threaded_search(
+        self, name: str, retriever: BaseRetriever, context: QueryContext
+    ) -> List[SearchResult]:
+        """Run a blocking backend in a worker thread that holds the slot until it returns.
+
+        Cancelling the awaiting coroutine cannot stop the thread, so releasing
+        an event-loop semaphore on timeout would let more threads pile up on a
+        backend that is already stuck.
+        """
+        slot = self._thread_slot(name)
+        abandoned = threading.Event()
+        deadline = None if self.timeout_seconds is None else time.monotonic() + self.timeout_seconds
+
+        def _run() -> List[SearchResult]:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not slot.acquire(timeout=wait):
+                return []
+            try:
+                if abandoned.is_set():
+                    return []
+                return retriever.search(context)
+            finally:
+                slot.release()
 
         try:
-            # Execute in thread pool to avoid blocking
-            return await loop.run_in_executor(None, retriever.search, context)
-        except Exception as exc:
-            self._logger.warning("Async search wrapper failed for %s: %s", name, exc)
+            return await asyncio.wait_for(asyncio.to_thread(_run), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            self._logger.warning(
+                "Async search timed out for %s after %.1fs", name, self.timeout_seconds
+            )
             return []
+        finally:
+            abandoned.set()
 
     def get_name(self) -> str:
         return f"async_retriever({len(self.retrievers)})"
 
 
+@dataclass
+class RankingUpdate:
+    """Fused ranking snapshot emitted by ``StreamingRetriever.stream_rankings``."""
+
+    results: List[SearchResult]
+    completed: List[str]
+    pending: List[str]
+    is_final: bool
+    elapsed_ms: float
+
+
 class StreamingRetriever(BaseRetriever):
-    """Memory-efficient streaming retriever."""
+    """Streaming retriever that yields results as each backend finishes.
+
+    All backends run concurrently; ``stream_search`` yields raw results in
+    completion order and ``stream_rankings`` yields a provisional fused
+    ranking after every backend, ending with one marked ``is_final``.
+    """
 
     def __init__(
         self,
         retrievers: Dict[str, BaseRetriever],
         batch_size: int = 5,
         max_total_results: int = 100,
+        max_workers: Optional[int] = None,
+        timeout_seconds: Optional[float] = 30.0,
     ):
         self.retrievers = retrievers
         self.batch_size = batch_size
         self.max_total_results = max_total_results
+        self.max_workers = max_workers or max(1, len(retrievers))
+        self.timeout_seconds = timeout_seconds
         self._logger = logging.getLogger(__name__)
 
     def search(self, context: QueryContext) -> List[SearchResult]:
@@ -187,45 +308,95 @@ class StreamingRetriever(BaseRetriever):
         results = list(self.stream_search(context))
         return results[: self.max_total_results]
 
+    def _iter_completed(self, context: QueryContext) -> Iterator[tuple[str, List[SearchResult]]]:
+        """Yield (name, results) per backend in completion order."""
+        if not self.retrievers:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(self.retrievers)))
+        try:
+            futures = {
+                executor.submit(retriever.search, context): name
+                for name, retriever in self.retrievers.items()
+            }
+            try:
+                for future in as_completed(futures, timeout=self.timeout_seconds):
+                    name = futures[future]
+                    try:
+                        yield name, future.result()
+                    except Exception as exc:
+                        self._logger.warning("Streaming search failed for %s: %s", name, exc)
+                        yield name, []
+            except FuturesTimeoutError:
+                pending = [name for future, name in futures.items() if not future.done()]
+                self._logger.warning("Streaming search timed out waiting for: %s", pending)
+        finally:
+            # Do not wait for slow backends when the consumer stops early
+            executor.shutdown(wait=False, cancel_futures=True)
+
     def stream_search(self, context: QueryContext) -> Iterator[SearchResult]:
-        """Stream search results to minimize memory usage."""
+        """Stream search results as soon as each backend returns."""
         total_results = 0
 
-        for name, retriever in self.retrievers.items():
+        for name, retriever_results in self._iter_completed(context):
             if total_results >= self.max_total_results:
                 break
 
-            try:
-                # Get results from retriever
-                retriever_results = retriever.search(context)
-
-                # Stream results in batches
-                for i in range(0, len(retriever_results), self.batch_size):
+            yielded = 0
+            for i in range(0, len(retriever_results), self.batch_size):
+                batch = retriever_results[i: i + self.batch_size]
+                for result in batch:
                     if total_results >= self.max_total_results:
                         break
+                    yield result
+                    total_results += 1
+                    yielded += 1
 
-                    batch = retriever_results[i: i + self.batch_size]
-                    for result in batch:
-                        if total_results >= self.max_total_results:
-                            break
-                        yield result
-                        total_results += 1
+            self._logger.debug(
+                "Streaming search completed for %s: %d results yielded",
+                name,
+                yielded,
+            )
 
-                yielded = min(
-                    len(retriever_results),
-                    self.max_total_results - (total_results - len(batch)),
-                )
-                self._logger.debug(
-                    "Streaming search completed for %s: %d results yielded",
-                    name,
-                    yielded,
-                )
+        self._logger.info("Streaming search completed: %d total results", total_results)
+
+    def stream_rankings(
+        self,
+        context: QueryContext,
+        fusion: Optional[BaseResultFusion] = None,
+    ) -> Iterator[RankingUpdate]:
+        """Yield a provisional fused top-k after each backend, then a final one."""
+        if fusion is None:
+            from .fusion import ReciprocalRankFusion
 
-            except Exception as exc:
-                self._logger.warning("Streaming search failed for %s: %s", name, exc)
-                continue
+            fusion = ReciprocalRankFusion()
 
-        self._logger.info("Streaming search completed: %d total results", total_results)
+        start_time = time.perf_counter()
+        results_by_source: Dict[str, List[SearchResult]] = {}
+        completed: List[str] = []
+        ranking: List[SearchResult] = []
+
+        for name, retriever_results in self._iter_completed(context):
+            completed.append(name)
+            for result in retriever_results:
+                results_by_source.setdefault(result.source, []).append(result)
+            ranking = fusion.fuse_results(results_by_source, context) if results_by_source else []
+            pending = [n for n in self.retrievers if n not in completed]
+            if pending:
+                yield RankingUpdate(
+                    results=ranking,
+                    completed=list(completed),
+                    pending=pending,
+                    is_final=False,
+                    elapsed_ms=(time.perf_counter() - start_time) * 1000.0,
+                )
+
+        yield RankingUpdate(
+            results=ranking,
+            completed=list(completed),
+            pending=[n for n in self.retrievers if n not in completed],
+            is_final=True,
+            elapsed_ms=(time.perf_counter() - start_time) * 1000.0,
+        )
 
     def get_name(self) -> str:
         return f"streaming_retriever({len(self.retrievers)})"
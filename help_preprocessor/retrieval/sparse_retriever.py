@@ -8,32 +8,69 @@ from collections import Counter
 from pathlib import Path
 from typing import List, Optional
 
+import json
+import logging
+
 import joblib
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+
+from search_common.sparse_store import SparseIndex, file_signature, load_csr, save_csr, top_k_indices
 
 from .base import BaseRetriever, QueryContext, SearchResult
 
+logger = logging.getLogger(__name__)
+
 
 class SparseVectorRetriever(BaseRetriever):
-    """TF-IDF based sparse vector retrieval."""
+    """TF-IDF based sparse vector retrieval.
+
+    Document vectors are L2-normalized once and cached next to the vectorizer
+    (``<vectorizer stem>.matrix/``) as memory-mapped CSR arrays, so a cold
+    load does not re-transform the corpus and cosine similarity reduces to a
+    sparse dot product. The cache is stored term-major (terms x documents),
+    so scoring a query only touches the postings of its own terms.
+
+    Pass ``index_dir`` to read a pickle-free index written by
+    :func:`~search_common.sparse_store.write_sparse_index`
+    instead of the joblib/pickle pair.
+    """
     
+    MATRIX_NAME = "term_doc"
+
     def __init__(
         self, 
-        vectorizer_path: Path,
-        documents_path: Path,
-        index_name: str = "tfidf"
+        vectorizer_path: Optional[Path] = None,
+        documents_path: Optional[Path] = None,
+        index_name: str = "tfidf",
+        matrix_dir: Optional[Path] = None,
+        index_dir: Optional[Path] = None,
     ):
+        if index_dir is None and (vectorizer_path is None or documents_path is None):
+            raise ValueError("Either index_dir or vectorizer_path and documents_path is required")
         self.vectorizer_path = vectorizer_path
         self.documents_path = documents_path
         self.index_name = index_name
+        self.index_dir = index_dir
+        self.matrix_dir = matrix_dir or (
+            Path(vectorizer_path).with_suffix(".matrix") if vectorizer_path else None
+        )
         self._vectorizer: Optional[TfidfVectorizer] = None
         self._documents: Optional[List[dict]] = None
-        self._doc_vectors: Optional[np.ndarray] = None
+        self._term_doc: Optional[sparse.csr_matrix] = None
         
     def _load_index(self) -> None:
         """Load TF-IDF vectorizer and documents."""
+        if self.index_dir is not None:
+            if self._documents is None:
+                index = SparseIndex.load(self.index_dir)
+                self._vectorizer = index.vectorizer
+                self._term_doc = index.tfidf_term_doc
+                self._documents = index.documents
+            return
+
         if self._vectorizer is None:
             self._vectorizer = joblib.load(self.vectorizer_path)
             
@@ -41,10 +78,32 @@ class SparseVectorRetriever(BaseRetriever):
             with open(self.documents_path, 'rb') as f:
                 self._documents = pickle.load(f)
                 
-        if self._doc_vectors is None:
-            # Pre-compute document vectors for efficiency
-            doc_texts = [doc.get('content', '') for doc in self._documents]
-            self._doc_vectors = self._vectorizer.transform(doc_texts)
+        if self._term_doc is None:
+            self._term_doc = self._load_term_doc_matrix()
+
+    def _load_term_doc_matrix(self) -> sparse.csr_matrix:
+        """Load cached normalized term x document matrix, rebuilding it if stale."""
+        signature = file_signature(Path(self.vectorizer_path), Path(self.documents_path))
+        meta_path = self.matrix_dir / f"{self.MATRIX_NAME}.meta.json"
+        if meta_path.exists():
+            try:
+                if json.loads(meta_path.read_text(encoding="utf-8")) == signature:
+                    cached = load_csr(self.matrix_dir, self.MATRIX_NAME)
+                    if cached is not None and cached.shape[1] == len(self._documents):
+                        return cached
+            except (OSError, ValueError) as exc:
+                logger.warning("Ignoring unreadable TF-IDF matrix cache: %s", exc)
+
+        doc_texts = [doc.get('content', '') for doc in self._documents]
+        doc_vectors = normalize(self._vectorizer.transform(doc_texts), norm="l2", copy=False)
+        term_doc = sparse.csr_matrix(doc_vectors.T, dtype=np.float32)
+        try:
+            save_csr(self.matrix_dir, self.MATRIX_NAME, term_doc)
+            meta_path.write_text(json.dumps(signature), encoding="utf-8")
+            return load_csr(self.matrix_dir, self.MATRIX_NAME)
+        except OSError as exc:
+            logger.warning("Could not cache TF-IDF matrix at %s: %s", self.matrix_dir, exc)
+            return term_doc
     
     def search(self, context: QueryContext) -> List[SearchResult]:
         """Search using TF-IDF sparse vectors."""
@@ -54,13 +113,15 @@ class SparseVectorRetriever(BaseRetriever):
             return []
             
         # Transform query to sparse vector
-        query_vector = self._vectorizer.transform([context.query])
+        query_vector = normalize(self._vectorizer.transform([context.query]), norm="l2")
         
-        # Compute similarities
-        similarities = cosine_similarity(query_vector, self._doc_vectors).flatten()
+        # Cosine similarity == dot product of L2-normalized vectors
+        similarities = np.asarray(
+            (query_vector @ self._term_doc).todense(), dtype=np.float32
+        ).ravel()
         
         # Get top-k results
-        top_indices = np.argsort(similarities)[::-1][:context.top_k]
+        top_indices = top_k_indices(similarities, context.top_k)
         
         results = []
         for idx in top_indices:
@@ -88,17 +149,26 @@ class SparseVectorRetriever(BaseRetriever):
 
 
 class BM25Retriever(BaseRetriever):
-    """BM25-based sparse retrieval (simplified implementation)."""
+    """BM25-based sparse retrieval (simplified implementation).
+
+    With ``index_dir`` the precomputed term-frequency matrix of a sparse index
+    is used and only the postings of the query terms are scored.
+    """
     
     def __init__(
         self,
-        documents_path: Path,
+        documents_path: Optional[Path] = None,
         k1: float = 1.2,
-        b: float = 0.75
+        b: float = 0.75,
+        index_dir: Optional[Path] = None,
     ):
+        if index_dir is None and documents_path is None:
+            raise ValueError("Either index_dir or documents_path is required")
         self.documents_path = documents_path
+        self.index_dir = index_dir
         self.k1 = k1  # Term frequency saturation parameter
         self.b = b    # Length normalization parameter
+        self._index: Optional[SparseIndex] = None
         self._documents: Optional[List[dict]] = None
         self._doc_lengths: Optional[List[int]] = None
         self._avg_doc_length: Optional[float] = None
@@ -109,6 +179,11 @@ class BM25Retriever(BaseRetriever):
         """Load and preprocess documents for BM25."""
         if self._documents is not None:
             return
+
+        if self.index_dir is not None:
+            self._index = SparseIndex.load(self.index_dir)
+            self._documents = self._index.documents
+            return
             
         with open(self.documents_path, 'rb') as f:
             self._documents = pickle.load(f)
@@ -172,18 +247,25 @@ class BM25Retriever(BaseRetriever):
         if not self._documents:
             return []
             
-        # Tokenize query
-        query_tokens = re.findall(r'\w+', context.query.lower())
-        
-        # Calculate BM25 scores for all documents
-        scores = []
-        for doc_idx in range(len(self._documents)):
-            score = self._bm25_score(query_tokens, doc_idx)
-            scores.append((doc_idx, score))
+        if self._index is not None:
+            all_scores = self._index.bm25_scores(context.query, k1=self.k1, b=self.b)
+            top_results = [
+                (int(idx), float(all_scores[idx]))
+                for idx in top_k_indices(all_scores, context.top_k)
+            ]
+        else:
+            # Tokenize query
+            query_tokens = re.findall(r'\w+', context.query.lower())
             
-        # Sort by score and get top-k
-        scores.sort(key=lambda x: x[1], reverse=True)
-        top_results = scores[:context.top_k]
+            # Calculate BM25 scores for all documents
+            scores = []
+            for doc_idx in range(len(self._documents)):
+                score = self._bm25_score(query_tokens, doc_idx)
+                scores.append((doc_idx, score))
+                
+            # Sort by score and get top-k
+            scores.sort(key=lambda x: x[1], reverse=True)
+            top_results = scores[:context.top_k]
         
         results = []
         max_score = max(score for _, score in top_results) if top_results else 1.0
@@ -0,0 +1,129 @@
+"""Token streaming helpers with time-to-first-token metrics."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+def chunk_text(chunk: Any) -> str:
+    """Extract the text of a streamed chunk (LangChain message chunk, LlamaIndex delta or str)."""
+    if chunk is None:
+        return ""
+    if isinstance(chunk, str):
+        return chunk
+    for attr in ("content", "delta", "text"):
+        value = getattr(chunk, attr, None)
+        if isinstance(value, str):
+            return value
+    return str(chunk)
+
+
+class TokenStream:
+    """Iterate over generated tokens while timing the stream.
+
+    ``ttft_ms`` is measured from ``started`` (by default, construction) to the
+    first non-empty token, so retrieval done before the LLM call counts
+    towards it. After the stream is exhausted ``text`` holds the full answer
+    and ``total_ms`` the overall time. ``extra`` carries whatever the producer
+    wants returned next to the answer (sources, retrieval method, ...);
+    ``result()`` merges it with the answer and the metrics.
+    """
+
+    def __init__(
+        self,
+        chunks: Iterable[Any],
+        *,
+        started: Optional[float] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._chunks = chunks
+        self.started = time.perf_counter() if started is None else started
+        self.extra: Dict[str, Any] = dict(extra or {})
+        self.ttft_ms: Optional[float] = None
+        self.total_ms: Optional[float] = None
+        self.token_count = 0
+        self._parts: List[str] = []
+        self._consumed = False
+
+    def __iter__(self) -> Iterator[str]:
+        if self._consumed:
+            raise RuntimeError("TokenStream can only be iterated once")
+        self._consumed = True
+        try:
+            for chunk in self._chunks:
+                token = chunk_text(chunk)
+                if not token:
+                    continue
+                if self.ttft_ms is None:
+                    self.ttft_ms = (time.perf_counter() - self.started) * 1000
+                self.token_count += 1
+                self._parts.append(token)
+                yield token
+        finally:
+            self.total_ms = (time.perf_counter() - self.started) * 1000
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts)
+
+    def consume(self, on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Drain the stream, calling ``on_token`` for each token, and return ``result()``."""
+        for token in self:
+            if on_token is not None:
+                on_token(token)
+        return self.result()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "ttft_ms": self.ttft_ms,
+            "total_ms": self.total_ms,
+            "tokens": self.token_count,
+        }
+
+    def result(self) -> Dict[str, Any]:
+        return {**self.extra, "answer": self.text, "metrics": self.metrics()}
+
+
+_DONE = object()
+
+
+def stream_from_callback(
+    run: Callable[[Callable[[str], None]], Optional[Dict[str, Any]]],
+    *,
+    started: Optional[float] = None,
+) -> TokenStream:
+    """Turn a blocking call that reports tokens through a callback into a ``TokenStream``.
+
+    ``run(on_token)`` executes in a worker thread; the dict it returns is merged
+    into ``stream.extra`` once the stream ends. Exceptions raised by ``run`` are
+    re-raised from the iterating thread.
+    """
+    tokens: "queue.Queue[Any]" = queue.Queue()
+    outcome: Dict[str, Any] = {}
+
+    def _worker() -> None:
+        try:
+            outcome["extra"] = run(tokens.put) or {}
+        except BaseException as exc:  # re-raised in the consumer
+            outcome["error"] = exc
+        finally:
+            tokens.put(_DONE)
+
+    def _drain() -> Iterator[str]:
+        while True:
+            item = tokens.get()
+            if item is _DONE:
+                break
+            yield item
+        thread.join()
+        if "error" in outcome:
+            raise outcome["error"]
+        stream.extra.update(outcome.get("extra", {}))
+
+    stream = TokenStream(_drain(), started=started)
+    thread = threading.Thread(target=_worker, name="token-stream", daemon=True)
+    thread.start()
+    return stream
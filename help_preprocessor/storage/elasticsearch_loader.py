@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+"""Elasticsearch bulk loader for EVOSHIP help chunks."""
+
+import logging
+import time
+from typing import Any, Iterable, Mapping
+
+DEFAULT_INDEX_BODY: dict[str, Any] = {
+    "mappings": {
+        "properties": {
+            "content": {"type": "text"},
+            "title": {"type": "text"},
+            "section_id": {"type": "keyword"},
+            "anchors": {"type": "keyword"},
+        }
+    }
+}
+
+
+class HelpElasticsearchLoader:
+    """Write help chunks to an Elasticsearch index through batched ``_bulk`` requests.
+
+    Each chunk (``{"id", "text", "metadata"}`` as produced by the vector
+    generator) becomes one document whose ``content`` field holds the text and
+    whose metadata keys are stored as top-level fields. Intermediate batches
+    are sent with ``refresh=False``; only the last batch uses ``refresh`` so
+    the index is refreshed once per load instead of once per batch.
+    """
+
+    def __init__(
+        self,
+        index_name: str,
+        url: str | None = None,
+        *,
+        client=None,
+        batch_size: int = 500,
+        refresh: bool | str = "wait_for",
+        index_body: Mapping | None = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.index_name = index_name
+        self.url = url
+        self.batch_size = batch_size
+        self.refresh = refresh
+        self._index_body = dict(index_body or DEFAULT_INDEX_BODY)
+        self._client = client or self._create_client(url)
+
+    def _create_client(self, url: str | None):  # pragma: no cover
+        try:
+            from elasticsearch import Elasticsearch
+        except ImportError as exc:
+            raise ImportError("Elasticsearch package required. Install with: pip install elasticsearch") from exc
+        return Elasticsearch(url or "http://localhost:9200")
+
+    def ensure_index(self) -> None:
+        if not self._client.indices.exists(index=self.index_name):
+            self._client.indices.create(index=self.index_name, body=self._index_body)
+
+    @staticmethod
+    def _to_document(chunk: Mapping) -> tuple[str, dict]:
+        metadata = dict(chunk.get("metadata", {}))
+        document = {key: value for key, value in metadata.items() if value is not None}
+        document["content"] = chunk.get("text", "")
+        return str(chunk["id"]), document
+
+    def _send(self, operations: list[dict], refresh: bool | str) -> int:
+        response = self._client.bulk(body=operations, refresh=refresh)
+        if not response.get("errors"):
+            return 0
+        failed = [item for item in response.get("items", []) if next(iter(item.values())).get("error")]
+        for item in failed[:5]:
+            logging.warning("Elasticsearch bulk item failed: %s", item)
+        return len(failed)
+
+    def upsert(self, chunks: Iterable[Mapping]) -> dict[str, float]:
+        """Index ``chunks`` and return throughput statistics."""
+
+        self.ensure_index()
+        started = time.perf_counter()
+        indexed = errors = batches = 0
+        operations: list[dict] = []
+        pending: list[dict] | None = None
+
+        for chunk in chunks:
+            doc_id, document = self._to_document(chunk)
+            operations.append({"index": {"_index": self.index_name, "_id": doc_id}})
+            operations.append(document)
+            indexed += 1
+            if len(operations) >= 2 * self.batch_size:
+                # Hold back one full batch so the final request can carry the refresh.
+                if pending is not None:
+                    errors += self._send(pending, refresh=False)
+                    batches += 1
+                pending, operations = operations, []
+
+        if pending is not None and operations:
+            errors += self._send(pending, refresh=False)
+            batches += 1
+            pending = None
+        final = operations or pending
+        if final:
+            errors += self._send(final, refresh=self.refresh)
+            batches += 1
+
+        elapsed = time.perf_counter() - started
+        stats = {
+            "documents": indexed,
+            "errors": errors,
+            "batches": batches,
+            "seconds": elapsed,
+            "docs_per_second": indexed / elapsed if elapsed > 0 else 0.0,
+        }
+        logging.info(
+            "Indexed %s documents into %s in %s bulk requests (%.0f docs/s, %s errors)",
+            indexed,
+            self.index_name,
+            batches,
+            stats["docs_per_second"],
+            errors,
+        )
+        return stats
+
+    def refresh_index(self) -> None:
+        self._client.indices.refresh(index=self.index_name)
+
+    def purge(self) -> None:
+        self._client.indices.delete(index=self.index_name, ignore_unavailable=True)
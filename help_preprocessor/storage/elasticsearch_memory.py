@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+"""In-process Elasticsearch test double for offline indexing and search."""
+
+import copy
+import json
+import re
+from typing import Any, Mapping
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _tokens(value: Any) -> list[str]:
+    return _TOKEN_RE.findall(str(value).lower()) if value is not None else []
+
+
+def _edit_distance(left: str, right: str, limit: int) -> int:
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous = list(range(len(right) + 1))
+    for i, lch in enumerate(left, 1):
+        current = [i]
+        for j, rch in enumerate(right, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (lch != rch)))
+        previous = current
+    return previous[-1]
+
+
+def _max_edits(fuzziness: Any, term: str) -> int:
+    if fuzziness in (None, 0, "0"):
+        return 0
+    if str(fuzziness).upper().startswith("AUTO"):
+        return 0 if len(term) <= 2 else 1 if len(term) <= 5 else 2
+    return int(fuzziness)
+
+
+class _Indices:
+    """Subset of ``client.indices`` used by the help loaders."""
+
+    def __init__(self, client: "InMemoryElasticsearch") -> None:
+        self._client = client
+
+    def exists(self, index: str, **_: Any) -> bool:
+        return index in self._client._indices
+
+    def create(self, index: str, body: Mapping | None = None, **kwargs: Any) -> dict:
+        if index in self._client._indices:
+            raise ValueError(f"resource_already_exists_exception: {index}")
+        self._client._indices[index] = {"pending": {}, "visible": {}, "settings": dict(body or kwargs)}
+        return {"acknowledged": True, "index": index}
+
+    def delete(self, index: str, ignore_unavailable: bool = False, **_: Any) -> dict:
+        if index not in self._client._indices and not ignore_unavailable:
+            raise KeyError(f"index_not_found_exception: {index}")
+        self._client._indices.pop(index, None)
+        return {"acknowledged": True}
+
+    def refresh(self, index: str | None = None, **_: Any) -> dict:
+        names = [index] if index else list(self._client._indices)
+        for name in names:
+            self._client._refresh(name)
+        return {"_shards": {"failed": 0}}
+
+
+class InMemoryElasticsearch:
+    """Tiny Elasticsearch stand-in supporting bulk, search, msearch and count.
+
+    Documents become searchable only after a refresh (``refresh=True`` /
+    ``"wait_for"`` on ``bulk`` or ``indices.refresh``), like a real cluster.
+    Queries support ``match_all``, ``multi_match`` (field boosts, best_fields,
+    fuzziness) and ``bool`` with ``must`` and ``term``/``terms`` filters.
+    """
+
+    def __init__(self) -> None:
+        self._indices: dict[str, dict[str, Any]] = {}
+        self.indices = _Indices(self)
+        self.requests: list[tuple[str, Any]] = []
+
+    def ping(self, **_: Any) -> bool:
+        return True
+
+    def _index(self, name: str) -> dict[str, Any]:
+        if name not in self._indices:
+            self.indices.create(index=name)
+        return self._indices[name]
+
+    def _refresh(self, name: str) -> None:
+        state = self._indices.get(name)
+        if state is not None:
+            state["visible"] = copy.deepcopy(state["pending"])
+
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _lines(payload: Any) -> list[dict]:
+        if isinstance(payload, (str, bytes)):
+            text = payload.decode("utf-8") if isinstance(payload, bytes) else payload
+            return [json.loads(line) for line in text.splitlines() if line.strip()]
+        return list(payload)
+
+    def bulk(
+        self,
+        body: Any = None,
+        operations: Any = None,
+        index: str | None = None,
+        refresh: Any = None,
+        **_: Any,
+    ) -> dict:
+        lines = self._lines(operations if operations is not None else body)
+        self.requests.append(("bulk", len(lines)))
+        items: list[dict] = []
+        touched: set[str] = set()
+        position = 0
+        while position < len(lines):
+            action_line = lines[position]
+            action, meta = next(iter(action_line.items()))
+            name = meta.get("_index", index)
+            doc_id = str(meta.get("_id"))
+            state = self._index(name)
+            touched.add(name)
+            if action == "delete":
+                found = state["pending"].pop(doc_id, None) is not None
+                items.append({action: {"_index": name, "_id": doc_id, "status": 200 if found else 404}})
+                position += 1
+                continue
+            source = lines[position + 1]
+            position += 2
+            if action == "update":
+                current = state["pending"].get(doc_id)
+                if current is None and "doc_as_upsert" not in source:
+                    items.append({action: {"_index": name, "_id": doc_id, "status": 404, "error": "document_missing"}})
+                    continue
+                state["pending"][doc_id] = {**(current or {}), **source.get("doc", {})}
+                items.append({action: {"_index": name, "_id": doc_id, "status": 200}})
+            elif action == "create" and doc_id in state["pending"]:
+                items.append({action: {"_index": name, "_id": doc_id, "status": 409, "error": "version_conflict"}})
+            else:
+                created = doc_id not in state["pending"]
+                state["pending"][doc_id] = dict(source)
+                items.append({action: {"_index": name, "_id": doc_id, "status": 201 if created else 200}})
+        if refresh not in (None, False, "false"):
+            for name in touched:
+                self._refresh(name)
+        return {
+            "took": 0,
+            "errors": any(next(iter(item.values())).get("error") for item in items),
+            "items": items,
+        }
+
+    def count(self, index: str, **_: Any) -> dict:
+        return {"count": len(self._indices.get(index, {}).get("visible", {}))}
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def _score(self, query: Mapping, source: Mapping) -> float | None:
+        """Return a positive score for matches, 0.0 for filter-only matches, None otherwise."""
+        if not query or "match_all" in query:
+            return 1.0
+        if "multi_match" in query:
+            spec = query["multi_match"]
+            terms = _tokens(spec.get("query", ""))
+            best = 0.0
+            for field in spec.get("fields", ["*"]):
+                name, _, boost = field.partition("^")
+                weight = float(boost or 1.0)
+                values = source.values() if name == "*" else [source.get(name)]
+                doc_tokens = [token for value in values for token in _tokens(value)]
+                score = 0.0
+                for term in terms:
+                    if term in doc_tokens:
+                        score += doc_tokens.count(term)
+                        continue
+                    edits = _max_edits(spec.get("fuzziness"), term)
+                    if edits and any(_edit_distance(term, token, edits) <= edits for token in doc_tokens):
+                        score += 0.5
+                best = max(best, score * weight)
+            return best or None
+        if "bool" in query:
+            spec = query["bool"]
+            must = spec.get("must", [])
+            total = 0.0
+            for clause in must if isinstance(must, list) else [must]:
+                score = self._score(clause, source)
+                if score is None:
+                    return None
+                total += score
+            filters = spec.get("filter", [])
+            for clause in filters if isinstance(filters, list) else [filters]:
+                if not self._filter(clause, source):
+                    return None
+            return total
+        if "term" in query or "terms" in query:
+            return 0.0 if self._filter(query, source) else None
+        raise ValueError(f"Unsupported query in InMemoryElasticsearch: {list(query)}")
+
+    @staticmethod
+    def _filter(clause: Mapping, source: Mapping) -> bool:
+        if "term" in clause:
+            field, value = next(iter(clause["term"].items()))
+            value = value.get("value") if isinstance(value, Mapping) else value
+            return source.get(field) == value
+        if "terms" in clause:
+            field, values = next(iter(clause["terms"].items()))
+            return source.get(field) in values
+        raise ValueError(f"Unsupported filter in InMemoryElasticsearch: {list(clause)}")
+
+    def _search(self, index: str, body: Mapping) -> dict:
+        documents = self._indices.get(index, {}).get("visible", {})
+        query = body.get("query", {"match_all": {}})
+        scored = []
+        for doc_id, source in documents.items():
+            score = self._score(query, source)
+            if score is not None:
+                scored.append((score, doc_id, source))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        size = body.get("size", 10)
+        highlight_fields = (body.get("highlight") or {}).get("fields", {})
+
+        hits = []
+        for score, doc_id, source in scored[:size]:
+            hit = {"_index": index, "_id": doc_id, "_score": score, "_source": copy.deepcopy(source)}
+            if highlight_fields and "multi_match" in json.dumps(query):
+                terms = set(_tokens(json.dumps(query)))
+                highlight = {
+                    field: [str(source[field])[: options.get("fragment_size", 150)]]
+                    for field, options in highlight_fields.items()
+                    if field in source and terms & set(_tokens(source[field]))
+                }
+                if highlight:
+                    hit["highlight"] = highlight
+            hits.append(hit)
+        return {
+            "took": 0,
+            "hits": {
+                "total": {"value": len(scored), "relation": "eq"},
+                "max_score": scored[0][0] if scored else None,
+                "hits": hits,
+            },
+        }
+
+    def search(self, index: str, body: Mapping | None = None, **kwargs: Any) -> dict:
+        body = dict(body or {}, **{k: v for k, v in kwargs.items() if k in ("query", "size", "highlight")})
+        self.requests.append(("search", index))
+        return self._search(index, body)
+
+    def msearch(
+        self,
+        body: Any = None,
+        searches: Any = None,
+        index: str | None = None,
+        **_: Any,
+    ) -> dict:
+        lines = self._lines(searches if searches is not None else body)
+        self.requests.append(("msearch", len(lines) // 2))
+        responses = []
+        for header, query in zip(lines[0::2], lines[1::2]):
+            try:
+                responses.append({**self._search(header.get("index", index), query), "status": 200})
+            except ValueError as exc:
+                responses.append({"error": {"reason": str(exc)}, "status": 400})
+        return {"took": 0, "responses": responses}
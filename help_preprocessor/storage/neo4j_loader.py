@@ -8,6 +8,12 @@ from typing import Iterable, Mapping, Sequence
 from neo4j import Driver, GraphDatabase
 from neo4j.exceptions import Neo4jError
 
+from .neo4j_schema import (
+    TOPIC_EMBEDDING_PROPERTY,
+    fulltext_index_statements,
+    vector_index_statement,
+)
+
 
 class HelpNeo4jLoader:
     """Persist graph payloads into a dedicated Neo4j database."""
@@ -50,9 +56,57 @@ class HelpNeo4jLoader:
                     self._merge_node(session, node)
                 for rel in rel_list:
                     self._merge_relationship(session, rel)
+                self._create_search_indexes(session)
         except Neo4jError as exc:  # pragma: no cover - driver level errors
             raise RuntimeError("Failed to upsert help graph data") from exc
 
+    def ensure_search_indexes(self) -> None:
+        """Create the full-text indexes used by Neo4jGraphRetriever."""
+
+        if self._driver is None:
+            raise RuntimeError("Neo4j driver has been closed.")
+
+        try:
+            with self._driver.session(database=self.database) as session:
+                self._create_search_indexes(session)
+        except Neo4jError as exc:  # pragma: no cover - driver level errors
+            raise RuntimeError("Failed to create help graph search indexes") from exc
+
+    def upsert_embeddings(
+        self,
+        embeddings: Mapping[str, Sequence[float]],
+        *,
+        similarity: str = "cosine",
+        batch_size: int = 500,
+    ) -> None:
+        """Store topic embeddings (keyed by node id) and ensure the vector index exists."""
+
+        if self._driver is None:
+            raise RuntimeError("Neo4j driver has been closed.")
+
+        rows = [
+            {"id": node_id, "embedding": [float(value) for value in vector]}
+            for node_id, vector in embeddings.items()
+        ]
+        if not rows:
+            return
+        dimensions = len(rows[0]["embedding"])
+        if any(len(row["embedding"]) != dimensions for row in rows):
+            raise ValueError("All embeddings must have the same dimensions")
+
+        query = (
+            "UNWIND $rows AS row "
+            "MATCH (n:HelpTopic {id: row.id}) "
+            f"SET n.{TOPIC_EMBEDDING_PROPERTY} = row.embedding"
+        )
+        try:
+            with self._driver.session(database=self.database) as session:
+                session.run(vector_index_statement(dimensions, similarity))
+                for start in range(0, len(rows), batch_size):
+                    session.run(query, rows=rows[start:start + batch_size])
+        except Neo4jError as exc:  # pragma: no cover - driver level errors
+            raise RuntimeError("Failed to store help topic embeddings") from exc
+
     def cleanup(self, labels: Sequence[str] | None = None) -> None:
         """Remove help-related nodes by label prior to ingestion."""
 
@@ -74,6 +128,11 @@ class HelpNeo4jLoader:
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    @staticmethod
+    def _create_search_indexes(session) -> None:
+        for statement in fulltext_index_statements():
+            session.run(statement)
+
     def _merge_node(self, session, node: Mapping) -> None:
         node_id = node["id"]
         labels = [self._sanitize_label(label) for label in node.get("labels", []) if label]
@@ -0,0 +1,44 @@
+"""Neo4j index definitions for the help graph.
+
+Shared by HelpNeo4jLoader, which creates the indexes on ingest, and
+Neo4jGraphRetriever, which queries them.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+# Full-text indexes backing the graph strategies (created by HelpNeo4jLoader
+# on upsert, or lazily by Neo4jGraphRetriever.ensure_indexes)
+TOPIC_TITLE_INDEX = "help_topic_title"
+CATEGORY_NAME_INDEX = "help_category_name"
+FULLTEXT_ANALYZER = "cjk"
+
+FULLTEXT_INDEX_DEFINITIONS = {
+    TOPIC_TITLE_INDEX: ("HelpTopic", "title"),
+    CATEGORY_NAME_INDEX: ("HelpCategory", "name"),
+}
+
+# Vector index over topic embeddings (written by HelpNeo4jLoader.upsert_embeddings)
+TOPIC_EMBEDDING_INDEX = "help_topic_embedding"
+TOPIC_EMBEDDING_PROPERTY = "embedding"
+
+
+def fulltext_index_statements(analyzer: str = FULLTEXT_ANALYZER) -> List[str]:
+    """Cypher statements creating the help graph full-text indexes."""
+    return [
+        f"CREATE FULLTEXT INDEX {name} IF NOT EXISTS "
+        f"FOR (n:{label}) ON EACH [n.{prop}] "
+        f"OPTIONS {{indexConfig: {{`fulltext.analyzer`: '{analyzer}'}}}}"
+        for name, (label, prop) in FULLTEXT_INDEX_DEFINITIONS.items()
+    ]
+
+
+def vector_index_statement(dimensions: int, similarity: str = "cosine") -> str:
+    """Cypher statement creating the topic embedding vector index."""
+    return (
+        f"CREATE VECTOR INDEX {TOPIC_EMBEDDING_INDEX} IF NOT EXISTS "
+        f"FOR (n:HelpTopic) ON (n.{TOPIC_EMBEDDING_PROPERTY}) "
+        f"OPTIONS {{indexConfig: {{`vector.dimensions`: {int(dimensions)}, "
+        f"`vector.similarity_function`: '{similarity}'}}}}"
+    )
@@ -2,12 +2,16 @@ import sys
 import os
 import logging
 import argparse
+import json
+import statistics
 from pathlib import Path
 from dotenv import load_dotenv
 from main_helper_0905 import Config
-from neo4j import GraphDatabase
+import qa_cypher
 import re
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Dict, Optional
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent
@@ -24,6 +28,7 @@ logging.basicConfig(
     level=_log_level,
     format="%(asctime)s %(levelname)s %(name)s: %(message)s",
 )
+logger = logging.getLogger(__name__)
 
 
 def run_nollm_doc(config: Config):
@@ -111,7 +116,7 @@ def run_llamaindex_vectorization(config: Config):
     try:
         from llama_index.core import VectorStoreIndex, StorageContext
         from llama_index.vector_stores.chroma import ChromaVectorStore
-        from llama_index.embeddings.openai import OpenAIEmbedding
+        from main_helper_0905 import build_llamaindex_models
         import chromadb
 
         # 呼び出し元から受け取った Config を使用
@@ -130,10 +135,8 @@ def run_llamaindex_vectorization(config: Config):
             print("  標準モデル設定:")
             print(f"    Temperature: {config.llm_temperature}")
 
-        # LlamaIndexの埋め込みモデルを初期化（グローバル設定を避ける）
-        embed_model = OpenAIEmbedding(
-            **config.llamaindex_embedding_config
-        )
+        # LlamaIndexの埋め込みモデルを初期化（グローバル設定を避ける、EMBEDDING_BACKEND=stub も可）
+        _, embed_model = build_llamaindex_models(config)
 
         print("LlamaIndexを使用したベクトル化を開始...")
 
@@ -191,6 +194,227 @@ def run_clear_database(
         return False
 
 
+def _extract_keyword(question: str) -> str:
+    """質問から関数名らしきキーワードを抽出（見つからなければ質問全体）"""
+    m_vec = re.search(
+        r"`([^`]+)`|\"([^\"]+)\"|"
+        r"([A-Za-z_][A-Za-z0-9_]*)",
+        question,
+    )
+    if m_vec:
+        return next((g for g in m_vec.groups() if g), question)
+    return question
+
+
+def _build_graph_question(keyword: str) -> str:
+    """グラフ検索用のプロンプトを具体化（Parameter/Type 関連を辿る）
+
+    Cypher 本文は固定で、キーワードは JSON のパラメータとして別に渡す
+    （引用符などを含むキーワードでもクエリ文が壊れない）。
+    """
+    return f"""
+        Execute this Cypher to get a function and its parameters:
+        {qa_cypher.describe_for_llm(keyword)}
+
+        Then summarize the results in Japanese, focusing on:
+        - Function name and description
+        - Parameters (引数) with descriptions and whether required
+        - Return value (戻り値) if known; otherwise state 不明
+        """
+
+
+def _is_empty_graph_response(response) -> bool:
+    return not response or str(response).strip() in ("", "Empty Response")
+
+
+def _query_graph_directly(config: Config, keyword: str, neo4j=None) -> str:
+    """グラフ応答が空の場合のフォールバック: Neo4jを直接検索して整形
+
+    neo4j: 共有の Neo4jDriverManager（未指定時は接続先ごとの共有インスタンス）。
+    ドライバと接続プールを使い回すので、照会ごとの接続確立は発生しない。
+    """
+    if neo4j is None:
+        from main_helper_0905 import get_neo4j_manager
+
+        neo4j = get_neo4j_manager(config)
+    # 固定のクエリ文＋パラメータなのでサーバー側でプランが再利用される。
+    # 索引の有無は確認するだけ（作成は neo4j_importer の投入時 / --migrate-qa-schema）
+    indexed = qa_cypher.qa_indexes_online(
+        lambda statement: neo4j.run(statement, database=config.neo4j_database),
+        key=(neo4j.uri, config.neo4j_database),
+    )
+    rows = neo4j.run(
+        qa_cypher.function_lookup(indexed),
+        qa_cypher.keyword_params(keyword),
+        database=config.neo4j_database,
+    )
+    if not rows:
+        return ""
+    parts = []
+    for r in rows:
+        nm = r.get("name")
+        desc = r.get("description") or ""
+        params = r.get("parameters") or []
+        retv = r.get("return_value")
+
+        def _fmt_param(p):
+            if isinstance(p, dict):
+                n = p.get("name")
+                d = p.get("description")
+                req = p.get("is_required") or p.get("required")
+                return f"- {n}: {d} (required={req})"
+            n = getattr(p, "name", None)
+            d = getattr(p, "description", None)
+            req = getattr(p, "is_required", None)
+            return f"- {n}: {d} (required={req})"
+
+        param_lines = []
+        try:
+            for p in params:
+                if p and (isinstance(p, dict) and p.get("name") or getattr(p, "name", None)):
+                    param_lines.append(_fmt_param(p))
+        except Exception:
+            param_lines = []
+
+        section = [f"{nm}:", desc]
+        if param_lines:
+            section.append("parameters:\n" + "\n".join(param_lines))
+        if retv:
+            section.append(f"return_value: {retv}")
+        parts.append("\n".join(section))
+    return "\n\n".join(parts)
+
+
+def retrieve_hybrid(
+    config: Config,
+    vector_search,
+    graph_search,
+    question: str,
+    *,
+    on_graph_empty=None,
+    verbose: bool = True,
+    neo4j=None,
+) -> Dict[str, Any]:
+    """ベクトル検索とグラフ検索を並行実行する
+
+    各バックエンドには個別の制限時間（QA_VECTOR_TIMEOUT / QA_GRAPH_TIMEOUT 秒、
+    検索開始からの経過時間）を設け、間に合わなかった側は注記に置き換えて
+    もう一方の結果だけで回答を続行できるようにする。
+    グラフ結果が空のときの直接照会には共有ドライバ neo4j（Neo4jDriverManager）を使う。
+
+    戻り値: keyword, vector, graph, timed_out（超過したバックエンド名）,
+            graph_fallback（グラフ結果が直接照会の文字列か）,
+            timings_ms（vector / graph / retrieval）
+    """
+    keyword = _extract_keyword(question)
+    timings: Dict[str, float] = {}
+    fallback = {"used": False}
+
+    def _timed(name: str, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            timings[name] = (time.perf_counter() - t0) * 1000
+
+    def _graph_stage():
+        response = graph_search(
+            _build_graph_question(keyword),
+            on_empty=on_graph_empty,
+            diagnose=True,
+            keyword=keyword,
+        )
+        if _is_empty_graph_response(response):
+            try:
+                if verbose:
+                    print("  → グラフ結果が空のためNeo4jを直接照会...")
+                response = _query_graph_directly(config, keyword, neo4j)
+                fallback["used"] = True
+            except Exception:
+                # フォールバック失敗時はそのまま続行
+                pass
+        return response
+
+    budgets = {
+        "vector": config.qa_vector_timeout,
+        "graph": config.qa_graph_timeout,
+    }
+    labels = {"vector": "ベクトル検索", "graph": "グラフ検索"}
+
+    if verbose:
+        print("  → ベクトル検索とグラフ検索を並行実行中...")
+    started = time.perf_counter()
+    # 制限時間を超えたスレッドは待たずに切り離す（shutdown(wait=False)）
+    executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="qa-retrieval")
+    futures = {
+        "vector": executor.submit(_timed, "vector", vector_search, keyword),
+        "graph": executor.submit(_timed, "graph", _graph_stage),
+    }
+    responses: Dict[str, Any] = {}
+    timed_out = []
+    try:
+        for name, future in futures.items():
+            remaining = budgets[name] - (time.perf_counter() - started)
+            try:
+                responses[name] = future.result(timeout=max(remaining, 0))
+            except FuturesTimeoutError:
+                timed_out.append(name)
+                responses[name] = (
+                    f"（{labels[name]}が制限時間 {budgets[name]:g} 秒以内に完了しなかったため省略）"
+                )
+                logger.warning("%sがタイムアウトしました（%.1f 秒）", labels[name], budgets[name])
+    finally:
+        executor.shutdown(wait=False)
+
+    snapshot = dict(timings)
+    for name in timed_out:
+        snapshot[name] = budgets[name] * 1000
+    snapshot["retrieval"] = (time.perf_counter() - started) * 1000
+    return {
+        "keyword": keyword,
+        "vector": responses["vector"],
+        "graph": responses["graph"],
+        "timed_out": timed_out,
+        "graph_fallback": fallback["used"] and "graph" not in timed_out,
+        "timings_ms": snapshot,
+    }
+
+
+def _log_qa_timings(question: str, timings: Dict[str, float], timed_out) -> None:
+    """質問ごとの段階別レイテンシをログ出力"""
+    def _fmt(name: str) -> str:
+        value = timings.get(name)
+        if value is None:
+            return "-"
+        return f"{value:.0f}ms" + ("(timeout)" if name in timed_out else "")
+
+    logger.info(
+        "QA所要時間: ベクトル=%s グラフ=%s 検索=%s 初回トークン=%s 回答生成=%s 合計=%s 質問=%r",
+        _fmt("vector"),
+        _fmt("graph"),
+        _fmt("retrieval"),
+        _fmt("ttft"),
+        _fmt("generate"),
+        _fmt("total"),
+        question[:50],
+    )
+
+
+def _log_neo4j_metrics(neo4j) -> None:
+    """共有 Neo4j ドライバの利用状況をログ出力（ドライバ生成は 1 回で済んでいるはず）"""
+    m = neo4j.metrics()
+    avg = f"{m['avg_query_ms']:.1f}ms" if m["avg_query_ms"] is not None else "-"
+    logger.info(
+        "Neo4j共有ドライバ: 生成=%d セッション=%d（最大同時 %d） クエリ=%d（失敗 %d, 平均 %s）",
+        m["drivers_created"],
+        m["sessions"],
+        m["peak_active_sessions"],
+        m["queries"],
+        m["query_errors"],
+        avg,
+    )
+
+
 def run_qa_system(config: Config):
     """LangChainでラップしたQAシステム（LangSmithでウォッチ可能）"""
     try:
@@ -201,6 +425,9 @@ def run_qa_system(config: Config):
         vector_search = engines['vector_search']
         graph_search = engines['graph_search']
         generate_response = engines['generate_response']
+        neo4j = engines.get('neo4j')
+        stream_response = engines['stream_response']
+        answer_cache = engines.get('answer_cache')
 
         # ユーザーに質問を入力してもらう
         print("\nLangChain統合QAシステム（LangSmith対応）")
@@ -217,43 +444,27 @@ def run_qa_system(config: Config):
             return False
 
         print(f"\n📝 質問: {question}")
-        print("🔍 ハイブリッド検索中...")
 
-        # 質問から関数名らしきキーワードを抽出
-        vec_kw = question
-        m_vec = re.search(
-            r"`([^`]+)`|\"([^\"]+)\"|"
-            r"([A-Za-z_][A-Za-z0-9_]*)",
-            question,
-        )
-        if m_vec:
-            vec_kw = next((g for g in m_vec.groups() if g), question)
-
-        # 3. ハイブリッド検索実行（LangChainでラップ）
-        print("  → ベクトル検索を実行中...")
-        vector_response = vector_search(vec_kw)
+        # 意味的に同じ（同じキーワードで検索する）質問の回答が残っていれば、検索と生成を省略して返す
+        if answer_cache is not None:
+            lookup_started = time.perf_counter()
+            cached = answer_cache.lookup(question, key=_extract_keyword(question))
+            if cached is not None:
+                print("\n" + "=" * 50)
+                print(f"回答（キャッシュ, 類似度 {cached.similarity:.3f}, 元の質問: {cached.question}）:")
+                print("=" * 50)
+                print(f"ハイブリッド検索結果: {cached.answer}")
+                print("=" * 50)
+                logger.info(
+                    "QA回答キャッシュ命中: %.0fms 類似度=%.3f 質問=%r",
+                    (time.perf_counter() - lookup_started) * 1000,
+                    cached.similarity,
+                    question[:50],
+                )
+                return True
 
-        print("  → グラフ検索を実行中...")
-        # グラフ検索用のプロンプトを具体化（Parameter/Type 関連を辿る）
-        graph_question = f"""
-        Execute this Cypher to get a function and its parameters:
-        MATCH (f:Function)
-        WHERE toLower(f.name) CONTAINS toLower('{vec_kw}')
-        OPTIONAL MATCH (p:Parameter)
-        WHERE toLower(p.parent_function) = toLower(f.name)
-        WITH f, collect(p) AS params
-        RETURN f.name AS name,
-               f.description AS description,
-               [q IN params WHERE q IS NOT NULL AND q.name IS NOT NULL |
-                {{name:q.name, description:q.description, required:coalesce(q.is_required,false)}}] AS parameters,
-               null AS return_value
-        LIMIT 5
+        print("🔍 ハイブリッド検索中...")
 
-        Then summarize the results in Japanese, focusing on:
-        - Function name and description
-        - Parameters (引数) with descriptions and whether required
-        - Return value (戻り値) if known; otherwise state 不明
-        """
         # コールバックで空結果を検知（ログ/メトリクス等に活用可能）
         def _on_empty(info):
             diag = info.get("diagnosis") if isinstance(info, dict) else None
@@ -269,83 +480,19 @@ def run_qa_system(config: Config):
                 if names:
                     print("    サンプルFunction名: " + ", ".join(map(str, names)))
 
-        graph_response = graph_search(
-            graph_question,
-            on_empty=_on_empty,
-            diagnose=True,
-            keyword=vec_kw,
+        # 3. ハイブリッド検索実行（LangChainでラップ、ベクトル/グラフを並行実行）
+        started = time.perf_counter()
+        retrieved = retrieve_hybrid(
+            config, vector_search, graph_search, question, on_graph_empty=_on_empty, neo4j=neo4j
         )
-
-        # フォールバック: グラフ応答が空の場合はNeo4jを直接検索
-        if not graph_response or str(graph_response).strip() in (
-            "",
-            "Empty Response",
-        ):
-            try:
-                print("  → グラフ結果が空のためNeo4jを直接照会...")
-                with GraphDatabase.driver(
-                    config.neo4j_uri,
-                    auth=(config.neo4j_user, config.neo4j_password),
-                ) as driver:
-                    with driver.session(
-                        database=config.neo4j_database
-                    ) as session:
-                        cypher = (
-                            "MATCH (f:Function) "
-                            "WHERE toLower(f.name) CONTAINS toLower($kw) "
-                            "OPTIONAL MATCH (p:Parameter) "
-                            "WHERE toLower(p.parent_function) = toLower(f.name) "
-                            "WITH f, collect(p) AS params "
-                            "RETURN f.name AS name, f.description AS description, "
-                            "[q IN params WHERE q.name IS NOT NULL | q] AS parameters, null AS return_value "
-                            "LIMIT 5"
-                        )
-                        # ベクトル用に抽出したキーワードをそのまま使用
-                        kw = vec_kw
-                        rows = list(session.run(cypher, kw=kw))
-                        if rows:
-                            parts = []
-                            for r in rows:
-                                nm = r.get("name")
-                                desc = r.get("description") or ""
-                                params = r.get("parameters") or []
-                                retv = r.get("return_value")
-
-                                def _fmt_param(p):
-                                    if isinstance(p, dict):
-                                        n = p.get("name")
-                                        d = p.get("description")
-                                        req = p.get("is_required") or p.get("required")
-                                        return f"- {n}: {d} (required={req})"
-                                    n = getattr(p, "name", None)
-                                    d = getattr(p, "description", None)
-                                    req = getattr(p, "is_required", None)
-                                    return f"- {n}: {d} (required={req})"
-
-                                param_lines = []
-                                try:
-                                    for p in params:
-                                        if p and (isinstance(p, dict) and p.get("name") or getattr(p, "name", None)):
-                                            param_lines.append(_fmt_param(p))
-                                except Exception:
-                                    param_lines = []
-
-                                section = [f"{nm}:", desc]
-                                if param_lines:
-                                    section.append("parameters:\n" + "\n".join(param_lines))
-                                if retv:
-                                    section.append(f"return_value: {retv}")
-                                parts.append("\n".join(section))
-                            graph_response = "\n\n".join(parts)
-                        else:
-                            graph_response = ""
-            except Exception:
-                # フォールバック失敗時はそのまま続行
-                pass
+        vector_response = retrieved["vector"]
+        graph_response = retrieved["graph"]
+        timings = retrieved["timings_ms"]
+        if retrieved["timed_out"]:
+            print("  → 制限時間内に応答しなかった検索を除いて回答します: " + ", ".join(retrieved["timed_out"]))
 
         # ハイブリッド回答の統合（LangChainで生成）
         print("  → ハイブリッド回答を生成中...")
-        final_response = generate_response(vector_response, graph_response, question)
 
         # 4. 結果を表示
         print("\n" + "=" * 50)
@@ -353,8 +500,38 @@ def run_qa_system(config: Config):
         print("=" * 50)
         print(f"ベクトル検索結果: {vector_response}")
         print(f"グラフ検索結果: {graph_response}")
-        print(f"ハイブリッド検索結果: {final_response}")
+        generate_started = time.perf_counter()
+        if config.qa_streaming:
+            # 生成されたトークンから順に表示し、待ち時間の体感を短くする。
+            # 初回トークンまでの時間は検索開始から計測する
+            stream = stream_response(vector_response, graph_response, question, started=started)
+            print("ハイブリッド検索結果: ", end="", flush=True)
+            for token in stream:
+                print(token, end="", flush=True)
+            print()
+            if stream.ttft_ms is not None:
+                timings["ttft"] = stream.ttft_ms
+                print(
+                    f"⏱ 初回トークン（検索開始から）: {stream.ttft_ms:.0f} ms / "
+                    f"回答完了: {stream.total_ms:.0f} ms"
+                )
+            final_response = stream.text
+        else:
+            final_response = generate_response(vector_response, graph_response, question)
+            print(f"ハイブリッド検索結果: {final_response}")
+        timings["generate"] = (time.perf_counter() - generate_started) * 1000
+        timings["total"] = (time.perf_counter() - started) * 1000
         print("=" * 50)
+        _log_qa_timings(question, timings, retrieved["timed_out"])
+        if neo4j is not None:
+            _log_neo4j_metrics(neo4j)
+
+        context_ids = _cacheable_context_ids(retrieved, final_response)
+        if answer_cache is not None and context_ids is not None:
+            try:
+                answer_cache.store(question, str(final_response), context_ids, key=retrieved["keyword"])
+            except Exception as e:
+                logger.warning(f"回答キャッシュへの保存に失敗しました: {e}")
 
         return True
 
@@ -363,6 +540,163 @@ def run_qa_system(config: Config):
         return False
 
 
+def _context_ids(response) -> list:
+    """検索応答（LlamaIndex Response）から参照したノードIDを取り出す"""
+    ids = []
+    for node_with_score in getattr(response, "source_nodes", None) or []:
+        node = getattr(node_with_score, "node", node_with_score)
+        node_id = getattr(node, "node_id", None) or getattr(node, "id_", None)
+        if node_id:
+            ids.append(node_id)
+    return ids
+
+
+def _cacheable_context_ids(retrieved: Dict[str, Any], answer) -> Optional[list]:
+    """回答キャッシュに保存する根拠ID（"vector:<id>" / "graph:<id>"）を返す
+
+    検索が制限時間を超えた・エラーになった回答や生成エラーは不完全なので
+    キャッシュしない（None）。グラフ結果が直接照会（_query_graph_directly）の
+    文字列の場合も、根拠ノードを特定できず変更を検知できないのでキャッシュしない。
+    """
+    if retrieved["timed_out"] or retrieved.get("graph_fallback") or not answer:
+        return None
+    # 各ラッパーは失敗時に「…でエラーが発生しました: …」の文字列を返す
+    for text in (retrieved["vector"], retrieved["graph"], answer):
+        if isinstance(text, str) and "でエラーが発生しました" in text:
+            return None
+    return [f"vector:{i}" for i in _context_ids(retrieved["vector"])] + [
+        f"graph:{i}" for i in _context_ids(retrieved["graph"])
+    ]
+
+
+def _split_context_ids(context_ids) -> Dict[str, list]:
+    """キャッシュの根拠ID一覧を vector / graph に振り分ける"""
+    grouped: Dict[str, list] = {"vector": [], "graph": []}
+    for context_id in context_ids:
+        prefix, _, rest = str(context_id).partition(":")
+        if prefix in grouped:
+            grouped[prefix].append(rest)
+    return grouped
+
+
+def _read_questions(input_path: Path):
+    """JSONL から {"id", "question"} を読み込む（question の代わりに query も可）"""
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            question = (item.get("question") or item.get("query") or "").strip()
+            yield {**item, "id": item.get("id", line_no), "question": question}
+
+
+def run_qa_batch(
+    config: Config,
+    input_path: Path,
+    output_path: Path,
+    concurrency: Optional[int] = None,
+):
+    """JSONL の質問をまとめて処理し、回答と計測値を JSONL で書き出す
+
+    エンジンは全質問で共有し、同時に処理する質問数を concurrency
+    （未指定時は QA_BATCH_CONCURRENCY）で制限する。出力は入力順で、各行に
+    answer, keyword, context_ids（vector / graph）, timed_out, timings_ms, error を含む。
+    回答キャッシュ（ANSWER_CACHE=true で有効）に命中した質問は検索と生成を省略し、cache（類似度と元の質問）を付ける。
+    LLM_BACKEND=stub / EMBEDDING_BACKEND=stub でオフラインに再現計測できる。
+    """
+    try:
+        from main_helper_0905 import build_langchain_wrapped_engines
+
+        engines = build_langchain_wrapped_engines(config)
+        vector_search = engines['vector_search']
+        graph_search = engines['graph_search']
+        generate_response = engines['generate_response']
+        answer_cache = engines.get('answer_cache')
+        neo4j = engines.get('neo4j')
+
+        questions = list(_read_questions(input_path))
+        workers = max(1, concurrency or config.qa_batch_concurrency)
+        print(f"📦 バッチQA: {len(questions)}件（同時実行数 {workers}） → {output_path}")
+
+        def _answer(item: Dict[str, Any]) -> Dict[str, Any]:
+            record: Dict[str, Any] = {"id": item["id"], "question": item["question"]}
+            if not item["question"]:
+                return {**record, "error": "質問が空です"}
+            started = time.perf_counter()
+            try:
+                if answer_cache is not None:
+                    cached = answer_cache.lookup(item["question"], key=_extract_keyword(item["question"]))
+                    if cached is not None:
+                        total_ms = (time.perf_counter() - started) * 1000
+                        return {
+                            **record,
+                            "answer": cached.answer,
+                            "context_ids": _split_context_ids(cached.context_ids),
+                            "timed_out": [],
+                            "timings_ms": {"total": round(total_ms, 1)},
+                            "cache": {"similarity": round(cached.similarity, 4), "question": cached.question},
+                        }
+                retrieved = retrieve_hybrid(
+                    config, vector_search, graph_search, item["question"], verbose=False, neo4j=neo4j
+                )
+                timings = retrieved["timings_ms"]
+                generate_started = time.perf_counter()
+                answer = generate_response(retrieved["vector"], retrieved["graph"], item["question"])
+                timings["generate"] = (time.perf_counter() - generate_started) * 1000
+                timings["total"] = (time.perf_counter() - started) * 1000
+                _log_qa_timings(item["question"], timings, retrieved["timed_out"])
+                context_ids = _cacheable_context_ids(retrieved, str(answer))
+                if answer_cache is not None and context_ids is not None:
+                    answer_cache.store(item["question"], str(answer), context_ids, key=retrieved["keyword"])
+                return {
+                    **record,
+                    "answer": str(answer),
+                    "keyword": retrieved["keyword"],
+                    "context_ids": {
+                        "vector": _context_ids(retrieved["vector"]),
+                        "graph": _context_ids(retrieved["graph"]),
+                    },
+                    "timed_out": retrieved["timed_out"],
+                    "timings_ms": {k: round(v, 1) for k, v in timings.items()},
+                }
+            except Exception as e:
+                logger.error(f"バッチQAエラー（id={item['id']}）: {e}")
+                return {**record, "error": str(e)}
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        started = time.perf_counter()
+        totals = []
+        errors = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="qa-batch") as pool, \
+                open(output_path, "w", encoding="utf-8") as out:
+            # map は入力順に結果を返すので、完了した先頭から逐次書き出す
+            for record in pool.map(_answer, questions):
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                if "error" in record:
+                    errors += 1
+                else:
+                    totals.append(record["timings_ms"]["total"])
+        elapsed = time.perf_counter() - started
+
+        if answer_cache is not None:
+            stats = answer_cache.stats
+            print(f"  回答キャッシュ: 命中 {stats['hits']}件 / 失効 {stats['stale']}件 / 保存 {stats['stores']}件")
+        if neo4j is not None:
+            _log_neo4j_metrics(neo4j)
+        print(f"✅ {len(questions) - errors}件成功 / {errors}件失敗（{elapsed:.1f} 秒, "
+              f"{len(questions) / elapsed if elapsed > 0 else 0:.2f} 件/秒）")
+        if totals:
+            totals.sort()
+            p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))]
+            print(f"  1件あたり: 中央値 {statistics.median(totals):.0f} ms / p95 {p95:.0f} ms")
+        return errors == 0
+
+    except Exception as e:
+        print(f"バッチQAエラー: {e}")
+        return False
+
+
 def main():
     """メイン関数"""
     parser = argparse.ArgumentParser(
@@ -377,12 +711,17 @@ def main():
         使用例:
         python main_0905.py --function full_pipeline  # 完全パイプライン実行
         python main_0905.py --function qa            # ハイブリッド検索
+        python main_0905.py --function qa_batch --input questions.jsonl --output answers.jsonl
         python main_0905.py --function config        # 設定表示
         """
     )
     parser.add_argument("--function", "-f", help="実行する機能")
     parser.add_argument("--question", "-q", help="QA用の質問（非対話）")
     parser.add_argument("--list", "-l", action="store_true", help="機能一覧表示")
+    # バッチQA向け引数
+    parser.add_argument("--input", type=Path, help="qa_batch: 質問のJSONL（1行に {\"id\", \"question\"}）")
+    parser.add_argument("--output", type=Path, help="qa_batch: 回答を書き出すJSONL")
+    parser.add_argument("--concurrency", type=int, help="qa_batch: 同時に処理する質問数")
     # クリア機能向け追加引数
     parser.add_argument(
         "--db",
@@ -437,6 +776,12 @@ def main():
                 builtins.input = _orig_input  # type: ignore
         else:
             success = run_qa_system(config)
+    elif args.function == "qa_batch":
+        if not args.input or not args.output:
+            print("qa_batch には --input と --output が必要です")
+            success = False
+        else:
+            success = run_qa_batch(config, args.input, args.output, args.concurrency)
     elif args.function == "llamaindex_vectorize":
         success = run_llamaindex_vectorization(config)
     elif args.function == "clear_db":
@@ -1,6 +1,11 @@
 import os
 from pathlib import Path
+import asyncio
 import logging
+import atexit
+import threading
+import time
+from contextlib import contextmanager
 from typing import Optional, Any, Dict
 from neo4j import GraphDatabase
 import chromadb
@@ -21,6 +26,8 @@ from langchain_openai import ChatOpenAI, OpenAIEmbeddings
 from langchain.schema import HumanMessage, SystemMessage
 # from langchain.callbacks import LangChainTracer
 
+import qa_cypher
+
 # .envファイルを明示的にロード
 load_dotenv()
 
@@ -38,6 +45,18 @@ class Config:
         self.neo4j_user = os.getenv("NEO4J_USER", "neo4j")
         self.neo4j_password = os.getenv("NEO4J_PASSWORD", "password")
         self.neo4j_database = os.getenv("NEO4J_DATABASE", "docparser")
+        # 共有ドライバの接続プール設定（Neo4jDriverManager）
+        self.neo4j_max_pool_size = int(os.getenv("NEO4J_MAX_POOL_SIZE", "50"))
+        # この秒数以上アイドルだった接続は再利用前に疎通確認する（0 で無効）
+        self.neo4j_liveness_check_timeout = float(os.getenv("NEO4J_LIVENESS_CHECK_TIMEOUT", "30")) or None
+        self.neo4j_acquisition_timeout = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT", "60"))
+
+        # グラフ投入モード: rebuild（全削除して再投入）/ diff（由来ごとの差分のみ適用）
+        self.graph_sync_mode = os.getenv("GRAPH_SYNC_MODE", "rebuild")
+        self.graph_sync_batch_size = int(os.getenv("GRAPH_SYNC_BATCH_SIZE", "1000"))
+
+        # スクリプト例のトリプル抽出に使うプロセス数（未指定時は CPU コア数）
+        self.ingest_workers = int(os.getenv("INGEST_WORKERS", "0")) or None
 
         # OpenAI設定（環境変数から読み込み）
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -54,6 +73,34 @@ class Config:
         self.chroma_persist_directory = "chroma_db_store"
         self.chroma_collection_name = "api_documentation"
 
+        # 前処理成果物の形式: json（インデント付き）/ jsonl.gz（圧縮・逐次読み込み可）
+        self.preprocessed_format = os.getenv("PREPROCESSED_FORMAT", "json")
+
+        # QA の統合回答をトークン単位で逐次表示するか（false で一括表示）
+        self.qa_streaming = os.getenv("QA_STREAMING", "true").lower() not in ("0", "false", "no")
+        # QA のベクトル検索/グラフ検索の制限時間（秒）。超過した側は省略して回答する
+        self.qa_vector_timeout = float(os.getenv("QA_VECTOR_TIMEOUT", "30"))
+        self.qa_graph_timeout = float(os.getenv("QA_GRAPH_TIMEOUT", "60"))
+        # バッチQA（--function qa_batch）で同時に処理する質問数
+        self.qa_batch_concurrency = int(os.getenv("QA_BATCH_CONCURRENCY", "4"))
+
+        # 回答キャッシュ: 意味的に近い質問（埋め込みのコサイン類似度 >= しきい値）には保存済みの回答を返す。
+        # 回答の根拠にした Chroma / Neo4j のノードが変わったエントリは参照時に破棄される。
+        # 質問から抽出したキーワードが一致するエントリだけを使う。既定は無効（ANSWER_CACHE=true で有効）
+        self.answer_cache_enabled = os.getenv("ANSWER_CACHE", "false").lower() in ("1", "true", "yes")
+        self.answer_cache_path = Path(
+            os.getenv("ANSWER_CACHE_PATH", str(self.project_root / ".cache" / "answer_cache.sqlite3"))
+        )
+        self.answer_cache_threshold = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.92"))
+        # 0 なら期限なし（根拠ノードの変更検知のみで破棄）
+        self.answer_cache_ttl = float(os.getenv("ANSWER_CACHE_TTL", "0")) or None
+        # グラフ側の根拠ノードを探すラベル（PropertyGraphIndex のノードは __Node__ を持つ）
+        self.answer_cache_graph_labels = [
+            label.strip()
+            for label in os.getenv("ANSWER_CACHE_GRAPH_LABELS", "__Node__").split(",")
+            if label.strip()
+        ]
+
         # LlM設定
         self.setup_llm_config()
         self.setup_embedding_config()
@@ -150,6 +197,13 @@ class Config:
         self.embedding_model = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
         self.embedding_batch_size = int(os.getenv("EMBEDDING_BATCH_SIZE", "100"))
 
+        # バックエンド: openai / stub（API を呼ばない決定的なスタブ。オフライン計測・再現用）
+        self.llm_backend = os.getenv("LLM_BACKEND", "openai").lower()
+        self.embedding_backend = os.getenv("EMBEDDING_BACKEND", "openai").lower()
+        # スタブLLMの1呼び出しあたりの擬似レイテンシ（ミリ秒）と埋め込み次元
+        self.stub_llm_latency_ms = float(os.getenv("STUB_LLM_LATENCY_MS", "0"))
+        self.stub_embedding_dim = int(os.getenv("STUB_EMBEDDING_DIM", "1536"))
+
         # LangChain用設定
         self.langchain_embedding_config = {
             "model": self.embedding_model,
@@ -183,6 +237,241 @@ class Config:
             print(f"  {key}: {value}")
 
 
+class Neo4jDriverManager:
+    """Neo4j ドライバを 1 つだけ生成して共有する
+
+    GraphDatabase.driver を呼ぶたびに接続（TLS を含む）の確立とプールの破棄が
+    発生するため、QA のフォールバック照会・診断・キャッシュ検証などの単発クエリは
+    すべてこのマネージャ経由で同じドライバ（接続プール）を使う。
+    metrics() でドライバ生成回数・セッション数・クエリ数と所要時間を確認できる。
+    """
+
+    def __init__(self, config: Config):
+        self.uri = config.neo4j_uri
+        self.auth = (config.neo4j_user, config.neo4j_password)
+        self.database = config.neo4j_database
+        self.driver_kwargs: Dict[str, Any] = {
+            "max_connection_pool_size": config.neo4j_max_pool_size,
+            "connection_acquisition_timeout": config.neo4j_acquisition_timeout,
+        }
+        if config.neo4j_liveness_check_timeout is not None:
+            self.driver_kwargs["liveness_check_timeout"] = config.neo4j_liveness_check_timeout
+        self._driver = None
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Any] = {
+            "drivers_created": 0,
+            "sessions": 0,
+            "active_sessions": 0,
+            "peak_active_sessions": 0,
+            "queries": 0,
+            "query_errors": 0,
+            "query_ms": 0.0,
+        }
+
+    @property
+    def driver(self):
+        """共有ドライバ（初回アクセス時に生成）"""
+        if self._driver is None:
+            with self._lock:
+                if self._driver is None:
+                    self._driver = GraphDatabase.driver(self.uri, auth=self.auth, **self.driver_kwargs)
+                    self._stats["drivers_created"] += 1
+                    logger.info(
+                        f"Neo4j共有ドライバを生成しました: {self.uri}"
+                        f"（プール上限 {self.driver_kwargs['max_connection_pool_size']}）"
+                    )
+        return self._driver
+
+    @contextmanager
+    def session(self, database: Optional[str] = None, **kwargs):
+        """共有プールから接続を借りるセッション（database 未指定時は設定値）"""
+        with self._lock:
+            self._stats["sessions"] += 1
+            self._stats["active_sessions"] += 1
+            self._stats["peak_active_sessions"] = max(
+                self._stats["peak_active_sessions"], self._stats["active_sessions"]
+            )
+        try:
+            with self.driver.session(database=database or self.database, **kwargs) as session:
+                yield session
+        finally:
+            with self._lock:
+                self._stats["active_sessions"] -= 1
+
+    def run(self, query: str, parameters: Optional[Dict[str, Any]] = None, *, database: Optional[str] = None):
+        """クエリを実行してレコードのリストを返す（所要時間を計測）"""
+        started = time.perf_counter()
+        try:
+            with self.session(database) as session:
+                return list(session.run(query, parameters or {}))
+        except Exception:
+            with self._lock:
+                self._stats["query_errors"] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._stats["queries"] += 1
+                self._stats["query_ms"] += elapsed
+
+    def verify_connectivity(self) -> None:
+        """サーバーへの疎通を確認（失敗時は例外）"""
+        self.driver.verify_connectivity()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_query_ms"] = stats["query_ms"] / stats["queries"] if stats["queries"] else None
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            if self._driver is not None:
+                self._driver.close()
+                self._driver = None
+
+
+_neo4j_managers: Dict[tuple, Neo4jDriverManager] = {}
+_neo4j_managers_lock = threading.Lock()
+
+
+def get_neo4j_manager(config: Config) -> Neo4jDriverManager:
+    """接続先（URI・ユーザー）ごとに共有の Neo4jDriverManager を返す"""
+    key = (config.neo4j_uri, config.neo4j_user)
+    with _neo4j_managers_lock:
+        if key not in _neo4j_managers:
+            _neo4j_managers[key] = Neo4jDriverManager(config)
+        return _neo4j_managers[key]
+
+
+@atexit.register
+def close_neo4j_managers() -> None:
+    """プロセス終了時に共有ドライバを閉じる"""
+    with _neo4j_managers_lock:
+        managers = list(_neo4j_managers.values())
+        _neo4j_managers.clear()
+    for manager in managers:
+        try:
+            manager.close()
+        except Exception:
+            pass
+
+
+STUB_ANSWER = "（スタブ応答）検索結果に基づく回答です。"
+
+
+def build_llamaindex_models(config: Config):
+    """LlamaIndex 用の LLM と埋め込みモデルを返す（backend=stub ならローカルのスタブ）"""
+    if config.llm_backend == "stub":
+        from llama_index.core.llms import MockLLM
+
+        llm = MockLLM(max_tokens=32)
+    else:
+        llm = OpenAI(**config.llamaindex_llm_config)
+
+    if config.embedding_backend == "stub":
+        from llama_index.core.embeddings import MockEmbedding
+
+        embed_model = MockEmbedding(embed_dim=config.stub_embedding_dim)
+    else:
+        embed_model = OpenAIEmbedding(**config.llamaindex_embedding_config)
+    return llm, embed_model
+
+
+def _stub_chat_model(latency_s: float):
+    """1 呼び出しにつき latency_s 秒待つスタブ LLM（invoke でもストリーミングでも同じ）
+
+    FakeListChatModel の sleep は invoke では 1 回だが、ストリーミングでは
+    1 文字ごとに効くため使わず、最初のトークンの前に 1 回だけ待つ。
+    """
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+    class StubChatModel(FakeListChatModel):
+        latency: float = 0.0
+
+        def _call(self, *args: Any, **kwargs: Any) -> str:
+            time.sleep(self.latency)
+            return super()._call(*args, **kwargs)
+
+        def _stream(self, *args: Any, **kwargs: Any):
+            time.sleep(self.latency)
+            yield from super()._stream(*args, **kwargs)
+
+        async def _astream(self, *args: Any, **kwargs: Any):
+            await asyncio.sleep(self.latency)
+            async for chunk in super()._astream(*args, **kwargs):
+                yield chunk
+
+    return StubChatModel(responses=[STUB_ANSWER], latency=latency_s)
+
+
+def build_langchain_models(config: Config):
+    """LangChain 用の LLM と埋め込みモデルを返す（backend=stub ならローカルのスタブ）"""
+    if config.llm_backend == "stub":
+        # 1 呼び出しにつき STUB_LLM_LATENCY_MS 待つ（擬似レイテンシ）
+        llm = _stub_chat_model(config.stub_llm_latency_ms / 1000)
+    else:
+        # サポートされる引数のみを指定
+        llm_kwargs: Dict[str, Any] = {"model": config.llm_model}
+        if config.openai_api_key:
+            llm_kwargs["api_key"] = config.openai_api_key
+        llm = ChatOpenAI(**llm_kwargs)  # type: ignore[arg-type]
+
+    if config.embedding_backend == "stub":
+        from langchain_core.embeddings import DeterministicFakeEmbedding
+
+        embeddings = DeterministicFakeEmbedding(size=config.stub_embedding_dim)
+    else:
+        embeddings = OpenAIEmbeddings(**config.langchain_embedding_config)  # type: ignore[arg-type]
+    return llm, embeddings
+
+
+def build_answer_cache(config: Config, embeddings):
+    """QA 回答の意味的キャッシュを構築する（ANSWER_CACHE=true でなければ None）
+
+    根拠IDは "vector:<ChromaのID>" / "graph:<Neo4jノードのid>" 形式で保存し、
+    参照時に両ストアの現在の内容と照合して、変わっていればそのエントリを破棄する。
+    """
+    if not config.answer_cache_enabled:
+        return None
+
+    from help_preprocessor.retrieval.answer_cache import (
+        SemanticAnswerCache,
+        chroma_fingerprint,
+        neo4j_fingerprint,
+        routed_fingerprint,
+    )
+
+    chroma_collection = chromadb.PersistentClient(path=config.chroma_persist_directory).get_or_create_collection(
+        config.chroma_collection_name
+    )
+    neo4j = get_neo4j_manager(config)
+    fingerprint_fn = routed_fingerprint({
+        "vector": chroma_fingerprint(chroma_collection),
+        "graph": neo4j_fingerprint(
+            lambda: neo4j.session(config.neo4j_database),
+            config.answer_cache_graph_labels,
+        ),
+    })
+    # モデルやデータの参照先が異なる回答は混ぜない
+    namespace = ":".join([
+        config.llm_backend,
+        config.llm_model,
+        config.chroma_collection_name,
+        config.neo4j_database,
+    ])
+    cache = SemanticAnswerCache(
+        config.answer_cache_path,
+        embeddings.embed_documents,
+        threshold=config.answer_cache_threshold,
+        fingerprint_fn=fingerprint_fn,
+        namespace=namespace,
+        max_age_seconds=config.answer_cache_ttl,
+    )
+    logger.info(f"回答キャッシュ: {config.answer_cache_path}（{len(cache)}件, しきい値 {config.answer_cache_threshold}）")
+    return cache
+
+
 def fetch_data_from_neo4j(
     label: str = "ApiFunction",
     db_name: Optional[str] = None,
@@ -201,28 +490,27 @@ def fetch_data_from_neo4j(
 
     logger.info(f"Neo4jデータベース ({config.neo4j_uri}) に接続しています...")
     try:
-        with GraphDatabase.driver(config.neo4j_uri, auth=(config.neo4j_user, config.neo4j_password)) as driver:
-            database = db_name or config.neo4j_database
-            with driver.session(database=database) as session:
-                if allow_missing_description:
-                    query = f"""
-                    MATCH (n:{label})
-                    WHERE n.name IS NOT NULL
-                    RETURN elementId(n) AS node_id, n.name AS name,
-                           n.description AS description
-                    """
-                else:
-                    query = f"""
-                    MATCH (n:{label})
-                    WHERE n.name IS NOT NULL AND n.description IS NOT NULL
-                    RETURN elementId(n) AS node_id, n.name AS name,
-                           n.description AS description
-                    """
-                logger.info(f"{label} ノードを取得しています（database={database}）...")
-                result = session.run(query)  # type: ignore
-                records = list(result)
-                logger.info(f"{len(records)}件の{label}ノードを取得しました。")
-                return records
+        database = db_name or config.neo4j_database
+        with get_neo4j_manager(config).session(database) as session:
+            if allow_missing_description:
+                query = f"""
+                MATCH (n:{label})
+                WHERE n.name IS NOT NULL
+                RETURN elementId(n) AS node_id, n.name AS name,
+                       n.description AS description
+                """
+            else:
+                query = f"""
+                MATCH (n:{label})
+                WHERE n.name IS NOT NULL AND n.description IS NOT NULL
+                RETURN elementId(n) AS node_id, n.name AS name,
+                       n.description AS description
+                """
+            logger.info(f"{label} ノードを取得しています（database={database}）...")
+            result = session.run(query)  # type: ignore
+            records = list(result)
+            logger.info(f"{len(records)}件の{label}ノードを取得しました。")
+            return records
     except Exception as e:
         logger.error(f"Neo4jからのデータ取得中にエラーが発生しました: {e}", exc_info=True)
         return []
@@ -272,11 +560,11 @@ def ingest_data_to_chroma(
     try:
         # OpenAIの埋め込みモデルを初期化
         api_key = config.openai_api_key
-        if api_key is None:
+        if api_key is None and config.embedding_backend != "stub":
             logger.error("OpenAI APIキーが設定されていません。")
             return
         # OpenAI埋め込みモデルを使って埋め込みを生成（設定されたmodel/batch_sizeを反映）
-        embed_model = OpenAIEmbedding(**config.llamaindex_embedding_config)
+        _, embed_model = build_llamaindex_models(config)
         embeddings = embed_model.get_text_embedding_batch(documents)
         # Chroma の型要件に合わせて明示的に List[List[float]] に正規化
         embeddings_for_chroma = [list(map(float, vec)) for vec in embeddings]
@@ -326,8 +614,7 @@ def build_vector_engine(
     logger.info((f"既存のChromaDBコレクション '{collection}' からVectorQueryEngineを構築しています..."))
 
     # OpenAIのLLMと埋め込みモデルを初期化（グローバル設定を避ける）
-    llm = OpenAI(**config.llamaindex_llm_config)
-    embed_model = OpenAIEmbedding(**config.llamaindex_embedding_config)
+    llm, embed_model = build_llamaindex_models(config)
 
     client = chromadb.PersistentClient(path=persist_dir)
     chroma_collection = client.get_or_create_collection(collection)
@@ -363,8 +650,7 @@ def build_graph_engine(config: Config):
     logger.info((f"既存のNeo4jグラフ '{db_name}' からPropertyGraphQueryEngineを構築しています..."))
 
     # OpenAIのLLMと埋め込みモデルを初期化（グローバル設定を避ける）
-    llm = OpenAI(**config.llamaindex_llm_config)
-    embed_model = OpenAIEmbedding(**config.llamaindex_embedding_config)
+    llm, embed_model = build_llamaindex_models(config)
 
     try:
         # 標準的なNeo4jPropertyGraphStoreを使用（APOCプラグインが必要）
@@ -428,21 +714,33 @@ def build_graph_engine(config: Config):
 def build_langchain_wrapped_engines(config: Config):
     """LangChainでラップしたエンジンを構築（LangSmithでウォッチ可能）"""
 
-    # LangChainのLLMとEmbeddings（サポートされる引数のみを指定）
-    llm_kwargs: Dict[str, Any] = {"model": config.llm_model}
-    if config.openai_api_key:
-        llm_kwargs["api_key"] = config.openai_api_key
-    llm = ChatOpenAI(**llm_kwargs)  # type: ignore[arg-type]
-    embeddings = OpenAIEmbeddings(**config.langchain_embedding_config)  # type: ignore[arg-type]
+    # LangChainのLLMとEmbeddings
+    llm, embeddings = build_langchain_models(config)
+
+    # 診断などの単発クエリは共有ドライバ（接続プール）を使う
+    neo4j = get_neo4j_manager(config)
+
+    # クエリエンジンは初回利用時に一度だけ構築し、以降の質問（バッチの並行処理を含む）で共有する
+    engine_cache: Dict[str, Any] = {}
+    engine_locks = {"vector": threading.Lock(), "graph": threading.Lock()}
+
+    def _shared_engine(name: str, factory):
+        with engine_locks[name]:
+            if name not in engine_cache:
+                engine_cache[name] = factory()
+            return engine_cache[name]
 
     # ベクトル検索のラッパー
     def vector_search_wrapper(query: str):
         """ベクトル検索をLangChainでラップ"""
         try:
-            vector_engine = build_vector_engine(
-                persist_dir=config.chroma_persist_directory,
-                collection=config.chroma_collection_name,
-                config=config
+            vector_engine = _shared_engine(
+                "vector",
+                lambda: build_vector_engine(
+                    persist_dir=config.chroma_persist_directory,
+                    collection=config.chroma_collection_name,
+                    config=config
+                ),
             )
             return vector_engine.query(query)
         except Exception as e:
@@ -466,7 +764,7 @@ def build_langchain_wrapped_engines(config: Config):
         on_error(error: Exception) -> None: 例外時に呼ばれるコールバック
         """
         try:
-            graph_engine = build_graph_engine(config)
+            graph_engine = _shared_engine("graph", lambda: build_graph_engine(config))
             response = graph_engine.query(query)
 
             # 空判定: None, 空文字, "Empty Response" 等
@@ -478,33 +776,29 @@ def build_langchain_wrapped_engines(config: Config):
                 if diagnose:
                     diag = {}
                     try:
-                        with GraphDatabase.driver(
-                            config.neo4j_uri,
-                            auth=(config.neo4j_user, config.neo4j_password),
-                        ) as driver:
-                            with driver.session(database=config.neo4j_database) as session:
-                                # 全体件数
-                                total_funcs = session.run("MATCH (f:Function) RETURN count(f) AS c").single()
-                                diag["function_count"] = (total_funcs and total_funcs.get("c")) or 0
-                                # キーワード一致件数
-                                kw = keyword or ""
-                                match_funcs = session.run(
-                                    (
-                                        "MATCH (f:Function) "
-                                        "WHERE toLower(f.name) CONTAINS toLower($kw) "
-                                        "RETURN count(f) AS c"
-                                    ),
-                                    kw=kw,
-                                ).single()
-                                diag["match_count_by_keyword"] = (match_funcs and match_funcs.get("c")) or 0
-                                # サンプル名
-                                sample = session.run(
-                                    "MATCH (f:Function) RETURN f.name AS name LIMIT 5"
-                                )
-                                diag["sample_function_names"] = [r.get("name") for r in sample if r.get("name")]
-                                # Parameter の存在
-                                total_params = session.run("MATCH (p:Parameter) RETURN count(p) AS c").single()
-                                diag["parameter_count"] = (total_params and total_params.get("c")) or 0
+                        with neo4j.session() as session:
+                            # 全体件数
+                            total_funcs = session.run("MATCH (f:Function) RETURN count(f) AS c").single()
+                            diag["function_count"] = (total_funcs and total_funcs.get("c")) or 0
+                            # キーワード一致件数
+                            kw = keyword or ""
+                            indexed = qa_cypher.qa_indexes_online(
+                                lambda statement: session.run(statement),
+                                key=(neo4j.uri, config.neo4j_database),
+                            )
+                            match_funcs = session.run(
+                                qa_cypher.keyword_match_count(indexed),
+                                qa_cypher.keyword_params(kw),
+                            ).single()
+                            diag["match_count_by_keyword"] = (match_funcs and match_funcs.get("c")) or 0
+                            # サンプル名
+                            sample = session.run(
+                                "MATCH (f:Function) RETURN f.name AS name LIMIT 5"
+                            )
+                            diag["sample_function_names"] = [r.get("name") for r in sample if r.get("name")]
+                            # Parameter の存在
+                            total_params = session.run("MATCH (p:Parameter) RETURN count(p) AS c").single()
+                            diag["parameter_count"] = (total_params and total_params.get("c")) or 0
                     except Exception:
                         # 診断に失敗しても無視
                         pass
@@ -537,12 +831,10 @@ def build_langchain_wrapped_engines(config: Config):
                     pass
             return f"グラフ検索でエラーが発生しました: {e}"
 
-    # 統合回答生成のラッパー
-    def generate_integrated_response(vector_result: str, graph_result: str, question: str):
-        """統合回答をLangChainで生成"""
-        try:
-            messages = [
-                SystemMessage(content="""あなたはAPIドキュメントの専門家です。
+    # 統合回答用のメッセージ（通常生成とストリーミング生成で共通）
+    def _integrated_messages(vector_result: str, graph_result: str, question: str):
+        return [
+            SystemMessage(content="""あなたはAPIドキュメントの専門家です。
 以下の検索結果を統合して、ユーザーの質問に包括的に回答してください。
 
 回答のガイドライン:
@@ -552,7 +844,7 @@ def build_langchain_wrapped_engines(config: Config):
 - 実用的なコード例があれば提供
 - 不明な点は正直に「不明」と回答
 - 日本語で回答"""),
-                HumanMessage(content=f"""
+            HumanMessage(content=f"""
 【ベクトル検索結果】
 {vector_result}
 
@@ -563,17 +855,51 @@ def build_langchain_wrapped_engines(config: Config):
 {question}
 
 上記の情報を統合して回答してください。""")
-            ]
-            response = llm.invoke(messages)
+        ]
+
+    # 統合回答生成のラッパー
+    def generate_integrated_response(vector_result: str, graph_result: str, question: str):
+        """統合回答をLangChainで生成"""
+        try:
+            response = llm.invoke(_integrated_messages(vector_result, graph_result, question))
             return response.content
         except Exception as e:
             logger.error(f"統合回答生成エラー: {e}")
             return f"統合回答生成でエラーが発生しました: {e}"
 
+    # 統合回答のストリーミング生成
+    def stream_integrated_response(
+        vector_result: str,
+        graph_result: str,
+        question: str,
+        *,
+        started: Optional[float] = None,
+    ):
+        """統合回答をトークン単位で返す TokenStream
+
+        started に検索開始時刻（time.perf_counter()）を渡すと、ttft_ms / total_ms は
+        そこからの時間になる（help CLI と同じく、検索時間を含めた初回トークンまでの時間）。
+        読み終えた後の text が回答全文。
+        """
+        from help_preprocessor.retrieval.streaming import TokenStream
+
+        def _chunks():
+            try:
+                for chunk in llm.stream(_integrated_messages(vector_result, graph_result, question)):
+                    yield chunk
+            except Exception as e:
+                logger.error(f"統合回答生成エラー: {e}")
+                yield f"統合回答生成でエラーが発生しました: {e}"
+
+        return TokenStream(_chunks(), started=started)
+
     return {
         'vector_search': vector_search_wrapper,
         'graph_search': graph_search_wrapper,
         'generate_response': generate_integrated_response,
+        'stream_response': stream_integrated_response,
+        'answer_cache': build_answer_cache(config, embeddings),
+        'neo4j': neo4j,
         'llm': llm,
         'embeddings': embeddings
     }
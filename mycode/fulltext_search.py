@@ -2,14 +2,16 @@
 """
 This module provides a full-text search engine using Whoosh.
 """
+import hashlib
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from langchain_core.documents import Document
 from whoosh.analysis import StemmingAnalyzer
 from whoosh.fields import Schema, TEXT, ID
 from whoosh import index
-from whoosh.qparser import QueryParser
+
+from search_common.whoosh_pool import WhooshSearcherPool
 
 # --- Constants ---
 
@@ -25,11 +27,13 @@ class WhooshSearch:
     def __init__(self, index_dir: Path = DEFAULT_INDEX_DIR):
         self.index_dir = index_dir
         self.ix = None
+        self._pool = None
         self.schema = Schema(
             doc_id=ID(stored=True, unique=True),
             content=TEXT(stored=True, analyzer=StemmingAnalyzer()),
             object=ID(stored=True),
-            method_name=ID(stored=True)
+            method_name=ID(stored=True),
+            content_hash=ID(stored=True),
         )
 
     def _ensure_index_exists(self) -> None:
@@ -41,14 +45,58 @@ class WhooshSearch:
                     f"Please run the ingestion script first."
                 )
             self.ix = index.open_dir(self.index_dir)
+        if self._pool is None:
+            # Reuse pooled searchers; reopen only when the index changes
+            self._pool = WhooshSearcherPool(self.index_dir)
+
+    @staticmethod
+    def _content_hash(doc: Document) -> str:
+        """Hash of everything that is indexed for a document."""
+        digest = hashlib.sha1()
+        for value in (doc.page_content, doc.metadata.get("object"), doc.metadata.get("method_name")):
+            digest.update(str(value).encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @classmethod
+    def _fields(cls, doc: Document) -> dict:
+        return {
+            "doc_id": doc.metadata.get("doc_id"),
+            "content": doc.page_content,
+            "object": doc.metadata.get("object"),
+            "method_name": doc.metadata.get("method_name"),
+            "content_hash": cls._content_hash(doc),
+        }
+
+    def _writer(self, procs: int, limitmb: int, multisegment: bool):
+        """
+        Returns a writer; procs > 1 uses Whoosh's multi-process segment writer.
+        """
+        if procs > 1:
+            return self.ix.writer(procs=procs, limitmb=limitmb, multisegment=multisegment)
+        return self.ix.writer(limitmb=limitmb)
 
-    def index_documents(self, documents: List[Document], force_recreate: bool = True):
+    def index_documents(
+        self,
+        documents: List[Document],
+        force_recreate: bool = True,
+        *,
+        procs: int = 1,
+        limitmb: int = 128,
+        multisegment: bool = False,
+        optimize: bool = False,
+    ):
         """
         Creates or overwrites a Whoosh index with the given documents.
 
         Args:
             documents: A list of LangChain Document objects.
             force_recreate: If True, deletes the existing index before creating a new one.
+            procs: Number of indexing processes (> 1 enables the multi-process writer).
+            limitmb: Memory limit (MB) per indexing process for the segment pool.
+            multisegment: With procs > 1, keep one segment per process instead of
+                merging them at commit (faster build, slightly slower search).
+            optimize: Merge everything into a single segment after the build.
         """
         if self.index_dir.exists() and force_recreate:
             import shutil
@@ -56,17 +104,121 @@ class WhooshSearch:
 
         self.index_dir.mkdir(parents=True, exist_ok=True)
 
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
         self.ix = index.create_in(self.index_dir, self.schema)
-        # Use context manager to ensure commit/cancel is handled properly
-        with self.ix.writer() as writer:
+        writer = self._writer(procs, limitmb, multisegment)
+        try:
             for doc in documents:
-                writer.add_document(
-                    doc_id=doc.metadata.get("doc_id"),
-                    content=doc.page_content,
-                    object=doc.metadata.get("object"),
-                    method_name=doc.metadata.get("method_name")
-                )
-        print(f"✔ Whoosh index created with {len(documents)} documents at: {self.index_dir}")
+                writer.add_document(**self._fields(doc))
+        except BaseException:
+            writer.cancel()
+            raise
+        writer.commit(optimize=optimize)
+        print(
+            f"✔ Whoosh index created with {len(documents)} documents at: {self.index_dir} "
+            f"(procs={procs}, segments={self.segment_count()})"
+        )
+
+    def update_documents(
+        self,
+        documents: List[Document],
+        delete_ids: Iterable[str] = (),
+        *,
+        merge: str = "auto",
+        max_segments: Optional[int] = None,
+        limitmb: int = 128,
+    ) -> int:
+        """
+        Incrementally adds/replaces documents keyed by doc_id and deletes delete_ids,
+        without rebuilding the index.
+
+        Args:
+            documents: Documents to add or replace (matched on their doc_id).
+            delete_ids: doc_ids to remove from the index.
+            merge: "auto" uses Whoosh's merge policy, "none" only appends a new
+                segment (fastest commit), "optimize" merges into one segment.
+            max_segments: If set and the segment count exceeds it after the
+                commit, the index is optimized (simple merge scheduling).
+            limitmb: Memory limit (MB) for the writer.
+
+        Returns:
+            The number of segments after the update.
+        """
+        if merge not in ("auto", "none", "optimize"):
+            raise ValueError(f"merge must be 'auto', 'none' or 'optimize', got {merge!r}")
+        self._ensure_index_exists()
+
+        writer = self.ix.writer(limitmb=limitmb)
+        try:
+            for doc_id in delete_ids:
+                writer.delete_by_term("doc_id", doc_id)
+            for doc in documents:
+                writer.update_document(**self._fields(doc))
+        except BaseException:
+            writer.cancel()
+            raise
+        writer.commit(merge=merge != "none", optimize=merge == "optimize")
+        self._pool.mark_stale()
+
+        segments = self.segment_count()
+        if max_segments is not None and segments > max_segments:
+            self.optimize()
+            segments = self.segment_count()
+        return segments
+
+    def stored_hashes(self) -> Dict[str, Optional[str]]:
+        """Returns {doc_id: content_hash} for every document in the index."""
+        self._ensure_index_exists()
+        with self.ix.reader() as reader:
+            return {
+                fields["doc_id"]: fields.get("content_hash")
+                for fields in reader.all_stored_fields()
+            }
+
+    def sync_documents(self, documents: List[Document], **update_kwargs) -> Tuple[int, int]:
+        """
+        Makes the index match documents, writing only what changed.
+
+        Documents whose doc_id is new or whose content hash differs are upserted;
+        doc_ids that are no longer in documents are deleted. Indexes built before
+        content hashes were stored are rebuilt once.
+
+        Args:
+            documents: The complete current document set.
+            **update_kwargs: Passed on to update_documents (merge, max_segments, limitmb).
+
+        Returns:
+            (number of upserted documents, number of deleted documents)
+        """
+        self._ensure_index_exists()
+        if "content_hash" not in self.ix.schema:
+            self.index_documents(documents, limitmb=update_kwargs.get("limitmb", 128))
+            return len(documents), 0
+
+        stored = self.stored_hashes()
+        current_ids = {doc.metadata.get("doc_id") for doc in documents}
+        changed = [
+            doc for doc in documents
+            if stored.get(doc.metadata.get("doc_id")) != self._content_hash(doc)
+        ]
+        delete_ids = [doc_id for doc_id in stored if doc_id not in current_ids]
+        if changed or delete_ids:
+            self.update_documents(changed, delete_ids=delete_ids, **update_kwargs)
+        return len(changed), len(delete_ids)
+
+    def optimize(self) -> None:
+        """Merges all segments into one (e.g. from a scheduled maintenance job)."""
+        self._ensure_index_exists()
+        self.ix.optimize()
+        self._pool.mark_stale()
+
+    def segment_count(self) -> int:
+        """Returns the number of segments in the latest index generation."""
+        self._ensure_index_exists()
+        self.ix = self.ix.refresh()
+        return len(self.ix._segments())
 
     def search(self, query_text: str, limit: int = 10) -> List[Tuple[str, float]]:
         """
@@ -81,18 +233,12 @@ class WhooshSearch:
         """
         self._ensure_index_exists()
 
-        results_list = []
-        with self.ix.searcher() as searcher:
-            # We search in the 'content' field by default
-            parser = QueryParser("content", self.ix.schema)
-            query = parser.parse(query_text)
+        # We search in the 'content' field by default
+        query = self._pool.parse(("content",), query_text)
 
+        with self._pool.searcher() as searcher:
             results = searcher.search(query, limit=limit)
-
-            for hit in results:
-                results_list.append((hit['doc_id'], hit.score))
-
-        return results_list
+            return [(hit['doc_id'], hit.score) for hit in results]
 
     def get_document(self, doc_id: str) -> Document:
         """
@@ -100,15 +246,15 @@ class WhooshSearch:
         """
         self._ensure_index_exists()
 
-        with self.ix.searcher() as searcher:
+        with self._pool.searcher() as searcher:
             results = searcher.document(doc_id=doc_id)
-            if results:
-                return Document(
-                    page_content=results['content'],
-                    metadata={
-                        "doc_id": results['doc_id'],
-                        "object": results['object'],
-                        "method_name": results['method_name'],
-                    }
-                )
+        if results:
+            return Document(
+                page_content=results['content'],
+                metadata={
+                    "doc_id": results['doc_id'],
+                    "object": results['object'],
+                    "method_name": results['method_name'],
+                }
+            )
         raise KeyError(f"Document with doc_id '{doc_id}' not found in Whoosh index.")
@@ -32,10 +32,26 @@ except ImportError:
 CHROMA_PERSIST_DIR = Path("data/chroma_db_hybrid")
 
 
+def _int_option(name: str, default: int) -> int:
+    """Reads an integer option given as '--name N' or '--name=N'."""
+    for i, arg in enumerate(sys.argv):
+        if arg == name and i + 1 < len(sys.argv):
+            return int(sys.argv[i + 1])
+        if arg.startswith(f"{name}="):
+            return int(arg.split("=", 1)[1])
+    return default
+
+
 def main():
     """
     Main function to run the full ingestion pipeline.
     Supports a --static-only flag to skip steps requiring API calls.
+
+    Whoosh options:
+      --whoosh-procs N     indexing processes (default: 1)
+      --whoosh-limitmb N   memory limit per process in MB (default: 128)
+      --whoosh-incremental only write documents whose content changed and delete
+                           doc_ids no longer in the source, instead of rebuilding
     """
     is_static_only = "--static-only" in sys.argv
 
@@ -101,7 +117,21 @@ def main():
         f"\n[{2 if is_static_only else 3}/{num_steps}] Indexing in Whoosh (Full-Text Search)..."
     )
     whoosh_search = WhooshSearch()
-    whoosh_search.index_documents(documents)
+    whoosh_limitmb = _int_option("--whoosh-limitmb", 128)
+    if "--whoosh-incremental" in sys.argv and whoosh_search.index_dir.exists():
+        upserted, deleted = whoosh_search.sync_documents(
+            documents, limitmb=whoosh_limitmb, max_segments=8
+        )
+        print(
+            f"✔ Whoosh index synced: {upserted} documents added/changed, {deleted} removed "
+            f"({whoosh_search.segment_count()} segments)."
+        )
+    else:
+        whoosh_search.index_documents(
+            documents,
+            procs=_int_option("--whoosh-procs", 1),
+            limitmb=whoosh_limitmb,
+        )
 
     # 4. Index documents in Sparse Vector Store (TF-IDF)
     print(
@@ -6,17 +6,24 @@ TF-IDF implementation. It's a simple, effective baseline for keyword-based searc
 import logging
 import pickle
 from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 
 import joblib
 from langchain_core.documents import Document
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-import numpy as np
+
+from search_common.sparse_store import (
+    SparseIndex,
+    is_sparse_index,
+    top_k_indices,
+    write_sparse_index,
+)
 
 # --- Constants ---
 
 DEFAULT_SPARSE_INDEX_DIR = Path("data/sparse_index")
+# Legacy (joblib/pickle) artifacts; new indexes use the manifest.json + .npy format
 VECTORIZER_FILE = "tfidf_vectorizer.joblib"
 DOCS_FILE = "documents.pkl"
 
@@ -36,6 +43,7 @@ class SparseVectorSearch:
         self.tfidf_matrix = None
         self.documents: List[Document] = []
         self._doc_map: Dict[str, Document] = {}
+        self._index: Optional[SparseIndex] = None
 
     def _update_documents(self, documents: List[Document]) -> None:
         """Populate the in-memory document list and id map, skipping invalid docs."""
@@ -63,6 +71,24 @@ class SparseVectorSearch:
                 f"Sparse index directory not found at {self.index_dir}. Please run ingestion."
             )
 
+        if is_sparse_index(self.index_dir):
+            self._index = SparseIndex.load(self.index_dir)
+            self.vectorizer = self._index.vectorizer
+            self.tfidf_matrix = self._index.tfidf_term_doc
+            self._update_documents(
+                [
+                    Document(page_content=doc["content"], metadata=doc.get("metadata", {}))
+                    for doc in self._index.documents
+                ]
+            )
+            return
+
+        logger.warning(
+            "Loading legacy pickle-based sparse index from %s; re-run ingestion to "
+            "convert it to the manifest/.npy format.",
+            self.index_dir,
+        )
+
         vectorizer_path = self.index_dir / VECTORIZER_FILE
         docs_path = self.index_dir / DOCS_FILE
 
@@ -98,18 +124,22 @@ class SparseVectorSearch:
                 "No valid documents with 'doc_id' metadata provided for indexing."
             )
 
-        # We need a corpus of text to fit the vectorizer
-        corpus = [doc.page_content for doc in self.documents]
-
-        self.vectorizer = TfidfVectorizer()
-        self.tfidf_matrix = self.vectorizer.fit_transform(corpus)
-
-        # Save the fitted vectorizer and the document list
-        joblib.dump(
-            (self.vectorizer, self.tfidf_matrix), self.index_dir / VECTORIZER_FILE
+        # Save vocabulary, IDF, normalized matrix and documents (no pickle)
+        write_sparse_index(
+            self.index_dir,
+            [
+                {
+                    "id": doc.metadata["doc_id"],
+                    "content": doc.page_content,
+                    "metadata": doc.metadata,
+                }
+                for doc in self.documents
+            ],
+            include_bm25=False,
         )
-        with open(self.index_dir / DOCS_FILE, "wb") as f:
-            pickle.dump(self.documents, f)
+        self._index = SparseIndex.load(self.index_dir)
+        self.vectorizer = self._index.vectorizer
+        self.tfidf_matrix = self._index.tfidf_term_doc
 
         print(
             f"✔ Sparse vector index created with {len(self.documents)} documents at: {self.index_dir}"
@@ -129,25 +159,20 @@ class SparseVectorSearch:
         if self.vectorizer is None or self.tfidf_matrix is None:
             self._load_from_disk()
 
-        query_vector = self.vectorizer.transform([query_text])
-
-        # Compute cosine similarity between the query and all documents
-        scores = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
-
-        # Get the top N results
-        # We use argpartition for efficiency if N is much smaller than the total number of docs
         if not self.documents:
             return []
 
-        if limit < len(self.documents):
-            top_k_indices = np.argpartition(scores, -limit)[-limit:]
+        if self._index is not None:
+            # Sparse dot product against the L2-normalized term x document matrix
+            scores = self._index.tfidf_scores(query_text)
         else:
-            top_k_indices = np.argsort(scores)[::-1]
+            query_vector = self.vectorizer.transform([query_text])
 
-        # Sort the top k results by score
-        results = sorted(
-            [(i, scores[i]) for i in top_k_indices], key=lambda x: x[1], reverse=True
-        )
+            # Compute cosine similarity between the query and all documents
+            scores = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+
+        # Get the top N results (argpartition, then sort only the candidates)
+        results = [(i, float(scores[i])) for i in top_k_indices(scores, limit)]
 
         # Map back to doc_ids
         mapped_results: List[Tuple[str, float]] = []
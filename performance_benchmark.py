@@ -1 +1,608 @@
- 
\ No newline at end of file
+"""
+パフォーマンス計測スクリプト
+
+各サブコマンドが 1つの計測対象に対応する。
+
+使い方:
+    python performance_benchmark.py artifacts --source data/src/preprocessed --scale 20
+    python performance_benchmark.py sparse-index --docs 50000
+    python performance_benchmark.py fusion --sizes 100,1000,10000
+    python performance_benchmark.py whoosh-build --docs 20000 --procs 1,2,4
+    python performance_benchmark.py graph-paths --query "板 作成 要素 削除 移動 複写"
+    python performance_benchmark.py elasticsearch --docs 20000 --batch-sizes 100,500,2000 [--url http://localhost:9200]
+    python performance_benchmark.py qa-cypher --keywords 200
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+def _time_it(fn: Callable[[], Any], repeat: int) -> float:
+    """fn を repeat 回実行し、中央値（秒）を返す"""
+    samples: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    widths = {h: max(len(h), *(len(str(r[h])) for r in rows)) for h in headers}
+    print("  ".join(h.ljust(widths[h]) for h in headers))
+    for r in rows:
+        print("  ".join(str(r[h]).ljust(widths[h]) for h in headers))
+
+
+# ---------------------------------------------------------------------------
+# artifacts: 前処理成果物（json / jsonl.gz）のサイズと読み込み時間
+# ---------------------------------------------------------------------------
+
+def _scaled_graph(source_dir: Path, scale: int):
+    """既存の graph_specs.json を scale 倍に複製したトリプル/ノードを作る"""
+    data = json.loads((source_dir / "graph_specs.json").read_text(encoding="utf-8"))
+    api_entries = json.loads((source_dir / "api_entries.json").read_text(encoding="utf-8"))
+    type_descriptions = json.loads(
+        (source_dir / "type_descriptions.json").read_text(encoding="utf-8")
+    )
+    triples: List[Dict[str, Any]] = []
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for i in range(scale):
+        suffix = "" if i == 0 else f"#{i}"
+        for t in data["triples"]:
+            triples.append({**t, "source": t["source"] + suffix, "target": t["target"] + suffix})
+        for node_id, meta in data["nodes"].items():
+            nodes[node_id + suffix] = meta
+    return api_entries, type_descriptions, triples, nodes
+
+
+def bench_artifacts(args: argparse.Namespace) -> None:
+    from graphrag_gpt.ingest0903 import (
+        _dump_preprocessed_artifacts,
+        iter_preprocessed_records,
+        load_preprocessed_graph,
+    )
+
+    api_entries, type_descriptions, triples, nodes = _scaled_graph(
+        Path(args.source), args.scale
+    )
+    print(f"triples={len(triples)}, nodes={len(nodes)}, scale={args.scale}")
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in ("json", "jsonl.gz"):
+            out_dir = Path(tmp) / fmt.replace(".", "_")
+            write_s = _time_it(
+                lambda: _dump_preprocessed_artifacts(
+                    out_dir, api_entries, type_descriptions, triples, nodes, [], {}, fmt=fmt
+                ),
+                args.repeat,
+            )
+            size = sum(p.stat().st_size for p in out_dir.iterdir())
+            graph_size = sum(p.stat().st_size for p in out_dir.glob("graph_*"))
+
+            if fmt == "json":
+                load_all = _time_it(
+                    lambda: json.loads((out_dir / "graph_all.json").read_text(encoding="utf-8")),
+                    args.repeat,
+                )
+            else:
+                load_all = _time_it(lambda: load_preprocessed_graph(out_dir), args.repeat)
+            load_triples = _time_it(
+                lambda: load_preprocessed_graph(out_dir, with_nodes=False), args.repeat
+            )
+            if fmt == "jsonl.gz":
+                # 先頭 100 件だけ必要な場合（逐次読み込みの効果）
+                def _head():
+                    for i, _ in enumerate(
+                        iter_preprocessed_records(out_dir / "graph_specs.jsonl.gz", kind="triple")
+                    ):
+                        if i >= 99:
+                            break
+                first_100 = f"{_time_it(_head, args.repeat) * 1000:.1f}"
+            else:
+                first_100 = f"{load_triples * 1000:.1f}"
+
+            rows.append(
+                {
+                    "format": fmt,
+                    "total_KB": f"{size / 1024:.0f}",
+                    "graph_KB": f"{graph_size / 1024:.0f}",
+                    "write_ms": f"{write_s * 1000:.1f}",
+                    "load_all_ms": f"{load_all * 1000:.1f}",
+                    "load_triples_ms": f"{load_triples * 1000:.1f}",
+                    "first_100_ms": first_100,
+                }
+            )
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# sparse-index: pickle/joblib と manifest + .npy 形式のロード時間・メモリ
+# ---------------------------------------------------------------------------
+
+# 別プロセスで「ロード + 1クエリ」を実行し、経過時間と RSS 増分（プロセス固有 / ファイル共有）を返す
+_SPARSE_PROBE = """
+import json, sys, time
+from pathlib import Path
+from help_preprocessor.retrieval.base import QueryContext
+from help_preprocessor.retrieval.sparse_retriever import BM25Retriever, SparseVectorRetriever
+kind, mode, root, query = sys.argv[1:5]
+root = Path(root)
+def rss():
+    fields = dict(l.split(":", 1) for l in open("/proc/self/status") if l.startswith("Rss"))
+    return {k: int(v.split()[0]) for k, v in fields.items()}
+base = rss()
+t0 = time.perf_counter()
+if mode == "pickle":
+    if kind == "tfidf":
+        r = SparseVectorRetriever(root / "tfidf_vectorizer.joblib", root / "documents.pkl")
+    else:
+        r = BM25Retriever(documents_path=root / "documents.pkl")
+else:
+    if kind == "tfidf":
+        r = SparseVectorRetriever(index_dir=root / "index")
+    else:
+        r = BM25Retriever(index_dir=root / "index")
+r.search(QueryContext(query=query, top_k=10))
+t1 = time.perf_counter()
+r.search(QueryContext(query=query, top_k=10))
+t2 = time.perf_counter()
+now = rss()
+print(json.dumps({"cold_s": t1 - t0, "warm_s": t2 - t1,
+                  "anon_kb": now["RssAnon"] - base["RssAnon"],
+                  "file_kb": now["RssFile"] - base["RssFile"]}))
+"""
+
+
+def bench_sparse_index(args: argparse.Namespace) -> None:
+    import pickle
+
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    from search_common.sparse_store import write_sparse_index
+
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(args.vocab)]
+    documents = [
+        {
+            "id": f"doc_{i}",
+            "title": f"title {i}",
+            "section_id": f"s{i}",
+            "content": " ".join(rng.choices(vocab, k=args.doc_len)),
+            "metadata": {"category": f"c{i % 20}"},
+        }
+        for i in range(args.docs)
+    ]
+    query = " ".join(rng.choices(vocab, k=4))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        vectorizer = TfidfVectorizer().fit(doc["content"] for doc in documents)
+        joblib.dump(vectorizer, root / "tfidf_vectorizer.joblib")
+        with open(root / "documents.pkl", "wb") as handle:
+            pickle.dump(documents, handle)
+        write_sparse_index(root / "index", documents, vectorizer=vectorizer)
+
+        pickle_kb = sum(p.stat().st_size for p in root.glob("*.*")) / 1024
+        index_kb = sum(p.stat().st_size for p in (root / "index").iterdir()) / 1024
+        print(
+            f"docs={args.docs}, vocab={args.vocab}, doc_len={args.doc_len}, "
+            f"pickle+joblib={pickle_kb:.0f} KB, index={index_kb:.0f} KB"
+        )
+
+        rows = []
+        for kind in ("tfidf", "bm25"):
+            for mode in ("pickle", "index"):
+                samples = []
+                for _ in range(args.repeat):
+                    out = subprocess.run(
+                        [sys.executable, "-c", _SPARSE_PROBE, kind, mode, str(root), query],
+                        check=True,
+                        capture_output=True,
+                        text=True,
+                        cwd=Path(__file__).resolve().parent,
+                    )
+                    samples.append(json.loads(out.stdout.strip().splitlines()[-1]))
+                rows.append(
+                    {
+                        "retriever": kind,
+                        "format": mode,
+                        "load+query_ms": f"{statistics.median(s['cold_s'] for s in samples) * 1000:.0f}",
+                        "warm_query_ms": f"{statistics.median(s['warm_s'] for s in samples) * 1000:.1f}",
+                        "private_MB": f"{statistics.median(s['anon_kb'] for s in samples) / 1024:.1f}",
+                        "shared_file_MB": f"{statistics.median(s['file_kb'] for s in samples) / 1024:.1f}",
+                    }
+                )
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# fusion: 検索結果統合（RRF / weighted / borda）の候補数ごとの処理時間
+# ---------------------------------------------------------------------------
+
+def _dict_loop_rrf(results_by_source, top_k: int, k: int = 60):
+    """比較用: SearchResult を全件コピーして dict で集計する従来方式の RRF"""
+    from help_preprocessor.retrieval.base import SearchResult
+
+    first: Dict[str, Any] = {}
+    scores: Dict[str, float] = {}
+    for results in results_by_source.values():
+        for rank, result in enumerate(results, 1):
+            first.setdefault(result.id, result)
+            scores[result.id] = scores.get(result.id, 0.0) + 1.0 / (k + rank)
+    fused = [
+        SearchResult(
+            id=doc_id,
+            content=first[doc_id].content,
+            score=score,
+            source="fusion_rrf",
+            metadata={**first[doc_id].metadata, "rrf_score": score},
+        )
+        for doc_id, score in scores.items()
+    ]
+    fused.sort(key=lambda r: r.score, reverse=True)
+    return fused[:top_k]
+
+
+def bench_fusion(args: argparse.Namespace) -> None:
+    from help_preprocessor.retrieval.base import QueryContext, SearchResult
+    from help_preprocessor.retrieval.fusion import (
+        BordaCountFusion,
+        ReciprocalRankFusion,
+        WeightedSumFusion,
+    )
+
+    rng = random.Random(0)
+    sources = ["dense", "sparse_tfidf", "sparse_bm25", "fulltext_whoosh", "graph_neo4j"][: args.sources]
+    context = QueryContext(query="benchmark", top_k=args.top_k)
+    methods = {
+        "rrf (dict loop)": lambda r: _dict_loop_rrf(r, args.top_k),
+        "rrf": lambda r: ReciprocalRankFusion().fuse_results(r, context),
+        "weighted": lambda r: WeightedSumFusion().fuse_results(r, context),
+        "borda": lambda r: BordaCountFusion().fuse_results(r, context),
+    }
+
+    rows = []
+    for size in (int(v) for v in args.sizes.split(",")):
+        pool = [f"doc_{i}" for i in range(size * 2)]
+        results_by_source = {
+            source: [
+                SearchResult(id=doc_id, content=doc_id, score=rng.random(), source=source, metadata={"i": i})
+                for i, doc_id in enumerate(rng.sample(pool, size))
+            ]
+            for source in sources
+        }
+        row: Dict[str, Any] = {"candidates/source": size}
+        for name, fn in methods.items():
+            row[f"{name}_ms"] = f"{_time_it(lambda: fn(results_by_source), args.repeat) * 1000:.2f}"
+        rows.append(row)
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# whoosh-build: Whoosh 全文索引の構築（プロセス数別）と差分更新の時間
+# ---------------------------------------------------------------------------
+
+def bench_whoosh_build(args: argparse.Namespace) -> None:
+    from langchain_core.documents import Document
+
+    from mycode.fulltext_search import WhooshSearch
+
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(args.vocab)]
+    documents = [
+        Document(
+            page_content=" ".join(rng.choices(vocab, k=args.doc_len)),
+            metadata={"doc_id": f"doc_{i}", "object": f"Obj{i % 50}", "method_name": f"M{i}"},
+        )
+        for i in range(args.docs)
+    ]
+    edits = [
+        Document(page_content="edited " + doc.page_content, metadata=doc.metadata)
+        for doc in rng.sample(documents, args.edits)
+    ]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for procs in (int(v) for v in args.procs.split(",")):
+            for multisegment in ((False, True) if procs > 1 else (False,)):
+                search = WhooshSearch(Path(tmp) / f"p{procs}_{int(multisegment)}")
+                t0 = time.perf_counter()
+                search.index_documents(
+                    documents, procs=procs, limitmb=args.limitmb, multisegment=multisegment
+                )
+                build_s = time.perf_counter() - t0
+                t0 = time.perf_counter()
+                search.update_documents(edits, merge="none")
+                update_s = time.perf_counter() - t0
+                rows.append(
+                    {
+                        "procs": procs,
+                        "multisegment": multisegment,
+                        "build_s": f"{build_s:.2f}",
+                        f"update_{args.edits}_ms": f"{update_s * 1000:.0f}",
+                        "segments": search.segment_count(),
+                    }
+                )
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# graph-paths: GraphPathRetriever の語数ごとのレイテンシ（要 Neo4j）
+# ---------------------------------------------------------------------------
+
+def bench_graph_paths(args: argparse.Namespace) -> None:
+    from help_preprocessor.retrieval.base import QueryContext
+    from help_preprocessor.retrieval.graph_retriever import GraphPathRetriever
+
+    terms = args.query.split()
+    retriever = GraphPathRetriever(
+        uri=args.uri,
+        username=args.username,
+        password=args.password,
+        database=args.database,
+        max_path_length=args.max_path_length,
+        max_terms=len(terms),
+        timeout_seconds=args.timeout,
+    )
+    rows = []
+    try:
+        for n in range(2, len(terms) + 1):
+            context = QueryContext(query=" ".join(terms[:n]), top_k=10)
+            elapsed = _time_it(lambda: retriever.search(context), args.repeat)
+            stats = retriever.last_search_stats
+            rows.append(
+                {
+                    "terms": n,
+                    "pairs": stats.get("pairs", 0),
+                    "paths": stats.get("paths", 0),
+                    "median_ms": f"{elapsed * 1000:.1f}",
+                }
+            )
+    finally:
+        retriever.close()
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# elasticsearch: バルク投入のスループットと msearch の一括検索レイテンシ
+# ---------------------------------------------------------------------------
+
+def bench_elasticsearch(args: argparse.Namespace) -> None:
+    from help_preprocessor.retrieval.base import QueryContext
+    from help_preprocessor.retrieval.fulltext_retriever import ElasticsearchRetriever
+    from help_preprocessor.storage.elasticsearch_loader import HelpElasticsearchLoader
+    from help_preprocessor.storage.elasticsearch_memory import InMemoryElasticsearch
+
+    if args.url:
+        from elasticsearch import Elasticsearch
+
+        client = Elasticsearch(args.url)
+    else:
+        # --url 未指定時はプロセス内の疑似クライアントで計測する（相対比較用）
+        client = InMemoryElasticsearch()
+
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(args.vocab)]
+    chunks = [
+        {
+            "id": f"doc_{i}",
+            "text": " ".join(rng.choices(vocab, k=args.doc_len)),
+            "metadata": {"section_id": f"s{i % 100}", "title": " ".join(rng.choices(vocab, k=3))},
+        }
+        for i in range(args.docs)
+    ]
+
+    rows = []
+    for batch_size in (int(v) for v in args.batch_sizes.split(",")):
+        loader = HelpElasticsearchLoader(args.index, client=client, batch_size=batch_size)
+        loader.purge()
+        stats = loader.upsert(chunks)
+        rows.append(
+            {
+                "batch_size": batch_size,
+                "requests": stats["batches"],
+                "seconds": f"{stats['seconds']:.2f}",
+                "docs/s": f"{stats['docs_per_second']:.0f}",
+            }
+        )
+    _print_table(rows)
+
+    contexts = [
+        QueryContext(query=" ".join(rng.choices(vocab, k=2)), top_k=10) for _ in range(args.queries)
+    ]
+    rows = []
+    for fuzziness in ("AUTO", None):
+        retriever = ElasticsearchRetriever(index_name=args.index, client=client, fuzziness=fuzziness)
+        sequential = _time_it(lambda: [retriever.search(c) for c in contexts], args.repeat)
+        batched = _time_it(lambda: retriever.search_batch(contexts), args.repeat)
+        rows.append(
+            {
+                "fuzziness": fuzziness or "off",
+                "queries": len(contexts),
+                "search_ms": f"{sequential * 1000:.1f}",
+                "msearch_ms": f"{batched * 1000:.1f}",
+            }
+        )
+    _print_table(rows)
+
+
+# ---------------------------------------------------------------------------
+# qa-cypher: QA フォールバック照会の文字列埋め込み / パラメータ化 / 索引の比較（要 Neo4j）
+# ---------------------------------------------------------------------------
+
+def _interpolated_lookup(keyword: str, limit: int) -> str:
+    """旧実装と同じく、キーワードをクエリ文字列に埋め込んだ版（比較用）"""
+    import qa_cypher
+
+    literal = "'" + keyword.lower().replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return (
+        qa_cypher.FUNCTION_LOOKUP_UNINDEXED
+        .replace("$kw", literal)
+        .replace("$limit", str(limit))
+    )
+
+
+def bench_qa_cypher(args: argparse.Namespace) -> None:
+    from neo4j import GraphDatabase
+
+    import qa_cypher
+
+    driver = GraphDatabase.driver(args.uri, auth=(args.username, args.password))
+    try:
+        def run(query: str, parameters: Optional[Dict[str, Any]] = None) -> List[Any]:
+            records, _, _ = driver.execute_query(query, parameters or {}, database_=args.database)
+            return records
+
+        # 比較のため索引を用意する（書き込み権限がなければ索引なしの版だけを計測）
+        try:
+            qa_cypher.migrate_qa_schema(lambda statement: run(statement))
+            run("CALL db.awaitIndexes(300)")
+        except Exception as e:
+            print(f"QA用の索引を作成できませんでした: {e}")
+        indexed = qa_cypher.qa_indexes_online(lambda statement: run(statement), key=(args.uri, args.database))
+
+        # 実在する関数名の一部（3〜6 文字）をキーワードにする。クエリ文が毎回変わるよう重複は除く
+        names = [r["name"] for r in run("MATCH (f:Function) RETURN f.name AS name LIMIT 10000") if r["name"]]
+        rng = random.Random(0)
+        keywords: List[str] = []
+        seen = set()
+        for _ in range(args.keywords * 20):
+            if len(keywords) >= args.keywords or not names:
+                break
+            name = rng.choice(names)
+            size = rng.randint(3, 6)
+            start = rng.randrange(max(len(name) - size, 0) + 1)
+            kw = name[start:start + size].lower()
+            if kw and kw not in seen:
+                seen.add(kw)
+                keywords.append(kw)
+        if not keywords:
+            keywords = [f"func{i}" for i in range(args.keywords)]
+
+        modes = [
+            ("interpolated", lambda kw: (_interpolated_lookup(kw, args.limit), {})),
+            ("parameterized", lambda kw: (qa_cypher.FUNCTION_LOOKUP_UNINDEXED, qa_cypher.keyword_params(kw, args.limit))),
+        ]
+        if indexed:
+            modes.append(
+                ("parameterized+index", lambda kw: (qa_cypher.FUNCTION_LOOKUP, qa_cypher.keyword_params(kw, args.limit)))
+            )
+        else:
+            print("影プロパティ/索引を作成できなかったため parameterized+index は省略します")
+
+        rows = []
+        for mode, build in modes:
+            try:
+                run("CALL db.clearQueryCaches()")
+            except Exception:
+                pass  # 権限がなければプランキャッシュを残したまま計測する
+            rounds = []
+            for _ in range(2):
+                samples = []
+                for kw in keywords:
+                    query, parameters = build(kw)
+                    t0 = time.perf_counter()
+                    run(query, parameters)
+                    samples.append((time.perf_counter() - t0) * 1000)
+                rounds.append(samples)
+            cold, warm = rounds
+            rows.append(
+                {
+                    "mode": mode,
+                    "keywords": len(keywords),
+                    "first_ms": f"{cold[0]:.1f}",
+                    "cold_median_ms": f"{statistics.median(cold):.1f}",
+                    "cold_p95_ms": f"{sorted(cold)[min(len(cold) - 1, int(len(cold) * 0.95))]:.1f}",
+                    "warm_median_ms": f"{statistics.median(warm):.1f}",
+                }
+            )
+        _print_table(rows)
+    finally:
+        driver.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="パフォーマンス計測")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_art = sub.add_parser("artifacts", help="前処理成果物の形式比較 (json / jsonl.gz)")
+    p_art.add_argument("--source", default="data/src/preprocessed", help="既存成果物のディレクトリ")
+    p_art.add_argument("--scale", type=int, default=1, help="トリプル/ノードの複製倍率")
+    p_art.add_argument("--repeat", type=int, default=5, help="計測回数（中央値を採用）")
+    p_art.set_defaults(func=bench_artifacts)
+
+    p_sparse = sub.add_parser("sparse-index", help="疎ベクトル索引のロード比較 (pickle / manifest+npy)")
+    p_sparse.add_argument("--docs", type=int, default=20000, help="文書数")
+    p_sparse.add_argument("--vocab", type=int, default=30000, help="語彙数")
+    p_sparse.add_argument("--doc-len", type=int, default=120, help="1文書あたりの語数")
+    p_sparse.add_argument("--repeat", type=int, default=3, help="計測回数（中央値を採用）")
+    p_sparse.set_defaults(func=bench_sparse_index)
+
+    p_fusion = sub.add_parser("fusion", help="検索結果統合の候補数別処理時間")
+    p_fusion.add_argument("--sizes", default="100,1000,10000", help="1ソースあたりの候補数（カンマ区切り）")
+    p_fusion.add_argument("--sources", type=int, default=4, help="統合するソース数（最大5）")
+    p_fusion.add_argument("--top-k", type=int, default=10)
+    p_fusion.add_argument("--repeat", type=int, default=7, help="計測回数（中央値を採用）")
+    p_fusion.set_defaults(func=bench_fusion)
+
+    p_whoosh = sub.add_parser("whoosh-build", help="Whoosh 索引のプロセス数別構築時間と差分更新")
+    p_whoosh.add_argument("--docs", type=int, default=20000, help="文書数")
+    p_whoosh.add_argument("--vocab", type=int, default=20000, help="語彙数")
+    p_whoosh.add_argument("--doc-len", type=int, default=80, help="1文書あたりの語数")
+    p_whoosh.add_argument("--procs", default="1,2,4", help="インデックス作成プロセス数（カンマ区切り）")
+    p_whoosh.add_argument("--limitmb", type=int, default=128, help="プロセスあたりのメモリ上限 (MB)")
+    p_whoosh.add_argument("--edits", type=int, default=20, help="差分更新する文書数")
+    p_whoosh.set_defaults(func=bench_whoosh_build)
+
+    p_paths = sub.add_parser("graph-paths", help="GraphPathRetriever の語数別レイテンシ（要 Neo4j）")
+    p_paths.add_argument("--query", required=True, help="空白区切りの検索語（先頭から 2..N 語で計測）")
+    p_paths.add_argument("--uri", default=os.getenv("NEO4J_URI", "bolt://localhost:7687"))
+    p_paths.add_argument("--username", default=os.getenv("NEO4J_USERNAME", "neo4j"))
+    p_paths.add_argument("--password", default=os.getenv("NEO4J_PASSWORD", "password"))
+    p_paths.add_argument("--database", default=os.getenv("NEO4J_DATABASE"))
+    p_paths.add_argument("--max-path-length", type=int, default=3)
+    p_paths.add_argument("--timeout", type=float, default=5.0, help="トランザクションタイムアウト（秒）")
+    p_paths.add_argument("--repeat", type=int, default=5, help="計測回数（中央値を採用）")
+    p_paths.set_defaults(func=bench_graph_paths)
+
+    p_es = sub.add_parser("elasticsearch", help="Elasticsearch のバルク投入と msearch の計測")
+    p_es.add_argument("--url", default=None, help="Elasticsearch の URL（未指定時はプロセス内の疑似クライアント）")
+    p_es.add_argument("--index", default="help_benchmark", help="計測用インデックス名（毎回作り直す）")
+    p_es.add_argument("--docs", type=int, default=5000, help="文書数")
+    p_es.add_argument("--vocab", type=int, default=5000, help="語彙数")
+    p_es.add_argument("--doc-len", type=int, default=60, help="1文書あたりの語数")
+    p_es.add_argument("--batch-sizes", default="100,500,2000", help="_bulk 1回あたりの文書数（カンマ区切り）")
+    p_es.add_argument("--queries", type=int, default=20, help="一括検索するクエリ数")
+    p_es.add_argument("--repeat", type=int, default=3, help="計測回数（中央値を採用）")
+    p_es.set_defaults(func=bench_elasticsearch)
+
+    p_qa = sub.add_parser("qa-cypher", help="QA 照会 Cypher の埋め込み/パラメータ化/索引別のプラン計測（要 Neo4j）")
+    p_qa.add_argument("--keywords", type=int, default=200, help="照会するキーワード数（1 巡目: 初回、2 巡目: 再実行）")
+    p_qa.add_argument("--limit", type=int, default=5)
+    p_qa.add_argument("--uri", default=os.getenv("NEO4J_URI", "bolt://localhost:7687"))
+    p_qa.add_argument("--username", default=os.getenv("NEO4J_USER", "neo4j"))
+    p_qa.add_argument("--password", default=os.getenv("NEO4J_PASSWORD", "password"))
+    p_qa.add_argument("--database", default=os.getenv("NEO4J_DATABASE", "docparser"))
+    p_qa.set_defaults(func=bench_qa_cypher)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+QA（main_0905）が Neo4j に直接発行する Cypher の定義
+
+キーワードは必ずパラメータ（$kw）で渡し、クエリ文字列を固定にする。
+文字列に埋め込むとキーワードごとに別クエリとして毎回プランが作られ、
+サーバーのプランキャッシュが効かない（インジェクションの危険もある）。
+
+照合は小文字化した影プロパティ（Function.name_lower / Parameter.parent_function_lower）
+と、その索引で行う。影プロパティと索引は doc_parser/neo4j_importer.py が投入時に作成し、
+既存データは migrate_qa_schema()（python doc_parser/neo4j_importer.py --migrate-qa-schema）
+で補完する。QA の照会経路はデータベースに書き込まず、qa_indexes_online() で索引の有無を
+確かめるだけで、索引が無ければ toLower() で照合する索引なしの版（*_UNINDEXED）を使う。
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+# キーワード（部分一致）に合う関数と、その引数
+FUNCTION_LOOKUP = (
+    "MATCH (f:Function) "
+    "WHERE f.name_lower CONTAINS $kw "
+    "OPTIONAL MATCH (p:Parameter) "
+    "WHERE p.parent_function_lower = f.name_lower "
+    "WITH f, collect(p) AS params "
+    "RETURN f.name AS name, f.description AS description, "
+    "[q IN params WHERE q.name IS NOT NULL | q] AS parameters, null AS return_value "
+    "LIMIT $limit"
+)
+FUNCTION_LOOKUP_UNINDEXED = (
+    "MATCH (f:Function) "
+    "WHERE toLower(f.name) CONTAINS $kw "
+    "OPTIONAL MATCH (p:Parameter) "
+    "WHERE toLower(p.parent_function) = toLower(f.name) "
+    "WITH f, collect(p) AS params "
+    "RETURN f.name AS name, f.description AS description, "
+    "[q IN params WHERE q.name IS NOT NULL | q] AS parameters, null AS return_value "
+    "LIMIT $limit"
+)
+
+# キーワードに一致する関数の件数（診断用）
+KEYWORD_MATCH_COUNT = "MATCH (f:Function) WHERE f.name_lower CONTAINS $kw RETURN count(f) AS c"
+KEYWORD_MATCH_COUNT_UNINDEXED = "MATCH (f:Function) WHERE toLower(f.name) CONTAINS $kw RETURN count(f) AS c"
+
+# 影プロパティの補完（未設定または元の値と食い違うノードのみ更新）
+BACKFILL_STATEMENTS = [
+    "MATCH (f:Function) WHERE f.name IS NOT NULL AND "
+    "(f.name_lower IS NULL OR f.name_lower <> toLower(f.name)) "
+    "SET f.name_lower = toLower(f.name)",
+    "MATCH (p:Parameter) WHERE p.parent_function IS NOT NULL AND "
+    "(p.parent_function_lower IS NULL OR p.parent_function_lower <> toLower(p.parent_function)) "
+    "SET p.parent_function_lower = toLower(p.parent_function)",
+]
+
+# 照合に使うプロパティの索引（CONTAINS はテキスト索引、等価比較は範囲索引が使われる）
+INDEX_STATEMENTS = [
+    "CREATE TEXT INDEX qa_function_name_lower IF NOT EXISTS FOR (f:Function) ON (f.name_lower)",
+    "CREATE INDEX qa_parameter_parent_function_lower IF NOT EXISTS FOR (p:Parameter) ON (p.parent_function_lower)",
+    "CREATE INDEX qa_function_name IF NOT EXISTS FOR (f:Function) ON (f.name)",
+]
+
+# QA の照会が使う索引（すべて ONLINE なら索引付きのクエリを使う）
+QA_INDEX_NAMES = ["qa_function_name_lower", "qa_parameter_parent_function_lower"]
+SHOW_QA_INDEXES = (
+    "SHOW INDEXES YIELD name, state "
+    f"WHERE name IN {json.dumps(QA_INDEX_NAMES)} RETURN name, state"
+)
+
+# 索引が ONLINE と確認できた接続先（確認できなかった結果はキャッシュしない）
+_indexes_online: Set[Any] = set()
+_indexes_lock = threading.Lock()
+
+
+def keyword_params(keyword: str, limit: int = 5) -> Dict[str, Any]:
+    """照合用のパラメータ（キーワードは影プロパティに合わせて小文字化）"""
+    return {"kw": (keyword or "").lower(), "limit": limit}
+
+
+def migrate_qa_schema(run: Callable[[str], Any]) -> None:
+    """既存データの影プロパティを補完し、索引を作成する（要書き込み権限）
+
+    投入時（doc_parser/neo4j_importer.py）や明示的な移行コマンドから呼ぶ。
+    QA の照会経路からは呼ばないこと。失敗時は例外をそのまま送出する。
+    run: Cypher を 1 文実行する関数（例: lambda q: session.run(q).consume()）
+    """
+    for statement in BACKFILL_STATEMENTS + INDEX_STATEMENTS:
+        run(statement)
+
+
+def qa_indexes_online(run: Callable[[str], Iterable[Any]], key: Any = None) -> bool:
+    """QA の照会が使う索引がすべて ONLINE か（読み取りのみ）
+
+    run: Cypher を 1 文実行してレコードを返す関数（例: lambda q: manager.run(q)）
+    True になった key はプロセス内で記憶し、以降は照会しない。
+    索引が無い・作成中・確認に失敗した場合は False を返し、記憶しない
+    （移行後や一時的な障害の回復後に再確認される）。
+    """
+    with _indexes_lock:
+        if key in _indexes_online:
+            return True
+    try:
+        states = {record["name"]: record["state"] for record in run(SHOW_QA_INDEXES)}
+    except Exception as e:
+        logger.warning(f"QA用の索引を確認できませんでした（索引なしで照会します）: {e}")
+        return False
+    online = all(states.get(name) == "ONLINE" for name in QA_INDEX_NAMES)
+    if online:
+        with _indexes_lock:
+            _indexes_online.add(key)
+    return online
+
+
+def function_lookup(indexed: bool) -> str:
+    return FUNCTION_LOOKUP if indexed else FUNCTION_LOOKUP_UNINDEXED
+
+
+def keyword_match_count(indexed: bool) -> str:
+    return KEYWORD_MATCH_COUNT if indexed else KEYWORD_MATCH_COUNT_UNINDEXED
+
+
+def describe_for_llm(keyword: str, limit: int = 5) -> str:
+    """LLM 向けグラフ質問に添える、固定の Cypher とパラメータ（JSON）の説明文"""
+    return (
+        f"{FUNCTION_LOOKUP_UNINDEXED}\n"
+        f"with parameters: {json.dumps(keyword_params(keyword, limit), ensure_ascii=False)}"
+    )
@@ -0,0 +1,5 @@
+"""Search utilities shared by help_preprocessor and mycode."""
+
+from .whoosh_pool import WhooshSearcherPool
+
+__all__ = ["WhooshSearcherPool"]
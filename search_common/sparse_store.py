@@ -0,0 +1,406 @@
+"""On-disk storage for sparse retrieval indexes.
+
+Besides the CSR helpers used for derived caches, this module defines a
+versioned index directory that replaces the joblib/pickle artifacts::
+
+    manifest.json            format name, version, document count, sections
+    documents.jsonl          one document dict per line
+    documents.offsets.npy    byte offsets into documents.jsonl (n_docs + 1)
+    tfidf.vocabulary.json    terms ordered by column index
+    tfidf.idf.npy            TfidfVectorizer.idf_
+    tfidf.term_doc.*.npy     L2-normalized TF-IDF matrix, terms x documents
+    bm25.vocabulary.json     BM25 terms ordered by row index
+    bm25.idf.npy / bm25.doc_lengths.npy
+    bm25.term_doc.*.npy      raw term frequencies, terms x documents
+
+Everything except the manifest and vocabularies is a plain ``.npy`` array
+that is memory-mapped on load, and documents are decoded only when a result
+actually references them. Nothing is unpickled.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import re
+from collections import Counter
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.preprocessing import normalize
+
+SPARSE_INDEX_FORMAT = "help-sparse-index"
+SPARSE_INDEX_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+DOCUMENTS_FILE = "documents.jsonl"
+DOCUMENT_OFFSETS_FILE = "documents.offsets.npy"
+
+BM25_TOKEN_RE = re.compile(r"\w+")
+
+# TfidfVectorizer parameters that survive a JSON round trip
+_VECTORIZER_PARAMS = (
+    "lowercase",
+    "strip_accents",
+    "token_pattern",
+    "ngram_range",
+    "analyzer",
+    "stop_words",
+    "norm",
+    "use_idf",
+    "smooth_idf",
+    "sublinear_tf",
+    "binary",
+)
+
+
+def save_csr(directory: Path, name: str, matrix: sparse.spmatrix) -> None:
+    """Persist a CSR matrix as three ``.npy`` arrays plus a small shape header.
+
+    The arrays are written uncompressed so that :func:`load_csr` can map them
+    into memory instead of reading them; the OS page cache is then shared by
+    every process that opens the same index.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    csr = sparse.csr_matrix(matrix)
+    csr.sort_indices()
+    np.save(directory / f"{name}.data.npy", csr.data.astype(np.float32, copy=False))
+    # scipy requires matching index dtypes; mismatches would force a copy on load
+    index_dtype = np.int32 if max(csr.nnz, *csr.shape) < np.iinfo(np.int32).max else np.int64
+    np.save(directory / f"{name}.indices.npy", csr.indices.astype(index_dtype, copy=False))
+    np.save(directory / f"{name}.indptr.npy", csr.indptr.astype(index_dtype, copy=False))
+    (directory / f"{name}.shape.json").write_text(
+        json.dumps({"shape": list(csr.shape)}), encoding="utf-8"
+    )
+
+
+def load_csr(directory: Path, name: str, *, mmap: bool = True) -> Optional[sparse.csr_matrix]:
+    """Load a matrix written by :func:`save_csr`, or ``None`` if it is missing."""
+    shape_path = directory / f"{name}.shape.json"
+    if not shape_path.exists():
+        return None
+    mode = "r" if mmap else None
+    shape = tuple(json.loads(shape_path.read_text(encoding="utf-8"))["shape"])
+    data = np.load(directory / f"{name}.data.npy", mmap_mode=mode)
+    indices = np.load(directory / f"{name}.indices.npy", mmap_mode=mode)
+    indptr = np.load(directory / f"{name}.indptr.npy", mmap_mode=mode)
+    matrix = sparse.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    matrix.has_sorted_indices = True
+    return matrix
+
+
+def file_signature(*paths: Path) -> Dict[str, int]:
+    """Size/mtime signature used to detect stale derived artifacts."""
+    signature: Dict[str, int] = {}
+    for path in paths:
+        stat = path.stat()
+        signature[f"{path.name}:size"] = stat.st_size
+        signature[f"{path.name}:mtime_ns"] = stat.st_mtime_ns
+    return signature
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the ``k`` highest scores in descending order.
+
+    Uses ``argpartition`` so only the selected candidates are sorted.
+    """
+    n = scores.shape[0]
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def bm25_tokenize(text: str) -> List[str]:
+    """Tokenizer shared by BM25 indexing and querying."""
+    return BM25_TOKEN_RE.findall(text.lower())
+
+
+class DocumentStore(Sequence):
+    """Read-only, lazily decoded view over ``documents.jsonl``."""
+
+    def __init__(self, directory: Path):
+        self._path = directory / DOCUMENTS_FILE
+        self._offsets = np.load(directory / DOCUMENT_OFFSETS_FILE, mmap_mode="r")
+        self._buffer: Optional[mmap.mmap] = None
+
+    def _data(self) -> mmap.mmap:
+        if self._buffer is None:
+            with open(self._path, "rb") as handle:
+                self._buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._buffer
+
+    def __len__(self) -> int:
+        return max(len(self._offsets) - 1, 0)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return json.loads(self._data()[start:end])
+
+
+def write_documents(directory: Path, documents: Iterable[Dict[str, Any]]) -> int:
+    """Write documents as JSONL plus an offsets array; returns the count."""
+    directory.mkdir(parents=True, exist_ok=True)
+    offsets = [0]
+    with open(directory / DOCUMENTS_FILE, "wb") as handle:
+        for doc in documents:
+            line = json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            handle.write(line + b"\n")
+            offsets.append(offsets[-1] + len(line) + 1)
+    np.save(directory / DOCUMENT_OFFSETS_FILE, np.asarray(offsets, dtype=np.int64))
+    return len(offsets) - 1
+
+
+def _vectorizer_params(vectorizer: TfidfVectorizer) -> Dict[str, Any]:
+    params = vectorizer.get_params()
+    for name in ("tokenizer", "preprocessor", "vocabulary"):
+        if params.get(name) is not None:
+            raise ValueError(
+                f"TfidfVectorizer with a custom {name!r} cannot be stored in a sparse index"
+            )
+    if not isinstance(params.get("analyzer"), str):
+        raise ValueError("TfidfVectorizer with a callable analyzer cannot be stored in a sparse index")
+    exported = {name: params[name] for name in _VECTORIZER_PARAMS}
+    if exported["stop_words"] is not None and not isinstance(exported["stop_words"], str):
+        exported["stop_words"] = sorted(exported["stop_words"])
+    exported["ngram_range"] = list(exported["ngram_range"])
+    return exported
+
+
+def _rebuild_vectorizer(
+    params: Dict[str, Any], terms: List[str], idf: Optional[np.ndarray]
+) -> TfidfVectorizer:
+    params = dict(params)
+    params["ngram_range"] = tuple(params["ngram_range"])
+    vectorizer = TfidfVectorizer(**params)
+    vectorizer.vocabulary_ = {term: idx for idx, term in enumerate(terms)}
+    if params.get("use_idf", True) and idf is not None:
+        vectorizer.idf_ = np.asarray(idf, dtype=np.float64)
+    return vectorizer
+
+
+def write_sparse_index(
+    directory: Path,
+    documents: Sequence,
+    *,
+    vectorizer: Optional[TfidfVectorizer] = None,
+    include_tfidf: bool = True,
+    include_bm25: bool = True,
+) -> Dict[str, Any]:
+    """Build a sparse index directory from document dicts with a ``content`` key.
+
+    ``vectorizer`` may be an already fitted TF-IDF vectorizer (e.g. when
+    converting a legacy index); otherwise one is fitted on the documents.
+    The manifest is written last, so a directory without one is incomplete.
+    Returns the manifest.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest_path = directory / MANIFEST_FILE
+    if manifest_path.exists():
+        manifest_path.unlink()
+
+    texts = [doc.get("content", "") for doc in documents]
+    n_docs = write_documents(directory, documents)
+    manifest: Dict[str, Any] = {
+        "format": SPARSE_INDEX_FORMAT,
+        "version": SPARSE_INDEX_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_docs": n_docs,
+    }
+
+    if include_tfidf:
+        if vectorizer is None:
+            vectorizer = TfidfVectorizer().fit(texts)
+        terms = [""] * len(vectorizer.vocabulary_)
+        for term, idx in vectorizer.vocabulary_.items():
+            terms[idx] = term
+        (directory / "tfidf.vocabulary.json").write_text(
+            json.dumps(terms, ensure_ascii=False), encoding="utf-8"
+        )
+        has_idf = bool(getattr(vectorizer, "use_idf", True))
+        if has_idf:
+            np.save(directory / "tfidf.idf.npy", np.asarray(vectorizer.idf_, dtype=np.float64))
+        doc_vectors = vectorizer.transform(texts)
+        if vectorizer.norm != "l2":
+            doc_vectors = normalize(doc_vectors, norm="l2", copy=False)
+        save_csr(directory, "tfidf.term_doc", sparse.csr_matrix(doc_vectors.T, dtype=np.float32))
+        manifest["tfidf"] = {
+            "params": _vectorizer_params(vectorizer),
+            "n_terms": len(terms),
+            "has_idf": has_idf,
+        }
+
+    if include_bm25:
+        vocab: Dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        values: List[float] = []
+        lengths = np.zeros(n_docs, dtype=np.float32)
+        for doc_idx, text in enumerate(texts):
+            tokens = bm25_tokenize(text)
+            lengths[doc_idx] = len(tokens)
+            for term, count in Counter(tokens).items():
+                rows.append(vocab.setdefault(term, len(vocab)))
+                cols.append(doc_idx)
+                values.append(count)
+        term_doc = sparse.csr_matrix(
+            (np.asarray(values, dtype=np.float32), (rows, cols)),
+            shape=(len(vocab), n_docs),
+        )
+        df = np.diff(term_doc.indptr)
+        idf = np.log((n_docs - df + 0.5) / (df + 0.5))
+        terms = [""] * len(vocab)
+        for term, idx in vocab.items():
+            terms[idx] = term
+        (directory / "bm25.vocabulary.json").write_text(
+            json.dumps(terms, ensure_ascii=False), encoding="utf-8"
+        )
+        np.save(directory / "bm25.idf.npy", idf.astype(np.float64))
+        np.save(directory / "bm25.doc_lengths.npy", lengths)
+        save_csr(directory, "bm25.term_doc", term_doc)
+        manifest["bm25"] = {
+            "n_terms": len(terms),
+            "avg_doc_length": float(lengths.mean()) if n_docs else 0.0,
+            "tokenizer": BM25_TOKEN_RE.pattern,
+        }
+
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    return manifest
+
+
+def convert_pickle_index(
+    vectorizer_path: Path, documents_path: Path, directory: Path
+) -> Dict[str, Any]:
+    """Convert a legacy joblib vectorizer + pickled documents into a sparse index.
+
+    Only run this on artifacts you produced yourself: loading them still
+    unpickles arbitrary objects.
+    """
+    import pickle
+
+    import joblib
+
+    vectorizer = joblib.load(vectorizer_path)
+    with open(documents_path, "rb") as handle:
+        documents = pickle.load(handle)
+    return write_sparse_index(directory, documents, vectorizer=vectorizer)
+
+
+def is_sparse_index(directory: Optional[Path]) -> bool:
+    return directory is not None and (Path(directory) / MANIFEST_FILE).exists()
+
+
+class SparseIndex:
+    """Memory-mapped reader for a directory written by :func:`write_sparse_index`."""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.documents = DocumentStore(self.directory)
+        self._vectorizer: Optional[TfidfVectorizer] = None
+        self._tfidf_term_doc: Optional[sparse.csr_matrix] = None
+        self._bm25: Optional[Dict[str, Any]] = None
+        self._bm25_norm_cache: Dict[tuple, np.ndarray] = {}
+
+    @classmethod
+    def load(cls, directory: Path) -> "SparseIndex":
+        directory = Path(directory)
+        manifest_path = directory / MANIFEST_FILE
+        if not manifest_path.exists():
+            raise FileNotFoundError(f"Sparse index manifest not found: {manifest_path}")
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        if manifest.get("format") != SPARSE_INDEX_FORMAT:
+            raise ValueError(f"Not a sparse index: {directory}")
+        if manifest.get("version") != SPARSE_INDEX_VERSION:
+            raise ValueError(
+                f"Unsupported sparse index version {manifest.get('version')} "
+                f"(expected {SPARSE_INDEX_VERSION}); rebuild the index"
+            )
+        return cls(directory, manifest)
+
+    @property
+    def n_docs(self) -> int:
+        return int(self.manifest["n_docs"])
+
+    # -- TF-IDF -----------------------------------------------------------
+
+    @property
+    def has_tfidf(self) -> bool:
+        return "tfidf" in self.manifest
+
+    @property
+    def vectorizer(self) -> TfidfVectorizer:
+        if self._vectorizer is None:
+            section = self.manifest["tfidf"]
+            terms = json.loads((self.directory / "tfidf.vocabulary.json").read_text(encoding="utf-8"))
+            idf = np.load(self.directory / "tfidf.idf.npy") if section.get("has_idf", True) else None
+            self._vectorizer = _rebuild_vectorizer(section["params"], terms, idf)
+        return self._vectorizer
+
+    @property
+    def tfidf_term_doc(self) -> sparse.csr_matrix:
+        if self._tfidf_term_doc is None:
+            self._tfidf_term_doc = load_csr(self.directory, "tfidf.term_doc")
+        return self._tfidf_term_doc
+
+    def tfidf_scores(self, query: str) -> np.ndarray:
+        """Cosine similarity of ``query`` against every document."""
+        query_vector = normalize(self.vectorizer.transform([query]), norm="l2")
+        return np.asarray((query_vector @ self.tfidf_term_doc).todense(), dtype=np.float32).ravel()
+
+    # -- BM25 -------------------------------------------------------------
+
+    @property
+    def has_bm25(self) -> bool:
+        return "bm25" in self.manifest
+
+    def _bm25_arrays(self) -> Dict[str, Any]:
+        if self._bm25 is None:
+            terms = json.loads((self.directory / "bm25.vocabulary.json").read_text(encoding="utf-8"))
+            self._bm25 = {
+                "vocab": {term: idx for idx, term in enumerate(terms)},
+                "idf": np.load(self.directory / "bm25.idf.npy", mmap_mode="r"),
+                "lengths": np.load(self.directory / "bm25.doc_lengths.npy", mmap_mode="r"),
+                "term_doc": load_csr(self.directory, "bm25.term_doc"),
+            }
+        return self._bm25
+
+    def bm25_scores(self, query: str, k1: float = 1.2, b: float = 0.75) -> np.ndarray:
+        """BM25 scores for every document (query terms counted with repetition)."""
+        arrays = self._bm25_arrays()
+        scores = np.zeros(self.n_docs, dtype=np.float64)
+        if not self.n_docs:
+            return scores
+
+        norm = self._bm25_norm_cache.get((k1, b))
+        if norm is None:
+            avg = self.manifest["bm25"].get("avg_doc_length") or 1.0
+            norm = k1 * (1 - b + b * np.asarray(arrays["lengths"], dtype=np.float64) / avg)
+            self._bm25_norm_cache[(k1, b)] = norm
+
+        term_doc = arrays["term_doc"]
+        for term, query_tf in Counter(bm25_tokenize(query)).items():
+            row = arrays["vocab"].get(term)
+            if row is None:
+                continue
+            start, end = term_doc.indptr[row], term_doc.indptr[row + 1]
+            doc_idx = term_doc.indices[start:end]
+            tf = term_doc.data[start:end].astype(np.float64)
+            scores[doc_idx] += query_tf * arrays["idf"][row] * (
+                tf * (k1 + 1) / (tf + norm[doc_idx])
+            )
+        return scores
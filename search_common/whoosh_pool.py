@@ -0,0 +1,157 @@
+"""Pooled Whoosh searchers shared by the help retriever and mycode's WhooshSearch."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+
+class WhooshSearcherPool:
+    """Bounded pool of Whoosh searchers over one index, refreshed on new commits.
+
+    Whoosh searchers are not thread-safe, so each search checks one out with
+    ``with pool.searcher() as searcher:`` and returns it afterwards; threads
+    that come and go (one executor per query) reuse the same few searchers.
+    At most ``max_searchers`` are open at once; further callers wait for one
+    to be returned. On checkout, at most every ``refresh_interval`` seconds,
+    an idle searcher is swapped for ``searcher.refresh()`` if the index
+    generation changed, which reuses the readers of unchanged segments.
+    Query parsers (one per field set) and parsed queries, kept in a small
+    LRU, are shared by all threads.
+    """
+
+    def __init__(
+        self,
+        index_dir: Path,
+        refresh_interval: float = 1.0,
+        query_cache_size: int = 256,
+        max_searchers: int = 8,
+    ):
+        self.index_dir = Path(index_dir)
+        self.refresh_interval = refresh_interval
+        self.query_cache_size = query_cache_size
+        self.max_searchers = max_searchers
+        self._index = None
+        self._epoch = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_searchers)
+        self._parser_lock = threading.Lock()
+        self._parsers: Dict[Tuple[str, ...], Any] = {}
+        # Idle searchers as (searcher, checked_at, epoch); most recently returned last
+        self._idle: List[Tuple[Any, float, int]] = []
+        self._queries: "OrderedDict[Tuple[Tuple[str, ...], str], Any]" = OrderedDict()
+
+    def get_index(self):
+        """Open the index once (shared by all threads)."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    try:
+                        from whoosh import index
+                        self._index = index.open_dir(str(self.index_dir))
+                    except ImportError as exc:
+                        raise ImportError("Whoosh package required. Install with: pip install whoosh") from exc
+                    except Exception as exc:
+                        raise RuntimeError(f"Failed to open Whoosh index at {self.index_dir}") from exc
+        return self._index
+
+    @contextmanager
+    def searcher(self) -> Iterator[Any]:
+        """Check out a searcher for the duration of the ``with`` block."""
+        self._slots.acquire()
+        try:
+            searcher, checked_at, epoch, generation = self._checkout()
+            try:
+                yield searcher
+            finally:
+                self._checkin(searcher, checked_at, epoch, generation)
+        finally:
+            self._slots.release()
+
+    def _checkout(self) -> Tuple[Any, float, int, int]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._idle.pop() if self._idle else None
+            epoch, generation = self._epoch, self._generation
+        if entry is None:
+            return self.get_index().searcher(), now, epoch, generation
+        searcher, checked_at, searcher_epoch = entry
+        if now - checked_at >= self.refresh_interval or searcher_epoch != epoch:
+            checked_at = now
+            if not searcher.up_to_date():
+                # refresh() closes what the new searcher does not reuse,
+                # so the old one is dropped rather than closed
+                searcher = searcher.refresh()
+        return searcher, checked_at, epoch, generation
+
+    def _checkin(self, searcher, checked_at: float, epoch: int, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._idle.append((searcher, checked_at, epoch))
+                return
+        # The pool was closed while this searcher was checked out
+        try:
+            searcher.close()
+        except Exception:
+            pass
+
+    def mark_stale(self):
+        """Make every pooled searcher check for a new index generation on its next checkout.
+
+        Call after committing to the index from this process.
+        """
+        with self._lock:
+            self._epoch += 1
+
+    def parse(self, fields: Sequence[str], text: str):
+        """Parse ``text`` against ``fields``, reusing cached query objects."""
+        from whoosh.qparser import MultifieldParser, QueryParser
+
+        key = (tuple(fields), text)
+        with self._lock:
+            query = self._queries.get(key)
+            if query is not None:
+                self._queries.move_to_end(key)
+                return query
+        # One parser per field set, built for the current schema and used by one thread at a time
+        with self._parser_lock:
+            parser = self._parsers.get(key[0])
+            if parser is None:
+                schema = self.get_index().schema
+                parser = (
+                    QueryParser(fields[0], schema)
+                    if len(fields) == 1
+                    else MultifieldParser(list(fields), schema)
+                )
+                self._parsers[key[0]] = parser
+            query = parser.parse(text)
+        with self._lock:
+            self._queries[key] = query
+            while len(self._queries) > self.query_cache_size:
+                self._queries.popitem(last=False)
+        return query
+
+    def close(self):
+        """Close the idle searchers and forget the index.
+
+        Searchers checked out at the time are closed when they are returned.
+        """
+        with self._lock:
+            idle = self._idle
+            self._idle = []
+            self._generation += 1
+            self._queries.clear()
+            self._index = None
+        with self._parser_lock:
+            # A rebuilt index may have a different schema
+            self._parsers.clear()
+        for searcher, _, _ in idle:
+            try:
+                searcher.close()
+            except Exception:
+                pass
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+from help_preprocessor.retrieval.answer_cache import SemanticAnswerCache, routed_fingerprint
+
+
+def _embed(texts: list[str]) -> list[list[float]]:
+    # Bag of words over a tiny vocabulary; word order and punctuation do not matter.
+    vocab = ["hull", "surface", "create", "export", "dxf", "how", "to", "a", "drawings"]
+    vectors = []
+    for text in texts:
+        words = text.lower().replace("?", "").split()
+        vectors.append([float(words.count(word)) for word in vocab])
+    return vectors
+
+
+def test_near_duplicate_question_hits(tmp_path) -> None:
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite3", _embed, threshold=0.9)
+    cache.store("how to create a hull surface", "Use the hull tool.", ["vector:a:0"])
+
+    hit = cache.lookup("create a hull surface how to?")
+    assert hit is not None
+    assert hit.answer == "Use the hull tool."
+    assert hit.context_ids == ["vector:a:0"]
+    assert cache.lookup("export drawings to dxf") is None
+    assert cache.stats["hits"] == 1 and cache.stats["misses"] == 1
+
+
+def test_entries_survive_reopen(tmp_path) -> None:
+    path = tmp_path / "answers.sqlite3"
+    SemanticAnswerCache(path, _embed).store("export drawings to dxf", "File > Export.", ["graph:b"])
+
+    reopened = SemanticAnswerCache(path, _embed)
+    assert len(reopened) == 1
+    assert reopened.lookup("export drawings to dxf").answer == "File > Export."
+    assert len(SemanticAnswerCache(path, _embed, namespace="other")) == 0
+
+
+def test_changed_context_invalidates_entry(tmp_path) -> None:
+    store = {"a:0": "create hull surfaces", "b": "export"}
+    cache = SemanticAnswerCache(
+        tmp_path / "answers.sqlite3",
+        _embed,
+        fingerprint_fn=routed_fingerprint({
+            "vector": lambda ids: repr([store.get(i) for i in sorted(ids)]),
+        }),
+    )
+    cache.store("how to create a hull surface", "Use the hull tool.", ["vector:a:0", "graph:b"])
+    assert cache.lookup("how to create a hull surface") is not None
+
+    store["b"] = "export v2"  # not a vector id, so not part of the fingerprint
+    assert cache.lookup("how to create a hull surface") is not None
+
+    store["a:0"] = "create hull surfaces from curves"
+    assert cache.lookup("how to create a hull surface") is None
+    assert cache.stats["stale"] == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_and_eviction(tmp_path) -> None:
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite3", _embed, max_entries=2)
+    cache.store("create a hull surface", "1", ["vector:a"])
+    cache.store("export drawings to dxf", "2", ["vector:b"])
+    cache.store("how to export", "3", ["vector:c"])
+    assert len(cache) == 2
+    assert cache.lookup("create a hull surface") is None
+
+    assert cache.invalidate(["vector:b"]) == 1
+    assert [cache.lookup("how to export").answer] == ["3"]
+
+
+def test_key_must_match(tmp_path) -> None:
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite3", _embed, threshold=0.9)
+    cache.store("how to create a hull surface", "Use the hull tool.", ["vector:a"], key="hull")
+
+    assert cache.lookup("how to create a hull surface") is None
+    assert cache.lookup("how to create a hull surface", key="surface") is None
+    assert cache.lookup("how to create a hull surface", key="hull").answer == "Use the hull tool."
+
+
+def test_cache_without_key_column_is_migrated(tmp_path) -> None:
+    import sqlite3
+
+    path = tmp_path / "answers.sqlite3"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE answers (id INTEGER PRIMARY KEY AUTOINCREMENT, namespace TEXT NOT NULL,"
+        " question TEXT NOT NULL, embedding BLOB NOT NULL, answer TEXT NOT NULL, context_ids TEXT NOT NULL,"
+        " fingerprint TEXT, created_at REAL NOT NULL, last_hit_at REAL NOT NULL, hits INTEGER NOT NULL DEFAULT 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    cache = SemanticAnswerCache(path, _embed)
+    cache.store("export drawings to dxf", "File > Export.", ["vector:b"], key="dxf")
+    assert cache.lookup("export drawings to dxf", key="dxf").answer == "File > Export."
+
+
+def test_min_similarity_raises_threshold(tmp_path) -> None:
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite3", _embed, threshold=0.9)
+    cache.store("how to create a hull surface", "Use the hull tool.", ["vector:a"])
+
+    assert cache.lookup("how to create a hull surface a") is not None  # cosine ~0.95
+    assert cache.lookup("how to create a hull surface a", min_similarity=0.97) is None
+    assert cache.lookup("how to create a hull surface a", min_similarity=0.5) is not None
+
+
+def test_rag_chain_scopes_cache_entries_by_query_terms(tmp_path) -> None:
+    from help_preprocessor.retrieval.langchain_integration import HelpRAGChain
+
+    cache = SemanticAnswerCache(tmp_path / "answers.sqlite3", _embed, threshold=0.9)
+    chain = HelpRAGChain(hybrid_retriever=None, answer_cache=cache, unscoped_cache_threshold=0.97)
+    result = {"answer": "Use CreatePlate.", "source_documents": [{"metadata": {"id": "vector:a"}}]}
+    chain._remember("how to create a hull surface with CreatePlate", result)
+    chain._remember("how to create a hull surface", {**result, "answer": "Use the hull tool."})
+
+    # Same embedding, different API name: not shared
+    assert chain._cached_result("how to create a hull surface with CreateSolid") is None
+    hit = chain._cached_result("With CreatePlate: how to create a hull surface?")
+    assert hit["answer"] == "Use CreatePlate." and hit["retrieval_method"] == "answer_cache"
+    # Without identifier terms only very close paraphrases hit
+    assert chain._cached_result("create a hull surface how to") is not None
+    assert chain._cached_result("how to create a hull surface a") is None
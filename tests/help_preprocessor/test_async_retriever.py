@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from help_preprocessor.retrieval.base import BaseRetriever, QueryContext, SearchResult
+from help_preprocessor.retrieval.fusion import ReciprocalRankFusion
+from help_preprocessor.retrieval.hybrid_retriever import HybridRetriever, HybridRetrieverConfig
+from help_preprocessor.retrieval.parallel_retriever import AsyncRetriever
+
+
+class _AsyncFake(BaseRetriever):
+    def __init__(self, name: str, delay: float = 0.01) -> None:
+        self.name = name
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.cancelled = 0
+
+    def search(self, context: QueryContext) -> list[SearchResult]:
+        return [SearchResult(id=f"{self.name}-0", content="", score=0.5, source=self.name, metadata={})]
+
+    async def asearch(self, context: QueryContext) -> list[SearchResult]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+        return self.search(context)
+
+    def get_name(self) -> str:
+        return self.name
+
+
+def test_async_search_limits_concurrency_per_backend() -> None:
+    dense = _AsyncFake("dense")
+    retriever = AsyncRetriever({"dense": dense}, max_concurrency={"dense": 2})
+    context = QueryContext(query="plate")
+
+    async def run() -> tuple[list[SearchResult], list[SearchResult], int, list[SearchResult]]:
+        with pytest.raises(RuntimeError):
+            retriever.search(context)  # blocking entry point is refused inside a loop
+        return await asyncio.gather(*(retriever.async_search(context) for _ in range(6)))
+
+    batches = asyncio.run(run())
+
+    assert all(len(results) == 1 for results in batches)
+    assert dense.peak == 2
+
+
+def test_async_search_times_out_and_cancels() -> None:
+    slow = _AsyncFake("graph_neo4j", delay=5.0)
+    fast = _AsyncFake("sparse_bm25")
+    retriever = AsyncRetriever({"graph_neo4j": slow, "sparse_bm25": fast}, timeout_seconds=0.05)
+    context = QueryContext(query="plate")
+
+    results = asyncio.run(retriever.async_search(context))
+    assert [r.id for r in results] == ["sparse_bm25-0"]
+    assert slow.cancelled == 1
+
+    async def cancel_midway() -> None:
+        task = asyncio.create_task(AsyncRetriever({"graph_neo4j": slow}).async_search(context))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_midway())
+    assert slow.cancelled == 2
+
+
+class _BlockingFake(BaseRetriever):
+    """Blocking backend (default ``asearch``) that hangs until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def search(self, context: QueryContext) -> list[SearchResult]:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            self.release.wait(5)
+        finally:
+            with self._lock:
+                self.active -= 1
+        return [SearchResult(id="graph-0", content="", score=0.5, source="graph", metadata={})]
+
+    def get_name(self) -> str:
+        return "graph"
+
+
+def test_timed_out_thread_keeps_its_slot_until_it_returns() -> None:
+    graph = _BlockingFake()
+    retriever = AsyncRetriever({"graph": graph}, max_concurrency=1, timeout_seconds=0.05)
+    context = QueryContext(query="plate")
+
+    async def run() -> tuple[list[SearchResult], list[SearchResult], int, list[SearchResult]]:
+        first = await retriever.async_search(context)  # times out, thread still blocked
+        second = await retriever.async_search(context)  # no free slot within its timeout
+        calls_while_stuck = graph.calls
+        graph.release.set()
+        while graph.active:
+            await asyncio.sleep(0.01)
+        third = await retriever.async_search(context)
+        return first, second, calls_while_stuck, third
+
+    first, second, calls_while_stuck, third = asyncio.run(run())
+
+    assert first == [] and second == []
+    assert calls_while_stuck == 1
+    assert [r.id for r in third] == ["graph-0"]
+    assert graph.peak == 1
+
+
+def test_hybrid_asearch_fuses_backends() -> None:
+    hybrid = HybridRetriever(
+        HybridRetrieverConfig(enable_dense=False, enable_sparse=False, enable_fulltext=False, enable_graph=False)
+    )
+    hybrid.retrievers = {"dense": _AsyncFake("dense"), "sparse_bm25": _AsyncFake("sparse_bm25")}
+    hybrid.fusion_engine = ReciprocalRankFusion()
+
+    results = asyncio.run(hybrid.asearch(QueryContext(query="plate", top_k=5)))
+
+    assert {r.id for r in results} == {"dense-0", "sparse_bm25-0"}
+    assert all(r.source == "fusion_rrf" for r in results)
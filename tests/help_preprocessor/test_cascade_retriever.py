@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import time
+
+from help_preprocessor.retrieval.base import BaseRetriever, QueryContext, SearchResult
+from help_preprocessor.retrieval.enhanced_retriever import CascadeConfig, CascadeRetriever
+from help_preprocessor.retrieval.fusion import ReciprocalRankFusion
+from help_preprocessor.retrieval.hybrid_retriever import HybridRetriever, HybridRetrieverConfig
+
+
+class _FakeRetriever(BaseRetriever):
+    def __init__(self, name: str, scores: list[float], delay: float = 0.0) -> None:
+        self.name = name
+        self.scores = scores
+        self.delay = delay
+        self.calls = 0
+
+    def search(self, context: QueryContext) -> list[SearchResult]:
+        self.calls += 1
+        time.sleep(self.delay)
+        return [
+            SearchResult(id=f"{self.name}-{i}", content="", score=score, source=self.name, metadata={})
+            for i, score in enumerate(self.scores)
+        ]
+
+    def get_name(self) -> str:
+        return self.name
+
+
+def _cascade(retrievers: dict[str, BaseRetriever], **config) -> CascadeRetriever:
+    hybrid = HybridRetriever(
+        HybridRetrieverConfig(enable_dense=False, enable_sparse=False, enable_fulltext=False, enable_graph=False)
+    )
+    hybrid.retrievers = retrievers
+    hybrid.fusion_engine = ReciprocalRankFusion()
+    return CascadeRetriever(hybrid, CascadeConfig(**config))
+
+
+def test_confident_cheap_tier_skips_expensive_retrievers() -> None:
+    bm25 = _FakeRetriever("sparse_bm25", [0.9, 0.4, 0.3])
+    dense = _FakeRetriever("dense", [0.8, 0.7, 0.6])
+    cascade = _cascade({"sparse_bm25": bm25, "dense": dense})
+
+    results = cascade.search(QueryContext(query="plate", top_k=3))
+
+    assert [r.id for r in results] == ["sparse_bm25-0", "sparse_bm25-1", "sparse_bm25-2"]
+    assert dense.calls == 0
+    stats = cascade.get_cascade_stats()
+    assert stats["queries"] == 1
+    assert stats["tiers"][0]["stopped_here"] == 1
+
+
+def test_weak_results_escalate_and_slow_retrievers_are_dropped() -> None:
+    bm25 = _FakeRetriever("sparse_bm25", [0.1])
+    dense = _FakeRetriever("dense", [0.8, 0.7, 0.6])
+    graph = _FakeRetriever("graph_neo4j", [0.9], delay=0.5)
+    cascade = _cascade(
+        {"sparse_bm25": bm25, "dense": dense, "graph_neo4j": graph},
+        tiers=[["sparse_bm25"], ["graph_neo4j"], ["dense"]],
+        stage_budgets_ms=[200.0, 20.0, 200.0],
+    )
+
+    results = cascade.search(QueryContext(query="plate", top_k=3))
+
+    assert dense.calls == 1
+    assert {r.id for r in results} >= {"dense-0", "sparse_bm25-0"}
+    assert not any(r.id.startswith("graph") for r in results)
+    stats = cascade.get_cascade_stats()
+    assert [tier["reached"] for tier in stats["tiers"]] == [1, 1, 1]
+    assert stats["tiers"][1]["timeouts"] == 1
+
+
+def test_real_bm25_is_judged_on_raw_scores(tmp_path) -> None:
+    import pickle
+
+    from help_preprocessor.retrieval.sparse_retriever import BM25Retriever
+
+    documents = [
+        {"id": "deck", "content": "ship deck plate layout"},
+        {"id": "girder", "content": "girder web and flange"},
+        {"id": "hull", "content": "hull surface from curves"},
+        {"id": "export", "content": "export drawings to dxf"},
+    ]
+    with open(tmp_path / "documents.pkl", "wb") as handle:
+        pickle.dump(documents, handle)
+    query = QueryContext(query="ship deck girder", top_k=3)
+
+    # Rescaled scores always put the leader at 1.0; the raw BM25 scores of this
+    # tiny corpus are weak, so the cascade must escalate to the dense tier.
+    dense = _FakeRetriever("dense", [0.8, 0.7, 0.6])
+    cascade = _cascade({"sparse_bm25": BM25Retriever(documents_path=tmp_path / "documents.pkl"), "dense": dense})
+    cascade.search(query)
+    assert dense.calls == 1
+
+    lenient = _FakeRetriever("dense", [0.8, 0.7, 0.6])
+    cascade = _cascade(
+        {"sparse_bm25": BM25Retriever(documents_path=tmp_path / "documents.pkl"), "dense": lenient},
+        source_min_top_score={"sparse_bm25": 0.5},
+        min_results=2,
+    )
+    cascade.search(query)
+    assert lenient.calls == 0
+
+
+def test_tiers_share_one_worker_pool_across_queries() -> None:
+    import threading
+
+    bm25 = _FakeRetriever("sparse_bm25", [0.1])
+    dense = _FakeRetriever("dense", [0.1])
+    slow = _FakeRetriever("graph_neo4j", [0.9], delay=0.2)
+    cascade = _cascade(
+        {"sparse_bm25": bm25, "dense": dense, "graph_neo4j": slow},
+        stage_budgets_ms=[100.0, 100.0, 10.0],
+        max_workers=4,
+    )
+    baseline = threading.active_count()
+
+    for _ in range(10):
+        cascade.search(QueryContext(query="plate", top_k=3))
+
+    assert threading.active_count() - baseline <= 4
+    assert cascade.get_cascade_stats()["tiers"][2]["timeouts"] >= 1
+    cascade.close()
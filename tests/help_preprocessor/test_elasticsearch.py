@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from help_preprocessor.retrieval.base import QueryContext
+from help_preprocessor.retrieval.fulltext_retriever import ElasticsearchRetriever
+from help_preprocessor.storage.elasticsearch_loader import HelpElasticsearchLoader
+from help_preprocessor.storage.elasticsearch_memory import InMemoryElasticsearch
+
+
+def _chunks() -> list[dict]:
+    return [
+        {"id": "a:0", "text": "create a hull surface from curves", "metadata": {"section_id": "a", "title": "Hull"}},
+        {"id": "b:0", "text": "export drawings to dxf", "metadata": {"section_id": "b", "title": "Export"}},
+        {"id": "c:0", "text": "mirror a hull plate", "metadata": {"section_id": "c", "title": "Mirror"}},
+    ]
+
+
+def test_bulk_loader_batches_and_refreshes_once() -> None:
+    client = InMemoryElasticsearch()
+    loader = HelpElasticsearchLoader("help", client=client, batch_size=2)
+
+    stats = loader.upsert(_chunks())
+
+    assert stats["documents"] == 3
+    assert stats["batches"] == 2
+    assert stats["errors"] == 0
+    assert [name for name, _ in client.requests] == ["bulk", "bulk"]
+    assert client.count(index="help")["count"] == 3
+
+
+def test_bulk_loader_without_refresh_keeps_documents_hidden() -> None:
+    client = InMemoryElasticsearch()
+    loader = HelpElasticsearchLoader("help", client=client, refresh=False)
+
+    loader.upsert(_chunks())
+    assert client.count(index="help")["count"] == 0
+
+    loader.refresh_index()
+    assert client.count(index="help")["count"] == 3
+
+
+def test_retriever_search_and_msearch_agree() -> None:
+    client = InMemoryElasticsearch()
+    HelpElasticsearchLoader("help", client=client).upsert(_chunks())
+    retriever = ElasticsearchRetriever(index_name="help", client=client)
+
+    contexts = [QueryContext(query="hull", top_k=5), QueryContext(query="export", top_k=5)]
+    batched = retriever.search_batch(contexts)
+
+    assert [[r.id for r in results] for results in batched] == [
+        [r.id for r in retriever.search(context)] for context in contexts
+    ]
+    assert {r.id for r in batched[0]} == {"a:0", "c:0"}
+    assert ("msearch", 2) in client.requests
+
+
+def test_retriever_fuzziness_and_filters() -> None:
+    client = InMemoryElasticsearch()
+    HelpElasticsearchLoader("help", client=client).upsert(_chunks())
+
+    fuzzy = ElasticsearchRetriever(index_name="help", client=client)
+    exact = ElasticsearchRetriever(index_name="help", client=client, fuzziness=None)
+    typo = QueryContext(query="exprot", top_k=5)
+
+    assert [r.id for r in fuzzy.search(typo)] == ["b:0"]
+    assert exact.search(typo) == []
+
+    filtered = fuzzy.search(QueryContext(query="hull", top_k=5, filters={"section_id": "c"}))
+    assert [r.id for r in filtered] == ["c:0"]
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+
+import pytest
+
+from help_preprocessor.retrieval.base import QueryContext, SearchResult
+from help_preprocessor.retrieval.fusion import (
+    BordaCountFusion,
+    ReciprocalRankFusion,
+    WeightedSumFusion,
+)
+
+
+def _result(doc_id: str, score: float, source: str) -> SearchResult:
+    return SearchResult(id=doc_id, content=doc_id.upper(), score=score, source=source, metadata={"doc": doc_id})
+
+
+def _naive_scores(method: str, results_by_source: dict[str, list[SearchResult]]) -> dict[str, float]:
+    """Reference implementation using plain dict accumulation."""
+    scores: dict[str, float] = defaultdict(float)
+    for source, results in results_by_source.items():
+        if method == "rrf":
+            for rank, result in enumerate(results, 1):
+                scores[result.id] += 1.0 / (60 + rank)
+        elif method == "borda":
+            for rank, result in enumerate(results):
+                scores[result.id] += len(results) - rank
+        else:
+            top = max(r.score for r in results)
+            low = min(r.score for r in results)
+            span = top - low if top > low else 1.0
+            weight = WeightedSumFusion().source_weights.get(source, 1.0)
+            for result in results:
+                scores[result.id] += (result.score - low) / span * weight
+    if method == "borda":
+        best = max(scores.values())
+        return {doc_id: score / best for doc_id, score in scores.items()}
+    return dict(scores)
+
+
+def test_rrf_orders_by_fused_rank_and_keeps_first_metadata() -> None:
+    results = {
+        "dense": [_result("a", 0.9, "dense"), _result("b", 0.8, "dense")],
+        "sparse_bm25": [_result("b", 0.7, "sparse_bm25"), _result("c", 0.6, "sparse_bm25")],
+    }
+
+    fused = ReciprocalRankFusion().fuse_results(results, QueryContext(query="q", top_k=2))
+
+    assert [r.id for r in fused] == ["b", "a"]
+    assert fused[0].score == pytest.approx(1 / 62 + 1 / 61)
+    assert fused[0].metadata["original_source"] == "dense"
+    assert fused[0].metadata["original_score"] == 0.8
+    assert fused[1].source == "fusion_rrf"
+
+
+def test_ties_keep_first_seen_order() -> None:
+    results = {
+        "dense": [_result("a", 0.9, "dense")],
+        "sparse_bm25": [_result("b", 0.9, "sparse_bm25")],
+        "fulltext_whoosh": [_result("c", 0.9, "fulltext_whoosh")],
+    }
+
+    fused = BordaCountFusion().fuse_results(results, QueryContext(query="q", top_k=2))
+
+    assert [r.id for r in fused] == ["a", "b"]
+
+
+@pytest.mark.parametrize(
+    ("method", "fusion"),
+    [("rrf", ReciprocalRankFusion()), ("borda", BordaCountFusion()), ("weighted", WeightedSumFusion())],
+)
+def test_fusion_matches_reference_on_random_lists(method, fusion) -> None:
+    rng = random.Random(7)
+    results = {}
+    for source in ("dense", "sparse_bm25", "graph_neo4j"):
+        ids = rng.sample([f"d{i}" for i in range(300)], 120)
+        results[source] = [_result(doc_id, rng.random(), source) for doc_id in ids]
+
+    fused = fusion.fuse_results(results, QueryContext(query="q", top_k=20))
+    expected = _naive_scores(method, results)
+    ranked = sorted(expected, key=lambda doc_id: expected[doc_id], reverse=True)[:20]
+
+    assert [r.id for r in fused] == ranked
+    for result in fused:
+        raw = expected[result.id]
+        assert result.score == pytest.approx(raw if raw <= 1 else min(raw, 10.0) / 10.0)
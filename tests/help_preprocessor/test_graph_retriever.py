@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+from help_preprocessor.retrieval.base import QueryContext
+from help_preprocessor.retrieval.graph_retriever import (
+    GraphPathRetriever,
+    Neo4jGraphRetriever,
+    to_lucene_query,
+)
+
+
+class _Record:
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+
+    def data(self) -> dict[str, Any]:
+        return dict(self._data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+
+class _StubSession:
+    def __init__(self, driver: "_StubDriver") -> None:
+        self.driver = driver
+
+    def run(self, query: Any, parameters: dict[str, Any] | None = None) -> list[_Record]:
+        self.driver.timeouts.append(getattr(query, "timeout", None))
+        text = getattr(query, "text", query)
+        return [_Record(row) for row in self.driver.handle(text, parameters or {})]
+
+    def __enter__(self) -> "_StubSession":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+class _StubDriver:
+    def __init__(self, fulltext: bool) -> None:
+        self.fulltext = fulltext
+        self.queries: list[str] = []
+        self.threads: set[int] = set()
+        self.timeouts: list[float | None] = []
+        self.session_count = 0
+        self._lock = threading.Lock()
+
+    def session(self, database: str | None = None) -> _StubSession:
+        self.session_count += 1
+        return _StubSession(self)
+
+    def close(self) -> None:
+        return None
+
+    def handle(self, query: str, parameters: dict[str, Any]) -> list[dict[str, Any]]:
+        with self._lock:
+            self.queries.append(query)
+            self.threads.add(threading.get_ident())
+        if "CREATE FULLTEXT INDEX" in query:
+            if not self.fulltext:
+                raise RuntimeError("full-text indexes not supported")
+            return []
+        if "SHOW FULLTEXT INDEXES" in query:
+            return [{"name": name, "state": "ONLINE"} for name in parameters["names"]]
+        topic = {"source_path": "a.html", "section_count": 2}
+        if "UNWIND $pairs" in query:
+            return [
+                {"term1": a, "term2": b, "path_length": 2, "start_title": a, "end_title": b, "score": 1 / 3}
+                for a, b in parameters["pairs"]
+            ]
+        if "db.index.vector.queryNodes" in query:
+            assert parameters["embedding"] == [1.0, 0.0]
+            return [{"id": "t4", "title": "Hull plate", "score": 0.9, **topic}][: parameters["k"]]
+        if "$index" not in query and "db.index.fulltext" not in query:
+            if "cat.name" in query and "topic1" not in query:
+                return [{"id": "t2", "title": "Plate", "category_name": "Plate tools", "score": 0.8, **topic}]
+            if "topic1" in query:
+                return []
+            return [{"id": "t1", "title": "Create plate", "score": 0.9, **topic}]
+        if parameters["index"] == "help_category_name":
+            return [{"id": "t2", "title": "Plate", "category_name": "Plate tools", "score": 2.0, **topic}]
+        if "topic1" in query:
+            return [{"id": "t3", "title": "Edit plate", "category_name": "Plate tools", "score": 4.0, **topic}]
+        return [
+            {"id": "t1", "title": "Create plate", "score": 8.0, **topic},
+            {"id": "t2", "title": "Plate", "score": 4.0, **topic},
+        ]
+
+
+def _retriever(driver: _StubDriver, **kwargs: Any) -> Neo4jGraphRetriever:
+    retriever = Neo4jGraphRetriever("bolt://localhost", "neo4j", "password", **kwargs)
+    retriever._driver = driver
+    return retriever
+
+
+def test_lucene_query_escapes_special_characters() -> None:
+    assert to_lucene_query("plate (a+b) x:y") == r"plate \(a\+b\) x\:y"
+
+
+def test_graph_retriever_uses_fulltext_indexes_and_reports_timings() -> None:
+    driver = _StubDriver(fulltext=True)
+    retriever = _retriever(driver)
+
+    results = retriever.search(QueryContext(query="Plate", top_k=5))
+
+    assert [result.id for result in results] == ["t1", "t2", "t3"]
+    assert results[0].score == 1.0
+    assert results[1].score == 0.8  # best of title (0.5) and category (0.8)
+    assert not any("CONTAINS" in query for query in driver.queries)
+    assert set(retriever.last_strategy_timings) == {
+        "topic_title",
+        "category_name",
+        "related_topics",
+        "content_similarity",
+    }
+    assert "strategy_ms" in results[0].metadata
+
+
+def test_graph_retriever_falls_back_to_contains_without_indexes() -> None:
+    driver = _StubDriver(fulltext=False)
+    retriever = _retriever(driver)
+
+    results = retriever.search(QueryContext(query="Plate", top_k=5))
+
+    assert [result.id for result in results] == ["t1", "t2"]
+    assert any("CONTAINS" in query for query in driver.queries)
+
+
+def test_graph_retriever_content_similarity_uses_vector_index() -> None:
+    driver = _StubDriver(fulltext=True)
+    embedded: list[str] = []
+
+    def embed(text: str) -> list[int]:
+        embedded.append(text)
+        return [1, 0]
+
+    retriever = _retriever(driver, embed_fn=embed, vector_k=3, vector_budget_ms=1000)
+
+    results = retriever.search(QueryContext(query="Plate", top_k=5))
+
+    assert embedded == ["Plate"]  # not lowercased like the keyword strategies
+
+    vector_hits = [result for result in results if result.source == "graph_content"]
+    assert [result.id for result in vector_hits] == ["t4"]
+    assert vector_hits[0].score == 0.9
+    assert any(timeout is not None and 0 < timeout <= 1.0 for timeout in driver.timeouts)
+
+
+def test_path_retriever_resolves_all_pairs_in_one_query() -> None:
+    driver = _StubDriver(fulltext=True)
+    retriever = GraphPathRetriever("bolt://localhost", "neo4j", "password", max_terms=3)
+    retriever._driver = driver
+
+    results = retriever.search(QueryContext(query="plate hull plate deck girder", top_k=10))
+
+    assert driver.session_count == 1
+    assert len(driver.queries) == 1
+    assert retriever.last_search_stats["terms"] == 3
+    assert retriever.last_search_stats["pairs"] == 3
+    assert [result.metadata["search_terms"] for result in results] == [
+        ["plate", "hull"],
+        ["plate", "deck"],
+        ["hull", "deck"],
+    ]
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from help_preprocessor.retrieval.llamaindex_integration import HelpIndexBuilder
+
+
+def _write_documents(path: Path, count: int) -> None:
+    with open(path, "w", encoding="utf-8") as handle:
+        for i in range(count):
+            handle.write(json.dumps({"id": f"doc{i}", "content": f"text {i}", "metadata": {}}) + "\n")
+
+
+def test_ingest_streams_fixed_size_batches(tmp_path: Path) -> None:
+    documents_path = tmp_path / "documents.jsonl"
+    _write_documents(documents_path, 7)
+    builder = HelpIndexBuilder(documents_path, batch_size=3)
+
+    batches: list[list[str]] = []
+    stats = builder.ingest(lambda batch: batches.append([doc["id"] for doc in batch]))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[-1] == ["doc6"]
+    assert stats["total"] == 7 and stats["batches"] == 3
+
+
+def test_ingest_resumes_after_last_completed_batch(tmp_path: Path) -> None:
+    documents_path = tmp_path / "documents.jsonl"
+    _write_documents(documents_path, 5)
+    checkpoint = tmp_path / "checkpoint.json"
+    builder = HelpIndexBuilder(documents_path, batch_size=2)
+
+    seen: list[str] = []
+
+    def _fail_on_third_batch(batch: list[dict]) -> None:
+        if batch[0]["id"] == "doc4":
+            raise RuntimeError("interrupted")
+        seen.extend(doc["id"] for doc in batch)
+
+    with pytest.raises(RuntimeError):
+        builder.ingest(_fail_on_third_batch, checkpoint_path=checkpoint)
+    assert builder.load_checkpoint(checkpoint) == 4
+
+    resumed: list[str] = []
+    stats = builder.ingest(lambda batch: resumed.extend(doc["id"] for doc in batch), checkpoint_path=checkpoint)
+    assert resumed == ["doc4"]
+    assert stats["resumed_from"] == 4 and stats["total"] == 5
+
+    # A rewritten source invalidates the checkpoint.
+    _write_documents(documents_path, 6)
+    assert builder.load_checkpoint(checkpoint) == 0
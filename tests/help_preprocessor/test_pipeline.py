@@ -92,6 +92,38 @@ def test_pipeline_storage_integration(tmp_path: Path) -> None:
     assert result.vector_chunks
 
 
+def test_pipeline_writes_topic_embeddings_with_configured_model(tmp_path: Path) -> None:
+    source_root, cache_dir, output_dir = _create_help_source(tmp_path)
+    config = _build_config(source_root, cache_dir, output_dir)
+    config.neo4j_embedding_model = "text-embedding-3-small"
+
+    class RecordingNeo4j:
+        def __init__(self) -> None:
+            self.embeddings: list[dict] = []
+
+        def upsert(self, nodes: list[dict], relationships: list[dict]) -> None:
+            return None
+
+        def upsert_embeddings(self, embeddings: dict) -> None:
+            self.embeddings.append(embeddings)
+
+    embedded: list[str] = []
+
+    def fake_embed(texts: list[str]) -> list[list[float]]:
+        embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    loader = RecordingNeo4j()
+    pipeline = HelpPreprocessorPipeline(config, neo4j_loader=loader, topic_embed_batch=fake_embed)
+    pipeline.run(dry_run=False)
+
+    [embeddings] = loader.embeddings
+    assert list(embeddings) == ["topic:topic_one"]
+    assert embedded[0].startswith("Topic One\n")
+    assert "Overview text" in embedded[0]
+    assert embeddings["topic:topic_one"] == [float(len(embedded[0])), 1.0]
+
+
 def test_pipeline_dry_run_skips_storage(tmp_path: Path) -> None:
     source_root, cache_dir, output_dir = _create_help_source(tmp_path)
     config = _build_config(source_root, cache_dir, output_dir)
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import sys
+import types
+from typing import Any
+
+import pytest
+
+from help_preprocessor.retrieval.base import QueryContext
+from help_preprocessor.retrieval.embeddings import QueryEmbedder
+from help_preprocessor.retrieval.hybrid_retriever import ChromaDenseRetriever
+
+
+class _CountingBackend:
+    def __init__(self) -> None:
+        self.calls: list[list[str]] = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 1.0] for text in texts]
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.queries: list[dict[str, Any]] = []
+
+    def query(self, **kwargs: Any) -> dict[str, Any]:
+        self.queries.append(kwargs)
+        rows = len(kwargs["query_embeddings"])
+        return {
+            "ids": [["a", "b", "c"] for _ in range(rows)],
+            "documents": [["A", "B", "C"] for _ in range(rows)],
+            "distances": [[0.1, 0.2, 0.3] for _ in range(rows)],
+            "metadatas": [[{}, {}, {}] for _ in range(rows)],
+        }
+
+
+def test_query_embedder_batches_misses_and_caches() -> None:
+    backend = _CountingBackend()
+    embedder = QueryEmbedder("test-model", embed_batch=backend, cache_size=2)
+
+    assert embedder.embed_many(["plate", "hull", "plate"]) == [[5.0, 1.0], [4.0, 1.0], [5.0, 1.0]]
+    assert backend.calls == [["plate", "hull"]]
+
+    embedder.embed("hull")
+    assert len(backend.calls) == 1
+
+    embedder.embed("deck")  # evicts "plate" (least recently used)
+    embedder.embed("plate")
+    assert backend.calls[1:] == [["deck"], ["plate"]]
+    assert embedder.cache_info()["size"] == 2
+
+
+def test_chroma_retriever_queries_with_client_side_embeddings() -> None:
+    backend = _CountingBackend()
+    retriever = ChromaDenseRetriever(
+        "help",
+        embedding_model="test-model",
+        embedder=QueryEmbedder("test-model", embed_batch=backend),
+    )
+    collection = _FakeCollection()
+    retriever._collection = collection
+
+    batches = retriever.search_batch(
+        [QueryContext(query="plate", top_k=2), QueryContext(query="hull", top_k=3)]
+    )
+    retriever.search(QueryContext(query="plate", top_k=1))
+
+    assert [len(results) for results in batches] == [2, 3]
+    assert len(collection.queries) == 2
+    assert "query_texts" not in collection.queries[0]
+    assert collection.queries[0]["query_embeddings"] == [[5.0, 1.0], [4.0, 1.0]]
+    assert backend.calls == [["plate", "hull"]]
+
+
+def test_query_embedder_passes_timeout_to_openai_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    clients: list[dict[str, Any]] = []
+
+    class _Embeddings:
+        def create(self, model: str, input: list[str]) -> Any:
+            data = [types.SimpleNamespace(index=i, embedding=[1.0, 0.0]) for i in range(len(input))]
+            return types.SimpleNamespace(data=data)
+
+    class _Client:
+        def __init__(self, **kwargs: Any) -> None:
+            clients.append(kwargs)
+            self.embeddings = _Embeddings()
+
+    monkeypatch.setitem(sys.modules, "openai", types.SimpleNamespace(Client=_Client))
+
+    assert QueryEmbedder("test-model", timeout=0.3).embed("plate") == [1.0, 0.0]
+    QueryEmbedder("test-model").embed("plate")
+
+    assert clients == [{"timeout": 0.3, "max_retries": 0}, {}]
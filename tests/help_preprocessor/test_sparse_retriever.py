@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import json
+import pickle
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from help_preprocessor.retrieval.base import QueryContext
+from help_preprocessor.retrieval.sparse_retriever import BM25Retriever, SparseVectorRetriever
+from search_common.sparse_store import (
+    SparseIndex,
+    convert_pickle_index,
+    write_sparse_index,
+)
+
+DOCUMENTS = [
+    {"id": "doc-plate", "content": "create plate solid element with thickness"},
+    {"id": "doc-color", "content": "set element color red green blue"},
+    {"id": "doc-sheet", "content": "create offset sheet from plate surface"},
+    {"id": "doc-stl", "content": "export document as stl file"},
+]
+
+
+def _write_index(tmp_path, documents):
+    vectorizer = TfidfVectorizer().fit([doc["content"] for doc in documents])
+    joblib.dump(vectorizer, tmp_path / "tfidf_vectorizer.joblib")
+    with open(tmp_path / "documents.pkl", "wb") as handle:
+        pickle.dump(documents, handle)
+    return vectorizer
+
+
+def _is_memory_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, "base", None)
+        if not isinstance(array, np.ndarray):
+            return False
+    return False
+
+
+def _retriever(tmp_path) -> SparseVectorRetriever:
+    return SparseVectorRetriever(
+        vectorizer_path=tmp_path / "tfidf_vectorizer.joblib",
+        documents_path=tmp_path / "documents.pkl",
+    )
+
+
+def test_search_matches_cosine_ranking(tmp_path):
+    vectorizer = _write_index(tmp_path, DOCUMENTS)
+    query = "create plate"
+
+    results = _retriever(tmp_path).search(QueryContext(query=query, top_k=2))
+
+    expected = cosine_similarity(
+        vectorizer.transform([query]),
+        vectorizer.transform([doc["content"] for doc in DOCUMENTS]),
+    ).ravel()
+    order = np.argsort(-expected)[:2]
+    assert [r.id for r in results] == [DOCUMENTS[i]["id"] for i in order]
+    assert np.allclose([r.metadata["original_score"] for r in results], expected[order], atol=1e-6)
+
+
+def test_matrix_cache_is_memory_mapped_and_rebuilt_when_stale(tmp_path):
+    _write_index(tmp_path, DOCUMENTS)
+    _retriever(tmp_path).search(QueryContext(query="plate", top_k=1))
+
+    cached = _retriever(tmp_path)
+    cached._load_index()
+    assert _is_memory_mapped(cached._term_doc.data)
+    assert _is_memory_mapped(cached._term_doc.indices)
+    assert _is_memory_mapped(cached._term_doc.indptr)
+    assert cached._term_doc.shape[1] == len(DOCUMENTS)
+
+    _write_index(tmp_path, DOCUMENTS[:2])
+    rebuilt = _retriever(tmp_path)
+    rebuilt._load_index()
+    assert rebuilt._term_doc.shape[1] == 2
+
+
+def test_sparse_index_matches_pickle_path(tmp_path):
+    _write_index(tmp_path, DOCUMENTS)
+    index_dir = tmp_path / "index"
+    convert_pickle_index(
+        tmp_path / "tfidf_vectorizer.joblib", tmp_path / "documents.pkl", index_dir
+    )
+    context = QueryContext(query="create plate element", top_k=3)
+
+    legacy_tfidf = _retriever(tmp_path).search(context)
+    indexed_tfidf = SparseVectorRetriever(index_dir=index_dir).search(context)
+    legacy_bm25 = BM25Retriever(documents_path=tmp_path / "documents.pkl").search(context)
+    indexed_bm25 = BM25Retriever(index_dir=index_dir).search(context)
+
+    assert [r.id for r in indexed_tfidf] == [r.id for r in legacy_tfidf]
+    assert np.allclose([r.score for r in indexed_tfidf], [r.score for r in legacy_tfidf], atol=1e-6)
+    assert [r.id for r in indexed_bm25] == [r.id for r in legacy_bm25]
+    assert np.allclose(
+        [r.metadata["bm25_score"] for r in indexed_bm25],
+        [r.metadata["bm25_score"] for r in legacy_bm25],
+    )
+    assert not list(index_dir.glob("*.pkl")) and not list(index_dir.glob("*.joblib"))
+
+
+def test_sparse_index_rejects_unknown_version(tmp_path):
+    write_sparse_index(tmp_path, DOCUMENTS)
+    manifest = json.loads((tmp_path / "manifest.json").read_text(encoding="utf-8"))
+    manifest["version"] = 999
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        SparseIndex.load(tmp_path)
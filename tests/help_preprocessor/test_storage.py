@@ -2,6 +2,8 @@
 
 from typing import Any
 
+import pytest
+
 from help_preprocessor.storage.chroma_loader import HelpChromaLoader
 from help_preprocessor.storage.neo4j_loader import HelpNeo4jLoader
 
@@ -91,12 +93,47 @@ def test_neo4j_loader_upsert_and_cleanup() -> None:
     assert "MERGE (start)-[rel:HAS_TOPIC]->(end)" in rel_query
     assert rel_params["start_id"] == "category:root"
 
+    index_queries = [query for query, _ in driver.sessions[0][1].queries[2:]]
+    assert all("CREATE FULLTEXT INDEX" in query for query in index_queries)
+    assert any("help_topic_title" in query for query in index_queries)
+
     loader.cleanup(["HelpCategory", "HelpTopic"])
     cleanup_query, _ = driver.sessions[1][1].queries[0]
     assert "MATCH (n) WHERE" in cleanup_query
     loader.close()
 
 
+def test_neo4j_loader_upsert_embeddings_creates_vector_index_and_batches() -> None:
+    driver = _StubDriver()
+    loader = HelpNeo4jLoader("bolt://example", "neo4j", "secret", database="neo4j", driver=driver)
+
+    loader.upsert_embeddings(
+        {"topic:a": [0.1, 0.2, 0.3], "topic:b": [1, 0, 0], "topic:c": [0.0, 1.0, 0.0]},
+        batch_size=2,
+    )
+
+    database, session = driver.sessions[0]
+    assert database == "neo4j"
+    index_query, _ = session.queries[0]
+    assert "CREATE VECTOR INDEX help_topic_embedding" in index_query
+    assert "`vector.dimensions`: 3" in index_query
+    assert "'cosine'" in index_query
+    batches = [params["rows"] for _, params in session.queries[1:]]
+    assert [[row["id"] for row in rows] for rows in batches] == [["topic:a", "topic:b"], ["topic:c"]]
+    assert batches[0][1]["embedding"] == [1.0, 0.0, 0.0]
+    assert "MATCH (n:HelpTopic {id: row.id})" in session.queries[1][0]
+
+
+def test_neo4j_loader_upsert_embeddings_rejects_mixed_dimensions() -> None:
+    driver = _StubDriver()
+    loader = HelpNeo4jLoader("bolt://example", "neo4j", "secret", driver=driver)
+
+    with pytest.raises(ValueError):
+        loader.upsert_embeddings({"topic:a": [0.1, 0.2], "topic:b": [0.1]})
+    loader.upsert_embeddings({})
+    assert driver.sessions == []
+
+
 def test_chroma_loader_upsert_and_purge() -> None:
     client = _FakeChromaClient()
     loader = HelpChromaLoader("evoship-help", client=client)
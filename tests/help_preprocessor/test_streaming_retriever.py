@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+
+from help_preprocessor.retrieval.base import BaseRetriever, QueryContext, SearchResult
+from help_preprocessor.retrieval.parallel_retriever import StreamingRetriever
+
+
+class _DelayedRetriever(BaseRetriever):
+    def __init__(self, name: str, delay: float, ids: list[str]) -> None:
+        self.name = name
+        self.delay = delay
+        self.ids = ids
+
+    def search(self, context: QueryContext) -> list[SearchResult]:
+        time.sleep(self.delay)
+        return [
+            SearchResult(id=doc_id, content=doc_id, score=0.9 - i * 0.1, source=self.name, metadata={})
+            for i, doc_id in enumerate(self.ids)
+        ]
+
+    def get_name(self) -> str:
+        return self.name
+
+
+def _retrievers() -> dict[str, BaseRetriever]:
+    return {
+        "graph_neo4j": _DelayedRetriever("graph_neo4j", 0.3, ["c", "a"]),
+        "sparse_bm25": _DelayedRetriever("sparse_bm25", 0.0, ["a", "b"]),
+    }
+
+
+def test_stream_search_yields_fast_backend_first() -> None:
+    streaming = StreamingRetriever(_retrievers())
+
+    started = time.perf_counter()
+    stream = streaming.stream_search(QueryContext(query="plate"))
+    first = next(stream)
+    first_latency = time.perf_counter() - started
+
+    assert first.source == "sparse_bm25"
+    assert first_latency < 0.2
+    assert [r.id for r in stream] == ["b", "c", "a"]
+
+
+def test_stream_rankings_are_provisional_until_final() -> None:
+    streaming = StreamingRetriever(_retrievers())
+
+    updates = list(streaming.stream_rankings(QueryContext(query="plate", top_k=3)))
+
+    assert [update.is_final for update in updates] == [False, True]
+    assert updates[0].completed == ["sparse_bm25"]
+    assert updates[0].pending == ["graph_neo4j"]
+    assert [r.id for r in updates[0].results] == ["a", "b"]
+    assert updates[-1].pending == []
+    assert [r.id for r in updates[-1].results][0] == "a"
+    assert {r.id for r in updates[-1].results} == {"a", "b", "c"}
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from help_preprocessor.retrieval.streaming import TokenStream, stream_from_callback
+
+
+def _slow_chunks():
+    time.sleep(0.02)
+    yield SimpleNamespace(content="")
+    yield SimpleNamespace(content="こん")
+    time.sleep(0.02)
+    yield "にちは"
+
+
+def test_token_stream_yields_tokens_and_measures_ttft() -> None:
+    stream = TokenStream(_slow_chunks(), extra={"retrieval_method": "test"})
+
+    tokens = list(stream)
+
+    assert tokens == ["こん", "にちは"]
+    assert stream.text == "こんにちは"
+    assert 15 <= stream.ttft_ms < stream.total_ms
+    result = stream.result()
+    assert result["answer"] == "こんにちは"
+    assert result["retrieval_method"] == "test"
+    assert result["metrics"]["tokens"] == 2
+
+
+def test_stream_from_callback_forwards_tokens_and_result() -> None:
+    def _run(on_token):
+        for token in ("a", "b", "c"):
+            on_token(token)
+        return {"source_documents": [{"content": "doc"}]}
+
+    received: list[str] = []
+    result = stream_from_callback(_run).consume(received.append)
+
+    assert received == ["a", "b", "c"]
+    assert result["answer"] == "abc"
+    assert result["source_documents"] == [{"content": "doc"}]
+
+
+def test_stream_from_callback_reraises_worker_errors() -> None:
+    def _run(on_token):
+        on_token("partial")
+        raise RuntimeError("llm failed")
+
+    stream = stream_from_callback(_run)
+    with pytest.raises(RuntimeError, match="llm failed"):
+        list(stream)
+    assert stream.text == "partial"
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("whoosh")
+
+from whoosh import index  # noqa: E402
+from whoosh.fields import ID, TEXT, Schema  # noqa: E402
+
+from help_preprocessor.retrieval.base import QueryContext  # noqa: E402
+from help_preprocessor.retrieval.fulltext_retriever import WhooshRetriever  # noqa: E402
+from search_common.whoosh_pool import WhooshSearcherPool  # noqa: E402
+
+
+def _build_index(index_dir: Path) -> None:
+    schema = Schema(id=ID(stored=True, unique=True), title=TEXT(stored=True), content=TEXT(stored=True))
+    ix = index.create_in(str(index_dir), schema)
+    with ix.writer() as writer:
+        writer.add_document(id="s1", title="Create plate", content="create a plate solid")
+        writer.add_document(id="s2", title="Delete element", content="delete the selected element")
+
+
+def test_pool_reuses_returned_searchers(tmp_path: Path) -> None:
+    _build_index(tmp_path)
+    pool = WhooshSearcherPool(tmp_path)
+    with pool.searcher() as first:
+        with pool.searcher() as second:
+            assert second is not first
+    with pool.searcher() as again:
+        assert again in (first, second)
+
+    assert pool.parse(["content"], "plate") is pool.parse(["content"], "plate")
+    pool.close()
+
+
+def test_parsers_are_shared_across_threads(tmp_path: Path) -> None:
+    _build_index(tmp_path)
+    pool = WhooshSearcherPool(tmp_path)
+    queries = ["plate", "hull", "deck", "girder"]
+
+    threads = [
+        threading.Thread(target=pool.parse, args=(["title", "content"], query)) for query in queries
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert list(pool._parsers) == [("title", "content")]
+    assert len(pool._queries) == len(queries)
+    pool.close()
+    assert pool._parsers == {}
+
+
+def test_short_lived_threads_share_a_bounded_set_of_searchers(tmp_path: Path) -> None:
+    _build_index(tmp_path)
+    retriever = WhooshRetriever(tmp_path, max_searchers=2)
+    opened: list = []
+    index_searcher = retriever._get_index().searcher
+
+    def counting_searcher(*args, **kwargs):
+        searcher = index_searcher(*args, **kwargs)
+        opened.append(searcher)
+        return searcher
+
+    retriever._get_index().searcher = counting_searcher
+    found: list = []
+    for _ in range(5):
+        # A fresh executor per query, as ParallelRetriever does
+        threads = [
+            threading.Thread(target=lambda: found.append([r.id for r in retriever.search(QueryContext(query="plate"))]))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert found == [["s1"]] * 20
+    assert 1 <= len(opened) <= 2
+    retriever.close()
+    assert all(searcher.is_closed for searcher in opened)
+
+
+def test_retriever_sees_new_commits_after_refresh(tmp_path: Path) -> None:
+    _build_index(tmp_path)
+    retriever = WhooshRetriever(tmp_path, refresh_interval=0.0)
+
+    assert [r.id for r in retriever.search(QueryContext(query="hull"))] == []
+
+    with index.open_dir(str(tmp_path)).writer() as writer:
+        writer.add_document(id="s3", title="Hull form", content="edit the hull surface")
+
+    assert [r.id for r in retriever.search(QueryContext(query="hull"))] == ["s3"]
+    assert [r.id for r in retriever.search(QueryContext(query="plate"))] == ["s1"]
+    retriever.close()
@@ -0,0 +1,124 @@
+import pytest
+
+pytest.importorskip("neo4j")
+
+from graphrag_gpt.bounded_graph import BoundedGraphStore, _row_tokens  # noqa: E402
+
+
+class _Record:
+    def __init__(self, row):
+        self._row = row
+
+    def data(self):
+        return dict(self._row)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+        self.fetched = 0
+        self.consumed = False
+
+    def __iter__(self):
+        for row in self.rows:
+            self.fetched += 1
+            yield _Record(row)
+
+    def consume(self):
+        self.consumed = True
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def run(self, query, params):
+        self.driver.queries.append((query.text, params))
+        return self.driver.result
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+class StubDriver:
+    """neo4j.Driver の代わりに、固定の行をストリーミングで返す"""
+
+    def __init__(self, rows):
+        self.result = _Result(rows)
+        self.queries = []
+        self.sessions = []
+
+    def session(self, **kwargs):
+        self.sessions.append(kwargs)
+        return _Session(self)
+
+
+def _store(rows, **limits):
+    driver = StubDriver(rows)
+    store = BoundedGraphStore(None, driver, database="neo4j", fetch_size=2, **limits)
+    return store, driver
+
+
+def test_row_cap_stops_streaming_and_appends_note():
+    rows = [{"name": f"Func{i}"} for i in range(10)]
+    store, driver = _store(rows, max_rows=3, max_context_tokens=10_000)
+
+    result = store.query("MATCH (f:Function) RETURN f.name AS name")
+
+    assert result[:3] == rows[:3]
+    assert "注記" in result[3] and "3 件" in result[3]["注記"]
+    assert store.last_stats["rows"] == 3 and store.last_stats["truncated"]
+    assert driver.result.fetched == 4 and driver.result.consumed
+    assert driver.sessions == [{"database": "neo4j", "fetch_size": 2}]
+
+
+def test_token_cap_stops_before_the_row_that_does_not_fit():
+    rows = [{"description": "x" * 100} for _ in range(5)]
+    budget = _row_tokens(rows[0]) * 2 + 1
+    store, _ = _store(rows, max_rows=100, max_context_tokens=budget)
+
+    result = store.query("MATCH (f) RETURN f.description AS description")
+
+    assert result[:2] == rows[:2] and "注記" in result[2]
+    assert store.last_stats["tokens"] <= budget
+
+
+def test_oversized_first_row_is_truncated_to_the_budget():
+    rows = [{"name": "CreatePlate", "description": "長い説明" * 500, "params": ["a" * 50] * 20}]
+    store, _ = _store(rows, max_rows=100, max_context_tokens=60)
+
+    result = store.query("MATCH (f) RETURN f")
+
+    first, note = result
+    assert first["name"] == "CreatePlate"
+    assert first["description"].endswith("…")
+    assert _row_tokens(first) <= 60
+    assert store.last_stats == {"rows": 1, "tokens": _row_tokens(first), "truncated": True}
+    assert "注記" in note
+
+
+def test_results_within_limits_have_no_note():
+    rows = [{"name": "CreatePlate"}]
+    store, _ = _store(rows, max_rows=5, max_context_tokens=1000)
+
+    assert store.query("MATCH (f) RETURN f.name AS name", {"kw": "plate"}) == rows
+    assert store.last_stats["truncated"] is False
+
+
+def test_store_reuses_the_graph_driver_by_default():
+    class Graph:
+        _database = "neo4j"
+
+        def __init__(self, driver):
+            self._driver = driver
+
+    driver = StubDriver([{"name": "CreatePlate"}])
+    store = BoundedGraphStore(Graph(driver), max_rows=5, max_context_tokens=1000)
+
+    assert store.query("MATCH (f) RETURN f.name AS name") == [{"name": "CreatePlate"}]
+    assert driver.sessions == [{"database": "neo4j", "fetch_size": 100}]
+    with pytest.raises(TypeError):
+        BoundedGraphStore(object(), max_rows=5, max_context_tokens=1000)
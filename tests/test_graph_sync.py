@@ -0,0 +1,128 @@
+import pytest
+
+pytest.importorskip("langchain_neo4j")
+pytest.importorskip("tree_sitter_python")
+
+from graphrag_gpt.ingest0903 import (  # noqa: E402
+    _apply_graph_diff,
+    _diff_graph_state,
+    _fetch_current_graph_state,
+    _group_by_provenance,
+    _node_types,
+    _tag_provenance,
+)
+
+SPEC = "spec:api.txt"
+SCRIPT = "script:a.py"
+
+
+class StubGraph:
+    """Neo4jGraph の代わりに、発行されたクエリを記録し既定の行を返す"""
+
+    def __init__(self, node_rows=(), rel_rows=()):
+        self.node_rows = list(node_rows)
+        self.rel_rows = list(rel_rows)
+        self.queries = []
+
+    def query(self, query, params=None):
+        self.queries.append((query, params))
+        if query.startswith("MATCH (n) WHERE n.provenance IS NOT NULL"):
+            return self.node_rows
+        if query.startswith("MATCH (a)-[r]->(b) WHERE r.provenance IS NOT NULL"):
+            return self.rel_rows
+        return []
+
+    def writes(self):
+        return [q for q, _ in self.queries if q.startswith("UNWIND")]
+
+
+def _desired(description="ソリッド作成", with_script=True):
+    spec_triples = [
+        {"source": "Part", "source_type": "Object", "label": "HAS_METHOD",
+         "target": "CreateSolid", "target_type": "Method"},
+    ]
+    spec_nodes = {"CreateSolid": {"type": "Method", "properties": {"description": description}}}
+    _tag_provenance(spec_triples, spec_nodes, SPEC)
+    triples, nodes = spec_triples, dict(spec_nodes)
+    if with_script:
+        script_triples = [
+            {"source": "a.py_call_0", "source_type": "MethodCall", "label": "CALLS",
+             "target": "CreateSolid", "target_type": "Method"},
+        ]
+        script_nodes = {"a.py_call_0": {"type": "MethodCall", "properties": {"order": 0}}}
+        _tag_provenance(script_triples, script_nodes, SCRIPT)
+        triples, nodes = triples + script_triples, {**nodes, **script_nodes}
+    return _group_by_provenance(triples, nodes)
+
+
+def _as_graph(desired, extra_labels=()):
+    """desired state を Neo4j に投入済みとみなした StubGraph（ノードは追加ラベル付き）"""
+    node_rows, rel_rows = [], []
+    for provenance, bucket in desired.items():
+        for node_id, meta in bucket["nodes"].items():
+            node_rows.append({"provenance": provenance, "id": node_id,
+                              "labels": [*extra_labels, meta["type"]], "props": meta["properties"]})
+        for t in bucket["rels"].values():
+            rel_rows.append({"provenance": provenance, "source": t["source"],
+                             "source_labels": [*extra_labels, t["source_type"]], "label": t["label"],
+                             "target": t["target"], "target_labels": [*extra_labels, t["target_type"]]})
+    return StubGraph(node_rows, rel_rows)
+
+
+def test_unchanged_graph_produces_empty_diff():
+    desired = _desired()
+    current = _fetch_current_graph_state(_as_graph(desired), _node_types(desired))
+
+    diff = _diff_graph_state(desired, current)
+
+    assert diff == {"upsert_nodes": [], "stale_nodes": [], "add_rels": [], "remove_rels": []}
+    graph = StubGraph()
+    _apply_graph_diff(graph, diff, batch_size=10)
+    assert graph.writes() == []
+
+
+def test_added_script_is_diffed_and_applied():
+    current = _fetch_current_graph_state(_as_graph(_desired(with_script=False)))
+    desired = _desired()
+
+    diff = _diff_graph_state(desired, current)
+
+    assert [n["id"] for n in diff["upsert_nodes"]] == ["a.py_call_0"]
+    assert [(t["source"], t["label"], t["target"]) for t in diff["add_rels"]] == [
+        ("a.py_call_0", "CALLS", "CreateSolid")
+    ]
+    assert diff["remove_rels"] == [] and diff["stale_nodes"] == []
+
+    graph = StubGraph()
+    _apply_graph_diff(graph, diff, batch_size=10)
+    rel_query = next(q for q in graph.writes() if "CALLS" in q)
+    # 由来なしの既存リレーションを引き継ぐので、MERGE のパターンに provenance を含めない
+    assert "MERGE (s)-[" not in rel_query
+    assert "old.provenance IS NULL" in rel_query
+
+
+def test_removed_script_deletes_its_nodes_and_relationships():
+    desired = _desired(with_script=False)
+    current = _fetch_current_graph_state(_as_graph(_desired()), _node_types(desired))
+
+    diff = _diff_graph_state(desired, current)
+
+    assert diff["upsert_nodes"] == [] and diff["add_rels"] == []
+    assert [(t["source"], t["provenance"]) for t in diff["remove_rels"]] == [("a.py_call_0", SCRIPT)]
+    assert diff["stale_nodes"] == [{"id": "a.py_call_0", "type": "MethodCall", "provenance": SCRIPT}]
+
+
+def test_changed_node_is_upserted_and_multi_label_nodes_keep_their_type():
+    old = _desired(description="旧い説明")
+    desired = _desired(description="新しい説明")
+    graph = _as_graph(old, extra_labels=("__Entity__", "Aaa"))
+
+    diff = _diff_graph_state(desired, _fetch_current_graph_state(graph, _node_types(desired)))
+
+    assert [(n["id"], n["type"]) for n in diff["upsert_nodes"]] == [("CreateSolid", "Method")]
+    assert diff["add_rels"] == [] and diff["remove_rels"] == [] and diff["stale_nodes"] == []
+
+    applied = StubGraph()
+    _apply_graph_diff(applied, diff, batch_size=10)
+    [upsert] = applied.writes()
+    assert "MERGE (n:`Method` {id: row.id})" in upsert
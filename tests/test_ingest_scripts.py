@@ -0,0 +1,27 @@
+import pytest
+
+pytest.importorskip("langchain_neo4j")
+pytest.importorskip("tree_sitter_python")
+
+from concurrent.futures.process import BrokenProcessPool  # noqa: E402
+
+from graphrag_gpt.ingest0903 import _collect_script_results, _extract_script_worker  # noqa: E402
+
+SCRIPTS = [
+    (f"s{i}.py", f"part = doc.GetPart()\npart.CreateSolid{i}()\n")
+    for i in range(3)
+]
+
+
+def _pool_that_breaks_after(count):
+    for item in SCRIPTS[:count]:
+        yield _extract_script_worker(item)
+    raise BrokenProcessPool("worker died")
+
+
+def test_broken_pool_falls_back_to_serial_for_the_remaining_scripts():
+    expected = [_extract_script_worker(item) for item in SCRIPTS]
+
+    assert _collect_script_results(_pool_that_breaks_after(1), SCRIPTS) == expected
+    assert _collect_script_results(_pool_that_breaks_after(0), SCRIPTS) == expected
+    assert _collect_script_results(iter(expected), SCRIPTS) == expected
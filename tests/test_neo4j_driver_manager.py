@@ -0,0 +1,137 @@
+import importlib
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("neo4j")
+pytest.importorskip("dotenv")
+pytest.importorskip("langchain_openai")
+
+# LlamaIndex / Chroma が無い環境では main_helper_0905 の import だけ通るように差し替える
+_STUB_MODULES = {
+    "llama_index": [],
+    "llama_index.core": ["VectorStoreIndex", "StorageContext"],
+    "llama_index.core.indices": [],
+    "llama_index.core.indices.property_graph": ["PropertyGraphIndex"],
+    "llama_index.embeddings": [],
+    "llama_index.embeddings.openai": ["OpenAIEmbedding"],
+    "llama_index.llms": [],
+    "llama_index.llms.openai": ["OpenAI"],
+    "llama_index.vector_stores": [],
+    "llama_index.vector_stores.chroma": ["ChromaVectorStore"],
+    "llama_index.graph_stores": [],
+    "llama_index.graph_stores.neo4j": ["Neo4jPropertyGraphStore"],
+    "chromadb": [],
+}
+
+
+@pytest.fixture
+def helper(monkeypatch):
+    try:
+        importlib.import_module("llama_index.core")
+    except ImportError:
+        for name, attrs in _STUB_MODULES.items():
+            module = types.ModuleType(name)
+            for attr in attrs:
+                setattr(module, attr, object)
+            monkeypatch.setitem(sys.modules, name, module)
+    try:
+        importlib.import_module("langchain.schema")
+    except ImportError:
+        from langchain_core import messages
+
+        schema = types.ModuleType("langchain.schema")
+        schema.HumanMessage = messages.HumanMessage
+        schema.SystemMessage = messages.SystemMessage
+        monkeypatch.setitem(sys.modules, "langchain.schema", schema)
+    monkeypatch.delitem(sys.modules, "main_helper_0905", raising=False)
+    module = importlib.import_module("main_helper_0905")
+    yield module
+    sys.modules.pop("main_helper_0905", None)
+
+
+class _FakeSession:
+    def __init__(self, driver, database):
+        self.driver = driver
+        self.database = database
+
+    def run(self, query, parameters):
+        self.driver.queries.append((self.database, query, parameters))
+        if "FAIL" in query:
+            raise RuntimeError("query failed")
+        return [{"n": 1}]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+class _FakeDriver:
+    def __init__(self, uri, auth, **kwargs):
+        self.uri = uri
+        self.auth = auth
+        self.kwargs = kwargs
+        self.queries = []
+        self.closed = False
+
+    def session(self, database=None, **kwargs):
+        return _FakeSession(self, database)
+
+    def close(self):
+        self.closed = True
+
+
+def _config():
+    return types.SimpleNamespace(
+        neo4j_uri="bolt://example:7687",
+        neo4j_user="neo4j",
+        neo4j_password="secret",
+        neo4j_database="neo4j",
+        neo4j_max_pool_size=10,
+        neo4j_acquisition_timeout=5.0,
+        neo4j_liveness_check_timeout=None,
+    )
+
+
+def test_one_driver_is_shared_and_sessions_and_errors_are_counted(helper, monkeypatch):
+    created = []
+
+    def fake_driver(uri, auth, **kwargs):
+        driver = _FakeDriver(uri, auth, **kwargs)
+        created.append(driver)
+        return driver
+
+    monkeypatch.setattr(helper, "GraphDatabase", types.SimpleNamespace(driver=fake_driver))
+    manager = helper.Neo4jDriverManager(_config())
+
+    assert manager.run("RETURN 1 AS n") == [{"n": 1}]
+    with manager.session() as outer:
+        with manager.session(database="other") as inner:
+            outer.run("RETURN 2", {})
+            inner.run("RETURN 3", {})
+    with pytest.raises(RuntimeError):
+        manager.run("FAIL")
+
+    assert len(created) == 1
+    driver = created[0]
+    assert driver.auth == ("neo4j", "secret")
+    assert driver.kwargs == {"max_connection_pool_size": 10, "connection_acquisition_timeout": 5.0}
+    assert [(db, query) for db, query, _ in driver.queries] == [
+        ("neo4j", "RETURN 1 AS n"),
+        ("neo4j", "RETURN 2"),
+        ("other", "RETURN 3"),
+        ("neo4j", "FAIL"),
+    ]
+    metrics = manager.metrics()
+    assert metrics["drivers_created"] == 1
+    assert metrics["sessions"] == 4
+    assert metrics["active_sessions"] == 0
+    assert metrics["peak_active_sessions"] == 2
+    assert metrics["queries"] == 2 and metrics["query_errors"] == 1
+    assert metrics["avg_query_ms"] is not None
+
+    manager.close()
+    assert driver.closed
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("langchain_neo4j")
+pytest.importorskip("tree_sitter_python")
+
+from graphrag_gpt.ingest0903 import (  # noqa: E402
+    _dump_preprocessed_artifacts,
+    iter_preprocessed_records,
+    load_preprocessed_graph,
+)
+
+SPEC_TRIPLES = [
+    {"source": "Part", "source_type": "Object", "label": "HAS_METHOD",
+     "target": "CreateSolid", "target_type": "Method"},
+]
+SPEC_NODES = {"CreateSolid": {"type": "Method", "properties": {"description": "ソリッド\n作成"}}}
+SCRIPT_TRIPLES = [
+    {"source": "a.py_call_0", "source_type": "MethodCall", "label": "CALLS",
+     "target": "CreateSolid", "target_type": "Method"},
+]
+SCRIPT_NODES = {"a.py_call_0": {"type": "MethodCall", "properties": {"order": 0}}}
+
+
+def _dump(tmp_path, fmt):
+    _dump_preprocessed_artifacts(
+        tmp_path, [{"name": "CreateSolid"}], {"長さ": "mm"},
+        SPEC_TRIPLES, SPEC_NODES, SCRIPT_TRIPLES, SCRIPT_NODES, fmt=fmt,
+    )
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl.gz"])
+def test_load_preprocessed_graph_matches_across_formats(tmp_path, fmt):
+    _dump(tmp_path, fmt)
+
+    triples, nodes = load_preprocessed_graph(tmp_path)
+
+    assert triples == SPEC_TRIPLES + SCRIPT_TRIPLES
+    assert nodes == {**SPEC_NODES, **SCRIPT_NODES}
+
+
+def test_iter_preprocessed_records_filters_by_kind(tmp_path):
+    _dump(tmp_path, "jsonl.gz")
+
+    records = list(iter_preprocessed_records(tmp_path / "graph_specs.jsonl.gz", kind="triple"))
+    triples_only, nodes = load_preprocessed_graph(tmp_path, sources=("specs",), with_nodes=False)
+
+    assert [{k: v for k, v in r.items() if k != "kind"} for r in records] == SPEC_TRIPLES
+    assert triples_only == SPEC_TRIPLES
+    assert nodes == {}
+
+
+@pytest.mark.parametrize("old, new", [("jsonl.gz", "json"), ("json", "jsonl.gz")])
+def test_switching_format_removes_stale_artifacts(tmp_path, old, new):
+    _dump_preprocessed_artifacts(
+        tmp_path, [], {}, [], {"Stale": {"type": "Method", "properties": {}}}, [], {}, fmt=old,
+    )
+    _dump(tmp_path, new)
+
+    suffix = ".jsonl.gz" if old == "jsonl.gz" else ".json"
+    assert not list(tmp_path.glob(f"*{suffix}"))
+    triples, nodes = load_preprocessed_graph(tmp_path)
+    assert "Stale" not in nodes
+    assert triples == SPEC_TRIPLES + SCRIPT_TRIPLES
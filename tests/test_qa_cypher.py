@@ -0,0 +1,50 @@
+import qa_cypher
+
+
+def test_keyword_is_passed_as_parameter():
+    keyword = "Create'Plate"
+    params = qa_cypher.keyword_params(keyword, limit=3)
+
+    assert params == {"kw": "create'plate", "limit": 3}
+    for query in (qa_cypher.function_lookup(True), qa_cypher.function_lookup(False)):
+        assert "$kw" in query and "$limit" in query
+        assert "plate" not in query.lower()
+    assert "toLower" not in qa_cypher.function_lookup(True)
+
+
+def test_migration_runs_backfill_then_indexes():
+    statements = []
+    qa_cypher.migrate_qa_schema(statements.append)
+
+    assert statements == qa_cypher.BACKFILL_STATEMENTS + qa_cypher.INDEX_STATEMENTS
+
+
+def test_index_check_is_read_only_and_caches_only_success():
+    statements = []
+    rows = [{"name": "qa_function_name_lower", "state": "ONLINE"}]
+
+    def run(statement):
+        statements.append(statement)
+        return rows
+
+    assert qa_cypher.qa_indexes_online(run, key="test-missing") is False
+    rows.append({"name": "qa_parameter_parent_function_lower", "state": "ONLINE"})
+    assert qa_cypher.qa_indexes_online(run, key="test-missing") is True
+    assert qa_cypher.qa_indexes_online(run, key="test-missing") is True
+
+    assert statements == [qa_cypher.SHOW_QA_INDEXES] * 2
+    assert statements[0].startswith("SHOW INDEXES")
+
+
+def test_index_check_falls_back_on_errors_without_caching():
+    calls = []
+
+    def run(statement):
+        calls.append(statement)
+        if len(calls) == 1:
+            raise ConnectionError("transient")
+        return [{"name": name, "state": "ONLINE"} for name in qa_cypher.QA_INDEX_NAMES]
+
+    assert qa_cypher.qa_indexes_online(run, key="test-transient") is False
+    assert "toLower" in qa_cypher.keyword_match_count(False)
+    assert qa_cypher.qa_indexes_online(run, key="test-transient") is True
@@ -0,0 +1,106 @@
+import importlib
+import json
+import sys
+import time
+import types
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+
+class StubConfig:
+    qa_vector_timeout = 0.5
+    qa_graph_timeout = 0.5
+    qa_batch_concurrency = 2
+
+
+@pytest.fixture
+def main_0905(monkeypatch):
+    """main_helper_0905（LlamaIndex/Chroma が必要）を差し替えて main_0905 を読み込む"""
+    helper = types.ModuleType("main_helper_0905")
+    helper.Config = StubConfig
+    monkeypatch.setitem(sys.modules, "main_helper_0905", helper)
+    monkeypatch.delitem(sys.modules, "main_0905", raising=False)
+    module = importlib.import_module("main_0905")
+    yield module
+    sys.modules.pop("main_0905", None)
+
+
+def _fast_vector(keyword):
+    return f"vector:{keyword}"
+
+
+def _fast_graph(question, **kwargs):
+    return f"graph:{kwargs['keyword']}"
+
+
+def _slow_graph(question, **kwargs):
+    time.sleep(1.0)
+    return "graph:late"
+
+
+def test_retrieve_hybrid_returns_both_results_and_timings(main_0905):
+    retrieved = main_0905.retrieve_hybrid(
+        StubConfig(), _fast_vector, _fast_graph, "`CreatePlate` の使い方", verbose=False
+    )
+
+    assert retrieved["keyword"] == "CreatePlate"
+    assert retrieved["vector"] == "vector:CreatePlate"
+    assert retrieved["graph"] == "graph:CreatePlate"
+    assert retrieved["timed_out"] == []
+    assert set(retrieved["timings_ms"]) == {"vector", "graph", "retrieval"}
+    assert retrieved["timings_ms"]["retrieval"] < 500
+
+
+def test_slow_backend_is_replaced_by_a_note_within_its_budget(main_0905):
+    config = StubConfig()
+    config.qa_graph_timeout = 0.1
+
+    started = time.perf_counter()
+    retrieved = main_0905.retrieve_hybrid(config, _fast_vector, _slow_graph, "CreatePlate", verbose=False)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.8  # the slow thread is not waited for
+    assert retrieved["timed_out"] == ["graph"]
+    assert retrieved["vector"] == "vector:CreatePlate"
+    assert "グラフ検索が制限時間 0.1 秒以内に完了しなかったため省略" in retrieved["graph"]
+    assert retrieved["timings_ms"]["graph"] == pytest.approx(100.0)
+    assert retrieved["timings_ms"]["retrieval"] >= 100.0
+    assert main_0905._cacheable_context_ids(retrieved, "answer") is None
+
+
+def test_qa_batch_round_trip_keeps_input_order(main_0905, tmp_path):
+    calls = []
+
+    def generate(vector, graph, question):
+        calls.append(question)
+        return f"answer({vector}, {graph})"
+
+    sys.modules["main_helper_0905"].build_langchain_wrapped_engines = lambda config: {
+        "vector_search": _fast_vector,
+        "graph_search": _fast_graph,
+        "generate_response": generate,
+    }
+    input_path = tmp_path / "questions.jsonl"
+    input_path.write_text(
+        "\n".join(json.dumps(item, ensure_ascii=False) for item in [
+            {"id": "q1", "question": "`CreatePlate` の引数は？"},
+            {"id": "q2", "query": "DeleteElement"},
+            {"id": "q3", "question": ""},
+        ]) + "\n",
+        encoding="utf-8",
+    )
+    output_path = tmp_path / "out" / "answers.jsonl"
+
+    assert main_0905.run_qa_batch(StubConfig(), input_path, output_path) is False  # q3 is an error
+
+    records = [json.loads(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+    assert [r["id"] for r in records] == ["q1", "q2", "q3"]
+    assert records[0]["answer"] == "answer(vector:CreatePlate, graph:CreatePlate)"
+    assert records[0]["keyword"] == "CreatePlate"
+    assert records[1]["answer"] == "answer(vector:DeleteElement, graph:DeleteElement)"
+    assert records[0]["timed_out"] == [] and "total" in records[0]["timings_ms"]
+    assert records[0]["context_ids"] == {"vector": [], "graph": []}
+    assert records[2]["error"]
+    assert sorted(calls) == ["DeleteElement", "`CreatePlate` の引数は？"]
@@ -0,0 +1,41 @@
+import pickle
+
+import pytest
+
+pytest.importorskip("sklearn")
+pytest.importorskip("langchain_core")
+
+import joblib  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from sklearn.feature_extraction.text import TfidfVectorizer  # noqa: E402
+
+from mycode.sparse_vector_db import DOCS_FILE, VECTORIZER_FILE, SparseVectorSearch  # noqa: E402
+
+DOCS = [
+    Document(page_content="create a plate solid", metadata={"doc_id": "plate"}),
+    Document(page_content="export drawings to dxf", metadata={"doc_id": "dxf"}),
+    Document(page_content="edit the hull surface", metadata={"doc_id": "hull"}),
+]
+
+
+def test_manifest_index_search(tmp_path):
+    SparseVectorSearch(tmp_path).index_documents(DOCS)
+
+    results = SparseVectorSearch(tmp_path).search("plate solid", limit=2)
+
+    assert results[0][0] == "plate" and results[0][1] > 0
+
+
+def test_legacy_pickle_index_search(tmp_path):
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform([doc.page_content for doc in DOCS])
+    joblib.dump((vectorizer, matrix), tmp_path / VECTORIZER_FILE)
+    with open(tmp_path / DOCS_FILE, "wb") as f:
+        pickle.dump(DOCS, f)
+
+    search = SparseVectorSearch(tmp_path)
+    results = search.search("hull surface", limit=2)
+
+    assert search._index is None  # legacy branch, scored with cosine_similarity
+    assert results[0][0] == "hull" and results[0][1] > 0
+    assert search.get_document("dxf").page_content == "export drawings to dxf"
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+from doc_preprocessor_hybrid import spec_cache
+from doc_preprocessor_hybrid.rule_parser import parse_api_documents
+
+API_TEXT = """■Partオブジェクトのメソッド
+〇線を作成する
+返り値:作成した要素のID
+CreateLine(
+ParamName, // 文字列:パラメータ名
+bUpdate ); // bool:更新する場合はTrue
+"""
+
+ARG_TEXT = """■文字列
+通常の文字列
+■bool
+True または False
+"""
+
+
+def test_cached_parse_hits_memory_then_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_SPEC_CACHE_DIR", str(tmp_path))
+    spec_cache.clear_memory_cache()
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return spec_cache.parse_api_spec_dicts(text)
+
+    first = spec_cache.cached_parse("test", API_TEXT, parse)
+    first[0]["name"] = "mutated"
+    second = spec_cache.cached_parse("test", API_TEXT, parse)
+    spec_cache.clear_memory_cache()
+    third = spec_cache.cached_parse("test", API_TEXT, parse)
+
+    assert len(calls) == 1
+    assert len(list(tmp_path.glob("test-*.json"))) == 1
+    assert second == third
+    assert second[0]["name"] == "CreateLine"
+    assert [p["name"] for p in second[0]["params"]] == ["ParamName", "bUpdate"]
+
+
+def test_cached_parse_key_changes_with_input(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_SPEC_CACHE_DIR", "")
+    spec_cache.clear_memory_cache()
+
+    original = spec_cache.load_api_spec_dicts(API_TEXT)
+    changed = spec_cache.load_api_spec_dicts(API_TEXT.replace("CreateLine", "CreateArc"))
+
+    assert original[0]["name"] == "CreateLine"
+    assert changed[0]["name"] == "CreateArc"
+    assert spec_cache.load_type_description_dicts(ARG_TEXT) == {
+        "文字列": "通常の文字列",
+        "bool": "True または False",
+    }
+
+
+def test_parse_api_documents_cached_bundle_matches(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_SPEC_CACHE_DIR", str(tmp_path / "cache"))
+    spec_cache.clear_memory_cache()
+    doc_path = tmp_path / "api.txt"
+    arg_path = tmp_path / "api_arg.txt"
+    doc_path.write_text(API_TEXT, encoding="utf-8")
+    arg_path.write_text(ARG_TEXT, encoding="utf-8")
+
+    fresh = parse_api_documents(doc_path, arg_path)
+    spec_cache.clear_memory_cache()
+    cached = parse_api_documents(Path(doc_path), Path(arg_path))
+
+    assert cached.api_entries == fresh.api_entries
+    assert cached.type_definitions == fresh.type_definitions
+
+
+def test_parser_source_change_invalidates_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("API_SPEC_CACHE_DIR", str(tmp_path))
+    spec_cache.clear_memory_cache()
+    calls = []
+
+    def parse(text):
+        calls.append(text)
+        return spec_cache.parse_api_spec_dicts(text)
+
+    spec_cache.cached_parse("test", API_TEXT, parse)
+    assert spec_cache._parser_digest(parse) != spec_cache._parser_digest(parse_api_documents)
+
+    # 解析関数のモジュールのソースが変わった状態を再現
+    monkeypatch.setattr(spec_cache, "_parser_digest", lambda fn: "changed")
+    spec_cache.cached_parse("test", API_TEXT, parse)
+
+    assert len(calls) == 2
+    assert len(list(tmp_path.glob("test-*.json"))) == 2
+
+
+def test_default_cache_dir_is_anchored_to_project_root(tmp_path, monkeypatch):
+    monkeypatch.delenv("API_SPEC_CACHE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert spec_cache.cache_dir() == Path(spec_cache.__file__).resolve().parent.parent / ".cache" / "api_spec"
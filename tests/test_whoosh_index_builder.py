@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("whoosh")
+pytest.importorskip("langchain_core")
+
+from langchain_core.documents import Document  # noqa: E402
+
+from mycode.fulltext_search import WhooshSearch  # noqa: E402
+
+
+def _doc(doc_id, text):
+    return Document(page_content=text, metadata={"doc_id": doc_id, "object": "Part", "method_name": doc_id})
+
+
+def test_multiprocess_build_and_incremental_update(tmp_path):
+    search = WhooshSearch(tmp_path / "ix")
+    search.index_documents(
+        [_doc(f"d{i}", f"plate solid {i}") for i in range(50)],
+        procs=2,
+        limitmb=32,
+        multisegment=True,
+    )
+    assert len(search.search("plate", limit=100)) == 50
+
+    segments = search.update_documents([_doc("d1", "hull girder")], delete_ids=["d2"], merge="none")
+
+    assert segments >= 2
+    assert [doc_id for doc_id, _ in search.search("girder")] == ["d1"]
+    assert len(search.search("plate", limit=100)) == 48
+
+    assert search.update_documents([], max_segments=1) == 1
+    assert search.get_document("d1").page_content == "hull girder"
+
+
+def test_sync_writes_only_changed_documents_and_deletes_vanished_ids(tmp_path):
+    search = WhooshSearch(tmp_path / "ix")
+    search.index_documents([_doc(f"d{i}", f"plate solid {i}") for i in range(5)])
+    segments = search.segment_count()
+
+    assert search.sync_documents([_doc(f"d{i}", f"plate solid {i}") for i in range(5)]) == (0, 0)
+    assert search.segment_count() == segments
+
+    current = [_doc("d0", "plate solid 0"), _doc("d1", "hull girder"), _doc("d5", "new deck")]
+    assert search.sync_documents(current, merge="none") == (2, 3)
+
+    assert set(search.stored_hashes()) == {"d0", "d1", "d5"}
+    assert [doc_id for doc_id, _ in search.search("girder")] == ["d1"]
+    assert [doc_id for doc_id, _ in search.search("plate")] == ["d0"]
+    assert search.sync_documents(current) == (0, 0)